@@ -1,20 +1,40 @@
 from __future__ import annotations
+import copy
 import json
 
-from typing import TypedDict, Optional, Dict, Any, List
+from typing import TypedDict, Optional, Dict, Any, List, Literal, Sequence
 
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_abaqus import read_inp, write_inp
+from .fc_addons import FCIdMap, FCRenumberReport, compress, extract, merge, merge_coincident_nodes, refine, renumber_nodes, reorder, to_simplices
 from .fc_blocks import FCBlock
+from .fc_coloring import FCColoring
+from .fc_components import FCComponents
 from .fc_conditions import FC_INITIAL_SET_TYPES_CODES, FC_INITIAL_SET_TYPES_KEYS, \
     FC_LOADS_TYPES_CODES, FC_LOADS_TYPES_KEYS, FC_RESTRAINT_FLAGS_CODES, FC_RESTRAINT_FLAGS_KEYS, FCInitialSet, FCRestraint, FCLoad
 from .fc_constraint import FCConstraint
 from .fc_coordinate_system import FCCoordinateSystem
 from .fc_data import FC_DEPENDENCY_TYPES_CODES, FC_DEPENDENCY_TYPES_KEYS, FCData, FCDependencyColumn
+from .fc_gmsh import read_gmsh
+from .fc_mass import FCMassReport, mass_properties
 from .fc_materials import FC_MATERIAL_PROPERTY_NAMES_CODES, FC_MATERIAL_PROPERTY_NAMES_KEYS, FC_MATERIAL_PROPERTY_TYPES_CODES, FC_MATERIAL_PROPERTY_TYPES_KEYS, FCMaterial, FCMaterialProperty
-from .fc_mesh import FC_ELEMENT_TYPES_KEYID, FC_ELEMENT_TYPES_KEYNAME, FCMesh, FCElement, FCElementType
+from .fc_memory import FCSolverMemory, estimate_solver_memory
+from .fc_mesh import FC_ELEMENT_TYPES_KEYID, FC_ELEMENT_TYPES_KEYNAME, FCMesh, FCElement, FCElementType, FCRefinement
+from .fc_nastran import read_bdf, write_bdf
+from .fc_parallel import FCElementChunk
+from .fc_partition import FCPart, FCPartitionMethodLiteral, partition
 from .fc_property_tables import FCPropertyTable
 from .fc_receivers import FCReceiver
+from .fc_selection import FCRegion, add_nodeset, add_sideset
 from .fc_set import FCSet
+from .fc_shapes import FCShape
+from .fc_sides import FCSideGeometry
+from .fc_spatial import FCElementLocator, FCNodeIndex
+from .fc_validation import FCValidationIssue, validate
 from .fc_value import FCValue
+from .fc_vtk import read_vtu, to_vtu
 
 
 class FCHeader(TypedDict):
@@ -168,6 +188,171 @@ class FCModel:
             self._decode_sets(src_data)
 
 
+    @classmethod
+    def from_gmsh(cls, filepath: str) -> FCModel:
+        """Создаёт модель по сетке Gmsh 4.1 (см. `fc_gmsh.read_gmsh`)."""
+        model = cls()
+        read_gmsh(model, filepath)
+        return model
+
+
+    @classmethod
+    def from_vtu(cls, filepath: str) -> FCModel:
+        """Создаёт модель по файлу VTK .vtu (см. `fc_vtk.read_vtu`)."""
+        model = cls()
+        read_vtu(model, filepath)
+        return model
+
+
+    @classmethod
+    def from_inp(cls, filepath: str) -> FCModel:
+        """Создаёт модель по входному файлу Abaqus (см. `fc_abaqus.read_inp`)."""
+        model = cls()
+        read_inp(model, filepath)
+        return model
+
+
+    @classmethod
+    def from_bdf(cls, filepath: str) -> FCModel:
+        """Создаёт модель по входному файлу Nastran (см. `fc_nastran.read_bdf`)."""
+        model = cls()
+        read_bdf(model, filepath)
+        return model
+
+
+    def compress(self) -> Dict[str, FCIdMap]:
+        """
+        Удаляет неиспользуемые узлы, блоки, материалы и таблицы свойств,
+        плотно перенумеровывает id и обновляет все ссылки на них.
+        Возвращает отображения старых id в новые (см. `fc_addons.compress`).
+        """
+        return compress(self)
+
+
+    def renumber_nodes(self, method: Literal['rcm'] = 'rcm') -> FCRenumberReport:
+        """
+        Перенумеровывает узлы для уменьшения ширины ленты (по умолчанию — RCM).
+        Возвращает отображение id и ширину ленты/профиль до и после.
+        """
+        return renumber_nodes(self, method)
+
+
+    def reorder(self, spatial: Literal['hilbert', 'morton'] = 'hilbert') -> Dict[str, FCIdMap]:
+        """
+        Упорядочивает узлы и элементы вдоль кривой Гильберта или Мортона
+        для локальности данных. Возвращает отображения id узлов и элементов.
+        """
+        return reorder(self, spatial)
+
+
+    def merge_coincident_nodes(self, tol: float = 0.0) -> FCIdMap:
+        """
+        Сливает узлы, совпадающие с точностью `tol`, в узел с наименьшим id
+        и переводит на него все ссылки. Возвращает отображение id слитых узлов.
+        """
+        return merge_coincident_nodes(self, tol)
+
+
+    def merge(self, other: FCModel) -> Dict[str, FCIdMap]:
+        """
+        Добавляет в модель копию `other` со сдвигом всех id за уже занятые.
+        Возвращает отображения id `other` в id модели (см. `fc_addons.merge`).
+        """
+        return merge(self, [other])[0]
+
+
+    def extract(self, blocks: Optional[Sequence[int]] = None, nodeset: Optional[int] = None,
+                bbox: Optional[NDArray[np.float64]] = None, elements: Optional[NDArray[np.int32]] = None) -> FCModel:
+        """
+        Новая модель из элементов, выбранных по блокам, набору узлов, параллелепипеду
+        и/или списку id, со всеми нужными им сущностями (см. `fc_addons.extract`).
+        """
+        return extract(self, blocks, nodeset, bbox, elements)
+
+
+    def select_nodes(self, region: FCRegion, name: str = '') -> FCSet:
+        """
+        Добавляет набор узлов, лежащих в области `region` (`fc_selection.box`,
+        `sphere`, `cylinder`, `band`), и возвращает его.
+        """
+        return add_nodeset(self, region, name)
+
+
+    def select_sides(self, region: Optional[FCRegion] = None, direction: Optional[Sequence[float]] = None,
+                     angle: float = 5.0, name: str = '') -> FCSet:
+        """
+        Добавляет набор внешних сторон объёмных элементов, лежащих в области `region`
+        и с внешней нормалью в пределах `angle` градусов от `direction`, и возвращает его.
+        """
+        return add_sideset(self, region, direction, angle, name)
+
+
+    def partition(self, n_parts: int, method: FCPartitionMethodLiteral = 'rcb') -> List[FCPart]:
+        """
+        Делит модель на `n_parts` сбалансированных частей методом 'rcb' или 'graph';
+        каждая часть — отдельная модель с интерфейсными узлами (см. `fc_partition.partition`).
+        """
+        return partition(self, n_parts, method)
+
+
+    def estimate_solver_memory(self, pattern: bool = False, memory_limit: Optional[int] = None) -> FCSolverMemory:
+        """
+        Число неизвестных, ненулевых элементов матрицы и оценка памяти решателя
+        по связности сетки, настройкам и закреплениям; `permission_write`
+        рекомендуется, если оценка превышает `memory_limit` (см. `fc_memory`).
+        """
+        return estimate_solver_memory(self, pattern, memory_limit)
+
+
+    def validate(self) -> List[FCValidationIssue]:
+        """
+        Проверяет, что все ссылки модели указывают на существующие узлы, элементы,
+        стороны, блоки, материалы, таблицы свойств и системы координат, а id
+        узлов и элементов уникальны. Пустой список — ошибок нет (см. `fc_validation`).
+        """
+        return validate(self)
+
+
+    def refine(self, levels: int = 1) -> List[FCRefinement]:
+        """
+        Равномерно делит сетку `levels` раз и переводит на неё наборы,
+        условия и связи (см. `fc_addons.refine`).
+        """
+        return refine(self, levels)
+
+
+    def to_simplices(self) -> FCRefinement:
+        """
+        Разбивает сетку на треугольники и тетраэдры с согласованными
+        диагоналями и переводит на неё наборы, условия и связи
+        (см. `fc_addons.to_simplices`).
+        """
+        return to_simplices(self)
+
+
+    def mass_properties(self) -> FCMassReport:
+        """
+        Масса, центр масс и тензор инерции по блокам и для всей модели
+        (см. `fc_mass.mass_properties`).
+        """
+        return mass_properties(self)
+
+
+    def to_vtu(self, filepath: str) -> None:
+        """Записывает сетку, блоки и наборы в файл VTK .vtu (см. `fc_vtk.to_vtu`)."""
+        to_vtu(self, filepath)
+
+
+    def to_inp(self, filepath: str) -> None:
+        """Записывает сетку, наборы и материалы во входной файл Abaqus (см. `fc_abaqus.write_inp`)."""
+        write_inp(self, filepath)
+
+
+    def to_bdf(self, filepath: str) -> None:
+        """Записывает сетку, наборы узлов и материалы в файл Nastran (см. `fc_nastran.write_bdf`)."""
+        write_bdf(self, filepath)
+
+
     def save(self, filepath: str) -> None:
         with open(filepath, "w") as f:
             json.dump(self.dump(), f, indent=4)
@@ -371,13 +556,26 @@ class FCModel:
                 output_data['receivers'].append(receiver.dump())
 
 
+def assemble(models: Sequence[FCModel]) -> FCModel:
+    """
+    Собирает новую модель из нескольких: id каждой следующей модели
+    сдвигаются за id предыдущих. Заголовок берётся из первой модели.
+    """
+    assembly = FCModel()
+    if models:
+        assembly.header = copy.deepcopy(models[0].header)
+    merge(assembly, models)
+    return assembly
+
 
 __all__ = [
-    'FCModel',
+    'FCModel', 'assemble',
     'FCMesh', 'FCBlock', 'FCPropertyTable', 'FCCoordinateSystem', 'FCConstraint',
     'FCElement', 'FCElementType', 'FCMaterial', 'FCLoad', 'FCRestraint', 'FCInitialSet',
     'FCReceiver', 'FCSet', 'FCDependencyColumn', 'FCValue', 'FCData', 'FCHeader',
-    'FCMaterialProperty',
+    'FCMaterialProperty', 'FCIdMap', 'FCNodeIndex', 'FCElementLocator', 'FCShape', 'FCPart',
+    'FCElementChunk', 'FCColoring', 'FCSolverMemory', 'FCComponents', 'FCValidationIssue',
+    'FCSideGeometry',
     'FC_DEPENDENCY_TYPES_KEYS', 'FC_DEPENDENCY_TYPES_CODES',
     'FC_INITIAL_SET_TYPES_CODES', 'FC_INITIAL_SET_TYPES_KEYS',
     'FC_LOADS_TYPES_CODES', 'FC_LOADS_TYPES_KEYS',
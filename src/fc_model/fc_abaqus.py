@@ -0,0 +1,436 @@
+import re
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import new_set, populate
+from .fc_materials import FCMaterial, FCMaterialPropertiesTypeLiteral
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, FCElementArrays, FCElementTypeLiteral, \
+    concatenate_element_arrays, lookup, node_order
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+# Рёбра квадратичных элементов Abaqus в порядке их срединных узлов
+_TRI = [(0, 1), (1, 2), (2, 0)]
+_QUAD = [(0, 1), (1, 2), (2, 3), (3, 0)]
+_TETRA = [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)]
+_HEX = [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)]
+_WEDGE = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)]
+
+# Стороны S1, S2, ... объёмных элементов Abaqus (номера угловых узлов)
+_TETRA_FACES = [[0, 1, 2], [0, 3, 1], [1, 3, 2], [2, 3, 0]]
+_HEX_FACES = [[0, 1, 2, 3], [4, 7, 6, 5], [0, 4, 5, 1], [1, 5, 6, 2], [2, 6, 7, 3], [3, 7, 4, 0]]
+_WEDGE_FACES = [[0, 1, 2], [3, 5, 4], [0, 3, 4, 1], [1, 4, 5, 2], [2, 5, 3, 0]]
+
+# Основание призмы Abaqus обходится в обратную сторону
+_WEDGE_CORNERS = [0, 2, 1, 3, 5, 4]
+
+_AbaqusType = Tuple[FCElementTypeLiteral, List[int], List[int]]
+
+
+def _entry(typename: FCElementTypeLiteral, corners: List[int], edges: List[Tuple[int, int]],
+           faces: List[List[int]]) -> _AbaqusType:
+    """Тип fc, номера узлов Abaqus в порядке fc и номер стороны fc для каждой стороны S1, S2, ..."""
+    order = node_order(typename, corners, edges)
+    element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+    fc_faces = [frozenset(order[node] for node in facet if node < len(corners)) for facet in element_type['facets']]
+    return typename, order, [fc_faces.index(frozenset(face)) for face in faces]
+
+
+# Тип элемента Abaqus (с точностью до суффиксов вида R, H, I, M) -> тип fc, порядок узлов и стороны.
+# Первое имя для каждого типа fc используется при записи.
+ABAQUS_ELEMENT_TYPES: Dict[str, _AbaqusType] = {
+    'C3D4': _entry('TETRA4', [0, 1, 2, 3], [], _TETRA_FACES),
+    'C3D10': _entry('TETRA10', [0, 1, 2, 3], _TETRA, _TETRA_FACES),
+    'C3D8': _entry('HEX8', list(range(8)), [], _HEX_FACES),
+    'C3D20': _entry('HEX20', list(range(8)), _HEX, _HEX_FACES),
+    'C3D6': _entry('WEDGE6', _WEDGE_CORNERS, [], _WEDGE_FACES),
+    'C3D15': _entry('WEDGE15', _WEDGE_CORNERS, _WEDGE, _WEDGE_FACES),
+    'CPS3': _entry('TRI3', [0, 1, 2], [], []),
+    'CPS6': _entry('TRI6', [0, 1, 2], _TRI, []),
+    'CPS4': _entry('QUAD4', [0, 1, 2, 3], [], []),
+    'CPS8': _entry('QUAD8', [0, 1, 2, 3], _QUAD, []),
+    'CPE3': _entry('TRI3', [0, 1, 2], [], []),
+    'CPE6': _entry('TRI6', [0, 1, 2], _TRI, []),
+    'CPE4': _entry('QUAD4', [0, 1, 2, 3], [], []),
+    'CPE8': _entry('QUAD8', [0, 1, 2, 3], _QUAD, []),
+    'CAX3': _entry('TRI3', [0, 1, 2], [], []),
+    'CAX6': _entry('TRI6', [0, 1, 2], _TRI, []),
+    'CAX4': _entry('QUAD4', [0, 1, 2, 3], [], []),
+    'CAX8': _entry('QUAD8', [0, 1, 2, 3], _QUAD, []),
+    'S3': _entry('MITC3', [0, 1, 2], [], []),
+    'STRI65': _entry('MITC6', [0, 1, 2], _TRI, []),
+    'S4': _entry('MITC4', [0, 1, 2, 3], [], []),
+    'S8': _entry('MITC8', [0, 1, 2, 3], _QUAD, []),
+    # Срединный узел балок и стержней Abaqus — второй
+    'B31': ('BEAM26', [0, 1], []),
+    'B32': ('BEAM36', [0, 2, 1], []),
+    'T3D2': ('BAR2', [0, 1], []),
+    'T3D3': ('BAR3', [0, 2, 1], []),
+    'SPRINGA': ('SPRING3D', [0, 1], []),
+    'MASS': ('LUMPMASS3D', [0], []),
+}
+
+_FC_ABAQUS_TYPES: Dict[FCElementTypeLiteral, str] = {}
+for _name, (_typename, _, _) in ABAQUS_ELEMENT_TYPES.items():
+    _FC_ABAQUS_TYPES.setdefault(_typename, _name)
+
+
+def abaqus_element_type(name: str) -> str:
+    """Ключ `ABAQUS_ELEMENT_TYPES` для имени типа Abaqus (самый длинный совпадающий префикс)."""
+    name = name.upper()
+    matches = [key for key in ABAQUS_ELEMENT_TYPES if name.startswith(key)]
+    if not matches:
+        raise ValueError(f"Abaqus element type {name} is not supported")
+    return max(matches, key=len)
+
+
+# Опции материала Abaqus -> (группа, тип, имена свойств по порядку значений первой строки данных)
+_MATERIAL_OPTIONS: Dict[str, Tuple[FCMaterialPropertiesTypeLiteral, str, List[str]]] = {
+    'ELASTIC': ('elasticity', 'HOOK', ['YOUNG_MODULE', 'POISSON_RATIO']),
+    'DENSITY': ('common', 'USUAL', ['DENSITY']),
+    'EXPANSION': ('thermal', 'ISOTROPIC', ['COEF_LIN_EXPANSION']),
+    'CONDUCTIVITY': ('thermal', 'ISOTROPIC', ['COEF_THERMAL_CONDUCTIVITY']),
+}
+
+_SECTIONS = ('SOLID SECTION', 'SHELL SECTION', 'MEMBRANE SECTION', 'BEAM SECTION')
+
+
+def _keyword(line: str) -> Tuple[str, Dict[str, str]]:
+    fields = line[1:].split(',')
+    params = {}
+    for field in fields[1:]:
+        key, _, value = field.partition('=')
+        if key.strip():
+            params[' '.join(key.split()).upper()] = value.strip().strip('"')
+    return ' '.join(fields[0].split()).upper(), params
+
+
+def _cards(stream: TextIO, chunk_lines: int) -> Iterator[Tuple[str, Dict[str, str], List[str], bool]]:
+    """
+    Ключевые слова с параметрами и порциями строк данных не длиннее `chunk_lines`
+    (запись, продолженная запятой, не разрывается). Последний элемент — признак
+    первой порции ключевого слова; каждое ключевое слово выдаётся хотя бы раз.
+    """
+    keyword: Optional[Tuple[str, Dict[str, str]]] = None
+    lines: List[str] = []
+    first = True
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith('**'):
+            continue
+        if line.startswith('*'):
+            if keyword is not None:
+                yield keyword[0], keyword[1], lines, first
+            keyword, lines, first = _keyword(line), [], True
+        elif keyword is not None:
+            lines.append(line)
+            if len(lines) >= chunk_lines and not line.endswith(','):
+                yield keyword[0], keyword[1], lines, first
+                lines, first = [], False
+    if keyword is not None:
+        yield keyword[0], keyword[1], lines, first
+
+
+def _numbers(lines: List[str], dtype: type) -> NDArray[np.generic]:
+    text = ','.join(line.rstrip(',') for line in lines)
+    values: NDArray[np.generic] = np.fromstring(text, dtype=dtype, sep=',')
+    if len(values) != text.count(',') + 1:
+        raise ValueError(f"Abaqus data lines are malformed near '{lines[0]}'")
+    return values
+
+
+class _Deck:
+    """Накопитель данных файла Abaqus: узлы, элементы, наборы, материалы и секции."""
+
+    def __init__(self) -> None:
+        self.nodes_ids: List[NDArray[np.int64]] = []
+        self.nodes_xyz: List[NDArray[np.float64]] = []
+        self.parts: Dict[FCElementTypeLiteral, List[FCElementArrays]] = {}
+        # Для поиска сторон: id элементов и номер типа Abaqus в `kinds`
+        self.element_ids: List[NDArray[np.int64]] = []
+        self.element_kinds: List[NDArray[np.int64]] = []
+        self.kinds: List[str] = []
+        self.groups: Dict[str, int] = {}
+        self.names: Dict[str, str] = {}
+        self.nsets: Dict[str, List[NDArray[np.int64]]] = {}
+        self.elsets: Dict[str, List[NDArray[np.int64]]] = {}
+        self.surfaces: Dict[str, List[Tuple[NDArray[np.int64], NDArray[np.int64]]]] = {}
+        self.materials: Dict[str, FCMaterial] = {}
+        self.sections: List[Tuple[str, str]] = []
+
+    def node(self, params: Dict[str, str], lines: List[str]) -> None:
+        width = lines[0].rstrip(',').count(',') + 1
+        values = _numbers(lines, np.float64).reshape(-1, width)
+        xyz = np.zeros((len(values), 3))
+        xyz[:, :width - 1] = values[:, 1:4]
+        ids = values[:, 0].astype(np.int64)
+        self.nodes_ids.append(ids)
+        self.nodes_xyz.append(xyz)
+        if params.get('NSET'):
+            self.names.setdefault(params['NSET'].upper(), params['NSET'])
+            self.nsets.setdefault(params['NSET'].upper(), []).append(ids)
+
+    def element(self, params: Dict[str, str], lines: List[str]) -> None:
+        kind = abaqus_element_type(params.get('TYPE', ''))
+        typename, order, _ = ABAQUS_ELEMENT_TYPES[kind]
+        values = _numbers(lines, np.int64).astype(np.int64, copy=False).reshape(-1, len(order) + 1)
+        group = params.get('ELSET', '')
+        key = group.upper()
+        block = self.groups.setdefault(key, len(self.groups) + 1)
+        if group:
+            self.names.setdefault(key, group)
+            self.elsets.setdefault(key, []).append(values[:, 0])
+        if kind not in self.kinds:
+            self.kinds.append(kind)
+        count = len(values)
+        self.parts.setdefault(typename, []).append({
+            'ids': values[:, 0].astype(np.int32),
+            'nodes': values[:, 1:][:, order].astype(np.int32),
+            'blocks': np.full(count, block, np.int32),
+            'parent_ids': np.full(count, block, np.int32),
+            'orders': np.ones(count, np.int32),
+        })
+        self.element_ids.append(values[:, 0])
+        self.element_kinds.append(np.full(count, self.kinds.index(kind), np.int64))
+
+    def members(self, sets: Dict[str, List[NDArray[np.int64]]], params: Dict[str, str], lines: List[str],
+                name: str) -> None:
+        """Данные *NSET/*ELSET: номера, диапазоны GENERATE или имена других наборов."""
+        key = name.upper()
+        self.names.setdefault(key, name)
+        target = sets.setdefault(key, [])
+        if not lines:
+            return
+        if 'GENERATE' in params:
+            for start, stop, step in _numbers(lines, np.int64).reshape(-1, 3).tolist():
+                target.append(np.arange(start, stop + 1, step or 1, dtype=np.int64))
+            return
+        try:
+            target.append(_numbers(lines, np.int64).astype(np.int64))
+        except ValueError:
+            for token in ','.join(lines).split(','):
+                token = token.strip()
+                if token.lstrip('-').isdigit():
+                    target.append(np.array([int(token)], np.int64))
+                elif token:
+                    target.extend(sets.get(token.upper(), []))
+
+    def surface(self, name: str, lines: List[str]) -> None:
+        key = name.upper()
+        self.names.setdefault(key, name)
+        target = self.surfaces.setdefault(key, [])
+        for line in lines:
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) < 2 or not re.fullmatch(r'S\d+', fields[1].upper()):
+                continue
+            label = int(fields[1][1:])
+            ids = np.array([int(fields[0])], np.int64) if fields[0].isdigit() \
+                else np.concatenate([np.array([], np.int64)] + self.elsets.get(fields[0].upper(), []))
+            target.append((ids, np.full(len(ids), label, np.int64)))
+
+    def material_option(self, material: FCMaterial, keyword: str, params: Dict[str, str], lines: List[str]) -> None:
+        if not lines or params.get('TYPE', 'ISO').upper() not in ('ISO', 'ISOTROPIC'):
+            return
+        group, type, names = _MATERIAL_OPTIONS[keyword]
+        values = [float(v) for v in lines[0].split(',') if v.strip()]
+        for name, value in zip(names, values):
+            material.set_constant(group, type, name, value)
+
+
+def _ids(parts: List[NDArray[np.int64]]) -> NDArray[np.int64]:
+    result: NDArray[np.int64] = np.unique(np.concatenate([np.array([], np.int64)] + parts))
+    return result
+
+
+def read_inp(model: 'FCModel', path: str, chunk_lines: int = 65536) -> None:
+    """
+    Читает плоский входной файл Abaqus (.inp) в пустую модель.
+
+    Файл читается построчно, данные ключевых слов разбираются средствами NumPy
+    порциями по `chunk_lines` строк. Поддерживаются *NODE, *ELEMENT (типы
+    `ABAQUS_ELEMENT_TYPES`), *NSET и *ELSET (в том числе GENERATE и ссылки на
+    наборы), *SURFACE по сторонам элементов, *MATERIAL с *ELASTIC, *DENSITY,
+    *EXPANSION и *CONDUCTIVITY (первая строка данных) и секции с ELSET и MATERIAL.
+    Блок — группа ELSET ключевого слова *ELEMENT; секция по другому набору
+    выделяет его элементы в новый блок. Шаги (*STEP) пропускаются.
+    """
+    deck = _Deck()
+    material: Optional[FCMaterial] = None
+    skip = False
+    part_count = 0
+    with open(path, 'r', encoding='latin-1') as stream:
+        for keyword, params, lines, first in _cards(stream, chunk_lines):
+            if skip:
+                skip = keyword != 'END STEP'
+                continue
+            if keyword in _MATERIAL_OPTIONS and material is not None:
+                if first:
+                    deck.material_option(material, keyword, params, lines)
+                continue
+            material = None
+            if keyword == 'NODE' and lines:
+                deck.node(params, lines)
+            elif keyword == 'ELEMENT' and lines:
+                deck.element(params, lines)
+            elif keyword == 'NSET':
+                deck.members(deck.nsets, params, lines, params.get('NSET', ''))
+            elif keyword == 'ELSET':
+                deck.members(deck.elsets, params, lines, params.get('ELSET', ''))
+            elif keyword == 'SURFACE' and params.get('TYPE', 'ELEMENT').upper() == 'ELEMENT':
+                deck.surface(params.get('NAME', ''), lines)
+            elif keyword == 'MATERIAL':
+                name = params.get('NAME', '')
+                material = deck.materials.setdefault(name.upper(), FCMaterial({'id': len(deck.materials) + 1,
+                                                                                'name': name}))
+            elif keyword in _SECTIONS and first:
+                deck.sections.append((params.get('ELSET', '').upper(), params.get('MATERIAL', '').upper()))
+            elif keyword == 'STEP':
+                skip = True
+            elif keyword == 'PART':
+                part_count += 1
+                if part_count > 1:
+                    raise ValueError("Abaqus files with several parts are not supported")
+            elif keyword == 'INCLUDE':
+                raise ValueError("Abaqus *INCLUDE is not supported")
+
+    # Секции по наборам, не совпадающим с группами *ELEMENT, выделяют новые блоки
+    block_materials: Dict[int, int] = {}
+    block_count = len(deck.groups)
+    for elset, material_name in deck.sections:
+        material_id = deck.materials[material_name].id if material_name in deck.materials else 0
+        if elset in deck.groups:
+            block_materials[deck.groups[elset]] = material_id
+            continue
+        block_count += 1
+        block = block_count
+        block_materials[block] = material_id
+        members = _ids(deck.elsets.get(elset, []))
+        for chunks in deck.parts.values():
+            for arrays in chunks:
+                inside = np.isin(arrays['ids'], members)
+                arrays['blocks'][inside] = block
+
+    elements = {typename: concatenate_element_arrays(chunks) for typename, chunks in deck.parts.items()}
+    nodesets = {set_id: (deck.names[key], _ids(parts).astype(np.int32))
+                for set_id, (key, parts) in enumerate(deck.nsets.items(), 1)}
+    populate(model,
+             np.concatenate([np.array([], np.int64)] + deck.nodes_ids).astype(np.int32),
+             np.concatenate([np.empty((0, 3))] + deck.nodes_xyz),
+             elements, nodesets)
+
+    for fc_material in deck.materials.values():
+        model.materials[fc_material.id] = fc_material
+    for block_id, material_id in block_materials.items():
+        if block_id in model.blocks:
+            model.blocks[block_id].material_id = material_id
+
+    # Стороны: номер стороны fc по типу элемента Abaqus и метке S<k>
+    faces = np.full((len(deck.kinds) + 1, 7), -1, np.int64)
+    for row, kind in enumerate(deck.kinds):
+        fc_faces = ABAQUS_ELEMENT_TYPES[kind][2]
+        faces[row, 1:len(fc_faces) + 1] = fc_faces
+    all_ids = np.concatenate([np.array([], np.int64)] + deck.element_ids)
+    all_kinds = np.concatenate([np.array([], np.int64)] + deck.element_kinds)
+    for set_id, (key, entries) in enumerate(deck.surfaces.items(), 1):
+        ids = np.concatenate([np.array([], np.int64)] + [ids for ids, _ in entries])
+        labels = np.concatenate([np.array([], np.int64)] + [labels for _, labels in entries])
+        pos = lookup(all_ids, ids)
+        facet = faces[np.where(pos >= 0, all_kinds[pos], -1), np.where(labels <= 6, labels, 0)]
+        found = facet >= 0
+        model.sidesets[set_id] = new_set(set_id, deck.names[key], np.stack([ids[found], facet[found]], axis=1))
+
+
+def _label(name: str, default: str) -> str:
+    """Имя для Abaqus: исходное, если оно допустимо, иначе `default`."""
+    return name if re.fullmatch(r'[A-Za-z][\w\-.]*', name) else default
+
+
+def _row_format(size: int, per_line: int = 16) -> str:
+    fields = ['%d'] * size
+    return ',\n'.join(', '.join(fields[i:i + per_line]) for i in range(0, size, per_line))
+
+
+def _write_ids(stream: TextIO, ids: NDArray[np.int64]) -> None:
+    full = len(ids) // 16 * 16
+    if full:
+        np.savetxt(stream, ids[:full].reshape(-1, 16), fmt='%d', delimiter=', ')
+    if len(ids) > full:
+        stream.write(', '.join(str(v) for v in ids[full:].tolist()) + '\n')
+
+
+def write_inp(model: 'FCModel', path: str, chunk_size: int = 65536) -> None:
+    """
+    Записывает сетку модели во входной файл Abaqus (.inp).
+
+    Узлы и элементы пишутся пачками по `chunk_size`. Элементы блока образуют
+    набор BLOCK_<id>; блокам объёмных элементов с материалом добавляется
+    *SOLID SECTION. Непустые наборы узлов пишутся как *NSET, наборы сторон —
+    как *SURFACE, материалы — постоянными свойствами *ELASTIC, *DENSITY,
+    *EXPANSION и *CONDUCTIVITY. Типы без соответствия в Abaqus вызывают ValueError.
+    """
+    mesh = model.mesh
+    types = [tp for tp in mesh.elements if mesh.elements[tp]]
+    for typename in types:
+        if typename not in _FC_ABAQUS_TYPES:
+            raise ValueError(f"Element type {typename} has no Abaqus counterpart")
+    material_names = {material_id: _label(material.name, f'MATERIAL_{material_id}')
+                      for material_id, material in model.materials.items()}
+
+    with open(path, 'w') as stream:
+        stream.write('*HEADING\nfc_model export\n*NODE\n')
+        xyz = mesh.nodes_xyz.reshape(-1, 3)
+        for start in range(0, len(xyz), chunk_size):
+            rows = np.column_stack([mesh.nodes_ids[start:start + chunk_size], xyz[start:start + chunk_size]])
+            np.savetxt(stream, rows, fmt='%d, %.17g, %.17g, %.17g')
+
+        solid_blocks = set()
+        for typename in types:
+            kind = _FC_ABAQUS_TYPES[typename]
+            inverse = np.argsort(ABAQUS_ELEMENT_TYPES[kind][1])
+            row_format = _row_format(len(inverse) + 1)
+            for arrays in mesh.iter_element_arrays(typename, chunk_size):
+                rows = np.column_stack([arrays['ids'], arrays['nodes'][:, inverse]])
+                for block in np.unique(arrays['blocks']).tolist():
+                    stream.write(f'*ELEMENT, TYPE={kind}, ELSET=BLOCK_{block}\n')
+                    np.savetxt(stream, rows[arrays['blocks'] == block], fmt=row_format)
+                    if FC_ELEMENT_TYPES_KEYNAME[typename]['dim'] == 3:
+                        solid_blocks.add(block)
+
+        for set_id, fc_set in model.nodesets.items():
+            if len(fc_set.apply):
+                stream.write(f'*NSET, NSET={_label(fc_set.name, f"NSET_{set_id}")}\n')
+                _write_ids(stream, np.asarray(fc_set.apply.data, np.int64).ravel())
+
+        # Метка S<k> по типу элемента и номеру стороны fc
+        kinds = [_FC_ABAQUS_TYPES[tp] for tp in types]
+        faces = np.zeros((len(kinds) + 1, 6), np.int64)
+        for row, kind in enumerate(kinds):
+            for label, facet in enumerate(ABAQUS_ELEMENT_TYPES[kind][2], 1):
+                faces[row, facet] = label
+        all_ids = np.concatenate([np.array([], np.int64)] + [mesh.element_arrays(tp)['ids'] for tp in types])
+        all_kinds = np.concatenate([np.array([], np.int64)] +
+                                   [np.full(len(mesh.elements[tp]), row, np.int64) for row, tp in enumerate(types)])
+        for set_id, fc_set in model.sidesets.items():
+            pairs = np.asarray(fc_set.apply.data, np.int64).reshape(-1, 2)
+            pos = lookup(all_ids, pairs[:, 0])
+            labels = faces[np.where(pos >= 0, all_kinds[pos], -1), pairs[:, 1]]
+            found = labels > 0
+            if not np.any(found):
+                continue
+            stream.write(f'*SURFACE, TYPE=ELEMENT, NAME={_label(fc_set.name, f"SURFACE_{set_id}")}\n')
+            np.savetxt(stream, np.column_stack([pairs[found, 0], labels[found]]), fmt='%d, S%d')
+
+        for material_id, material in model.materials.items():
+            stream.write(f'*MATERIAL, NAME={material_names[material_id]}\n')
+            for keyword, (group, _, names) in _MATERIAL_OPTIONS.items():
+                values = [material.constant(group, name) for name in names]
+                if all(value is not None for value in values):
+                    stream.write(f'*{keyword}\n' + ', '.join(repr(value) for value in values) + '\n')
+
+        for block_id, block in model.blocks.items():
+            if block_id in solid_blocks and block.material_id in material_names:
+                stream.write(f'*SOLID SECTION, ELSET=BLOCK_{block_id}, MATERIAL={material_names[block.material_id]}\n')
@@ -1,134 +1,856 @@
-
-# from fc_model import FCModel
-
-# def compress(self: FCModel):
-
-#     # TODO всюду где есть ссылки на узлы и элементы, осуществить грамотную переиндексацию
-#     # TODO добавить системы координат
-
-
-#     # 1. Убираем неиспользуемые узлы и переиндексируем используемые
-
-#     nodes_id_map = {index: i + 1
-#                     for i, index in enumerate(set(self.elems.nodes_list))}
-
-#     self.nodes.reindex(nodes_id_map)
-
-#     for elem in self.elems:
-#         elem['nodes'] = [nodes_id_map[nid] for nid in elem['nodes']]
-
-#     # 2. Убираем неиспользуемые блоки и переиндексируем используемые
-
-#     blocks_id_map = {index: i + 1
-#                         for i, index in enumerate(set([elem['block'] for elem in self.elems]))}
-
-#     self.blocks.reindex(blocks_id_map)
-
-#     for elem in self.elems:
-#         elem['block'] = blocks_id_map[elem['block']]
-
-
-#     # 3. Убираем неиспользуемые свойтсва и переиндексируем используемые
-
-#     property_id_map = {index: i + 1
-#                         for i, index in enumerate(set([block['property_id']
-#                                                         for block in self.blocks]))}
-
-#     self.property_tables.reindex(property_id_map)
-
-#     for block in self.blocks:
-#         block['property_id'] = property_id_map[block['property_id']]
-
-#     # 4. Переиндексируем используемые материалы
-
-#     material_id_map = self.materials.compress()
-
-#     for block in self.blocks:
-#         block['material_id'] = material_id_map[block['material_id']]
-
-
-#     # 5. Переиндексируем используемые граничные условия
-
-#     load_id_map = self.loads.compress()
-
-#     restraint_id_map = self.restraints.compress()
-
-
-#     # 6. Переиндексируем существующие элементы
-
-#     elems_id_map = self.elems.compress()
-
-#     for material in self.materials:
-#         for key in material['properties']:
-#             for property in material['properties'][key]:
-
-#                 if isinstance(property['dependency'], list) and property['dependency']:
-#                     for dep in property['dependency']:
-#                         if isinstance(dep['data'], ndarray):
-#                             if dep['type'] == 10:
-#                                 for i, n in enumerate(dep['data']):
-#                                     dep['data'][i] = elems_id_map[int(n)]
-#                             if dep['type'] == 11:
-#                                 for i, n in enumerate(dep['data']):
-#                                     dep['data'][i] = nodes_id_map[int(n)]
-
-
-
-
-
-
-# def split_facet(facet: List[int]) -> List[int]:
-#     if len(facet) == 3:
-#         return facet
-#     if len(facet) < 3:
-#         return []
-#     tail = facet[2:]
-#     tail.append(facet[1])
-#     tris = [facet[-1], facet[0], facet[1]]
-#     tris.extend(split_facet(tail))
-#     return tris
-
-
-# def split_edge(edge: List[int]) -> List[int]:
-#     if len(edge) == 2:
-#         return edge
-#     if len(edge) < 2:
-#         return []
-#     tail = edge[1:]
-#     pairs = [edge[0], edge[1]]
-#     pairs.extend(split_edge(tail))
-#     return pairs
-
-
-# def split_polihedron(tetra: List[int]) -> List[int]:
-#     return tetra
-
-
-# def make_structure():
-#     for eid in FC_ELEMENT_TYPES:
-#         element_type = FC_ELEMENT_TYPES[eid]
-#         element_type['structure'][0] = np.arange(element_type['nodes'], dtype=np.int32)
-
-#         if element_type['dim'] > 0:
-
-#             pairs = []
-#             for edge in element_type['edges']:
-#                 pairs.extend(split_edge(edge))
-
-#             element_type['structure'][1] = np.array(pairs, dtype=np.int32)
-
-#         if element_type['dim'] > 1:
-
-#             trangles = []
-#             for facet in element_type['facets']:
-#                 trangles.extend(split_facet(facet))
-
-#             element_type['structure'][2] = np.array(trangles, dtype=np.int32)
-
-#         if element_type['dim'] > 2:
-
-#             tetras = []
-#             for tetra in element_type['tetras']:
-#                 tetras.extend(split_polihedron(tetra))
-
-#             element_type['structure'][3] = np.array(tetras, dtype=np.int32)
+import copy
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Literal, Optional, Sequence, Set, Tuple, TypedDict, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_blocks import FCBlock
+from .fc_conditions import FCApplyTargetLiteral, FCInitialSet, FCLoad, FCRestraint
+from .fc_coordinate_system import FCCoordinateSystem
+from .fc_data import FCData
+from .fc_graph import FCBandwidth, bandwidth, node_graph, rcm_order, unique_sorted
+from .fc_mesh import FCElementArrays, FCElementTypeLiteral, FCMesh, FCRefinement, concatenate_element_arrays, lookup
+from .fc_set import FCSet
+from .fc_spatial import coincident_groups, hilbert_keys, morton_keys
+from .fc_value import FCValue, encode
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+class FCIdMap:
+    """
+    Отображение старых id в новые, заданное парой массивов одинаковой длины.
+
+    Применяется векторно: `id_map(ids)`. Значения, которых нет в отображении
+    (например, -1 как признак отсутствия свойств), остаются без изменений.
+    """
+
+    old: NDArray[np.int32]
+    new: NDArray[np.int32]
+
+    def __init__(self, old: NDArray[np.int32], new: NDArray[np.int32]):
+        old = np.asarray(old, dtype=np.int32).ravel()
+        new = np.asarray(new, dtype=np.int32).ravel()
+        if old.shape != new.shape:
+            raise ValueError(f"FCIdMap: old and new must have equal lengths, got {len(old)} and {len(new)}")
+        if len(np.unique(old)) != len(old):
+            raise ValueError("FCIdMap: old ids must be unique")
+        self.old = old
+        self.new = new
+
+    @classmethod
+    def dense(cls, ids: NDArray[np.int32], start: int = 1) -> 'FCIdMap':
+        """Плотная перенумерация: уникальные id по возрастанию получают номера start, start+1, ..."""
+        old = np.unique(np.asarray(ids, dtype=np.int32))
+        return cls(old, np.arange(start, start + len(old), dtype=np.int32))
+
+    def __call__(self, ids: NDArray[np.generic]) -> NDArray[np.int32]:
+        ids = np.asarray(ids)
+        pos = lookup(self.old, ids)
+        found = pos >= 0
+        mapped: NDArray[np.int32] = ids.astype(np.int32)
+        mapped[found] = self.new[pos[found]]
+        return mapped
+
+    def __contains__(self, key: int) -> bool:
+        return bool(lookup(self.old, np.array([key]))[0] >= 0)
+
+    def __len__(self) -> int:
+        return len(self.old)
+
+    def to_dict(self) -> Dict[int, int]:
+        return dict(zip(self.old.tolist(), self.new.tolist()))
+
+    def __repr__(self) -> str:
+        return f"<FCIdMap {len(self.old)}>"
+
+
+def apply_values(model: 'FCModel') -> Iterator[Tuple[FCValue, FCApplyTargetLiteral]]:
+    """Все массивы ссылок модели на узлы/элементы/стороны вместе с видом ссылки."""
+    for nodeset in model.nodesets.values():
+        yield nodeset.apply, 'nodes'
+    for sideset in model.sidesets.values():
+        yield sideset.apply, 'faces'
+    for load in model.loads:
+        yield load.apply, load.apply_target
+    for restraint in model.restraints:
+        yield restraint.apply, restraint.apply_target
+    for initial_set in model.initial_sets:
+        yield initial_set.apply, initial_set.apply_target
+    for receiver in model.receivers:
+        yield receiver.apply, 'nodes'
+    for constraint in model.contact_constraints + model.periodic_constraints:
+        yield constraint.master, 'faces'
+        yield constraint.slave, 'faces'
+    for constraint in model.coupling_constraints:
+        yield constraint.master, 'nodes'
+        yield constraint.slave, 'nodes'
+
+
+def data_values(model: 'FCModel') -> Iterator[FCData]:
+    """Все зависимости модели (FCData) — в них могут быть столбцы TABULAR_NODE_ID/TABULAR_ELEMENT_ID."""
+    for load in model.loads:
+        yield from load.data
+    for restraint in model.restraints:
+        yield from restraint.data
+    for initial_set in model.initial_sets:
+        yield from initial_set.data
+    for material in model.materials.values():
+        for groups in material.properties.values():
+            for group in groups:
+                for prop in group:
+                    yield prop.data
+
+
+def shell_layers(model: 'FCModel') -> Iterator[Dict[str, Any]]:
+    """Описания слоёв оболочек в таблицах свойств (содержат material_id)."""
+    for table in model.property_tables.values():
+        for source in (table.properties, table.additional_properties):
+            layers = source.get('layers') if isinstance(source, dict) else None
+            if isinstance(layers, dict):
+                layers = layers.get('properties')
+            if isinstance(layers, list):
+                for layer in layers:
+                    if isinstance(layer, dict) and 'material_id' in layer:
+                        yield layer
+
+
+def _referenced(value: FCValue, target: FCApplyTargetLiteral) -> Tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """id узлов и id элементов, на которые ссылается массив apply."""
+    empty = np.array([], np.int32)
+    if value.type != 'array' or not isinstance(value.data, np.ndarray) or value.data.size == 0:
+        return empty, empty
+    data = value.data.astype(np.int32)
+    if target == 'nodes':
+        return data.ravel(), empty
+    if target == 'elements':
+        return empty, data.ravel()
+    return empty, data.reshape(len(data), -1)[:, 0]
+
+
+def _remap_apply(value: FCValue, target: FCApplyTargetLiteral,
+                 nodes: Optional[FCIdMap], elements: Optional[FCIdMap]) -> None:
+    if value.type != 'array' or not isinstance(value.data, np.ndarray) or value.data.size == 0:
+        return
+    data = np.array(value.data, dtype=np.int32)
+    if target == 'nodes' and nodes is not None:
+        data = nodes(data)
+    elif target == 'elements' and elements is not None:
+        data = elements(data)
+    elif target in ('faces', 'edges') and elements is not None:
+        pairs = data.reshape(len(data), -1)
+        pairs[:, 0] = elements(pairs[:, 0])
+        data = pairs.reshape(data.shape)
+    value.data = data
+
+
+def _remap_data(data: FCData, nodes: Optional[FCIdMap], elements: Optional[FCIdMap]) -> None:
+    for column in data.table:
+        id_map = {'TABULAR_NODE_ID': nodes, 'TABULAR_ELEMENT_ID': elements}.get(column.type)
+        if id_map is None or not isinstance(column.value.data, np.ndarray):
+            continue
+        ids = np.rint(column.value.data).astype(np.int64)
+        column.value.data = id_map(ids).astype(np.float64).reshape(column.value.data.shape)
+
+
+def remap(model: 'FCModel',
+          nodes: Optional[FCIdMap] = None,
+          elements: Optional[FCIdMap] = None,
+          blocks: Optional[FCIdMap] = None,
+          materials: Optional[FCIdMap] = None,
+          property_tables: Optional[FCIdMap] = None,
+          coordinate_systems: Optional[FCIdMap] = None) -> None:
+    """
+    Переименовывает id сущностей модели и все ссылки на них.
+
+    Узлы: `mesh.nodes_ids`, связность элементов, наборы узлов, узловые
+    нагрузки/закрепления/НУ, приёмники, связи и столбцы TABULAR_NODE_ID.
+    Элементы: id элементов, наборы сторон, нагрузки и закрепления
+    на гранях/рёбрах/элементах, контакты и периодические ГУ, TABULAR_ELEMENT_ID;
+    parent_id — id геометрии, а не элемента, и не меняется.
+    Блоки, материалы, таблицы свойств и системы координат — ключи словарей
+    и ссылки из блоков, слоёв оболочек и условий.
+    Id, отсутствующие в отображении, не меняются.
+    """
+    mesh = model.mesh
+
+    if nodes is not None:
+        mesh.nodes_ids = nodes(mesh.nodes_ids)
+
+    if nodes is not None or elements is not None or blocks is not None:
+        for typename in list(mesh.elements):
+            arrays = mesh.element_arrays(typename)
+            if nodes is not None:
+                arrays['nodes'] = nodes(arrays['nodes'])
+            if elements is not None:
+                arrays['ids'] = elements(arrays['ids'])
+            if blocks is not None:
+                arrays['blocks'] = blocks(arrays['blocks'])
+            mesh.set_element_arrays(typename, arrays)
+
+    if nodes is not None or elements is not None:
+        for value, target in apply_values(model):
+            _remap_apply(value, target, nodes, elements)
+        for data in data_values(model):
+            _remap_data(data, nodes, elements)
+
+    if blocks is not None:
+        model.blocks = _rekey(model.blocks, blocks)
+
+    if materials is not None:
+        for block in model.blocks.values():
+            block.material_id = int(materials(np.array([block.material_id]))[0])
+            if block.material is not None:
+                block.material['ids'] = materials(np.array(block.material['ids'], np.int32)).tolist()
+        for layer in shell_layers(model):
+            layer['material_id'] = int(materials(np.array([layer['material_id']]))[0])
+        model.materials = _rekey(model.materials, materials)
+
+    if property_tables is not None:
+        for block in model.blocks.values():
+            block.property_id = int(property_tables(np.array([block.property_id]))[0])
+        model.property_tables = _rekey(model.property_tables, property_tables)
+
+    if coordinate_systems is not None:
+        for block in model.blocks.values():
+            block.cs_id = int(coordinate_systems(np.array([block.cs_id]))[0])
+        conditions: List[Union[FCLoad, FCRestraint, FCInitialSet]] = [*model.loads, *model.restraints, *model.initial_sets]
+        for condition in conditions:
+            condition.cs_id = int(coordinate_systems(np.array([condition.cs_id]))[0])
+        model.coordinate_systems = _rekey(model.coordinate_systems, coordinate_systems)
+
+
+def _rekey(items: Dict[int, Any], id_map: FCIdMap) -> Dict[int, Any]:
+    """Переименовывает id объектов словаря (ключи и поле id), сохраняя порядок новых id."""
+    if not items:
+        return items
+    new_ids = id_map(np.array(list(items), np.int32)).tolist()
+    rekeyed: Dict[int, Any] = {}
+    for new_id, item in sorted(zip(new_ids, items.values()), key=lambda pair: pair[0]):
+        item.id = new_id
+        rekeyed[new_id] = item
+    if len(rekeyed) != len(items):
+        raise ValueError("id map produces duplicate ids")
+    return rekeyed
+
+
+def compress(model: 'FCModel') -> Dict[str, FCIdMap]:
+    """
+    Удаляет неиспользуемые узлы, блоки, материалы и таблицы свойств
+    и плотно перенумеровывает (с 1) узлы, элементы, блоки, материалы и таблицы свойств.
+
+    Узел используется, если на него ссылается элемент или любая другая сущность
+    модели (набор, нагрузка, приёмник, связь, табличная зависимость).
+    Блок — если в нём есть элементы; материал — если на него ссылается
+    оставшийся блок или слой оболочки; таблица свойств — если на неё ссылается блок.
+    Новые id назначаются в порядке возрастания старых.
+
+    Ссылки на несуществующие узлы и элементы (id > 0) после перенумерации
+    указывали бы на чужие сущности, поэтому при их наличии бросается KeyError
+    и модель не меняется (найти их можно через `FCModel.validate`).
+
+    Возвращает отображения старых id в новые по видам сущностей.
+    """
+    mesh = model.mesh
+    arrays = {typename: mesh.element_arrays(typename) for typename in mesh.elements}
+    element_ids = np.concatenate([np.array([], np.int32), *[a['ids'] for a in arrays.values()]])
+
+    # 1. Ссылки на узлы и элементы; висячие ссылки — ошибка
+
+    node_refs: List[NDArray[np.int32]] = [a['nodes'].ravel() for a in arrays.values()]
+    element_refs: List[NDArray[np.int32]] = [np.array([], np.int32)]
+    for value, target in apply_values(model):
+        node_ids, referenced_elements = _referenced(value, target)
+        node_refs.append(node_ids)
+        element_refs.append(referenced_elements)
+    for data in data_values(model):
+        for column in data.table:
+            if column.type in ('TABULAR_NODE_ID', 'TABULAR_ELEMENT_ID') and isinstance(column.value.data, np.ndarray):
+                refs = np.rint(column.value.data).astype(np.int32).ravel()
+                (node_refs if column.type == 'TABULAR_NODE_ID' else element_refs).append(refs)
+
+    used_nodes = np.unique(np.concatenate([np.array([], np.int32), *node_refs]))
+    positions = mesh.node_positions(used_nodes)
+    dangling = used_nodes[(positions < 0) & (used_nodes > 0)]
+    if len(dangling):
+        raise KeyError(f"compress: references to missing nodes {dangling[:10].tolist()}")
+    used_elements = np.unique(np.concatenate(element_refs))
+    dangling = used_elements[(lookup(element_ids, used_elements) < 0) & (used_elements > 0)]
+    if len(dangling):
+        raise KeyError(f"compress: references to missing elements {dangling[:10].tolist()}")
+
+    # 2. Узлы: оставляем только те, на которые есть ссылки
+
+    keep = np.zeros(len(mesh.nodes_ids), np.bool_)
+    keep[positions[positions >= 0]] = True
+    mesh.nodes_ids = mesh.nodes_ids[keep]
+    mesh.nodes_xyz = mesh.nodes_xyz[keep]
+
+    nodes_map = FCIdMap.dense(mesh.nodes_ids)
+
+    # 3. Элементы
+
+    elements_map = FCIdMap.dense(element_ids)
+
+    # 4. Блоки: только содержащие элементы
+
+    used_blocks = np.unique(np.concatenate([np.array([], np.int32), *[a['blocks'] for a in arrays.values()]]))
+    block_ids = set(used_blocks.tolist())
+    model.blocks = {bid: block for bid, block in model.blocks.items() if bid in block_ids}
+    blocks_map = FCIdMap.dense(used_blocks)
+
+    # 5. Таблицы свойств и материалы оставшихся блоков (id <= 0 — признак отсутствия)
+
+    used_tables = {block.property_id for block in model.blocks.values() if block.property_id > 0}
+    model.property_tables = {pid: table for pid, table in model.property_tables.items() if pid in used_tables}
+    tables_map = FCIdMap.dense(np.array(sorted(used_tables), np.int32))
+
+    used_materials: Set[int] = set()
+    for block in model.blocks.values():
+        used_materials.add(block.material_id)
+        if block.material is not None:
+            used_materials.update(block.material['ids'])
+    used_materials.update(layer['material_id'] for layer in shell_layers(model))
+    used_materials = {mid for mid in used_materials if mid > 0}
+    model.materials = {mid: material for mid, material in model.materials.items() if mid in used_materials}
+    materials_map = FCIdMap.dense(np.array(sorted(used_materials), np.int32))
+
+    remap(model, nodes=nodes_map, elements=elements_map, blocks=blocks_map,
+          materials=materials_map, property_tables=tables_map)
+
+    return {
+        'nodes': nodes_map,
+        'elements': elements_map,
+        'blocks': blocks_map,
+        'materials': materials_map,
+        'property_tables': tables_map,
+    }
+
+
+class FCRenumberReport(TypedDict):
+    nodes: FCIdMap
+    before: FCBandwidth
+    after: FCBandwidth
+
+
+def sort_nodes(mesh: FCMesh) -> None:
+    """Упорядочивает строки `nodes_ids`/`nodes_xyz` по возрастанию id."""
+    order = np.argsort(mesh.nodes_ids, kind='stable')
+    mesh.nodes_ids = mesh.nodes_ids[order]
+    mesh.nodes_xyz = mesh.nodes_xyz[order]
+
+
+def sort_elements(mesh: FCMesh) -> None:
+    """Упорядочивает элементы внутри каждого типа по возрастанию id."""
+    for typename in mesh.elements:
+        mesh.elements[typename] = dict(sorted(mesh.elements[typename].items()))
+
+
+def renumber_nodes(model: 'FCModel', method: Literal['rcm'] = 'rcm') -> FCRenumberReport:
+    """
+    Перенумеровывает узлы для уменьшения ширины ленты матрицы жёсткости.
+
+    Набор id узлов сохраняется: они раздаются по возрастанию в порядке,
+    найденном методом (`rcm` — обратный Катхилл–Макки по графу смежности узлов).
+    Строки `nodes_ids`/`nodes_xyz` переупорядочиваются по новым id, все ссылки
+    на узлы обновляются. Ширина ленты и профиль считаются для нумерации по id
+    до и после перенумерации.
+    """
+    if method != 'rcm':
+        raise ValueError(f"unknown renumbering method {method!r}")
+
+    mesh = model.mesh
+    graph = node_graph(mesh)
+    before = bandwidth(graph, np.argsort(mesh.nodes_ids, kind='stable'))
+
+    order = rcm_order(graph)
+    nodes_map = FCIdMap(mesh.nodes_ids[order], np.sort(mesh.nodes_ids))
+    after = bandwidth(graph, order)
+
+    remap(model, nodes=nodes_map)
+    sort_nodes(mesh)
+
+    return {'nodes': nodes_map, 'before': before, 'after': after}
+
+
+def element_centers(mesh: FCMesh) -> Tuple[NDArray[np.int32], NDArray[np.float64]]:
+    """Id элементов в порядке типов `mesh.elements` и их центры (среднее координат узлов)."""
+    element_ids: List[NDArray[np.int32]] = [np.array([], np.int32)]
+    centers: List[NDArray[np.float64]] = [np.zeros((0, 3))]
+    for typename in mesh.elements:
+        arrays = mesh.element_arrays(typename)
+        if len(arrays['ids']) == 0:
+            continue
+        positions = mesh.node_positions(arrays['nodes'])
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+        element_ids.append(arrays['ids'])
+        centers.append(mesh.nodes_xyz.reshape(-1, 3)[positions].mean(axis=1))
+    return np.concatenate(element_ids), np.concatenate(centers)
+
+
+def reorder(model: 'FCModel', spatial: Literal['hilbert', 'morton'] = 'hilbert') -> Dict[str, FCIdMap]:
+    """
+    Переупорядочивает узлы и элементы вдоль кривой, заполняющей пространство.
+
+    Узлы сортируются по ключу кривой от `nodes_xyz`, элементы — по ключу от
+    центров (среднего координат узлов). Набор id сохраняется: id раздаются
+    по возрастанию в порядке обхода кривой, все ссылки обновляются, строки
+    узлов и элементы внутри типов упорядочиваются по новым id.
+    """
+    curves = {'hilbert': hilbert_keys, 'morton': morton_keys}
+    if spatial not in curves:
+        raise ValueError(f"unknown space-filling curve {spatial!r}")
+    curve = curves[spatial]
+
+    mesh = model.mesh
+
+    # Узлы и элементы кодируются в общей системе координат сетки
+    ids, centers = element_centers(mesh)
+    keys = curve(np.concatenate([mesh.nodes_xyz.reshape(-1, 3), centers]))
+    node_keys = keys[:len(mesh.nodes_ids)]
+    element_keys = keys[len(mesh.nodes_ids):]
+
+    node_order = np.argsort(node_keys, kind='stable')
+    nodes_map = FCIdMap(mesh.nodes_ids[node_order], np.sort(mesh.nodes_ids))
+    element_order = np.argsort(element_keys, kind='stable')
+    elements_map = FCIdMap(ids[element_order], np.sort(ids))
+
+    remap(model, nodes=nodes_map, elements=elements_map)
+    sort_nodes(mesh)
+    sort_elements(mesh)
+
+    return {'nodes': nodes_map, 'elements': elements_map}
+
+
+def merge_coincident_nodes(model: 'FCModel', tol: float = 0.0) -> FCIdMap:
+    """
+    Сливает совпадающие узлы: узлы на расстоянии не больше `tol` (с учётом
+    транзитивности) заменяются узлом группы с наименьшим id, его координаты
+    сохраняются. Остальные узлы группы удаляются, ссылки на них в связности
+    элементов, наборах, условиях, приёмниках, связях и табличных зависимостях
+    переводятся на оставшийся узел.
+
+    Возвращает отображение id удалённых узлов в id оставшихся.
+    """
+    mesh = model.mesh
+    groups = coincident_groups(mesh.nodes_xyz.reshape(-1, 3), tol)
+
+    # Представитель группы — узел с наименьшим id
+    ids = mesh.nodes_ids
+    keeper = np.arange(len(ids))
+    order = np.lexsort((ids, groups))
+    starts = np.ones(len(order), np.bool_)
+    starts[1:] = groups[order[1:]] != groups[order[:-1]]
+    keeper[order] = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+
+    merged = keeper != np.arange(len(ids))
+    nodes_map = FCIdMap(ids[merged], ids[keeper[merged]])
+
+    mesh.nodes_ids = ids[~merged]
+    mesh.nodes_xyz = mesh.nodes_xyz[~merged]
+    if len(nodes_map):
+        remap(model, nodes=nodes_map)
+    return nodes_map
+
+
+def _refine_apply(value: FCValue, target: FCApplyTargetLiteral, refinement: FCRefinement) -> None:
+    """Переводит массив apply на сетку после одного уровня деления."""
+    if value.type != 'array' or not isinstance(value.data, np.ndarray) or value.data.size == 0:
+        return
+    data = value.data.astype(np.int32)
+    if target == 'nodes':
+        # Новый узел входит в набор, если в нём все узлы, по которым он построен
+        members = unique_sorted(data.ravel().astype(np.int64))
+        sources = refinement['sources']
+        inside = np.all((lookup(members, sources) >= 0) | (sources < 0), axis=1)
+        added = refinement['nodes'][inside]
+        result = np.concatenate([data.ravel(), added])
+        value.data = result.reshape(-1, data.shape[1]) if data.ndim == 2 else result
+    elif target == 'elements':
+        ids = data.ravel()
+        refined = np.isin(ids, refinement['parents'])
+        result = np.concatenate([ids[~refined], refinement['children'][np.isin(refinement['parents'], ids)]])
+        value.data = result.reshape(-1, data.shape[1]) if data.ndim == 2 else result
+    elif target == 'faces':
+        pairs = data.reshape(-1, 2).astype(np.int64)
+        faces = refinement['faces'].astype(np.int64)
+        keys = pairs[:, 0] * 64 + pairs[:, 1]
+        parent_keys = faces[:, 0] * 64 + faces[:, 1]
+        refined = np.isin(pairs[:, 0], refinement['parents'])
+        value.data = np.concatenate([pairs[~refined], faces[np.isin(parent_keys, keys[refined])][:, 2:]]).astype(np.int32)
+
+
+def refine(model: 'FCModel', levels: int = 1) -> List[FCRefinement]:
+    """
+    Равномерное деление сетки модели (`FCMesh.refine`) с переводом ссылок:
+    наборы узлов дополняются новыми узлами на рёбрах и гранях, целиком
+    лежащих в наборе; ссылки на элементы и стороны заменяются ссылками
+    на потомков. То же выполняется для нагрузок, закреплений, начальных
+    условий, приёмников и связей. Ссылки на рёбра не поддерживаются.
+    """
+    for value, target in apply_values(model):
+        if target == 'edges' and value.type == 'array' and len(value):
+            raise ValueError("refine does not support references to element edges")
+    refinements = model.mesh.refine(levels)
+    for refinement in refinements:
+        for value, target in apply_values(model):
+            _refine_apply(value, target, refinement)
+    return refinements
+
+
+def to_simplices(model: 'FCModel') -> FCRefinement:
+    """
+    Разбивает сетку модели на симплексы (`FCMesh.to_simplices`) и переводит
+    ссылки на элементы и стороны на потомков. Узлы не добавляются.
+    """
+    for value, target in apply_values(model):
+        if target == 'edges' and value.type == 'array' and len(value):
+            raise ValueError("to_simplices does not support references to element edges")
+    refinement = model.mesh.to_simplices()
+    for value, target in apply_values(model):
+        _refine_apply(value, target, refinement)
+    return refinement
+
+
+def _max_id(ids: Any) -> int:
+    return max((int(i) for i in ids), default=0)
+
+
+def _shift(ids: Any, offset: int) -> FCIdMap:
+    old = np.array(sorted(set(int(i) for i in ids)), np.int32)
+    return FCIdMap(old, old + offset)
+
+
+def _same_cs(a: FCCoordinateSystem, b: FCCoordinateSystem) -> bool:
+    return a.type == b.type and all(
+        np.array_equal(getattr(a, name), getattr(b, name)) for name in ('origin', 'dir1', 'dir2'))
+
+
+def merge(model: 'FCModel', others: Sequence['FCModel']) -> List[Dict[str, FCIdMap]]:
+    """
+    Добавляет в модель копии моделей `others` (сами они не изменяются).
+
+    Id узлов, элементов, блоков, материалов, таблиц свойств, наборов, условий,
+    связей и приёмников каждой добавляемой модели сдвигаются за максимальный
+    уже занятый id своего вида, ссылки обновляются через `remap`. Совпадающие
+    системы координат (тип, начало и направления) не дублируются, остальные
+    получают следующие свободные id. Сетка собирается конкатенацией массивов
+    один раз для всех моделей. parent_id элементов (id геометрии) копируются
+    без изменений.
+
+    Возвращает для каждой добавленной модели отображения её id в id модели
+    (ключи: nodes, elements, blocks, materials, property_tables, coordinate_systems).
+    """
+    mesh = model.mesh
+    types = list(mesh.elements)
+    for other in others:
+        types.extend(t for t in other.mesh.elements if t not in types)
+
+    arrays = {typename: [mesh.element_arrays(typename)] for typename in types}
+    nodes_ids = [mesh.nodes_ids]
+    nodes_xyz = [mesh.nodes_xyz.reshape(-1, 3)]
+
+    node_top = _max_id(mesh.nodes_ids.tolist())
+    element_top = _max_id(np.concatenate([np.array([], np.int32), *[a[0]['ids'] for a in arrays.values()]]).tolist())
+
+    maps: List[Dict[str, FCIdMap]] = []
+    for other in others:
+        # Копия всего, кроме сетки: сетка переносится массивами
+        part = copy.copy(other)
+        part.mesh = FCMesh()
+        for name in ('coordinate_systems', 'blocks', 'property_tables', 'materials', 'loads', 'restraints',
+                     'initial_sets', 'contact_constraints', 'coupling_constraints', 'periodic_constraints',
+                     'receivers', 'nodesets', 'sidesets'):
+            setattr(part, name, copy.deepcopy(getattr(other, name)))
+
+        other_arrays = {typename: other.mesh.element_arrays(typename) for typename in other.mesh.elements}
+        element_ids = np.concatenate([np.array([], np.int32), *[a['ids'] for a in other_arrays.values()]])
+
+        # Совпадающие системы координат убираются из копии, ссылки на них ведут на уже имеющиеся
+        cs_old: List[int] = []
+        cs_new: List[int] = []
+        for cs in list(part.coordinate_systems.values()):
+            same = next((cid for cid, known in model.coordinate_systems.items() if _same_cs(cs, known)), None)
+            cs_old.append(cs.id)
+            cs_new.append(same if same is not None else _max_id([*model.coordinate_systems, *cs_new]) + 1)
+            if same is not None:
+                del part.coordinate_systems[cs.id]
+        cs_map = FCIdMap(np.array(cs_old, np.int32), np.array(cs_new, np.int32))
+
+        part_maps = {
+            'nodes': _shift(other.mesh.nodes_ids.tolist(), node_top),
+            'elements': _shift(element_ids.tolist(), element_top),
+            'blocks': _shift(part.blocks, _max_id(model.blocks)),
+            'materials': _shift(part.materials, _max_id(model.materials)),
+            'property_tables': _shift(part.property_tables, _max_id(model.property_tables)),
+            'coordinate_systems': cs_map,
+        }
+        remap(part, **part_maps)
+
+        # Сетка
+        nodes_ids.append(part_maps['nodes'](other.mesh.nodes_ids))
+        nodes_xyz.append(other.mesh.nodes_xyz.reshape(-1, 3))
+        for typename, a in other_arrays.items():
+            arrays[typename].append({
+                'ids': part_maps['elements'](a['ids']),
+                'nodes': part_maps['nodes'](a['nodes']),
+                'blocks': part_maps['blocks'](a['blocks']),
+                'parent_ids': a['parent_ids'],
+                'orders': a['orders'],
+            })
+        node_top += _max_id(other.mesh.nodes_ids.tolist())
+        element_top += _max_id(element_ids.tolist())
+
+        # Словари и списки сущностей
+        for cs in part.coordinate_systems.values():
+            model.coordinate_systems.setdefault(cs.id, cs)
+        model.blocks.update(part.blocks)
+        model.materials.update(part.materials)
+        model.property_tables.update(part.property_tables)
+        for name in ('nodesets', 'sidesets'):
+            target = getattr(model, name)
+            offset = _max_id(target)
+            for item in getattr(part, name).values():
+                item.id += offset
+                target[item.id] = item
+        for name in ('loads', 'restraints', 'initial_sets', 'contact_constraints',
+                     'coupling_constraints', 'periodic_constraints', 'receivers'):
+            target = getattr(model, name)
+            offset = _max_id(item.id for item in target)
+            for item in getattr(part, name):
+                item.id += offset
+                target.append(item)
+        if not model.settings:
+            model.settings = copy.deepcopy(other.settings)
+
+        maps.append(part_maps)
+
+    mesh.nodes_ids = np.concatenate(nodes_ids).astype(np.int32)
+    mesh.nodes_xyz = np.concatenate(nodes_xyz)
+    for typename, parts in arrays.items():
+        mesh.set_element_arrays(typename, concatenate_element_arrays(parts))
+    return maps
+
+
+def _filter_apply(value: FCValue, target: FCApplyTargetLiteral,
+                  nodes: NDArray[np.int32], elements: NDArray[np.int32]) -> bool:
+    """
+    Оставляет в массиве apply только ссылки на узлы `nodes` и элементы `elements`.
+    Возвращает False, если от непустого массива ничего не осталось.
+    """
+    if value.type != 'array' or not isinstance(value.data, np.ndarray) or value.data.size == 0:
+        return True
+    data = value.data
+    owners = data.reshape(len(data), -1)[:, 0]
+    keep = lookup(nodes if target == 'nodes' else elements, owners) >= 0
+    value.data = data[keep]
+    return bool(keep.any())
+
+
+def _filter_data(data: FCData, nodes: NDArray[np.int32], elements: NDArray[np.int32]) -> None:
+    """
+    Удаляет из таблицы зависимости строки, у которых в столбце
+    TABULAR_NODE_ID/TABULAR_ELEMENT_ID стоит id не из `nodes`/`elements`.
+    """
+    keep = np.ones(len(data), np.bool_)
+    for column in data.table:
+        ids = {'TABULAR_NODE_ID': nodes, 'TABULAR_ELEMENT_ID': elements}.get(column.type)
+        if ids is None or not isinstance(column.value.data, np.ndarray):
+            continue
+        keep &= lookup(ids, np.rint(column.value.data).astype(np.int64)) >= 0
+    if keep.all():
+        return
+    for value in [data.value, *(column.value for column in data.table)]:
+        if isinstance(value.data, np.ndarray):
+            value.data = value.data.reshape(len(keep), -1)[keep].reshape(-1)
+
+
+def extract(model: 'FCModel',
+            blocks: Optional[Sequence[int]] = None,
+            nodeset: Optional[int] = None,
+            bbox: Optional[NDArray[np.float64]] = None,
+            elements: Optional[NDArray[np.int32]] = None) -> 'FCModel':
+    """
+    Новая самостоятельная модель из части элементов исходной (исходная не изменяется).
+
+    Элемент выбирается, если выполнены все заданные условия: он принадлежит
+    одному из блоков `blocks`, все его узлы входят в набор узлов с id `nodeset`,
+    все его узлы лежат в параллелепипеде `bbox` = [[xmin, ymin, zmin], [xmax, ymax, zmax]],
+    его id входит в массив `elements`.
+
+    В подмодель попадают узлы выбранных элементов, их блоки, таблицы свойств,
+    материалы и используемые системы координат. Наборы, условия, приёмники
+    и связи сохраняют только ссылки на попавшие узлы и элементы; оставшиеся
+    без ссылок отбрасываются. Из таблиц зависимостей удаляются строки
+    со столбцами TABULAR_NODE_ID/TABULAR_ELEMENT_ID, ссылающимися на
+    не попавшие узлы и элементы. Id сущностей не меняются.
+    """
+    mesh = model.mesh
+    if nodeset is not None and nodeset not in model.nodesets:
+        raise KeyError(f"nodeset {nodeset} not found")
+
+    set_nodes = np.array([], np.int64)
+    if nodeset is not None:
+        set_nodes = unique_sorted(_referenced(model.nodesets[nodeset].apply, 'nodes')[0].astype(np.int64))
+    box = None if bbox is None else np.asarray(bbox, dtype=np.float64).reshape(2, 3)
+    chosen = None if elements is None else unique_sorted(np.asarray(elements, np.int64).ravel())
+
+    sub = copy.copy(model)
+    sub.header = copy.deepcopy(model.header)
+    sub.settings = copy.deepcopy(model.settings)
+    sub.mesh = FCMesh()
+
+    # 1. Элементы и узлы — маски по массивам сетки
+
+    selected: Dict[FCElementTypeLiteral, FCElementArrays] = {}
+    for typename in mesh.elements:
+        arrays = mesh.element_arrays(typename)
+        keep = np.ones(len(arrays['ids']), np.bool_)
+        if blocks is not None:
+            keep &= np.isin(arrays['blocks'], np.asarray(blocks, np.int32))
+        if nodeset is not None:
+            keep &= np.all(lookup(set_nodes, arrays['nodes']) >= 0, axis=1)
+        if chosen is not None:
+            keep &= lookup(chosen, arrays['ids']) >= 0
+        if box is not None:
+            positions = mesh.node_positions(arrays['nodes'][keep])
+            if np.any(positions < 0):
+                raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+            xyz = mesh.nodes_xyz[positions]
+            inside = np.all((xyz >= box[0]) & (xyz <= box[1]), axis=(1, 2))
+            keep[np.nonzero(keep)[0][~inside]] = False
+        if keep.any():
+            selected[typename] = {
+                'ids': arrays['ids'][keep],
+                'nodes': arrays['nodes'][keep],
+                'blocks': arrays['blocks'][keep],
+                'parent_ids': arrays['parent_ids'][keep],
+                'orders': arrays['orders'][keep],
+            }
+
+    for typename, arrays in selected.items():
+        sub.mesh.set_element_arrays(typename, arrays)
+
+    element_ids = np.concatenate([np.array([], np.int32), *[a['ids'] for a in selected.values()]])
+    used_nodes = unique_sorted(np.concatenate([np.array([], np.int64), *[a['nodes'].ravel() for a in selected.values()]]))
+    keep_nodes = np.zeros(len(mesh.nodes_ids), np.bool_)
+    positions = mesh.node_positions(used_nodes.astype(np.int32))
+    keep_nodes[positions[positions >= 0]] = True
+    sub.mesh.nodes_ids = mesh.nodes_ids[keep_nodes]
+    sub.mesh.nodes_xyz = mesh.nodes_xyz.reshape(-1, 3)[keep_nodes]
+
+    # 2. Блоки, таблицы свойств, материалы
+
+    block_ids = set(np.concatenate([np.array([], np.int32), *[a['blocks'] for a in selected.values()]]).tolist())
+    sub.blocks = {bid: copy.deepcopy(block) for bid, block in model.blocks.items() if bid in block_ids}
+    table_ids = {block.property_id for block in sub.blocks.values()}
+    sub.property_tables = {pid: copy.deepcopy(table) for pid, table in model.property_tables.items() if pid in table_ids}
+
+    material_ids: Set[int] = set()
+    for block in sub.blocks.values():
+        material_ids.add(block.material_id)
+        if block.material is not None:
+            material_ids.update(block.material['ids'])
+    material_ids.update(layer['material_id'] for layer in shell_layers(sub))
+    sub.materials = {mid: copy.deepcopy(material) for mid, material in model.materials.items() if mid in material_ids}
+
+    # 3. Наборы, условия, приёмники и связи
+
+    sub.nodesets = {}
+    for sid, item in model.nodesets.items():
+        item = copy.deepcopy(item)
+        if _filter_apply(item.apply, 'nodes', sub.mesh.nodes_ids, element_ids):
+            sub.nodesets[sid] = item
+    sub.sidesets = {}
+    for sid, item in model.sidesets.items():
+        item = copy.deepcopy(item)
+        if _filter_apply(item.apply, 'faces', sub.mesh.nodes_ids, element_ids):
+            sub.sidesets[sid] = item
+
+    sub.loads = []
+    for load in model.loads:
+        load = copy.deepcopy(load)
+        if _filter_apply(load.apply, load.apply_target, sub.mesh.nodes_ids, element_ids):
+            sub.loads.append(load)
+    sub.restraints = []
+    for restraint in model.restraints:
+        restraint = copy.deepcopy(restraint)
+        if _filter_apply(restraint.apply, restraint.apply_target, sub.mesh.nodes_ids, element_ids):
+            sub.restraints.append(restraint)
+    sub.initial_sets = []
+    for initial_set in model.initial_sets:
+        initial_set = copy.deepcopy(initial_set)
+        if _filter_apply(initial_set.apply, initial_set.apply_target, sub.mesh.nodes_ids, element_ids):
+            sub.initial_sets.append(initial_set)
+    sub.receivers = []
+    for receiver in model.receivers:
+        receiver = copy.deepcopy(receiver)
+        if _filter_apply(receiver.apply, 'nodes', sub.mesh.nodes_ids, element_ids):
+            sub.receivers.append(receiver)
+
+    # Связь сохраняется, только если у неё остались обе стороны
+    sides: List[Tuple[str, FCApplyTargetLiteral]] = [
+        ('contact_constraints', 'faces'), ('periodic_constraints', 'faces'), ('coupling_constraints', 'nodes')]
+    for name, target in sides:
+        constraints = []
+        for constraint in getattr(model, name):
+            constraint = copy.deepcopy(constraint)
+            master = _filter_apply(constraint.master, target, sub.mesh.nodes_ids, element_ids)
+            slave = _filter_apply(constraint.slave, target, sub.mesh.nodes_ids, element_ids)
+            if master and slave:
+                constraints.append(constraint)
+        setattr(sub, name, constraints)
+
+    for data in data_values(sub):
+        _filter_data(data, sub.mesh.nodes_ids, element_ids)
+
+    # 4. Системы координат, на которые ссылаются оставшиеся блоки и условия
+
+    cs_ids = {block.cs_id for block in sub.blocks.values()}
+    conditions: List[Union[FCLoad, FCRestraint, FCInitialSet]] = [*sub.loads, *sub.restraints, *sub.initial_sets]
+    cs_ids.update(condition.cs_id for condition in conditions)
+    sub.coordinate_systems = {cid: copy.deepcopy(cs) for cid, cs in model.coordinate_systems.items() if cid in cs_ids}
+
+    return sub
+
+
+def populate(model: 'FCModel',
+             nodes_ids: NDArray[np.int32],
+             nodes_xyz: NDArray[np.float64],
+             elements: Dict[FCElementTypeLiteral, FCElementArrays],
+             nodesets: Optional[Dict[int, Tuple[str, NDArray[np.int32]]]] = None,
+             sidesets: Optional[Dict[int, Tuple[str, NDArray[np.int32]]]] = None) -> None:
+    """
+    Заполняет модель сеткой, заданной массивами (для импорта из других форматов):
+    глобальная декартова система координат с id 1, узлы, элементы, блоки
+    для всех встреченных id блоков (без материала и таблицы свойств)
+    и наборы узлов и сторон: id набора -> (имя, id узлов или пары (элемент, сторона)).
+    """
+    model.coordinate_systems.setdefault(1, FCCoordinateSystem({
+        'id': 1, 'type': 'cartesian', 'name': 'Глобальная декартова',
+        'origin': encode(np.zeros(3)), 'dir1': encode(np.array([1.0, 0.0, 0.0])),
+        'dir2': encode(np.array([0.0, 1.0, 0.0])),
+    }))
+    mesh = model.mesh
+    mesh.nodes_ids = np.ascontiguousarray(nodes_ids, np.int32)
+    mesh.nodes_xyz = np.ascontiguousarray(nodes_xyz, np.float64).reshape(-1, 3)
+    for typename, arrays in elements.items():
+        if len(arrays['ids']):
+            mesh._append_elements(typename, arrays)
+
+    block_ids = np.unique(np.concatenate([np.array([], np.int32)] + [a['blocks'] for a in elements.values()]))
+    for block_id in block_ids.tolist():
+        if block_id not in model.blocks:
+            model.blocks[block_id] = FCBlock({'id': block_id, 'cs_id': 1, 'material_id': 0, 'property_id': -1})
+
+    for sets, source in ((model.nodesets, nodesets), (model.sidesets, sidesets)):
+        for set_id, (name, data) in (source or {}).items():
+            sets[set_id] = new_set(set_id, name, data)
+
+
+def new_set(set_id: int, name: str, data: NDArray[np.int32]) -> FCSet:
+    """Набор из массива id узлов (K,) или пар (элемент, сторона) (K, 2)."""
+    data = np.ascontiguousarray(data, np.int32)
+    return FCSet({'id': set_id, 'name': name, 'apply_to': encode(data), 'apply_to_size': len(data)})
@@ -0,0 +1,203 @@
+from typing import TYPE_CHECKING, List, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .fc_mesh import FCMesh
+
+
+class FCColoring(TypedDict):
+    ids: NDArray[np.int32]           # id элементов в порядке типов `mesh.elements`
+    colors: NDArray[np.int32]        # цвет каждого элемента
+    groups: List[NDArray[np.int32]]  # id элементов каждого цвета; элементы цвета не имеют общих узлов
+
+
+def _incidence(mesh: 'FCMesh') -> Tuple[NDArray[np.int32], NDArray[np.int64], NDArray[np.int64]]:
+    """Id элементов и пары (номер элемента, позиция узла), упорядоченные по элементам."""
+    ids: List[NDArray[np.int32]] = [np.array([], np.int32)]
+    elements: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    nodes: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    count = 0
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        arrays = mesh.element_arrays(typename)
+        positions = mesh.node_positions(arrays['nodes'])
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+        ids.append(arrays['ids'])
+        elements.append(np.repeat(np.arange(count, count + len(positions)), positions.shape[1]))
+        nodes.append(positions.ravel())
+        count += len(positions)
+    return np.concatenate(ids), np.concatenate(elements), np.concatenate(nodes)
+
+
+def _bits(colors: NDArray[np.int64]) -> Tuple[NDArray[np.int64], NDArray[np.uint64]]:
+    """Слово и бит цвета в маске цветов узла."""
+    return colors // 64, np.left_shift(np.uint64(1), (colors % 64).astype(np.uint64))
+
+
+def _maxima(elements: NDArray[np.int64], nodes: NDArray[np.int64],
+            node_max: NDArray[np.int64], beaten: NDArray[np.bool_]) -> NDArray[np.bool_]:
+    """
+    Пары элементов, номер которых наибольший среди элементов группы во всех
+    их узлах. Пары упорядочены по номеру элемента, поэтому при присваивании
+    по повторяющимся индексам в узле остаётся наибольший номер. Рабочие
+    массивы `node_max` (-1) и `beaten` (False) возвращаются в исходное состояние.
+    """
+    node_max[nodes] = elements
+    beaten[elements[node_max[nodes] != elements]] = True
+    node_max[nodes] = -1
+    maxima: NDArray[np.bool_] = ~beaten[elements]
+    beaten[elements] = False
+    return maxima
+
+
+def _first_fit(masks: NDArray[np.uint64], nodes: NDArray[np.int64],
+               starts: NDArray[np.int64]) -> Tuple[NDArray[np.int64], NDArray[np.uint64]]:
+    """
+    Наименьший цвет, отсутствующий в масках всех узлов элемента (пары
+    элемент–узел, элементы начинаются с `starts`). При нехватке слов
+    маски расширяются.
+    """
+    color = np.full(len(starts), -1, np.int64)
+    word = 0
+    while np.any(color < 0):
+        if word == masks.shape[1]:
+            masks = np.hstack([masks, np.zeros((len(masks), 1), np.uint64)])
+        free = ~np.bitwise_or.reduceat(masks[nodes, word], starts)
+        pending = (color < 0) & (free != 0)
+        lowest = free[pending] & (~free[pending] + np.uint64(1))  # младший нулевой бит слова
+        color[pending] = 64 * word + np.log2(lowest.astype(np.float64)).astype(np.int64)
+        word += 1
+    return color, masks
+
+
+def _starts(elements: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Начала групп пар одного элемента."""
+    first = np.ones(len(elements), np.bool_)
+    first[1:] = elements[1:] != elements[:-1]
+    starts: NDArray[np.int64] = np.nonzero(first)[0]
+    return starts
+
+
+def color_elements(mesh: 'FCMesh', balance: bool = True, seed: int = 0) -> FCColoring:
+    """
+    Раскраска элементов: элементы одного цвета не имеют общих узлов
+    (их вклады можно собирать параллельно без конфликтов).
+
+    Векторная жадная раскраска над парами элемент–узел в духе
+    Джонса–Плассмана: за раунд каждый нераскрашенный элемент выбирает
+    пробный цвет — наименьший, которого нет в битовых масках цветов его
+    узлов, — и получает его, если его случайный приоритет больше, чем
+    у соседей с тем же пробным цветом. При `balance` элементы переполненных
+    цветов переносятся в недозаполненные, если там нет конфликта.
+    """
+    ids, pair_elements, pair_nodes = _incidence(mesh)
+    size = len(ids)
+    node_count = len(mesh.nodes_ids)
+
+    # Элементы перенумеровываются в случайном порядке; новый номер — приоритет
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(size)
+    counts = np.bincount(pair_elements, minlength=size)
+    sizes = counts[order]
+    pairs = np.repeat((np.cumsum(counts) - counts)[order] - (np.cumsum(sizes) - sizes), sizes) + np.arange(len(pair_elements))
+    pair_elements, pair_nodes = np.repeat(np.arange(size), sizes), pair_nodes[pairs]
+
+    colors = np.full(size, -1, np.int64)
+    masks = np.zeros((node_count, 1), np.uint64)  # биты цветов элементов узла
+    elements, nodes = pair_elements, pair_nodes
+    node_max = np.full(node_count, -1, np.int64)
+    beaten = np.zeros(size, np.bool_)
+    while len(elements):
+        # Пробный цвет — наименьший свободный; из элементов с одинаковым пробным
+        # цветом его получают локальные максимумы приоритета. Пары упорядочены
+        # по номеру элемента, поэтому при присваивании по повторяющимся
+        # индексам в узле остаётся наибольший номер
+        starts = _starts(elements)
+        trial, masks = _first_fit(masks, nodes, starts)
+        pair_trial = np.repeat(trial, np.diff(np.append(starts, len(elements))))
+        by_trial = np.argsort(pair_trial.astype(np.int16) if int(np.max(trial)) < 2 ** 15 else pair_trial, kind='stable')
+        bounds = np.searchsorted(pair_trial[by_trial], np.arange(int(np.max(trial)) + 2))
+        for c in np.nonzero(np.diff(bounds))[0].tolist():
+            group = by_trial[bounds[c]:bounds[c + 1]]
+            group_elements, group_nodes = elements[group], nodes[group]
+            wins = _maxima(group_elements, group_nodes, node_max, beaten)
+            colors[group_elements[wins]] = c
+            word, bit = _bits(np.array([c], np.int64))
+            masks[group_nodes[wins], word[0]] |= bit[0]
+        rest = colors[elements] < 0
+        elements, nodes = elements[rest], nodes[rest]
+
+    if balance and size:
+        colors = _balance(colors, pair_elements, pair_nodes, masks, rng)
+    colors[order] = colors.copy()
+
+    color_count = int(np.max(colors)) + 1 if size else 0
+    order = np.argsort(colors, kind='stable')
+    bounds = np.searchsorted(colors[order], np.arange(color_count + 1))
+    return {
+        'ids': ids,
+        'colors': colors.astype(np.int32),
+        'groups': [ids[order[bounds[c]:bounds[c + 1]]] for c in range(color_count)],
+    }
+
+
+def _balance(colors: NDArray[np.int64], pair_elements: NDArray[np.int64], pair_nodes: NDArray[np.int64],
+             masks: NDArray[np.uint64], rng: np.random.Generator, rounds: int = 4) -> NDArray[np.int64]:
+    """
+    Выравнивание размеров цветов: элементы переполненных цветов выбирают
+    случайный недозаполненный цвет, свободный на всех их узлах; из выбравших
+    один цвет переходят локальные максимумы номера, не больше недостатка
+    цвета и избытка исходного цвета. Маски цветов узлов обновляются на месте.
+    """
+    size = len(colors)
+    color_count = int(np.max(colors)) + 1
+    counts = np.bincount(colors, minlength=color_count)
+    node_max = np.full(len(masks), -1, np.int64)
+    beaten = np.zeros(size, np.bool_)
+    for _ in range(rounds):
+        surplus = counts - -(-size // color_count)
+        targets = np.nonzero(counts < size // color_count)[0]
+        if not len(targets) or not np.any(surplus > 0):
+            break
+        keep = surplus[colors[pair_elements]] > 0
+        elements, nodes = pair_elements[keep], pair_nodes[keep]
+        starts = _starts(elements)
+        words, bits = _bits(targets)
+        used = np.stack([np.bitwise_or.reduceat(masks[nodes, w], starts) for w in range(masks.shape[1])], axis=1)
+        score = rng.random((len(starts), len(targets)))
+        score[(used[:, words] & bits) != 0] = np.inf
+        choice = np.argmin(score, axis=1)
+        choice[~np.isfinite(score[np.arange(len(starts)), choice])] = -1
+        pair_choice = np.repeat(choice, np.diff(np.append(starts, len(elements))))
+
+        for k, c in enumerate(targets.tolist()):
+            group = pair_choice == k
+            group_elements, group_nodes = elements[group], nodes[group]
+            if not len(group_elements):
+                continue
+            chosen = group_elements[_maxima(group_elements, group_nodes, node_max, beaten)]
+            chosen = chosen[_starts(chosen)]
+
+            # Не больше избытка исходного цвета и недостатка цвета c
+            surplus = counts - -(-size // color_count)
+            chosen = chosen[np.argsort(colors[chosen], kind='stable')]
+            source = colors[chosen]
+            chosen = chosen[np.arange(len(chosen)) - np.searchsorted(source, source) < surplus[source]]
+            chosen = chosen[:max(size // color_count - int(counts[c]), 0)]
+            if not len(chosen):
+                continue
+
+            moving = np.zeros(size, np.bool_)
+            moving[chosen] = True
+            moving_pairs = moving[group_elements]
+            old_words, old_bits = _bits(colors[group_elements[moving_pairs]])
+            masks[group_nodes[moving_pairs], old_words] &= ~old_bits
+            masks[group_nodes[moving_pairs], words[k]] |= bits[k]
+            counts -= np.bincount(colors[chosen], minlength=color_count)
+            counts[c] += len(chosen)
+            colors[chosen] = c
+    return colors
@@ -0,0 +1,92 @@
+from typing import TYPE_CHECKING, List, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .fc_mesh import FCMesh
+
+
+class FCComponents(TypedDict):
+    ids: NDArray[np.int32]          # id элементов в порядке типов `mesh.elements`
+    elements: NDArray[np.int32]     # номер компоненты каждого элемента
+    nodes: NDArray[np.int32]        # номер компоненты каждого узла (порядок nodes_ids); -1 — узел без элементов
+    counts: NDArray[np.int64]       # число элементов в компоненте
+    bounds: NDArray[np.float64]     # (K, 2, 3) минимум и максимум координат узлов компоненты
+
+
+def _link(parent: NDArray[np.int64], u: NDArray[np.int64], v: NDArray[np.int64]) -> NDArray[np.int64]:
+    """
+    Объединение узлов по рёбрам (u, v): за раунд больший корень ребра
+    подвешивается к наименьшему соседнему корню, пути сжимаются удвоением
+    указателей, и в следующий раунд переходят рёбра между разными корнями.
+    """
+    while True:
+        ru, rv = parent[u], parent[v]
+        cross = ru != rv
+        if not np.any(cross):
+            return parent
+        u, v = np.minimum(ru[cross], rv[cross]), np.maximum(ru[cross], rv[cross])
+        np.minimum.at(parent, v, u)
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+
+def connected_components(mesh: 'FCMesh') -> FCComponents:
+    """
+    Связные компоненты сетки: элементы связаны, если у них есть общий узел.
+    Все узлы элемента объединяются рёбрами с его первым узлом, компоненты
+    ищутся векторным объединением корней со сжатием путей. Компоненты
+    нумеруются по порядку первых элементов (типы `mesh.elements`).
+    """
+    size = len(mesh.nodes_ids)
+    ids: List[NDArray[np.int32]] = [np.array([], np.int32)]
+    heads: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    u: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    v: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    used = np.zeros(size, np.bool_)
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        arrays = mesh.element_arrays(typename)
+        positions = mesh.node_positions(arrays['nodes'])
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+        ids.append(arrays['ids'])
+        heads.append(positions[:, 0])
+        u.append(np.repeat(positions[:, 0], positions.shape[1] - 1))
+        v.append(positions[:, 1:].ravel())
+        used[positions.ravel()] = True
+
+    parent = _link(np.arange(size, dtype=np.int64), np.concatenate(u), np.concatenate(v))
+
+    # Номер компоненты — порядок первого элемента с данным корнем
+    element_roots = parent[np.concatenate(heads)]
+    roots, first, inverse = np.unique(element_roots, return_index=True, return_inverse=True)
+    rank = np.empty(len(roots), np.int64)
+    rank[np.argsort(first, kind='stable')] = np.arange(len(roots))
+    root_component = np.full(size, -1, np.int64)
+    root_component[roots] = rank
+    node_components = np.where(used, root_component[parent], -1)
+
+    # Габариты по узлам компонент
+    bounds = np.zeros((len(roots), 2, 3), np.float64)
+    if len(roots):
+        xyz = np.asarray(mesh.nodes_xyz, np.float64).reshape(-1, 3)
+        members = np.nonzero(used)[0]
+        order = members[np.argsort(node_components[members], kind='stable')]
+        starts = np.searchsorted(node_components[order], np.arange(len(roots)))
+        bounds[:, 0] = np.minimum.reduceat(xyz[order], starts)
+        bounds[:, 1] = np.maximum.reduceat(xyz[order], starts)
+
+    elements = rank[inverse].astype(np.int32)
+    return {
+        'ids': np.concatenate(ids),
+        'elements': elements,
+        'nodes': node_components.astype(np.int32),
+        'counts': np.bincount(elements, minlength=len(roots)).astype(np.int64),
+        'bounds': bounds,
+    }
@@ -1,4 +1,4 @@
-from typing import Dict, Union, cast
+from typing import Dict, Literal, Union, cast
 from typing import List, Optional, TypedDict
 from numpy import dtype
 
@@ -57,6 +57,17 @@ FC_LOADS_TYPES_KEYS = {
 FC_LOADS_TYPES_CODES: Dict[str, int] = {code: key for key, code in FC_LOADS_TYPES_KEYS.items()}
 
 
+# На что ссылается apply_to: узлы, элементы или стороны элементов (пары [id элемента, номер грани/ребра])
+FCApplyTargetLiteral = Literal['nodes', 'elements', 'faces', 'edges']
+
+FC_LOADS_TYPES_TARGETS: Dict[int, FCApplyTargetLiteral] = {
+    **{key: 'faces' for key in (1, 3, 11, 13, 15, 19, 21, 22, 23, 24, 25, 26, 35, 36, 37, 38, 39)},
+    **{key: 'edges' for key in (2, 4, 12, 14, 16, 20, 31, 32, 33, 34, 40)},
+    **{key: 'nodes' for key in (5, 18, 28, 29, 30, 41, 43)},
+    **{key: 'elements' for key in (17, 42, 44)},
+}
+
+
 FC_RESTRAINT_FLAGS_KEYS = {
     0: 'EmptyRestraint',            # Отсутствует закрепление. Применяется в массивах вместе с остальными вариантами.
     1: 'Displacement',              # ГУ по перемещениям и поворотам для узлов. Длина массива равна 6.
@@ -207,6 +218,10 @@ class FCLoad:
 
         return load_src
 
+    @property
+    def apply_target(self) -> FCApplyTargetLiteral:
+        return FC_LOADS_TYPES_TARGETS[FC_LOADS_TYPES_CODES[self.type]]
+
     def __str__(self) -> str:
         return (
             f"FCLoad(id={self.id}, name='{self.name}', type={self.type}, "
@@ -291,6 +306,14 @@ class FCRestraint:
 
         return src_restraint
 
+    @property
+    def apply_target(self) -> FCApplyTargetLiteral:
+        if {'DirectionDisplacement', 'DirectionVelocity', 'DirectionAcceleration'} & set(self.flags):
+            return 'faces'
+        if 'VolumeAngularVelocity' in self.flags:
+            return 'elements'
+        return 'nodes'
+
     def __str__(self) -> str:
         return (
             f"FCRestraint(id={self.id}, name='{self.name}', apply={self.apply}, cs_id={self.cs_id}, "
@@ -374,6 +397,9 @@ class FCInitialSet:
 
         return src_initial_set
 
+    @property
+    def apply_target(self) -> FCApplyTargetLiteral:
+        return 'nodes'
 
     def __str__(self) -> str:
         return (
@@ -0,0 +1,262 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, TypedDict, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import new_set, populate
+from .fc_mesh import FCElementArrays, FCElementTypeLiteral, concatenate_element_arrays, node_order
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+# Рёбра квадратичных элементов Gmsh в порядке их срединных узлов
+_LINE = [(0, 1)]
+_TRI = [(0, 1), (1, 2), (2, 0)]
+_QUAD = [(0, 1), (1, 2), (2, 3), (3, 0)]
+_TETRA = [(0, 1), (1, 2), (2, 0), (3, 0), (3, 2), (3, 1)]
+_HEX = [(0, 1), (0, 3), (0, 4), (1, 2), (1, 5), (2, 3), (2, 6), (3, 7), (4, 5), (4, 7), (5, 6), (6, 7)]
+_PRISM = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 4), (2, 5), (3, 4), (3, 5), (4, 5)]
+_PYRAMID = [(0, 1), (0, 3), (0, 4), (1, 2), (1, 4), (2, 3), (2, 4), (3, 4)]
+
+# Основание призмы Gmsh обходится в обратную сторону
+_PRISM_CORNERS = [0, 2, 1, 3, 5, 4]
+
+
+def _entry(typename: FCElementTypeLiteral, nodes: int, corners: List[int],
+           edges: List[Tuple[int, int]]) -> Tuple[FCElementTypeLiteral, int, List[int]]:
+    return typename, nodes, node_order(typename, corners, edges)
+
+
+# Тип элемента Gmsh -> тип fc, число узлов Gmsh и номера узлов Gmsh в порядке fc.
+# У квадратичных элементов Лагранжа (QUAD9, HEX27, ...) узлы граней и центра отбрасываются.
+GMSH_ELEMENT_TYPES: Dict[int, Tuple[FCElementTypeLiteral, int, List[int]]] = {
+    15: _entry('POINT3D', 1, [0], []),
+    1: _entry('BEAM26', 2, [0, 1], []),
+    8: _entry('BEAM36', 3, [0, 1], _LINE),
+    2: _entry('TRI3', 3, [0, 1, 2], []),
+    9: _entry('TRI6', 6, [0, 1, 2], _TRI),
+    3: _entry('QUAD4', 4, [0, 1, 2, 3], []),
+    16: _entry('QUAD8', 8, [0, 1, 2, 3], _QUAD),
+    10: _entry('QUAD8', 9, [0, 1, 2, 3], _QUAD),
+    4: _entry('TETRA4', 4, [0, 1, 2, 3], []),
+    11: _entry('TETRA10', 10, [0, 1, 2, 3], _TETRA),
+    5: _entry('HEX8', 8, list(range(8)), []),
+    17: _entry('HEX20', 20, list(range(8)), _HEX),
+    12: _entry('HEX20', 27, list(range(8)), _HEX),
+    6: _entry('WEDGE6', 6, _PRISM_CORNERS, []),
+    18: _entry('WEDGE15', 15, _PRISM_CORNERS, _PRISM),
+    13: _entry('WEDGE15', 18, _PRISM_CORNERS, _PRISM),
+    7: _entry('PYR5', 5, [0, 1, 2, 3, 4], []),
+    19: _entry('PYR13', 13, [0, 1, 2, 3, 4], _PYRAMID),
+    14: _entry('PYR13', 14, [0, 1, 2, 3, 4], _PYRAMID),
+}
+
+# Число угловых узлов сторон по типу элемента Gmsh
+_GMSH_CORNERS = {2: 3, 9: 3, 3: 4, 16: 4, 10: 4}
+
+
+class _Binary:
+    """Последовательное чтение двоичных блоков: 'i' — int, 'z' — size_t, 'd' — double."""
+
+    def __init__(self, data: bytes, pos: int, size_t: int):
+        self.data = data
+        self.pos = pos
+        self.types = {'i': np.dtype('<i4'), 'z': np.dtype(f'<u{size_t}'), 'd': np.dtype('<f8')}
+
+    def take(self, kind: str, count: int) -> NDArray[Any]:
+        dtype = self.types[kind]
+        values: NDArray[Any] = np.frombuffer(self.data, dtype, count, self.pos)
+        self.pos += count * dtype.itemsize
+        return values
+
+
+class _Tokens:
+    """Последовательное чтение чисел текстового раздела, разобранного целиком."""
+
+    def __init__(self, text: bytes, dtype: type):
+        self.values: NDArray[np.generic] = np.fromstring(text.decode('ascii'), dtype=dtype, sep=' ')
+        self.pos = 0
+
+    def take(self, kind: str, count: int) -> NDArray[Any]:
+        values: NDArray[Any] = self.values[self.pos:self.pos + count]
+        if len(values) != count:
+            raise ValueError("Gmsh file is truncated")
+        self.pos += count
+        return values
+
+
+_Reader = Union[_Binary, _Tokens]
+
+
+def _read_entities(reader: _Reader) -> Dict[Tuple[int, int], List[int]]:
+    """Физические группы сущностей: (размерность, тег) -> теги групп."""
+    counts = reader.take('z', 4).astype(np.int64)
+    physical: Dict[Tuple[int, int], List[int]] = {}
+    for dim in range(4):
+        for _ in range(int(counts[dim])):
+            tag = int(reader.take('i', 1)[0])
+            reader.take('d', 3 if dim == 0 else 6)
+            number = int(reader.take('z', 1)[0])
+            physical[(dim, tag)] = [int(t) for t in reader.take('i', number)]
+            if dim > 0:
+                reader.take('i', int(reader.take('z', 1)[0]))
+    return physical
+
+
+def _read_nodes(reader: _Reader) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+    blocks, count = (int(v) for v in reader.take('z', 4)[:2])
+    ids = np.empty(count, np.int64)
+    xyz = np.empty((count, 3), np.float64)
+    filled = 0
+    for _ in range(blocks):
+        dim, _tag, parametric = (int(v) for v in reader.take('i', 3))
+        number = int(reader.take('z', 1)[0])
+        ids[filled:filled + number] = reader.take('z', number)
+        width = 3 + (dim if parametric else 0)
+        xyz[filled:filled + number] = reader.take('d', number * width).reshape(number, width)[:, :3]
+        filled += number
+    return ids, xyz
+
+
+def _read_elements(reader: _Reader) -> List[Tuple[int, int, int, NDArray[np.int64]]]:
+    """Блоки элементов: размерность и тег сущности, тип Gmsh, (n, 1 + узлы) — тег и узлы."""
+    blocks = int(reader.take('z', 4)[0])
+    result = []
+    for _ in range(blocks):
+        dim, tag, gmsh_type = (int(v) for v in reader.take('i', 3))
+        number = int(reader.take('z', 1)[0])
+        if gmsh_type not in GMSH_ELEMENT_TYPES:
+            raise ValueError(f"Gmsh element type {gmsh_type} is not supported")
+        size = GMSH_ELEMENT_TYPES[gmsh_type][1]
+        result.append((dim, tag, gmsh_type, reader.take('z', number * (size + 1)).reshape(number, size + 1)))
+    return result
+
+
+class _GmshMesh(TypedDict):
+    physical: Dict[Tuple[int, int], List[int]]
+    names: Dict[Tuple[int, int], str]
+    nodes: Tuple[NDArray[np.int64], NDArray[np.float64]]
+    elements: List[Tuple[int, int, int, NDArray[np.int64]]]
+
+
+def _parse(data: bytes, binary: bool, size_t: int) -> _GmshMesh:
+    """Разбирает разделы файла по порядку; неизвестные разделы пропускаются."""
+    mesh: _GmshMesh = {'physical': {}, 'names': {}, 'nodes': (np.array([], np.int64), np.empty((0, 3))),
+                       'elements': []}
+    pos = data.index(b'$EndMeshFormat')
+    while True:
+        pos = data.find(b'\n$', pos)
+        if pos < 0:
+            return mesh
+        end_of_line = data.index(b'\n', pos + 1)
+        name = data[pos + 2:end_of_line].strip().decode('ascii')
+        start = end_of_line + 1
+        if name.startswith('End'):
+            pos = end_of_line
+            continue
+        if name in ('Entities', 'Nodes', 'Elements'):
+            reader: _Reader
+            if binary:
+                reader = _Binary(data, start, size_t)
+            else:
+                reader = _Tokens(data[start:data.index(b'$End' + name.encode(), start)],
+                                 np.int64 if name == 'Elements' else np.float64)
+            if name == 'Entities':
+                mesh['physical'] = _read_entities(reader)
+            elif name == 'Nodes':
+                mesh['nodes'] = _read_nodes(reader)
+            else:
+                mesh['elements'] = _read_elements(reader)
+            # Конец двоичного раздела известен только после разбора
+            start = reader.pos if isinstance(reader, _Binary) else start
+        elif name == 'PhysicalNames':
+            lines = data[start:data.index(b'$EndPhysicalNames', start)].decode().splitlines()[1:]
+            for line in lines:
+                dim, tag, text = line.split(maxsplit=2)
+                mesh['names'][(int(dim), int(tag))] = text.strip().strip('"')
+        pos = data.index(b'$End' + name.encode(), start) - 1
+
+
+def _int32(values: NDArray[np.int64], what: str) -> NDArray[np.int32]:
+    if len(values) and int(np.max(values)) > np.iinfo(np.int32).max:
+        raise ValueError(f"Gmsh {what} tags exceed the int32 range")
+    result: NDArray[np.int32] = values.astype(np.int32)
+    return result
+
+
+def read_gmsh(model: 'FCModel', path: str) -> None:
+    """
+    Читает сетку Gmsh 4.1 (.msh, текстовую или двоичную) в пустую модель.
+
+    Разделы узлов и элементов разбираются целиком средствами NumPy.
+    Элементы старшей размерности становятся элементами модели: блок —
+    первая физическая группа сущности (сущности без групп попадают
+    в отдельный блок), parent_id — тег сущности; order в Gmsh не хранится
+    и у всех элементов равен 1. Каждая физическая группа
+    меньшей размерности даёт набор узлов, а группы поверхностей объёмной
+    сетки — ещё и набор сторон с тем же id; имена берутся из $PhysicalNames.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    header = data[data.index(b'$MeshFormat') + len(b'$MeshFormat'):data.index(b'$EndMeshFormat')].split()
+    version, binary, size_t = header[0].decode(), int(header[1]), int(header[2])
+    if not version.startswith('4.1'):
+        raise ValueError(f"Gmsh format {version} is not supported, expected 4.1")
+    if binary and np.frombuffer(header[3][:4], '<i4')[0] != 1:
+        raise ValueError("Big-endian Gmsh files are not supported")
+
+    parsed = _parse(data, bool(binary), size_t)
+    physical, names = parsed['physical'], parsed['names']
+    node_tags, xyz = parsed['nodes']
+    blocks = parsed['elements']
+
+    top = max((dim for dim, _, _, _ in blocks), default=0)
+    spare = 1 + max((tags[0] for (dim, _), tags in physical.items() if dim == top and tags), default=0)
+    parts: Dict[FCElementTypeLiteral, List[FCElementArrays]] = {}
+    groups: Dict[Tuple[int, int], List[Tuple[int, NDArray[np.int64]]]] = {}
+    for dim, tag, gmsh_type, table in blocks:
+        tags = physical.get((dim, tag), [])
+        if dim < top:
+            for group in tags:
+                groups.setdefault((dim, group), []).append((gmsh_type, table[:, 1:]))
+            continue
+        typename, _, order = GMSH_ELEMENT_TYPES[gmsh_type]
+        count = len(table)
+        parts.setdefault(typename, []).append({
+            'ids': _int32(table[:, 0], 'element'),
+            'nodes': _int32(table[:, 1:][:, order], 'node'),
+            'blocks': np.full(count, tags[0] if tags else spare, np.int32),
+            'parent_ids': np.full(count, tag, np.int32),
+            'orders': np.ones(count, np.int32),
+        })
+
+    elements = {typename: concatenate_element_arrays(chunks) for typename, chunks in parts.items()}
+
+    nodesets: Dict[int, Tuple[str, NDArray[np.int32]]] = {}
+    for set_id, (key, tables) in enumerate(sorted(groups.items()), 1):
+        nodes = np.unique(np.concatenate([t.ravel() for _, t in tables]))
+        nodesets[set_id] = (names.get(key, ''), _int32(nodes, 'node'))
+    populate(model, _int32(node_tags, 'node'), xyz, elements, nodesets)
+
+    if top != 3:
+        return
+    # Стороны ищутся одним запросом на каждое число угловых узлов
+    sides: Dict[int, List[NDArray[np.int32]]] = {}
+    for size in (3, 4):
+        owners, faces = [], []
+        for set_id, (key, tables) in enumerate(sorted(groups.items()), 1):
+            for gmsh_type, table in tables:
+                if key[0] == 2 and _GMSH_CORNERS.get(gmsh_type) == size:
+                    owners.append(np.full(len(table), set_id))
+                    faces.append(_int32(table[:, :size], 'node'))
+        if not faces:
+            continue
+        found = model.mesh.find_faces(np.concatenate(faces))
+        owner = np.concatenate(owners)
+        for set_id in np.unique(owner).tolist():
+            rows = found[owner == set_id]
+            sides.setdefault(set_id, []).append(rows[rows[:, 0] >= 0])
+    for set_id, (key, _) in enumerate(sorted(groups.items()), 1):
+        if set_id in sides:
+            model.sidesets[set_id] = new_set(set_id, names.get(key, ''), np.concatenate(sides[set_id]))
@@ -0,0 +1,220 @@
+from typing import Dict, List, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, FCElementTypeLiteral, FCMesh, midside_nodes
+
+
+class FCGraph(TypedDict):
+    """Граф в CSR-виде: соседи вершины i — indices[offsets[i]:offsets[i+1]]."""
+    offsets: NDArray[np.int64]
+    indices: NDArray[np.int64]
+
+
+class FCBandwidth(TypedDict):
+    bandwidth: int
+    profile: int
+
+
+def unique_sorted(values: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Уникальные значения по возрастанию (через сортировку — быстрее np.unique на больших массивах)."""
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    keep = np.empty(len(values), np.bool_)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    unique: NDArray[np.int64] = values[keep]
+    return unique
+
+
+def csr_from_pairs(size: int, rows: NDArray[np.int64], cols: NDArray[np.int64]) -> FCGraph:
+    """CSR-граф из списка пар (без петель и повторов, соседи упорядочены)."""
+    keep = rows != cols
+    keys = unique_sorted(rows[keep] * np.int64(size) + cols[keep])
+    rows = keys // size
+    offsets = np.zeros(size + 1, np.int64)
+    offsets[1:] = np.cumsum(np.bincount(rows, minlength=size))
+    return {'offsets': offsets, 'indices': keys % size}
+
+
+def node_graph(mesh: FCMesh) -> FCGraph:
+    """
+    Граф смежности узлов: узлы смежны, если входят в один элемент.
+    Вершины — позиции узлов в `mesh.nodes_ids`.
+    """
+    rows: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    cols: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    for typename in mesh.elements:
+        nodes = mesh.element_arrays(typename)['nodes']
+        size = nodes.shape[1]
+        if size < 2 or len(nodes) == 0:
+            continue
+        positions = mesh.node_positions(nodes)
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+        i, j = np.nonzero(~np.eye(size, dtype=np.bool_))
+        # Повторы внутри одного типа убираются сразу, чтобы не копить пары всех типов
+        keys = unique_sorted(positions[:, i].ravel() * np.int64(len(mesh.nodes_ids)) + positions[:, j].ravel())
+        rows.append(keys // len(mesh.nodes_ids))
+        cols.append(keys % len(mesh.nodes_ids))
+    return csr_from_pairs(len(mesh.nodes_ids), np.concatenate(rows), np.concatenate(cols))
+
+
+def element_sides(typename: FCElementTypeLiteral) -> List[List[int]]:
+    """
+    Угловые узлы сторон элемента, по которым элементы считаются смежными:
+    грани объёмных элементов, рёбра плоских и узлы линейных.
+    """
+    element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+    mids = set(midside_nodes(typename)[1].tolist()) if element_type['order'] == 2 else set()
+    if element_type['dim'] == 3:
+        return [[node for node in facet if node not in mids] for facet in element_type['facets']]
+    if element_type['dim'] == 2:
+        sides: List[List[int]] = []
+        for line in element_type['edges']:
+            corners = [node for node in line if node not in mids]
+            sides.extend([a, b] for a, b in zip(corners[:-1], corners[1:]))
+        return sides
+    if element_type['dim'] == 1:
+        return [[node] for node in range(element_type['nodes']) if node not in mids]
+    return []
+
+
+def element_graph(mesh: FCMesh) -> Tuple[FCGraph, NDArray[np.int32]]:
+    """
+    Двойственный граф сетки: элементы смежны, если у них есть общая сторона
+    (`element_sides`). Вершины — элементы в порядке типов `mesh.elements`;
+    возвращается граф и id элементов по вершинам. Элементы одной общей
+    стороны (неманифолдные стыки) связываются цепочкой.
+    """
+    ids: List[NDArray[np.int32]] = [np.array([], np.int32)]
+    # Число узлов стороны -> отсортированные узлы сторон и вершины-владельцы
+    keys: Dict[int, Tuple[List[NDArray[np.int32]], List[NDArray[np.int64]]]] = {}
+    count = 0
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        arrays = mesh.element_arrays(typename)
+        vertices = np.arange(count, count + len(arrays['ids']), dtype=np.int64)
+        for side in element_sides(typename):
+            nodes, owners = keys.setdefault(len(side), ([], []))
+            nodes.append(np.sort(arrays['nodes'][:, side], axis=1))
+            owners.append(vertices)
+        ids.append(arrays['ids'])
+        count += len(arrays['ids'])
+
+    pairs: List[NDArray[np.int64]] = [np.empty((2, 0), np.int64)]
+    for nodes, owners in keys.values():
+        table = np.ascontiguousarray(np.concatenate(nodes), np.int32)
+        owner = np.concatenate(owners)
+        order = np.lexsort(table.T[::-1])
+        table, owner = table[order], owner[order]
+        same = np.all(table[1:] == table[:-1], axis=1)
+        pairs.append(np.stack([owner[:-1][same], owner[1:][same]]))
+    a, b = np.concatenate(pairs, axis=1)
+    graph = csr_from_pairs(count, np.concatenate([a, b]), np.concatenate([b, a]))
+    return graph, np.concatenate(ids)
+
+
+def _bfs_levels(graph: FCGraph, degree: NDArray[np.int64], start: int,
+                visited: NDArray[np.bool_]) -> List[NDArray[np.int64]]:
+    """
+    Поуровневый обход в ширину в порядке Катхилла–Макки: вершины следующего
+    уровня упорядочены по позиции первого родителя, затем по степени.
+    Отмечает посещённые вершины в `visited`.
+    """
+    offsets = graph['offsets']
+    indices = graph['indices']
+
+    visited[start] = True
+    levels = [np.array([start], np.int64)]
+    while True:
+        frontier = levels[-1]
+        count = offsets[frontier + 1] - offsets[frontier]
+        total = int(count.sum())
+        if total == 0:
+            break
+        parent = np.repeat(np.arange(len(frontier)), count)
+        local = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+        neighbors = indices[np.repeat(offsets[frontier], count) + local]
+
+        fresh = ~visited[neighbors]
+        parent = parent[fresh]
+        neighbors = neighbors[fresh]
+        if len(neighbors) == 0:
+            break
+
+        order = np.lexsort((neighbors, degree[neighbors], parent))
+        neighbors = neighbors[order]
+        _, first = np.unique(neighbors, return_index=True)
+        level = neighbors[np.sort(first)]
+
+        visited[level] = True
+        levels.append(level)
+    return levels
+
+
+def _pseudo_peripheral(graph: FCGraph, degree: NDArray[np.int64], start: int) -> int:
+    """Псевдопериферийная вершина компоненты (алгоритм Джорджа–Лю)."""
+    eccentricity = -1
+    while True:
+        levels = _bfs_levels(graph, degree, start, np.zeros(len(degree), np.bool_))
+        if len(levels) - 1 <= eccentricity:
+            return start
+        eccentricity = len(levels) - 1
+        last = levels[-1]
+        candidate = int(last[np.argmin(degree[last])])
+        if candidate == start:
+            return start
+        start = candidate
+
+
+def rcm_order(graph: FCGraph) -> NDArray[np.int64]:
+    """
+    Обратный порядок Катхилла–Макки: перестановка вершин (новая позиция -> старая).
+    Компоненты связности обходятся по очереди, начиная с псевдопериферийной вершины.
+    """
+    degree = np.diff(graph['offsets'])
+    size = len(degree)
+    visited = degree == 0
+    # Изолированные вершины не влияют на ленту — они уходят в конец нумерации
+    parts: List[NDArray[np.int64]] = [np.nonzero(visited)[0]]
+
+    # Кандидаты в стартовые вершины компонент — по возрастанию степени
+    candidates = np.argsort(degree, kind='stable')
+    cursor = 0
+    while cursor < size:
+        while cursor < size and visited[candidates[cursor]]:
+            cursor += 1
+        if cursor == size:
+            break
+        start = _pseudo_peripheral(graph, degree, int(candidates[cursor]))
+        parts.extend(_bfs_levels(graph, degree, start, visited))
+
+    order: NDArray[np.int64] = np.concatenate(parts)[::-1].copy()
+    return order
+
+
+def bandwidth(graph: FCGraph, order: NDArray[np.int64]) -> FCBandwidth:
+    """
+    Ширина ленты и профиль (оболочка) симметричной матрицы смежности
+    при нумерации вершин `order` (новая позиция -> старая).
+    """
+    size = len(graph['offsets']) - 1
+    if size == 0:
+        return {'bandwidth': 0, 'profile': 0}
+
+    rank = np.empty(size, np.int64)
+    rank[order] = np.arange(size)
+
+    rows = rank[np.repeat(np.arange(size), np.diff(graph['offsets']))]
+    cols = rank[graph['indices']]
+    width = int(np.max(np.abs(rows - cols))) if len(rows) else 0
+
+    # Профиль: сумма расстояний от диагонали до первого ненулевого элемента строки
+    first = np.arange(size)
+    np.minimum.at(first, rows, cols)
+    profile = int(np.sum(np.arange(size) - first))
+    return {'bandwidth': width, 'profile': profile}
@@ -0,0 +1,246 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_mesh import FC_ELEMENT_SHAPES, FC_ELEMENT_TYPES_KEYNAME, lookup
+from .fc_property_tables import FCPropertyTable
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+class FCMassProperties(TypedDict):
+    """Масса, центр масс (3,) и тензор инерции (3, 3) относительно центра масс."""
+    mass: float
+    center: NDArray[np.float64]
+    inertia: NDArray[np.float64]
+
+
+class FCMassReport(TypedDict):
+    blocks: Dict[int, FCMassProperties]
+    total: FCMassProperties
+
+
+# Коды таблиц свойств и типов сечений (см. docs/FidesysCase.md)
+_SHELL, _BEAM, _LUMPMASS, _SPRING = 0, 1, 5, 6
+_RECTANGLE, _ELLIPSE, _I_BEAM, _CIRCLE_WITH_A_CUT, _POINT, _C_BEAM, _L_BEAM, _Z_BEAM, _T_BEAM = 0, 1, 2, 3, 4, 5, 6, 7, 8
+_RECTANGLE_WITH_A_CUT, _HAT_BEAM, _PIPE = 9, 10, 12
+
+
+def _number(source: Dict[str, Any], key: str, table: FCPropertyTable) -> float:
+    if key not in source:
+        raise ValueError(f"Property table {table.id}: missing '{key}'")
+    return float(source[key])
+
+
+def section_area(table: FCPropertyTable) -> float:
+    """
+    Площадь балочного сечения: свойство `area` или, если его нет,
+    площадь по размерам `geometry` для всех сечений, кроме POINT
+    (у эллипса `a` и `b` — оси, а не полуоси; полки двутавра, швеллера,
+    Z-сечения, уголка, тавра и корытного профиля — во всю ширину, стенки —
+    между полками).
+    """
+    props = table.properties
+    if 'area' in props:
+        return float(props['area'])
+    section = int(props.get('section_type', _POINT))
+    geometry: Dict[str, Any] = props.get('geometry') or {}
+
+    def size(key: str) -> float:
+        return _number(geometry, key, table)
+
+    if section == _RECTANGLE:
+        return size('B') * size('H')
+    if section == _ELLIPSE:
+        return float(np.pi * size('a') * size('b') / 4)
+    if section in (_I_BEAM, _C_BEAM, _Z_BEAM):
+        return size('B1') * size('c1') + size('B2') * size('c2') + (size('H') - size('c1') - size('c2')) * size('d')
+    if section in (_L_BEAM, _T_BEAM):
+        return size('B') * size('c1') + (size('H') - size('c1')) * size('d')
+    if section == _HAT_BEAM:
+        return size('B1') * size('c1') + size('B2') * size('c2') + size('B3') * size('c3') + \
+            (size('H') - size('c1') - size('c3')) * size('d1') + (size('H') - size('c2') - size('c3')) * size('d2')
+    if section == _RECTANGLE_WITH_A_CUT:
+        return size('B') * size('H') - (size('B') - size('d1') - size('d2')) * (size('H') - size('c1') - size('c2'))
+    if section == _PIPE:
+        return float(np.pi * (size('d1')**2 - size('d2')**2) / 4)
+    if section == _CIRCLE_WITH_A_CUT:
+        return float(np.pi * (size('D1')**2 - size('D2')**2) / 4)
+    raise ValueError(f"Property table {table.id}: section type {section} requires 'area'")
+
+
+def material_density(model: 'FCModel', material_id: int) -> float:
+    """Постоянная плотность материала (свойство DENSITY группы common)."""
+    if material_id not in model.materials:
+        raise KeyError(f"Material {material_id} is missing in the model")
+    density = model.materials[material_id].constant('common', 'DENSITY')
+    if density is None:
+        raise ValueError(f"Material {material_id} has no constant DENSITY")
+    return density
+
+
+def _shell_layers(table: FCPropertyTable) -> List[Dict[str, Any]]:
+    for source in (table.properties, table.additional_properties):
+        layers = source.get('layers')
+        if isinstance(layers, dict):
+            layers = layers.get('properties')
+        if isinstance(layers, list) and layers:
+            return layers
+    return []
+
+
+def _block_table(model: 'FCModel', block_id: int, kind: int) -> Optional[FCPropertyTable]:
+    table = model.property_tables.get(model.blocks[block_id].property_id)
+    return table if table is not None and table.type == kind else None
+
+
+def _line_factor(model: 'FCModel', block_id: int) -> float:
+    """Погонная масса балок, стержней и тросов: плотность на площадь сечения."""
+    table = _block_table(model, block_id, _BEAM)
+    if table is None:
+        raise ValueError(f"Block {block_id}: line elements need a BEAM property table")
+    return material_density(model, model.blocks[block_id].material_id) * section_area(table)
+
+
+def _surface_factor(model: 'FCModel', block_id: int) -> float:
+    """
+    Поверхностная плотность: сумма плотность * толщина по слоям оболочки.
+    Без слоёв — плотность материала блока (единичная толщина плоских элементов).
+    """
+    table = _block_table(model, block_id, _SHELL)
+    layers = _shell_layers(table) if table is not None else []
+    if not layers:
+        return material_density(model, model.blocks[block_id].material_id)
+    return sum(material_density(model, int(layer['material_id'])) * float(layer['t']) for layer in layers)
+
+
+def _point_mass(model: 'FCModel', block_id: int) -> Tuple[float, NDArray[np.float64]]:
+    """Масса и собственные моменты инерции (3,) сосредоточенной массы блока."""
+    table = _block_table(model, block_id, _LUMPMASS)
+    if table is None:
+        return 0.0, np.zeros(3)
+    props = table.properties
+    if 'mass' in props:
+        mass = float(props['mass'])
+    else:
+        # Масса, заданная по осям, усредняется
+        parts = [float(props[key]) for key in ('mass_x', 'mass_y', 'mass_z') if key in props]
+        mass = float(np.mean(parts)) if parts else 0.0
+    if 'mass_inertia' in props:
+        inertia = np.full(3, float(props['mass_inertia']))
+    else:
+        inertia = np.array([float(props.get(key, 0.0)) for key in ('mass_inertia_x', 'mass_inertia_y', 'mass_inertia_z')])
+    return mass, inertia
+
+
+def _spring_mass(model: 'FCModel', block_id: int) -> Tuple[float, float]:
+    """Доли массы пружины в узлах 0 и 1 (mass_distribution: -1, 0, 1)."""
+    table = _block_table(model, block_id, _SPRING)
+    if table is None:
+        return 0.0, 0.0
+    props = table.properties
+    mass = float(props.get('spring_mass', props.get('mass', 0.0)))
+    distribution = int(props.get('mass_distribution', 0))
+    if distribution < 0:
+        return mass, 0.0
+    if distribution > 0:
+        return 0.0, mass
+    return mass / 2, mass / 2
+
+
+def _properties(mass: float, first: NDArray[np.float64], second: NDArray[np.float64],
+                own: NDArray[np.float64]) -> FCMassProperties:
+    """Центр масс и тензор инерции по моментам: I = tr(J) E - J, J — второй момент относительно центра."""
+    if mass <= 0:
+        return {'mass': mass, 'center': np.full(3, np.nan), 'inertia': own.copy()}
+    center = first / mass
+    central = second - mass * np.outer(center, center)
+    inertia = np.trace(central) * np.eye(3) - central + own
+    return {'mass': mass, 'center': center, 'inertia': inertia}
+
+
+def mass_properties(model: 'FCModel', count: Optional[int] = None, chunk_size: int = 16384) -> FCMassReport:
+    """
+    Масса, центр масс и тензор инерции по блокам и для всей модели.
+
+    Объёмные элементы — плотность DENSITY материала блока на объём;
+    оболочки и плоские элементы — сумма плотность * толщина слоёв таблицы
+    SHELL (без слоёв — единичная толщина); балки, стержни и тросы — плотность
+    на площадь сечения таблицы BEAM. Оболочки и балки считаются тонкими:
+    масса сосредоточена на срединной поверхности и оси. Сосредоточенные
+    массы и массы пружин берутся из таблиц LUMPMASS и SPRING.
+    Интегрирование — квадратурой `FCShape.moments` пачками по `chunk_size`.
+    """
+    mesh = model.mesh
+    block_ids = np.array(sorted(model.blocks), np.int64)
+    size = len(block_ids)
+    masses = np.zeros(size)
+    first = np.zeros((size, 3))
+    second = np.zeros((size, 3, 3))
+    own = np.zeros((size, 3, 3))
+    xyz = mesh.nodes_xyz.reshape(-1, 3)
+
+    def accumulate(index: NDArray[np.int64], mass: NDArray[np.float64],
+                   moment: NDArray[np.float64], tensor: NDArray[np.float64]) -> None:
+        masses[:] += np.bincount(index, mass, size)
+        for i in range(3):
+            first[:, i] += np.bincount(index, moment[:, i], size)
+            for j in range(3):
+                second[:, i, j] += np.bincount(index, tensor[:, i, j], size)
+
+    for typename in mesh.elements:
+        arrays = mesh.element_arrays(typename)
+        if len(arrays['ids']) == 0:
+            continue
+        index = lookup(block_ids, arrays['blocks'])
+        if np.any(index < 0):
+            raise KeyError(f"{typename} elements reference blocks missing in the model")
+        positions = mesh.node_positions(arrays['nodes'])
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+
+        present = np.unique(index)
+        dim = FC_ELEMENT_TYPES_KEYNAME[typename]['dim']
+        shape = FC_ELEMENT_SHAPES.get(typename)
+
+        if typename.startswith('SPRING'):
+            shares = np.zeros((size, 2))
+            for i in present:
+                shares[i] = _spring_mass(model, int(block_ids[i]))
+            for node in range(2):
+                mass = shares[index, node]
+                points = xyz[positions[:, node]]
+                accumulate(index, mass, points * mass[:, None], points[:, :, None] * points[:, None, :] * mass[:, None, None])
+            continue
+
+        if dim == 0 or shape is None:
+            point_masses = np.zeros(size)
+            for i in present:
+                point_masses[i], inertia = _point_mass(model, int(block_ids[i]))
+                own[i] += np.diag(inertia) * np.count_nonzero(index == i)
+            mass = point_masses[index]
+            points = xyz[positions[:, 0]]
+            accumulate(index, mass, points * mass[:, None], points[:, :, None] * points[:, None, :] * mass[:, None, None])
+            continue
+
+        factors = np.zeros(size)
+        for i in present:
+            block_id = int(block_ids[i])
+            if dim == 1:
+                factors[i] = _line_factor(model, block_id)
+            elif dim == 2:
+                factors[i] = _surface_factor(model, block_id)
+            else:
+                factors[i] = material_density(model, model.blocks[block_id].material_id)
+
+        for start in range(0, len(index), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            measures, moment, tensor = shape.moments(xyz[positions[chunk]], count)
+            factor = factors[index[chunk]]
+            accumulate(index[chunk], measures * factor, moment * factor[:, None], tensor * factor[:, None, None])
+
+    blocks = {int(block_ids[i]): _properties(float(masses[i]), first[i], second[i], own[i]) for i in range(size)}
+    total = _properties(float(masses.sum()), first.sum(axis=0), second.sum(axis=0), own.sum(axis=0))
+    return {'blocks': blocks, 'total': total}
@@ -1,7 +1,10 @@
 # Material property type codes per group
-from typing import Dict, List, Literal, TypedDict, Union
+from typing import Dict, List, Literal, Optional, TypedDict, Union
+
+import numpy as np
 
 from .fc_data import FCData
+from .fc_value import encode
 
 
 FCMaterialPropertiesTypeLiteral = Literal[
@@ -342,6 +345,25 @@ class FCMaterial:
                     )
                     some_property_group.append(prop) 
 
+    def constant(self, group: FCMaterialPropertiesTypeLiteral, name: str) -> Optional[float]:
+        """Значение постоянного свойства `name` группы `group` или None."""
+        code = FC_MATERIAL_PROPERTY_NAMES_CODES[group].get(name)
+        for properties in self.properties.get(group, []):
+            for prop in properties:
+                value = prop.data.value.data
+                if prop.name in (name, code) and prop.data.type == 0 and isinstance(value, np.ndarray) and value.size:
+                    return float(value[0])
+        return None
+
+    def set_constant(self, group: FCMaterialPropertiesTypeLiteral, type: str, name: str, value: float) -> None:
+        """Добавляет постоянное свойство в группу свойств типа `type` (создаёт её при необходимости)."""
+        prop = FCMaterialProperty(type, name, FCData(encode(np.array([value], np.float64)), 0, ''))
+        for properties in self.properties.setdefault(group, []):
+            if properties and properties[0].type == type:
+                properties.append(prop)
+                return
+        self.properties[group].append([prop])
+
     def dump(self) -> FCSrcMaterial:
         material_src: FCSrcMaterial = {"id": self.id, "name": self.name}
 
@@ -0,0 +1,170 @@
+import os
+from typing import TYPE_CHECKING, List, Optional, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_graph import FCGraph, node_graph, rcm_order, unique_sorted
+from .fc_mesh import FCMesh
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+# Степени свободы узла: перемещения, повороты, температура, поровое давление
+FC_NODE_DOFS: List[str] = ['UX', 'UY', 'UZ', 'RX', 'RY', 'RZ', 'TEMPERATURE', 'PORE_PRESSURE']
+
+# Типы элементов с поворотными степенями свободы в узлах
+_ROTATIONAL_PREFIXES = ('BEAM', 'MITC', 'SHELL', 'SPRING6D', 'LUMPMASS6D', 'POINT6D', 'LUMPMASS2DR')
+
+# Флаги закреплений по компонентам: перемещения и повороты (0..5), температура, давление
+_COMPONENT_FLAGS = {'Displacement', 'Velocity', 'Acceleration'}
+_SCALAR_FLAGS = {'Temperature': 6, 'PorePressure': 7}
+
+
+class FCSolverMemory(TypedDict):
+    nodes: int                  # узлов с неизвестными
+    dofs: int                   # неизвестных после исключения закреплённых
+    restrained: int             # закреплённых степеней свободы
+    nnz: int                    # ненулевых элементов матрицы (полная симметричная структура)
+    matrix_bytes: int           # CSR: значения float64, столбцы int32/int64, смещения строк int64
+    factor_nnz: int             # ненулевых элементов нижнего треугольника множителя (оболочка после RCM)
+    factor_bytes: int
+    total_bytes: int            # матрица и множитель (прямой решатель) или предобусловливатель (итерационный)
+    permission_write: bool      # оценка не помещается в `memory_limit`
+    pattern: Optional[FCGraph]  # CSR-структура матрицы по неизвестным (узел за узлом), если запрошена
+
+
+def node_dofs(model: 'FCModel') -> Tuple[NDArray[np.bool_], NDArray[np.bool_]]:
+    """
+    Степени свободы узлов (столбцы FC_NODE_DOFS) по настройкам `settings`:
+    перемещения (2 или 3 по `dimensions`) при `elasticity`, повороты в узлах
+    балок, оболочек и 6D-элементов, температура при `heat_transfer`, давление
+    при `porefluid_transfer`. Возвращает маски активных и закреплённых
+    (по закреплениям модели) степеней свободы, (N, 8) в порядке `nodes_ids`.
+    """
+    mesh = model.mesh
+    settings = model.settings
+    planar = settings.get('dimensions', '3D') == '2D'
+    translations = [0, 1] if planar else [0, 1, 2]
+    rotations = [5] if planar else [3, 4, 5]
+
+    used = np.zeros(len(mesh.nodes_ids), np.bool_)
+    rotating = np.zeros(len(mesh.nodes_ids), np.bool_)
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        positions = mesh.node_positions(mesh.element_arrays(typename)['nodes']).ravel()
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+        used[positions] = True
+        if typename.startswith(_ROTATIONAL_PREFIXES):
+            rotating[positions] = True
+
+    active = np.zeros((len(mesh.nodes_ids), len(FC_NODE_DOFS)), np.bool_)
+    if settings.get('elasticity', True):
+        active[:, translations] = used[:, None]
+        active[:, rotations] = rotating[:, None]
+    if settings.get('heat_transfer', False):
+        active[:, 6] = used
+    if settings.get('porefluid_transfer', False):
+        active[:, 7] = used
+
+    fixed = np.zeros_like(active)
+    for restraint in model.restraints:
+        if restraint.apply_target != 'nodes' or restraint.apply.type != 'array':
+            continue
+        positions = mesh.node_positions(np.asarray(restraint.apply.data, np.int32).ravel())
+        positions = positions[positions >= 0]
+        for component, flag in enumerate(restraint.flags):
+            if flag in _COMPONENT_FLAGS and component < 6:
+                fixed[positions, component] = True
+            elif flag in _SCALAR_FLAGS:
+                fixed[positions, _SCALAR_FLAGS[flag]] = True
+    return active, fixed & active
+
+
+def _ranges(starts: NDArray[np.int64], lengths: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Конкатенация диапазонов [start, start + length)."""
+    total = int(lengths.sum())
+    ranges: NDArray[np.int64] = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+    return ranges
+
+
+def _pattern(graph: FCGraph, dofs: NDArray[np.int64]) -> FCGraph:
+    """CSR-структура по неизвестным: строки и столбцы узла идут подряд, диагональ включена."""
+    size = len(dofs)
+    rows = np.repeat(np.arange(size), np.diff(graph['offsets']))
+    keys = unique_sorted(np.concatenate([rows * size + graph['indices'], np.arange(size) * (size + 1)]))
+    rows, cols = keys // size, keys % size
+
+    first = np.cumsum(dofs) - dofs                    # первая неизвестная узла
+    row_length = np.bincount(rows, dofs[cols], size).astype(np.int64)
+    block = _ranges(first[cols], dofs[cols])          # столбцы строк узла, по одной копии на узел
+    block_start = np.cumsum(row_length) - row_length
+
+    # Каждая из dofs[i] строк узла i повторяет его блок столбцов
+    row_nodes = np.repeat(np.arange(size), dofs)
+    lengths = row_length[row_nodes]
+    offsets = np.zeros(len(row_nodes) + 1, np.int64)
+    offsets[1:] = np.cumsum(lengths)
+    return {'offsets': offsets, 'indices': block[_ranges(block_start[row_nodes], lengths)]}
+
+
+def estimate_solver_memory(model: 'FCModel', pattern: bool = False,
+                           memory_limit: Optional[int] = None) -> FCSolverMemory:
+    """
+    Оценка памяти решателя до запуска расчёта.
+
+    Структура матрицы — граф смежности узлов (`fc_graph.node_graph`),
+    размноженный на незакреплённые степени свободы узлов (`node_dofs`).
+    Заполнение множителя оценивается сверху оболочкой (профилем) матрицы
+    при нумерации RCM — так хранит множитель профильный решатель; решатели
+    с вложенными сечениями обычно требуют меньше. Для итерационного метода
+    (`settings['linear_solver']['method'] == 'iterative'`) вместо множителя
+    учитывается предобусловливатель ILU(0) со структурой матрицы.
+
+    `memory_limit` — доступная память в байтах (по умолчанию — физическая
+    память машины); `permission_write` показывает, что оценка её превышает.
+    """
+    mesh: FCMesh = model.mesh
+    active, fixed = node_dofs(model)
+    free = np.count_nonzero(active & ~fixed, axis=1).astype(np.int64)
+    graph = node_graph(mesh)
+    rows = np.repeat(np.arange(len(free)), np.diff(graph['offsets']))
+    dofs = int(free.sum())
+    nnz = int(np.sum(free * free) + np.sum(free[rows] * free[graph['indices']]))
+
+    index_bytes = 4 if dofs < 2 ** 31 else 8
+    matrix_bytes = nnz * (8 + index_bytes) + (dofs + 1) * 8
+
+    # Оболочка в нумерации RCM: строки узла занимают столбцы от первого соседа до себя
+    order = rcm_order(graph)
+    rank = np.empty(len(free), np.int64)
+    rank[order] = np.arange(len(free))
+    first = np.arange(len(free))  # наименьший номер соседа по номеру RCM
+    np.minimum.at(first, rank[rows], rank[graph['indices']])
+    ordered = free[order]
+    before = np.concatenate([[0], np.cumsum(ordered)])
+    factor_nnz = int(np.sum(ordered * (before[1:] - before[first])) - np.sum(ordered * (ordered - 1) // 2))
+    factor_bytes = factor_nnz * 8
+
+    iterative = model.settings.get('linear_solver', {}).get('method') == 'iterative'
+    total_bytes = matrix_bytes + (nnz * 8 if iterative else factor_bytes)
+    if memory_limit is None:
+        try:
+            memory_limit = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        except (AttributeError, ValueError, OSError):
+            memory_limit = 0
+    return {
+        'nodes': int(np.count_nonzero(active.any(axis=1))),
+        'dofs': dofs,
+        'restrained': int(np.count_nonzero(fixed)),
+        'nnz': nnz,
+        'matrix_bytes': matrix_bytes,
+        'factor_nnz': factor_nnz,
+        'factor_bytes': factor_bytes,
+        'total_bytes': total_bytes,
+        'permission_write': bool(memory_limit) and total_bytes > memory_limit,
+        'pattern': _pattern(graph, free) if pattern else None,
+    }
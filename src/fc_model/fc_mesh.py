@@ -1,7 +1,14 @@
-from typing import Iterator, List, Dict, Literal, TypedDict, Union
+from functools import partial
+from itertools import chain, islice
+from typing import Any, FrozenSet, Iterator, List, Dict, Literal, Optional, Tuple, TypedDict, Union
 import numpy as np
 from numpy.typing import NDArray
 
+from .fc_coloring import FCColoring, color_elements
+from .fc_components import FCComponents, connected_components
+from .fc_parallel import FCChunkFunction, FCElementChunk, parallel_map
+from .fc_shapes import FCShape, shape_for
+from .fc_spatial import FCElementLocator, FCNodeIndex
 from .fc_value import decode, encode
 
 
@@ -353,7 +360,7 @@ FC_ELEMENT_TYPES: List[FCElementType] = [
         'order': 2,
         'nodes': 10,
         'edges': [[0, 4, 1, 5, 2, 6, 0], [0, 7, 3], [1, 8, 3], [2, 9, 3]],
-        'facets': [[0, 6, 2, 5, 1, 4], [0, 4, 1, 8, 3, 5], [1, 5, 2, 9, 3, 8], [2, 6, 0, 5, 3, 9]],
+        'facets': [[0, 6, 2, 5, 1, 4], [0, 4, 1, 8, 3, 7], [1, 5, 2, 9, 3, 8], [2, 6, 0, 7, 3, 9]],
         'tetras': [],
     },
     {
@@ -373,7 +380,7 @@ FC_ELEMENT_TYPES: List[FCElementType] = [
         'order': 2,
         'nodes': 20,
         'edges': [[0, 8, 1, 9, 2, 10, 3, 11, 0], [4, 12, 5, 13, 6, 14, 7, 15, 4],
-                  [0, 0, 4], [1, 0, 5], [2, 0, 6], [3, 0, 7]],
+                  [0, 16, 4], [1, 17, 5], [2, 18, 6], [3, 19, 7]],
         'facets': [[3, 10, 2, 9, 1, 8, 0, 11], [4, 12, 5, 13, 6, 14, 7, 15], [1, 9, 2, 18, 6, 13, 5, 17],
                    [0, 8, 1, 17, 5, 12, 4, 16], [0, 16, 4, 15, 7, 19, 3, 11], [2, 10, 3, 19, 7, 14, 6, 18]],
         'tetras': [],
@@ -395,7 +402,7 @@ FC_ELEMENT_TYPES: List[FCElementType] = [
         'order': 2,
         'nodes': 10,
         'edges': [[0, 4, 1, 5, 2, 6, 0], [0, 7, 3], [1, 8, 3], [2, 9, 3]],
-        'facets': [[0, 6, 2, 5, 1, 4], [0, 4, 1, 8, 3, 5], [1, 5, 2, 9, 3, 8], [2, 6, 0, 5, 3, 9]],
+        'facets': [[0, 6, 2, 5, 1, 4], [0, 4, 1, 8, 3, 7], [1, 5, 2, 9, 3, 8], [2, 6, 0, 7, 3, 9]],
         'tetras': [],
     },
     {
@@ -415,7 +422,7 @@ FC_ELEMENT_TYPES: List[FCElementType] = [
         'order': 2,
         'nodes': 20,
         'edges': [[0, 8, 1, 9, 2, 10, 3, 11, 0], [4, 12, 5, 13, 6, 14, 7, 15, 4],
-                  [0, 0, 4], [1, 0, 5], [2, 0, 6], [3, 0, 7]],
+                  [0, 16, 4], [1, 17, 5], [2, 18, 6], [3, 19, 7]],
         'facets': [[3, 10, 2, 9, 1, 8, 0, 11], [4, 12, 5, 13, 6, 14, 7, 15], [1, 9, 2, 18, 6, 13, 5, 17],
                    [0, 8, 1, 17, 5, 12, 4, 16], [0, 16, 4, 15, 7, 19, 3, 11], [2, 10, 3, 19, 7, 14, 6, 18]],
         'tetras': [],
@@ -436,9 +443,9 @@ FC_ELEMENT_TYPES: List[FCElementType] = [
         'dim': 3,
         'order': 2,
         'nodes': 15,
-        'edges': [[0, 5, 1, 6, 2, 7, 3, 8, 0], [0, 9, 4], [1, 10, 4], [2, 11, 4], [3, 12, 4]],
-        'facets': [[3, 7, 2, 6, 1, 5, 0, 8],
-                   [0, 5, 1, 10, 4, 9], [1, 6, 2, 11, 4, 10], [2, 7, 3, 12, 4, 11], [3, 8, 0, 9, 4, 12]],
+        'edges': [[0, 6, 1, 7, 2, 8, 0], [3, 9, 4, 10, 5, 11, 3], [0, 12, 3], [1, 13, 4], [2, 14, 5]],
+        'facets': [[0, 6, 1, 7, 2, 8], [5, 10, 4, 9, 3, 11], [0, 8, 2, 14, 5, 11, 3, 12],
+                   [0, 12, 3, 9, 4, 13, 1, 6], [1, 13, 4, 10, 5, 14, 2, 7]],
         'tetras': [],
     },
     {
@@ -457,9 +464,9 @@ FC_ELEMENT_TYPES: List[FCElementType] = [
         'dim': 3,
         'order': 2,
         'nodes': 15,
-        'edges': [[0, 5, 1, 6, 2, 7, 3, 8, 0], [0, 9, 4], [1, 10, 4], [2, 11, 4], [3, 12, 4]],
-        'facets': [[3, 7, 2, 6, 1, 5, 0, 8],
-                   [0, 5, 1, 10, 4, 9], [1, 6, 2, 11, 4, 10], [2, 7, 3, 12, 4, 11], [3, 8, 0, 9, 4, 12]],
+        'edges': [[0, 6, 1, 7, 2, 8, 0], [3, 9, 4, 10, 5, 11, 3], [0, 12, 3], [1, 13, 4], [2, 14, 5]],
+        'facets': [[0, 6, 1, 7, 2, 8], [5, 10, 4, 9, 3, 11], [0, 8, 2, 14, 5, 11, 3, 12],
+                   [0, 12, 3, 9, 4, 13, 1, 6], [1, 13, 4, 10, 5, 14, 2, 7]],
         'tetras': [],
     },
     {
@@ -645,6 +652,281 @@ FC_ELEMENT_TYPES_KEYNAME: Dict[FCElementTypeLiteral, FCElementType] = {
 }
 
 
+FC_ELEMENT_SHAPES: Dict[FCElementTypeLiteral, FCShape] = {
+    element_type['name']: shape
+    for element_type in FC_ELEMENT_TYPES
+    for shape in [shape_for(element_type['dim'], element_type['nodes'])] if shape is not None
+}
+
+
+# Линейные типы и соответствующие им квадратичные (угловые узлы идут первыми)
+FC_QUADRATIC_TYPES: Dict[FCElementTypeLiteral, FCElementTypeLiteral] = {
+    'BEAM26': 'BEAM36', 'BEAM27': 'BEAM37', 'BAR2': 'BAR3', 'CABLE2': 'CABLE3',
+    'TRI3': 'TRI6', 'QUAD4': 'QUAD8', 'MITC3': 'MITC6', 'MITC4': 'MITC8',
+    'TETRA4': 'TETRA10', 'HEX8': 'HEX20', 'WEDGE6': 'WEDGE15', 'PYR5': 'PYR13',
+    'TETRA4S': 'TETRA10S', 'HEX8S': 'HEX20S', 'WEDGE6S': 'WEDGE15S', 'PYR5S': 'PYR13S',
+    'TRI3S': 'TRI6S', 'QUAD4S': 'QUAD8S', 'SHELL3S': 'SHELL6S', 'SHELL4S': 'SHELL8S',
+    'BEAM26S': 'BEAM36S', 'BEAM27S': 'BEAM37S',
+}
+
+
+# Типы, разбиваемые на симплексы, и типы симплексов
+FC_SIMPLEX_TYPES: Dict[FCElementTypeLiteral, FCElementTypeLiteral] = {
+    'QUAD4': 'TRI3', 'QUAD4S': 'TRI3S', 'MITC4': 'MITC3', 'SHELL4S': 'SHELL3S',
+    'HEX8': 'TETRA4', 'WEDGE6': 'TETRA4', 'PYR5': 'TETRA4',
+    'HEX8S': 'TETRA4S', 'WEDGE6S': 'TETRA4S', 'PYR5S': 'TETRA4S',
+}
+
+
+def _split_facet(nodes: NDArray[np.int32], facet: List[int]) -> NDArray[np.int64]:
+    """
+    Треугольники грани (N, t, 3) в локальных номерах узлов с сохранением
+    ориентации. Четырёхугольник делится диагональю из узла с наименьшим id,
+    поэтому у соседних элементов общая грань делится одинаково.
+    """
+    if len(facet) == 3:
+        return np.broadcast_to(np.array(facet, np.int64), (len(nodes), 1, 3))
+    a, b, c, d = facet
+    first = np.isin(np.argmin(nodes[:, facet], axis=1), (0, 2))[:, None, None]
+    return np.where(first, np.array([[a, b, c], [a, c, d]]), np.array([[b, c, d], [b, d, a]]))
+
+
+def midside_nodes(typename: FCElementTypeLiteral) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    Рёбра квадратичного типа по таблице `edges`: пары угловых узлов (E, 2)
+    и номера их срединных узлов (E,) — тройки подряд идущих узлов ломаных.
+    """
+    pairs: List[Tuple[int, int]] = []
+    mids: List[int] = []
+    for line in FC_ELEMENT_TYPES_KEYNAME[typename]['edges']:
+        for k in range(0, len(line) - 2, 2):
+            pairs.append((line[k], line[k + 2]))
+            mids.append(line[k + 1])
+    return np.array(pairs, np.int64).reshape(-1, 2), np.array(mids, np.int64)
+
+
+def node_order(typename: FCElementTypeLiteral, corners: List[int], edges: List[Tuple[int, int]]) -> List[int]:
+    """
+    Номера узлов элемента другого формата в порядке узлов типа fc:
+    `corners` — номера угловых узлов в порядке fc, `edges` — рёбра (пары
+    номеров угловых узлов формата) в порядке срединных узлов, которые
+    идут в формате сразу за угловыми.
+    """
+    if FC_ELEMENT_TYPES_KEYNAME[typename]['order'] != 2:
+        return list(corners)
+    pairs, mids = midside_nodes(typename)
+    foreign = {frozenset(edge): len(corners) + k for k, edge in enumerate(edges)}
+    order = list(corners) + [0] * len(mids)
+    for (a, b), mid in zip(pairs.tolist(), mids.tolist()):
+        order[mid] = foreign[frozenset((corners[a], corners[b]))]
+    return order
+
+
+class _RefineRule:
+    """
+    Правило равномерного деления линейного элемента.
+
+    Точки деления заданы множествами угловых узлов, средним которых они
+    являются: середины рёбер (2 узла), центры четырёхугольных граней (4)
+    и центр шестигранника (8). Локальная нумерация: углы, затем рёбра
+    `edges`, грани `faces` и центры `centers`.
+    """
+    corners: int
+    edges: NDArray[np.int64]                    # (E, 2)
+    faces: NDArray[np.int64]                    # (F, 4)
+    centers: NDArray[np.int64]                  # (C, 8)
+    children: List[NDArray[np.int64]]           # по видам потомков: (V, K, m)
+    face_map: NDArray[np.int64]                 # (V, R, 3): грань родителя, потомок, грань потомка
+
+    def __init__(self, linear: FCElementTypeLiteral, variants: List[List[List[FrozenSet[int]]]],
+                 child_types: List[FCElementTypeLiteral]):
+        self.corners = FC_ELEMENT_TYPES_KEYNAME[linear]['nodes']
+        points = sorted({p for variant in variants for child in variant for p in child if len(p) > 1},
+                        key=lambda p: (len(p), sorted(p)))
+        local = {frozenset([c]): c for c in range(self.corners)}
+        local.update({p: self.corners + i for i, p in enumerate(points)})
+        self.edges, self.faces, self.centers = [
+            np.array([sorted(p) for p in points if len(p) == m], np.int64).reshape(-1, m) for m in (2, 4, 8)]
+
+        facets = [frozenset(f) for f in FC_ELEMENT_TYPES_KEYNAME[linear]['facets']]
+        self.children = []
+        face_maps: List[List[Tuple[int, int, int]]] = [[] for _ in variants]
+        for kind, child_type in enumerate(child_types):
+            size = FC_ELEMENT_TYPES_KEYNAME[child_type]['nodes']
+            child_facets = FC_ELEMENT_TYPES_KEYNAME[child_type]['facets']
+            tables = []
+            for v, variant in enumerate(variants):
+                group = [child for child in variant if len(child) == size]
+                offset = sum(len([c for c in variant if len(c) == FC_ELEMENT_TYPES_KEYNAME[t]['nodes']])
+                             for t in child_types[:kind])
+                tables.append([[local[p] for p in child] for child in group])
+                for k, child in enumerate(group):
+                    for g, facet in enumerate(child_facets):
+                        inside = frozenset().union(*(child[i] for i in facet))
+                        for f, parent in enumerate(facets):
+                            if inside <= parent:
+                                face_maps[v].append((f, offset + k, g))
+            self.children.append(np.array(tables, np.int64))
+        self.face_map = np.array([sorted(rows) for rows in face_maps], np.int64).reshape(len(variants), -1, 3)
+
+
+def _tensor_children(linear: FCElementTypeLiteral) -> List[List[FrozenSet[int]]]:
+    """Деление отрезка, четырёхугольника, шестигранника на 2^dim подобных частей."""
+    element_type = FC_ELEMENT_TYPES_KEYNAME[linear]
+    shape = shape_for(element_type['dim'], element_type['nodes'])
+    assert shape is not None
+    bits = (shape.nodes > 0).astype(np.int64)                   # (c, dim): 0 — -1, 1 — +1
+
+    def point(grid: NDArray[np.int64]) -> FrozenSet[int]:
+        # Точка решётки 3^dim — среднее углов, совпадающих с ней по крайним координатам
+        return frozenset(c for c in range(len(bits)) if np.all((grid == 1) | (grid == 2 * bits[c])))
+
+    offsets = np.stack(np.meshgrid(*[[0, 1]] * shape.dim, indexing='ij'), -1).reshape(-1, shape.dim)
+    return [[point(offset + bits[c]) for c in range(len(bits))] for offset in offsets]
+
+
+def _oriented(tetra: List[FrozenSet[int]], coords: NDArray[np.float64]) -> List[FrozenSet[int]]:
+    """Тетраэдр с положительным объёмом (узлы 1 и 2 переставляются при необходимости)."""
+    a, b, c, d = [coords[sorted(p)].mean(axis=0) for p in tetra]
+    if np.linalg.det(np.array([b - a, c - a, d - a])) < 0:
+        return [tetra[0], tetra[2], tetra[1], tetra[3]]
+    return tetra
+
+
+def _tri_children() -> List[List[FrozenSet[int]]]:
+    e01, e12, e02 = frozenset([0, 1]), frozenset([1, 2]), frozenset([0, 2])
+    v0, v1, v2 = frozenset([0]), frozenset([1]), frozenset([2])
+    return [[v0, e01, e02], [e01, v1, e12], [e02, e12, v2], [e01, e12, e02]]
+
+
+def _tetra_variants() -> List[List[List[FrozenSet[int]]]]:
+    """Углы делятся подобно, октаэдр — по одной из трёх диагоналей (по вариантам)."""
+    def e(i: int, j: int) -> FrozenSet[int]:
+        return frozenset([i, j])
+
+    def v(i: int) -> FrozenSet[int]:
+        return frozenset([i])
+
+    coords = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    corners = [[v(0), e(0, 1), e(0, 2), e(0, 3)], [e(0, 1), v(1), e(1, 2), e(1, 3)],
+               [e(0, 2), e(1, 2), v(2), e(2, 3)], [e(0, 3), e(1, 3), e(2, 3), v(3)]]
+    variants = []
+    for a, b in [(e(0, 1), e(2, 3)), (e(0, 2), e(1, 3)), (e(0, 3), e(1, 2))]:
+        # Остальные 4 вершины октаэдра — цикл: соседние середины рёбер имеют общий угол
+        ring = [p for p in (e(0, 1), e(0, 2), e(0, 3), e(1, 2), e(1, 3), e(2, 3)) if p not in (a, b)]
+        cycle = [ring.pop(0)]
+        while ring:
+            cycle.append(next(p for p in ring if p & cycle[-1]))
+            ring.remove(cycle[-1])
+        octahedron = [_oriented([a, b, cycle[i], cycle[(i + 1) % 4]], coords) for i in range(4)]
+        variants.append(corners + octahedron)
+    return variants
+
+
+def _wedge_children() -> List[List[FrozenSet[int]]]:
+    """Треугольник делится на 4, высота — на 2."""
+    def lift(p: FrozenSet[int], level: int) -> FrozenSet[int]:
+        top = frozenset(c + 3 for c in p)
+        return p if level == 0 else top if level == 2 else p | top
+
+    return [[lift(p, level) for p in tri] + [lift(p, level + 1) for p in tri]
+            for level in (0, 1) for tri in _tri_children()]
+
+
+def _pyramid_children() -> List[List[FrozenSet[int]]]:
+    """6 пирамид (4 у углов основания, верхняя и перевёрнутая) и 4 тетраэдра между ними."""
+    def s(*nodes: int) -> FrozenSet[int]:
+        return frozenset(nodes)
+
+    coords = np.array([[-1.0, -1.0, 0.0], [1.0, -1.0, 0.0], [1.0, 1.0, 0.0], [-1.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    center = s(0, 1, 2, 3)
+    base = [s(i, (i + 1) % 4) for i in range(4)]                    # середины рёбер основания
+    side = [s(i, 4) for i in range(4)]                              # середины боковых рёбер
+    pyramids = [[s(i), base[i], center, base[i - 1], side[i]] for i in range(4)]
+    pyramids += [side + [s(4)], [side[0], side[3], side[2], side[1], center]]
+    tetras = [_oriented([base[i], center, side[i], side[(i + 1) % 4]], coords) for i in range(4)]
+    return pyramids + tetras
+
+
+# Правила деления по линейным типам (S-варианты делятся так же)
+_REFINE_RULES: Dict[FCElementTypeLiteral, _RefineRule] = {}
+
+
+def _refine_rule(typename: FCElementTypeLiteral) -> Optional[_RefineRule]:
+    element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+    if element_type['order'] != 1 or element_type['dim'] == 0 or typename.startswith('SPRING'):
+        return None
+    if typename in _REFINE_RULES:
+        return _REFINE_RULES[typename]
+    tetra: FCElementTypeLiteral = 'TETRA4S' if typename.endswith('S') else 'TETRA4'
+    family = (element_type['dim'], element_type['nodes'])
+    if family in ((1, 2), (2, 4), (3, 8)):
+        rule = _RefineRule(typename, [_tensor_children(typename)], [typename])
+    elif family == (2, 3):
+        rule = _RefineRule(typename, [_tri_children()], [typename])
+    elif family == (3, 4):
+        rule = _RefineRule(typename, _tetra_variants(), [typename])
+    elif family == (3, 6):
+        rule = _RefineRule(typename, [_wedge_children()], [typename])
+    elif family == (3, 5):
+        rule = _RefineRule(typename, [_pyramid_children()], [typename, tetra])
+    else:
+        return None
+    _REFINE_RULES[typename] = rule
+    return rule
+
+
+def lookup(keys: NDArray[np.generic], queries: NDArray[np.generic]) -> NDArray[np.int64]:
+    """
+    Позиции значений `queries` в массиве уникальных ключей `keys` (-1 для отсутствующих).
+    Для компактных диапазонов ключей используется прямая адресация.
+    """
+    key_values: NDArray[np.int64] = np.asarray(keys, dtype=np.int64)
+    query_values: NDArray[np.int64] = np.asarray(queries, dtype=np.int64)
+    result = np.full(query_values.shape, -1, np.int64)
+    if len(key_values) == 0 or query_values.size == 0:
+        return result
+
+    low = int(np.min(key_values))
+    high = int(np.max(key_values))
+    if high - low <= 4 * len(key_values) + 1024:
+        table = np.full(high - low + 1, -1, np.int64)
+        table[key_values - low] = np.arange(len(key_values))
+        inside = (query_values >= low) & (query_values <= high)
+        result[inside] = table[query_values[inside] - low]
+        return result
+
+    order = np.argsort(key_values, kind='stable')
+    pos = np.searchsorted(key_values, query_values, sorter=order)
+    pos[pos == len(key_values)] = 0
+    found = key_values[order[pos]] == query_values
+    result[found] = order[pos[found]]
+    return result
+
+
+class FCRefinement(TypedDict):
+    """Соответствие старых и новых элементов при делении сетки (`FCMesh.refine`, `FCMesh.to_simplices`)."""
+    parents: NDArray[np.int32]      # id родителя для каждого нового элемента
+    children: NDArray[np.int32]     # id новых элементов
+    faces: NDArray[np.int32]        # (K, 4): id родителя, грань родителя, id потомка, грань потомка
+    nodes: NDArray[np.int32]        # id новых узлов
+    sources: NDArray[np.int32]      # (M, 8): id углов, средним которых является новый узел (-1 — пусто)
+
+
+class FCElementArrays(TypedDict):
+    ids: NDArray[np.int32]
+    nodes: NDArray[np.int32]        # (N, k) id узлов
+    blocks: NDArray[np.int32]
+    parent_ids: NDArray[np.int32]
+    orders: NDArray[np.int32]
+
+
+class FCElementGeometry(TypedDict):
+    ids: NDArray[np.int32]
+    centroids: NDArray[np.float64]  # (N, 3) центры тяжести
+    measures: NDArray[np.float64]   # (N,) длина, площадь или объём — по размерности типа
+
+
 class FCSrcElement(TypedDict):
     id: int
     block: int
@@ -702,6 +984,42 @@ class FCSrcMesh(TypedDict):
     nodes_count: int
 
 
+def concatenate_element_arrays(parts: List[FCElementArrays]) -> FCElementArrays:
+    """Объединяет массивы элементов одного типа."""
+    return {
+        'ids': np.concatenate([part['ids'] for part in parts]),
+        'nodes': np.concatenate([part['nodes'] for part in parts]),
+        'blocks': np.concatenate([part['blocks'] for part in parts]),
+        'parent_ids': np.concatenate([part['parent_ids'] for part in parts]),
+        'orders': np.concatenate([part['orders'] for part in parts]),
+    }
+
+
+def _element_arrays(typename: FCElementTypeLiteral, elements: List[FCElement]) -> FCElementArrays:
+    count = len(elements)
+    size = FC_ELEMENT_TYPES_KEYNAME[typename]['nodes']
+    return {
+        'ids': np.fromiter((e.id for e in elements), np.int32, count),
+        'nodes': np.fromiter(chain.from_iterable(e.nodes for e in elements), np.int32, count * size)
+                   .reshape(count, size),
+        'blocks': np.fromiter((e.block for e in elements), np.int32, count),
+        'parent_ids': np.fromiter((e.parent_id for e in elements), np.int32, count),
+        'orders': np.fromiter((e.order for e in elements), np.int32, count),
+    }
+
+
+def _chunk_geometry(count: Optional[int], chunk: FCElementChunk) -> NDArray[np.float64]:
+    """Мера и центр тяжести элементов пачки: столбцы (мера, x, y, z)."""
+    coords = chunk['nodes_xyz'][chunk['positions']]
+    values = np.zeros((len(coords), 4))
+    shape = FC_ELEMENT_SHAPES.get(chunk['typename'])
+    if shape is None:
+        values[:, 1:] = coords.mean(axis=1)
+    else:
+        values[:, 0], values[:, 1:] = shape.geometry(coords, count)
+    return values
+
+
 class FCMesh:
     """
     Контейнер для хранения всех элементов модели, сгруппированных по типам.
@@ -719,6 +1037,9 @@ class FCMesh:
 
     elements: Dict[FCElementTypeLiteral, Dict[int, FCElement]]
 
+    _node_index: Optional[FCNodeIndex]
+    _node_index_source: Optional[NDArray[np.float64]]
+
 
     def __init__(self) -> None:
 
@@ -727,6 +1048,9 @@ class FCMesh:
 
         self.elements = {}
 
+        self._node_index = None
+        self._node_index_source = None
+
 
     def decode(self, src_mesh: FCSrcMesh) -> None:
 
@@ -880,6 +1204,553 @@ class FCMesh:
         self.elements[item.type][item.id] = item
 
 
+    @property
+    def node_index(self) -> FCNodeIndex:
+        """
+        Пространственный индекс узлов сетки (кэшируется).
+
+        Индекс перестраивается, если массив `nodes_xyz` был заменён.
+        При изменении координат на месте кэш нужно сбросить вручную:
+        `mesh.reset_node_index()`.
+        """
+        if self._node_index is None or self._node_index_source is not self.nodes_xyz:
+            self._node_index = FCNodeIndex(self.nodes_xyz)
+            self._node_index_source = self.nodes_xyz
+        return self._node_index
+
+
+    def reset_node_index(self) -> None:
+        self._node_index = None
+        self._node_index_source = None
+
+
+    def nearest_nodes(self, points: NDArray[np.float64], k: int = 1) -> NDArray[np.int32]:
+        """
+        Возвращает id ближайших узлов для каждой точки: массив (M,) при k=1,
+        иначе (M, k) с упорядочиванием по расстоянию.
+        """
+        index, _ = self.node_index.knearest(points, k)
+        ids: NDArray[np.int32] = self.nodes_ids[index]
+        return ids[:, 0] if k == 1 else ids
+
+
+    def nodes_in_radius(self, point: NDArray[np.float64], r: float) -> NDArray[np.int32]:
+        """Возвращает id узлов на расстоянии не больше `r` от точки."""
+        _, indices = self.node_index.radius(point, r)
+        ids: NDArray[np.int32] = self.nodes_ids[indices]
+        return ids
+
+
+    def node_positions(self, node_ids: NDArray[np.int32]) -> NDArray[np.int64]:
+        """Позиции узлов с заданными id в `nodes_ids`/`nodes_xyz` (-1 для отсутствующих)."""
+        return lookup(self.nodes_ids, node_ids)
+
+
+    def element_arrays(self, typename: FCElementTypeLiteral) -> FCElementArrays:
+        """Элементы одного типа в виде массивов, в порядке словаря `elements[typename]`."""
+        return _element_arrays(typename, list(self.elements.get(typename, {}).values()))
+
+
+    def iter_element_arrays(self, typename: FCElementTypeLiteral, chunk_size: int = 65536) -> Iterator[FCElementArrays]:
+        """Элементы одного типа пачками по `chunk_size` в порядке словаря `elements[typename]`."""
+        elements = iter(self.elements.get(typename, {}).values())
+        while True:
+            chunk = list(islice(elements, chunk_size))
+            if not chunk:
+                return
+            yield _element_arrays(typename, chunk)
+
+
+    def set_element_arrays(self, typename: FCElementTypeLiteral, arrays: FCElementArrays) -> None:
+        """Заменяет все элементы типа `typename` элементами, заданными массивами."""
+        ids = arrays['ids'].tolist()
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"{typename} element ids must be unique")
+
+        bucket: Dict[int, FCElement] = {}
+        for eid, nodes, block, parent_id, order in zip(
+            ids, arrays['nodes'].tolist(), arrays['blocks'].tolist(),
+            arrays['parent_ids'].tolist(), arrays['orders'].tolist()
+        ):
+            bucket[eid] = FCElement({
+                'id': eid,
+                'type': typename,
+                'nodes': nodes,
+                'parent_id': parent_id,
+                'block': block,
+                'order': order,
+            })
+
+        if bucket:
+            self.elements[typename] = bucket
+        else:
+            self.elements.pop(typename, None)
+
+
+    def element_locator(self, dim: Optional[int] = None) -> FCElementLocator:
+        """
+        Строит индекс для поиска элементов по точкам.
+
+        По умолчанию используются элементы наибольшей размерности: объёмные,
+        а при их отсутствии — плоские (в плоскости xy).
+        """
+        present = [tp for tp in self.elements if self.elements[tp] and tp in FC_ELEMENT_SHAPES]
+        if dim is None:
+            dims = [FC_ELEMENT_SHAPES[tp].dim for tp in present]
+            dim = max(dims) if dims else 3
+        if dim not in (2, 3):
+            raise ValueError(f"point location is supported for 2D and 3D elements, got dim={dim}")
+
+        groups = []
+        for typename in present:
+            shape = FC_ELEMENT_SHAPES[typename]
+            if shape.dim != dim:
+                continue
+            arrays = self.element_arrays(typename)
+            positions = self.node_positions(arrays['nodes'])
+            if np.any(positions < 0):
+                raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+            groups.append((shape, arrays['ids'], self.nodes_xyz[positions]))
+
+        return FCElementLocator(groups)
+
+
+    def locate(self, points: NDArray[np.float64], tol: float = 1e-6
+               ) -> Tuple[NDArray[np.int32], NDArray[np.float64]]:
+        """
+        Находит элементы, содержащие точки (M, 3).
+
+        Возвращает id элементов (-1 для точек вне сетки) и параметрические
+        координаты точек в опорных элементах (M, 3). Для повторных запросов
+        к неизменной сетке выгоднее один раз построить `element_locator()`.
+        """
+        return self.element_locator().locate(points, tol)
+
+
+    def element_geometry(self, typename: FCElementTypeLiteral, count: Optional[int] = None,
+                         chunk_size: int = 16384, workers: int = 1) -> FCElementGeometry:
+        """
+        Центры тяжести и меры элементов одного типа: длины балок и стержней,
+        площади плоских элементов и оболочек, объёмы объёмных элементов.
+        Считаются квадратурой Гаусса (`count` точек по направлению, по умолчанию
+        order + 1). Для точечных типов мера равна 0, центр — координаты узла.
+        При `workers` > 1 пачки считаются в пуле процессов (`parallel_map`).
+        """
+        ids = self.element_arrays(typename)['ids']
+        values = self.parallel_map(partial(_chunk_geometry, count), chunk_size, workers, [typename])
+        values = values.reshape(-1, 4)
+        return {'ids': ids, 'centroids': values[:, 1:], 'measures': values[:, 0]}
+
+
+    def parallel_map(self, func: FCChunkFunction, chunk_size: int = 16384, workers: Optional[int] = None,
+                     types: Optional[List[FCElementTypeLiteral]] = None) -> NDArray[Any]:
+        """Поэлементное вычисление пачками в пуле процессов с общей памятью (см. `fc_parallel.parallel_map`)."""
+        return parallel_map(self, func, chunk_size, workers, types)
+
+
+    def color_elements(self, balance: bool = True, seed: int = 0) -> FCColoring:
+        """Раскраска элементов без общих узлов внутри цвета (см. `fc_coloring.color_elements`)."""
+        return color_elements(self, balance, seed)
+
+
+    def connected_components(self) -> FCComponents:
+        """Связные по общим узлам части сетки с габаритами и числом элементов (см. `fc_components`)."""
+        return connected_components(self)
+
+
+    def find_faces(self, faces: NDArray[np.int32]) -> NDArray[np.int32]:
+        """
+        Ищет стороны объёмных элементов по угловым узлам: строка `faces` (M, k) —
+        id угловых узлов стороны в любом порядке. Возвращает (M, 2): id элемента
+        и номер стороны в таблице `facets` его типа; -1 для ненайденных сторон.
+        """
+        faces = np.asarray(faces).reshape(len(faces), -1)
+        size = faces.shape[1]
+        keys: List[NDArray[np.int32]] = [np.empty((0, size), np.int32)]
+        owners: List[NDArray[np.int32]] = [np.empty((0, 2), np.int32)]
+        for typename, bucket in self.elements.items():
+            element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+            if not bucket or element_type['dim'] != 3:
+                continue
+            mids = set(midside_nodes(typename)[1].tolist()) if element_type['order'] == 2 else set()
+            arrays = self.element_arrays(typename)
+            for f, facet in enumerate(element_type['facets']):
+                corners = [node for node in facet if node not in mids]
+                if len(corners) == size:
+                    keys.append(np.sort(arrays['nodes'][:, corners], axis=1))
+                    owners.append(np.stack([arrays['ids'], np.full(len(arrays['ids']), f, np.int32)], axis=1))
+
+        known = np.ascontiguousarray(np.concatenate(keys), np.int32)
+        queries = np.ascontiguousarray(np.sort(faces, axis=1), np.int32)
+        row = np.dtype((np.void, 4 * size))
+        _, inverse = np.unique(np.concatenate([known, queries]).view(row).ravel(), return_inverse=True)
+        inverse = inverse.ravel()
+        # Для внутренних сторон берётся первый из двух элементов
+        first = np.full(len(known) + len(queries), -1, np.int64)
+        first[inverse[:len(known)][::-1]] = np.arange(len(known))[::-1]
+        found = first[inverse[len(known):]]
+
+        owner = np.concatenate(owners)
+        result: NDArray[np.int32] = np.where(found[:, None] >= 0, owner[found], -1).astype(np.int32)
+        return result
+
+
+    def _append_elements(self, typename: FCElementTypeLiteral, arrays: FCElementArrays) -> None:
+        """Добавляет элементы к уже имеющимся элементам типа `typename`."""
+        if self.elements.get(typename):
+            present = self.element_arrays(typename)
+            arrays = concatenate_element_arrays([present, arrays])
+        self.set_element_arrays(typename, arrays)
+
+
+    def elevate_order(self) -> NDArray[np.int32]:
+        """
+        Переводит линейные элементы в квадратичные (TETRA4 -> TETRA10,
+        HEX8 -> HEX20, QUAD4 -> QUAD8, ... по `FC_QUADRATIC_TYPES`).
+
+        Рёбра нумеруются глобально, поэтому срединный узел общего ребра
+        один для всех соседних элементов; узлы рёбер уже имеющихся
+        квадратичных элементов используются повторно. Новые узлы — середины
+        рёбер — добавляются в конец `nodes_ids`/`nodes_xyz`, их id
+        продолжают наибольший id. Возвращает id новых узлов.
+        """
+        linear = [tp for tp in FC_QUADRATIC_TYPES if self.elements.get(tp)]
+        size = len(self.nodes_ids)
+        if not linear:
+            return np.array([], np.int32)
+
+        def edge_keys(typename: FCElementTypeLiteral, nodes: NDArray[np.int32], pairs: NDArray[np.int64]) -> NDArray[np.int64]:
+            positions = self.node_positions(nodes)
+            if np.any(positions < 0):
+                raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+            first, second = positions[:, pairs[:, 0]], positions[:, pairs[:, 1]]
+            keys: NDArray[np.int64] = np.minimum(first, second) * size + np.maximum(first, second)
+            return keys
+
+        # Рёбра имеющихся квадратичных элементов и их срединные узлы
+        known_keys: List[NDArray[np.int64]] = [np.array([], np.int64)]
+        known_mids: List[NDArray[np.int64]] = [np.array([], np.int64)]
+        for typename in dict.fromkeys(FC_QUADRATIC_TYPES.values()):
+            if not self.elements.get(typename):
+                continue
+            pairs, mids = midside_nodes(typename)
+            nodes = self.element_arrays(typename)['nodes']
+            known_keys.append(edge_keys(typename, nodes, pairs).ravel())
+            known_mids.append(self.node_positions(nodes[:, mids]).ravel())
+        known, first_known = np.unique(np.concatenate(known_keys), return_index=True)
+        known_positions = np.concatenate(known_mids)[first_known]
+
+        # Глобальная нумерация рёбер линейных элементов
+        arrays = {tp: self.element_arrays(tp) for tp in linear}
+        tables = {tp: midside_nodes(FC_QUADRATIC_TYPES[tp]) for tp in linear}
+        keys = [edge_keys(tp, arrays[tp]['nodes'], tables[tp][0]) for tp in linear]
+        edges, inverse = np.unique(np.concatenate([k.ravel() for k in keys]), return_inverse=True)
+
+        found = lookup(known, edges)
+        fresh = found < 0
+        count = int(np.count_nonzero(fresh))
+        targets = np.empty(len(edges), np.int64)
+        targets[~fresh] = known_positions[found[~fresh]]
+        targets[fresh] = size + np.arange(count)
+
+        xyz = self.nodes_xyz.reshape(-1, 3)
+        start = int(np.max(self.nodes_ids)) + 1 if size else 1
+        new_ids = np.arange(start, start + count, dtype=np.int32)
+        new_xyz = (xyz[edges[fresh] // size] + xyz[edges[fresh] % size]) / 2
+        self.nodes_ids = np.concatenate([self.nodes_ids, new_ids])
+        self.nodes_xyz = np.concatenate([xyz, new_xyz])
+
+        offset = 0
+        for typename, edge_key in zip(linear, keys):
+            quadratic = FC_QUADRATIC_TYPES[typename]
+            corners = arrays[typename]['nodes']
+            mids = tables[typename][1]
+            nodes = np.empty((len(corners), FC_ELEMENT_TYPES_KEYNAME[quadratic]['nodes']), np.int32)
+            nodes[:, :corners.shape[1]] = corners
+            nodes[:, mids] = self.nodes_ids[targets[inverse[offset:offset + edge_key.size]]].reshape(edge_key.shape)
+            offset += edge_key.size
+
+            arrays[typename]['nodes'] = nodes
+            self.elements.pop(typename)
+            self._append_elements(quadratic, arrays[typename])
+        return new_ids
+
+
+    def reduce_order(self) -> NDArray[np.int32]:
+        """
+        Переводит квадратичные элементы в линейные (обратно к `elevate_order`):
+        у элементов остаются угловые узлы, срединные узлы, на которые больше
+        не ссылается ни один элемент, удаляются из сетки. Возвращает id
+        удалённых узлов; ссылки на них в наборах и условиях не меняются.
+        """
+        linear_types = {quadratic: linear for linear, quadratic in FC_QUADRATIC_TYPES.items()}
+        quadratic = [tp for tp in linear_types if self.elements.get(tp)]
+        candidates: List[NDArray[np.int32]] = [np.array([], np.int32)]
+        for typename in quadratic:
+            linear = linear_types[typename]
+            arrays = self.element_arrays(typename)
+            corners = FC_ELEMENT_TYPES_KEYNAME[linear]['nodes']
+            candidates.append(arrays['nodes'][:, corners:].ravel())
+            arrays['nodes'] = np.ascontiguousarray(arrays['nodes'][:, :corners])
+            self.elements.pop(typename)
+            self._append_elements(linear, arrays)
+
+        used = np.zeros(len(self.nodes_ids), np.bool_)
+        for typename in self.elements:
+            positions = self.node_positions(self.element_arrays(typename)['nodes'])
+            if np.any(positions < 0):
+                raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+            used[positions.ravel()] = True
+        dropped = np.zeros(len(self.nodes_ids), np.bool_)
+        dropped[self.node_positions(np.concatenate(candidates))] = True
+        dropped &= ~used
+
+        removed: NDArray[np.int32] = self.nodes_ids[dropped]
+        self.nodes_ids = self.nodes_ids[~dropped]
+        self.nodes_xyz = self.nodes_xyz.reshape(-1, 3)[~dropped]
+        return removed
+
+
+    def refine(self, levels: int = 1) -> List[FCRefinement]:
+        """
+        Равномерное деление линейных элементов `levels` раз: отрезок на 2,
+        треугольник и четырёхугольник на 4, тетраэдр, шестигранник и клин
+        на 8, пирамида на 6 пирамид и 4 тетраэдра. Тетраэдр делится по
+        кратчайшей диагонали внутреннего октаэдра.
+
+        Узлы на серединах рёбер и в центрах четырёхугольных граней общие для
+        соседних элементов (глобальная нумерация рёбер и граней), новые
+        узлы и элементы получают id после наибольших. Потомки наследуют блок,
+        parent_id и order родителя. Точечные элементы и пружины не меняются,
+        квадратичные элементы не поддерживаются (см. `reduce_order`).
+        Возвращает описания уровней для перевода наборов (`fc_addons.refine`).
+        """
+        if levels < 0:
+            raise ValueError(f"levels must be non-negative, got {levels}")
+        return [self._refine_level() for _ in range(levels)]
+
+
+    def to_simplices(self) -> FCRefinement:
+        """
+        Разбивает четырёхугольники на треугольники, шестигранники, клинья
+        и пирамиды — на тетраэдры (`FC_SIMPLEX_TYPES`).
+
+        Четырёхугольные грани делятся диагональю из узла с наименьшим id,
+        объёмный элемент — конусом из своего узла с наименьшим id на
+        треугольники остальных граней, поэтому разбиения соседних элементов
+        согласованы. Новые элементы получают id после наибольших и наследуют
+        блок, parent_id и order; остальные типы не меняются, квадратичные
+        элементы не поддерживаются (см. `reduce_order`).
+        """
+        convert = [tp for tp in self.elements if self.elements[tp] and tp in FC_SIMPLEX_TYPES]
+        for typename in self.elements:
+            element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+            if self.elements[typename] and element_type['dim'] >= 2 and element_type['order'] != 1:
+                raise ValueError(f"to_simplices supports linear elements only, got {typename}")
+
+        next_id = 1 + max((max(bucket) for bucket in self.elements.values() if bucket), default=0)
+        parents: List[NDArray[np.int32]] = [np.array([], np.int32)]
+        children: List[NDArray[np.int32]] = [np.array([], np.int32)]
+        face_rows: List[NDArray[np.int32]] = [np.empty((0, 4), np.int32)]
+        created: Dict[FCElementTypeLiteral, List[FCElementArrays]] = {}
+        for typename in convert:
+            element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+            simplex = FC_SIMPLEX_TYPES[typename]
+            arrays = self.element_arrays(typename)
+            nodes = arrays['nodes']
+            count, corners = nodes.shape
+            facets = element_type['facets']
+
+            if element_type['dim'] == 2:
+                local = _split_facet(nodes, facets[0])                  # (N, 2, 3)
+            else:
+                # Конус из узла с наименьшим id на грани, которые его не содержат
+                apex = np.argmin(nodes, axis=1)
+                parts = []
+                for k in range(corners):
+                    rows = np.nonzero(apex == k)[0]
+                    triangles = np.concatenate([_split_facet(nodes[rows], f) for f in facets if k not in f], axis=1)
+                    tetras = np.empty(triangles.shape[:2] + (4,), np.int64)
+                    tetras[:, :, :3] = triangles[:, :, [0, 2, 1]]
+                    tetras[:, :, 3] = k
+                    parts.append((rows, tetras))
+                local = np.empty((count,) + parts[0][1].shape[1:], np.int64)
+                for rows, tetras in parts:
+                    local[rows] = tetras
+            per_parent = local.shape[1]
+            ids = (next_id + np.arange(count * per_parent, dtype=np.int64)).reshape(count, per_parent)
+            next_id += count * per_parent
+
+            created.setdefault(simplex, []).append({
+                'ids': ids.ravel().astype(np.int32),
+                'nodes': nodes[np.arange(count)[:, None, None], local].reshape(count * per_parent, -1),
+                'blocks': np.repeat(arrays['blocks'], per_parent),
+                'parent_ids': np.repeat(arrays['parent_ids'], per_parent),
+                'orders': np.repeat(arrays['orders'], per_parent),
+            })
+            parents.append(np.repeat(arrays['ids'], per_parent))
+            children.append(ids.ravel().astype(np.int32))
+
+            # Стороны: треугольники граней родителя ищутся среди граней потомков
+            def codes(triangles: NDArray[np.int64]) -> NDArray[np.int64]:
+                ordered = np.sort(triangles, axis=-1)
+                rows = np.arange(count).reshape((count,) + (1,) * (ordered.ndim - 2))
+                result: NDArray[np.int64] = (rows * 32 + ordered[..., 0]) * 1024 + ordered[..., 1] * 32 + ordered[..., 2]
+                return result
+
+            simplex_facets = np.array(FC_ELEMENT_TYPES_KEYNAME[simplex]['facets'], np.int64)
+            child_faces = codes(local[:, :, simplex_facets]).ravel()          # (N * K * G,)
+            known, first = np.unique(child_faces, return_index=True)
+            for f, facet in enumerate(facets):
+                found = first[lookup(known, codes(_split_facet(nodes, facet)).ravel())]
+                child, face = np.divmod(found % (per_parent * len(simplex_facets)), len(simplex_facets))
+                owner = found // (per_parent * len(simplex_facets))
+                face_rows.append(np.stack([arrays['ids'][owner], np.full(len(found), f),
+                                           ids[owner, child], face], 1).astype(np.int32))
+
+        for typename in convert:
+            self.elements.pop(typename)
+        for typename, parts_ in created.items():
+            self._append_elements(typename, concatenate_element_arrays(parts_))
+        return {
+            'parents': np.concatenate(parents),
+            'children': np.concatenate(children),
+            'faces': np.concatenate(face_rows),
+            'nodes': np.array([], np.int32),
+            'sources': np.empty((0, 8), np.int32),
+        }
+
+
+    def _refine_level(self) -> FCRefinement:
+        rules: Dict[FCElementTypeLiteral, _RefineRule] = {}
+        for typename in self.elements:
+            rule = _refine_rule(typename)
+            if rule is not None:
+                rules[typename] = rule
+            elif self.elements[typename] and FC_ELEMENT_TYPES_KEYNAME[typename]['dim'] > 0 \
+                    and not typename.startswith('SPRING'):
+                raise ValueError(f"refine supports linear elements only, got {typename}")
+
+        size = len(self.nodes_ids)
+        xyz = self.nodes_xyz.reshape(-1, 3)
+        arrays = {tp: self.element_arrays(tp) for tp in rules}
+        positions: Dict[FCElementTypeLiteral, NDArray[np.int64]] = {}
+        for typename in rules:
+            positions[typename] = self.node_positions(arrays[typename]['nodes'])
+            if np.any(positions[typename] < 0):
+                raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+
+        # Глобальная нумерация рёбер (ключ — пара позиций) и граней (две пары)
+        edge_nodes = [np.sort(positions[tp][:, rule.edges], axis=2).reshape(-1, 2) for tp, rule in rules.items()]
+        face_nodes = [np.sort(positions[tp][:, rule.faces], axis=2).reshape(-1, 4) for tp, rule in rules.items()]
+        center_nodes = [positions[tp][:, rule.centers].reshape(-1, 8) for tp, rule in rules.items()]
+        edges = np.concatenate(edge_nodes + [np.empty((0, 2), np.int64)])
+        faces = np.concatenate(face_nodes + [np.empty((0, 4), np.int64)])
+        centers = np.concatenate(center_nodes + [np.empty((0, 8), np.int64)])
+
+        _, edge_first, edge_inverse = np.unique(edges[:, 0] * size + edges[:, 1],
+                                                return_index=True, return_inverse=True)
+        face_keys = np.stack([faces[:, 0] * size + faces[:, 1], faces[:, 2] * size + faces[:, 3]], 1)
+        order = np.lexsort((face_keys[:, 1], face_keys[:, 0]))
+        starts = np.ones(len(order), np.bool_)
+        starts[1:] = np.any(face_keys[order[1:]] != face_keys[order[:-1]], axis=1)
+        face_inverse = np.empty(len(order), np.int64)
+        face_inverse[order] = np.cumsum(starts) - 1
+        face_first = order[starts]
+
+        # Новые узлы: середины рёбер, центры граней, центры ячеек — одним выделением памяти
+        counts = [len(edge_first), len(face_first), len(centers)]
+        total = sum(counts)
+        sources = np.full((total, 8), -1, np.int64)
+        sources[:counts[0], :2] = edges[edge_first]
+        sources[counts[0]:counts[0] + counts[1], :4] = faces[face_first]
+        sources[counts[0] + counts[1]:] = centers
+        width = np.array([2] * counts[0] + [4] * counts[1] + [8] * counts[2], np.float64)
+        new_xyz = np.zeros((total, 3))
+        for k in range(8):
+            present = sources[:, k] >= 0
+            new_xyz[present] += xyz[sources[present, k]]
+        new_xyz /= width[:, None] if total else 1.0
+
+        start = int(np.max(self.nodes_ids)) + 1 if size else 1
+        new_ids = np.arange(start, start + total, dtype=np.int32)
+        self.nodes_ids = np.concatenate([self.nodes_ids, new_ids])
+        self.nodes_xyz = np.concatenate([xyz, new_xyz])
+        source_ids = np.where(sources >= 0, self.nodes_ids[np.maximum(sources, 0)], -1).astype(np.int32)
+
+        # Потомки: номера после наибольшего id элемента
+        next_id = 1 + max((max(bucket) for bucket in self.elements.values() if bucket), default=0)
+        parents: List[NDArray[np.int32]] = [np.array([], np.int32)]
+        children: List[NDArray[np.int32]] = [np.array([], np.int32)]
+        face_rows: List[NDArray[np.int32]] = [np.empty((0, 4), np.int32)]
+        created: Dict[FCElementTypeLiteral, List[FCElementArrays]] = {}
+        edge_offset = face_offset = center_offset = 0
+        for typename, rule in rules.items():
+            parent = arrays[typename]
+            count = len(parent['ids'])
+            local = np.empty((count, rule.corners + len(rule.edges) + len(rule.faces) + len(rule.centers)), np.int32)
+            local[:, :rule.corners] = parent['nodes']
+            column = rule.corners
+            for block, inverse, offset, base in (
+                    (rule.edges, edge_inverse, edge_offset, 0),
+                    (rule.faces, face_inverse, face_offset, counts[0]),
+                    (rule.centers, np.arange(counts[2]), center_offset, counts[0] + counts[1])):
+                width_k = len(block)
+                local[:, column:column + width_k] = \
+                    new_ids[base + inverse[offset:offset + count * width_k]].reshape(count, width_k)
+                column += width_k
+            edge_offset += count * len(rule.edges)
+            face_offset += count * len(rule.faces)
+            center_offset += count * len(rule.centers)
+
+            # Вариант деления: для тетраэдра — кратчайшая диагональ октаэдра
+            variant = np.zeros(count, np.int64)
+            if len(rule.children[0]) > 1:
+                mids = (xyz[positions[typename][:, rule.edges[:, 0]]] + xyz[positions[typename][:, rule.edges[:, 1]]]) / 2
+                lengths = [np.sum((mids[:, a] - mids[:, b])**2, axis=1) for a, b in ((0, 5), (1, 4), (2, 3))]
+                variant = np.argmin(np.stack(lengths, 1), axis=1)
+
+            per_parent = sum(table.shape[1] for table in rule.children)
+            ids = (next_id + np.arange(count * per_parent, dtype=np.int64)).reshape(count, per_parent)
+            rows = np.arange(count)[:, None, None]
+            offset = 0
+            for kind, table in enumerate(rule.children):
+                child_type = typename if kind == 0 else ('TETRA4S' if typename.endswith('S') else 'TETRA4')
+                k = table.shape[1]
+                nodes = local[rows, table[variant]].reshape(count * k, -1)
+                created.setdefault(child_type, []).append({
+                    'ids': ids[:, offset:offset + k].ravel().astype(np.int32),
+                    'nodes': nodes,
+                    'blocks': np.repeat(parent['blocks'], k),
+                    'parent_ids': np.repeat(parent['parent_ids'], k),
+                    'orders': np.repeat(parent['orders'], k),
+                })
+                offset += k
+            parents.append(np.repeat(parent['ids'], per_parent))
+            children.append(ids.ravel().astype(np.int32))
+
+            face_map = rule.face_map[variant]                           # (N, R, 3)
+            if face_map.shape[1]:
+                face_rows.append(np.stack([
+                    np.repeat(parent['ids'], face_map.shape[1]),
+                    face_map[:, :, 0].ravel(),
+                    np.take_along_axis(ids, face_map[:, :, 1], axis=1).ravel(),
+                    face_map[:, :, 2].ravel()], 1).astype(np.int32))
+            next_id += count * per_parent
+
+        for typename in rules:
+            self.elements.pop(typename)
+        for typename, parts in created.items():
+            self._append_elements(typename, concatenate_element_arrays(parts))
+        return {
+            'parents': np.concatenate(parents),
+            'children': np.concatenate(children),
+            'faces': np.concatenate(face_rows),
+            'nodes': new_ids,
+            'sources': source_ids,
+        }
+
+
     @property
     def nodes_list(self) -> List[int]:
         return [node for elem in self for node in elem.nodes]
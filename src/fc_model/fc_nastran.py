@@ -0,0 +1,293 @@
+import re
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import populate
+from .fc_materials import FCMaterial
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, FCElementArrays, FCElementTypeLiteral, \
+    concatenate_element_arrays, node_order
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+# Рёбра квадратичных элементов Nastran в порядке их срединных узлов
+_TRI = [(0, 1), (1, 2), (2, 0)]
+_QUAD = [(0, 1), (1, 2), (2, 3), (3, 0)]
+_TETRA = [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)]
+_HEX = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (1, 5), (2, 6), (3, 7), (4, 5), (5, 6), (6, 7), (7, 4)]
+_PENTA = [(0, 1), (1, 2), (2, 0), (0, 3), (1, 4), (2, 5), (3, 4), (4, 5), (5, 3)]
+_PYRAM = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (1, 4), (2, 4), (3, 4)]
+
+# Основание призмы Nastran обходится в обратную сторону
+_PENTA_CORNERS = [0, 2, 1, 3, 5, 4]
+
+_NastranType = Tuple[FCElementTypeLiteral, List[int]]
+
+
+def _entry(typename: FCElementTypeLiteral, corners: List[int], edges: List[Tuple[int, int]]) -> _NastranType:
+    return typename, node_order(typename, corners, edges)
+
+
+# Карта элемента Nastran -> (число узлов -> тип fc и номера узлов Nastran в порядке fc).
+# Узлы идут в полях карты сразу за EID и PID.
+NASTRAN_ELEMENT_TYPES: Dict[str, Dict[int, _NastranType]] = {
+    'CTETRA': {4: _entry('TETRA4', [0, 1, 2, 3], []), 10: _entry('TETRA10', [0, 1, 2, 3], _TETRA)},
+    'CHEXA': {8: _entry('HEX8', list(range(8)), []), 20: _entry('HEX20', list(range(8)), _HEX)},
+    'CPENTA': {6: _entry('WEDGE6', _PENTA_CORNERS, []), 15: _entry('WEDGE15', _PENTA_CORNERS, _PENTA)},
+    'CPYRAM': {5: _entry('PYR5', list(range(5)), []), 13: _entry('PYR13', list(range(5)), _PYRAM)},
+    'CTRIA3': {3: _entry('MITC3', [0, 1, 2], [])},
+    'CTRIA6': {6: _entry('MITC6', [0, 1, 2], _TRI)},
+    'CQUAD4': {4: _entry('MITC4', [0, 1, 2, 3], [])},
+    'CQUAD8': {8: _entry('MITC8', [0, 1, 2, 3], _QUAD)},
+    'CROD': {2: ('BAR2', [0, 1])},
+    'CBAR': {2: ('BEAM26', [0, 1])},
+    'CBEAM': {2: ('BEAM26', [0, 1])},
+}
+
+# Наибольшее число узлов в полях карты элемента (остальные поля — ориентация, толщины и т. п.)
+_NODE_FIELDS = {name: max(sizes) for name, sizes in NASTRAN_ELEMENT_TYPES.items()}
+
+# Тип fc -> карта для записи (балки CBAR требуют вектора ориентации и не пишутся)
+_FC_NASTRAN_TYPES: Dict[FCElementTypeLiteral, str] = {
+    typename: name for name, sizes in NASTRAN_ELEMENT_TYPES.items() if name not in ('CBAR', 'CBEAM')
+    for typename, _ in sizes.values()
+}
+
+_PROPERTIES = ('PSOLID', 'PSHELL', 'PROD', 'PBAR', 'PBEAM')
+
+# Неявная экспонента: 1.0-3 == 1.0e-3
+_EXPONENT = re.compile(r'(?<=[0-9.])([+-])')
+
+
+def _real(field: str) -> float:
+    try:
+        return float(field)
+    except ValueError:
+        return float(_EXPONENT.sub(r'e\1', field.upper().replace('D', 'E'))) if field else 0.0
+
+
+def _int(field: str) -> int:
+    return int(field) if field else 0
+
+
+def _fields(line: str) -> Tuple[str, List[str]]:
+    """Имя (или метка продолжения) и поля данных одной строки: свободный, короткий или длинный формат."""
+    if '\t' in line:
+        line = line.expandtabs(8)
+    if ',' in line:
+        parts = line.split(',')
+        data = [part.strip() for part in parts[1:9]]
+        return parts[0].strip(), data + [''] * (8 - len(data))
+    name = line[:8].strip()
+    if name.endswith('*') or name.startswith('*'):
+        return name, [line[8 + 16 * i:24 + 16 * i].strip() for i in range(4)]
+    return name, [line[8 + 8 * i:16 + 8 * i].strip() for i in range(8)]
+
+
+def _cards(stream: TextIO) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Карты раздела Bulk Data: имя и поля данных со всеми продолжениями.
+    Если в файле нет BEGIN BULK, раздел начинается с первой известной карты.
+    """
+    known = set(NASTRAN_ELEMENT_TYPES) | set(_PROPERTIES) | {'GRID', 'MAT1', 'SET1', 'INCLUDE'}
+    bulk = False
+    name, fields = '', []
+    for line in stream:
+        line = line.split('$', 1)[0].rstrip()
+        if not line:
+            continue
+        if not bulk:
+            upper = line.upper()
+            if upper.startswith('BEGIN'):
+                bulk = True
+                continue
+            if re.split(r'[\s,*]', upper, 1)[0] not in known:
+                continue
+            bulk = True
+        head, data = _fields(line)
+        if not head or head[0] in '+*':
+            fields.extend(data)
+            continue
+        if name:
+            yield name, fields
+        name, fields = head.rstrip('*').upper(), data
+        if name == 'ENDDATA':
+            return
+        if name == 'INCLUDE':
+            raise ValueError("Nastran INCLUDE is not supported")
+    if name:
+        yield name, fields
+
+
+def read_bdf(model: 'FCModel', path: str, chunk_size: int = 65536) -> None:
+    """
+    Читает входной файл Nastran (.bdf, .nas, .dat) в пустую модель.
+
+    Файл читается построчно, карты поддерживаются в свободном, коротком
+    и длинном формате с продолжениями и неявной экспонентой (1.0-3).
+    Узлы и элементы копятся пачками по `chunk_size` карт. Элементы —
+    `NASTRAN_ELEMENT_TYPES`, блок и parent_id — PID; материал блока берётся
+    из PSOLID, PSHELL, PROD, PBAR, PBEAM, материалы — из MAT1 (E, NU, RHO, A).
+    SET1 становится набором узлов с тем же id. Узлы в локальных системах
+    координат (поле CP) не поддерживаются; прочие карты пропускаются.
+    """
+    nodes_ids: List[NDArray[np.int64]] = []
+    nodes_xyz: List[NDArray[np.float64]] = []
+    grids: List[List[str]] = []
+    parts: Dict[FCElementTypeLiteral, List[FCElementArrays]] = {}
+    rows: Dict[Tuple[str, int], List[List[int]]] = {}
+    block_materials: Dict[int, int] = {}
+    nodesets: Dict[int, List[int]] = {}
+
+    def flush_grids() -> None:
+        if grids:
+            nodes_ids.append(np.array([_int(card[0]) for card in grids], np.int64))
+            nodes_xyz.append(np.array([[_real(v) for v in card[2:5]] for card in grids], np.float64))
+            grids.clear()
+
+    def flush_elements(key: Tuple[str, int]) -> None:
+        typename, order = NASTRAN_ELEMENT_TYPES[key[0]][key[1]]
+        table = np.array(rows.pop(key), np.int64)
+        count = len(table)
+        parts.setdefault(typename, []).append({
+            'ids': table[:, 0].astype(np.int32),
+            'nodes': table[:, 2:][:, order].astype(np.int32),
+            'blocks': table[:, 1].astype(np.int32),
+            'parent_ids': table[:, 1].astype(np.int32),
+            'orders': np.ones(count, np.int32),
+        })
+
+    with open(path, 'r', encoding='latin-1') as stream:
+        for name, fields in _cards(stream):
+            if name == 'GRID':
+                if _int(fields[1]):
+                    raise ValueError(f"GRID {fields[0]}: local coordinate systems are not supported")
+                grids.append(fields)
+                if len(grids) >= chunk_size:
+                    flush_grids()
+            elif name in NASTRAN_ELEMENT_TYPES:
+                nodes = fields[2:2 + _NODE_FIELDS[name]]
+                while nodes and not nodes[-1]:
+                    nodes.pop()
+                if len(nodes) not in NASTRAN_ELEMENT_TYPES[name]:
+                    raise ValueError(f"{name} {fields[0]}: {len(nodes)} nodes are not supported")
+                key = (name, len(nodes))
+                rows.setdefault(key, []).append([_int(fields[0]), _int(fields[1])] + [int(v) for v in nodes])
+                if len(rows[key]) >= chunk_size:
+                    flush_elements(key)
+            elif name in _PROPERTIES:
+                block_materials[_int(fields[0])] = _int(fields[1])
+            elif name == 'MAT1':
+                _material(model, fields)
+            elif name == 'SET1':
+                members = nodesets.setdefault(_int(fields[0]), [])
+                values = [v for v in fields[1:] if v]
+                for k, value in enumerate(values):
+                    if value.upper() == 'THRU':
+                        continue
+                    if k > 0 and values[k - 1].upper() == 'THRU':
+                        members.extend(range(members[-1] + 1, int(value) + 1))
+                    else:
+                        members.append(int(value))
+
+    flush_grids()
+    for key in list(rows):
+        flush_elements(key)
+    elements = {typename: concatenate_element_arrays(chunks) for typename, chunks in parts.items()}
+    populate(model,
+             np.concatenate([np.array([], np.int64)] + nodes_ids).astype(np.int32),
+             np.concatenate([np.empty((0, 3))] + nodes_xyz),
+             elements,
+             {set_id: ('', np.unique(np.array(members, np.int32))) for set_id, members in nodesets.items()})
+    for block_id, material_id in block_materials.items():
+        if block_id in model.blocks:
+            model.blocks[block_id].material_id = material_id
+
+
+def _material(model: 'FCModel', fields: List[str]) -> None:
+    """MAT1: MID, E, G, NU, RHO, A; NU при пустом поле выводится из E и G."""
+    material_id = _int(fields[0])
+    young, shear, poisson, density, expansion = (_real(v) if v else None for v in fields[1:6])
+    if poisson is None and young is not None and shear:
+        poisson = young / (2 * shear) - 1
+    material = FCMaterial({'id': material_id, 'name': f'MAT1 {material_id}'})
+    if young is not None:
+        material.set_constant('elasticity', 'HOOK', 'YOUNG_MODULE', young)
+    if poisson is not None:
+        material.set_constant('elasticity', 'HOOK', 'POISSON_RATIO', poisson)
+    if density is not None:
+        material.set_constant('common', 'USUAL', 'DENSITY', density)
+    if expansion is not None:
+        material.set_constant('thermal', 'ISOTROPIC', 'COEF_LIN_EXPANSION', expansion)
+    model.materials[material_id] = material
+
+
+def _card_format(name: str, size: int) -> str:
+    """Формат карты короткого формата: имя и `size` целых полей, по 8 полей в строке."""
+    fields = ['%8d'] * size
+    lines = [''.join(fields[i:i + 8]) for i in range(0, size, 8)]
+    return f'{name:<8}' + '\n+       '.join(lines)
+
+
+def _field(value: Optional[float]) -> str:
+    """Вещественное поле длинного формата (16 символов)."""
+    return '' if value is None else f'{value:16.9e}'
+
+
+def write_bdf(model: 'FCModel', path: str, chunk_size: int = 65536) -> None:
+    """
+    Записывает сетку модели в файл Nastran Bulk Data (.bdf).
+
+    Узлы пишутся картами GRID длинного формата, элементы — короткого, пачками
+    по `chunk_size`; PID элемента — id блока. Блокам объёмных элементов
+    пишется PSOLID, материалам — MAT1 (E, NU, RHO, A), непустым наборам
+    узлов — SET1. Наборы сторон не пишутся; типы без соответствия
+    в Nastran (в том числе балки CBAR) вызывают ValueError.
+    """
+    mesh = model.mesh
+    types = [tp for tp in mesh.elements if mesh.elements[tp]]
+    for typename in types:
+        if typename not in _FC_NASTRAN_TYPES:
+            raise ValueError(f"Element type {typename} has no Nastran counterpart")
+
+    with open(path, 'w') as stream:
+        stream.write('BEGIN BULK\n')
+        xyz = mesh.nodes_xyz.reshape(-1, 3)
+        for start in range(0, len(xyz), chunk_size):
+            rows = np.column_stack([mesh.nodes_ids[start:start + chunk_size], xyz[start:start + chunk_size]])
+            np.savetxt(stream, rows, fmt='GRID*   %16d                %16.9e%16.9e\n*       %16.9e')
+
+        solid_blocks = set()
+        for typename in types:
+            name = _FC_NASTRAN_TYPES[typename]
+            size = FC_ELEMENT_TYPES_KEYNAME[typename]['nodes']
+            inverse = np.argsort(NASTRAN_ELEMENT_TYPES[name][size][1])
+            card_format = _card_format(name, size + 2)
+            for arrays in mesh.iter_element_arrays(typename, chunk_size):
+                np.savetxt(stream, np.column_stack([arrays['ids'], arrays['blocks'], arrays['nodes'][:, inverse]]),
+                           fmt=card_format)
+                if FC_ELEMENT_TYPES_KEYNAME[typename]['dim'] == 3:
+                    solid_blocks.update(np.unique(arrays['blocks']).tolist())
+
+        for block_id, block in model.blocks.items():
+            if block_id in solid_blocks:
+                material = f'{block.material_id:8d}' if block.material_id in model.materials else ''
+                stream.write(f'PSOLID  {block_id:8d}{material}\n')
+
+        for material_id, fc_material in model.materials.items():
+            values = [fc_material.constant('elasticity', 'YOUNG_MODULE'), None,
+                      fc_material.constant('elasticity', 'POISSON_RATIO'),
+                      fc_material.constant('common', 'DENSITY'),
+                      fc_material.constant('thermal', 'COEF_LIN_EXPANSION')]
+            stream.write(f'MAT1*   {material_id:16d}{"".join(_field(v).rjust(16) for v in values[:3])}\n'
+                         f'*       {"".join(_field(v).rjust(16) for v in values[3:])}\n')
+
+        for set_id, fc_set in model.nodesets.items():
+            ids = np.asarray(fc_set.apply.data, np.int64).ravel()
+            if not len(ids):
+                continue
+            stream.write(_card_format('SET1', len(ids) + 1) % (set_id, *ids.tolist()) + '\n')
+        stream.write('ENDDATA\n')
@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .fc_mesh import FCElementTypeLiteral, FCMesh
+
+
+class FCElementChunk(TypedDict):
+    """
+    Пачка элементов одного типа, передаваемая функции `parallel_map`.
+    Массивы доступны только для чтения; в процессах пула это представления
+    общей памяти.
+    """
+    typename: 'FCElementTypeLiteral'
+    ids: NDArray[np.int32]
+    blocks: NDArray[np.int32]
+    nodes: NDArray[np.int32]        # (N, k) id узлов
+    positions: NDArray[np.int64]    # (N, k) позиции узлов в nodes_xyz
+    nodes_xyz: NDArray[np.float64]  # (M, 3) координаты всех узлов сетки
+
+
+# Функция пачки: массив с первой осью по элементам пачки
+FCChunkFunction = Callable[[FCElementChunk], NDArray[Any]]
+
+# Описание массива в общей памяти: (ключ, имя сегмента, форма, dtype)
+_Descriptor = Tuple[str, str, Tuple[int, ...], str]
+
+# Массивы сетки, подключённые процессом пула (ключ -> представление)
+_ATTACHED: Dict[str, NDArray[Any]] = {}
+_SEGMENTS: List[SharedMemory] = []
+
+
+def _attach(descriptors: List[_Descriptor]) -> None:
+    """Инициализатор процесса пула: подключение сегментов общей памяти без копирования."""
+    _ATTACHED.clear()
+    _SEGMENTS.clear()
+    for key, name, shape, dtype in descriptors:
+        segment = SharedMemory(name=name)
+        _SEGMENTS.append(segment)
+        view: NDArray[Any] = np.ndarray(shape, np.dtype(dtype), segment.buf)
+        view.flags.writeable = False
+        _ATTACHED[key] = view
+
+
+def _chunk(arrays: Dict[str, NDArray[Any]], typename: 'FCElementTypeLiteral', start: int, stop: int) -> FCElementChunk:
+    return {
+        'typename': typename,
+        'ids': arrays[f'{typename}/ids'][start:stop],
+        'blocks': arrays[f'{typename}/blocks'][start:stop],
+        'nodes': arrays[f'{typename}/nodes'][start:stop],
+        'positions': arrays[f'{typename}/positions'][start:stop],
+        'nodes_xyz': arrays['nodes_xyz'],
+    }
+
+
+def _run(task: Tuple[FCChunkFunction, 'FCElementTypeLiteral', int, int]) -> NDArray[Any]:
+    func, typename, start, stop = task
+    return func(_chunk(_ATTACHED, typename, start, stop))
+
+
+def parallel_map(mesh: 'FCMesh', func: FCChunkFunction, chunk_size: int = 16384,
+                 workers: Optional[int] = None,
+                 types: Optional[Sequence['FCElementTypeLiteral']] = None) -> NDArray[Any]:
+    """
+    Применяет `func` к пачкам элементов по `chunk_size` (`FCElementChunk`)
+    и склеивает результаты по первой оси в порядке типов `mesh.elements`
+    (или `types`) и элементов внутри типа.
+
+    При `workers` > 1 (по умолчанию — число ядер) координаты узлов, id,
+    блоки и связность элементов один раз копируются в общую память
+    (`multiprocessing.shared_memory`), процессы пула подключаются к ней
+    без копирования, а в задачах передаются только границы пачек.
+    Функция должна быть доступна по имени модуля (для pickle), например
+    функция верхнего уровня или `functools.partial` от неё.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    typenames = [t for t in (types if types is not None else mesh.elements) if mesh.elements.get(t)]
+
+    arrays: Dict[str, NDArray[Any]] = {'nodes_xyz': np.ascontiguousarray(mesh.nodes_xyz, np.float64).reshape(-1, 3)}
+    tasks: List[Tuple[FCChunkFunction, 'FCElementTypeLiteral', int, int]] = []
+    for typename in typenames:
+        element_arrays = mesh.element_arrays(typename)
+        positions = mesh.node_positions(element_arrays['nodes'])
+        if np.any(positions < 0):
+            raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+        arrays[f'{typename}/ids'] = element_arrays['ids']
+        arrays[f'{typename}/blocks'] = element_arrays['blocks']
+        arrays[f'{typename}/nodes'] = element_arrays['nodes']
+        arrays[f'{typename}/positions'] = positions
+        size = len(positions)
+        tasks.extend((func, typename, start, min(start + chunk_size, size)) for start in range(0, size, chunk_size))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        views = {key: array.view() for key, array in arrays.items()}
+        for view in views.values():
+            view.flags.writeable = False
+        results = [func(_chunk(views, typename, start, stop)) for _, typename, start, stop in tasks]
+    else:
+        segments: List[SharedMemory] = []
+        descriptors: List[_Descriptor] = []
+        try:
+            for key, array in arrays.items():
+                segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, array.dtype, segment.buf)[...] = array
+                descriptors.append((key, segment.name, array.shape, array.dtype.str))
+            with ProcessPoolExecutor(min(workers, len(tasks)), initializer=_attach, initargs=(descriptors,)) as pool:
+                results = list(pool.map(_run, tasks))
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    if not results:
+        return np.array([])
+    result: NDArray[Any] = np.concatenate(results)
+    return result
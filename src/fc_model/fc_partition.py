@@ -0,0 +1,185 @@
+from typing import TYPE_CHECKING, Callable, List, Literal, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import element_centers, extract
+from .fc_graph import FCGraph, csr_from_pairs, element_graph, rcm_order, unique_sorted
+from .fc_mesh import FCMesh
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+FCPartitionMethodLiteral = Literal['rcb', 'graph']
+
+# Отделение части вершин: (вершины, сколько отделить) -> маска отделённых
+_Split = Callable[[NDArray[np.int64], int], NDArray[np.bool_]]
+
+
+class FCPart(TypedDict):
+    model: 'FCModel'               # часть как самостоятельная модель (id сущностей исходные)
+    interface: NDArray[np.int32]   # id узлов части, общих с другими частями
+    neighbors: List[int]           # номера частей, имеющих с ней общие узлы
+
+
+def _subgraph(graph: FCGraph, vertices: NDArray[np.int64]) -> FCGraph:
+    """Подграф на вершинах `vertices` (вершины нумеруются по их порядку в массиве)."""
+    local = np.full(len(graph['offsets']) - 1, -1, np.int64)
+    local[vertices] = np.arange(len(vertices))
+    starts = graph['offsets'][vertices]
+    count = graph['offsets'][vertices + 1] - starts
+    total = int(count.sum())
+    rows = np.repeat(np.arange(len(vertices)), count)
+    cols = local[graph['indices'][np.repeat(starts, count) + np.arange(total) - np.repeat(np.cumsum(count) - count, count)]]
+    keep = cols >= 0
+    return csr_from_pairs(len(vertices), rows[keep], cols[keep])
+
+
+def _bisect(size: int, n_parts: int, split: _Split) -> NDArray[np.int32]:
+    """
+    Рекурсивное деление вершин 0..size-1 на `n_parts` частей: функция `split`
+    отделяет от вершин части заданное число вершин в пропорции числа частей
+    левой и правой половин, так что размеры частей отличаются не более чем на 1.
+    """
+    labels = np.zeros(size, np.int32)
+    stack: List[Tuple[NDArray[np.int64], int, int]] = [(np.arange(size, dtype=np.int64), n_parts, 0)]
+    while stack:
+        vertices, parts, first = stack.pop()
+        if parts == 1:
+            labels[vertices] = first
+            continue
+        left = parts // 2
+        mask = split(vertices, len(vertices) * left // parts)
+        stack.append((vertices[mask], left, first))
+        stack.append((vertices[~mask], parts - left, first + left))
+    return labels
+
+
+def _gains(graph: FCGraph, mask: NDArray[np.bool_]) -> NDArray[np.int64]:
+    """Уменьшение числа разрезанных рёбер при переносе каждой вершины на другую сторону."""
+    rows = np.repeat(np.arange(len(mask)), np.diff(graph['offsets']))
+    across = mask[rows] != mask[graph['indices']]
+    gain: NDArray[np.int64] = np.bincount(rows, np.where(across, 1, -1), len(mask)).astype(np.int64)
+    return gain
+
+
+def _refine_cut(graph: FCGraph, mask: NDArray[np.bool_], passes: int = 8) -> NDArray[np.bool_]:
+    """
+    Жадное улучшение разреза: за проход поровну вершин с обеих сторон
+    с наибольшим положительным выигрышем меняют сторону; проход,
+    не уменьшивший разрез, отменяется.
+    """
+    rows = np.repeat(np.arange(len(mask)), np.diff(graph['offsets']))
+    cols = graph['indices']
+    cut = int(np.count_nonzero(mask[rows] != mask[cols]))
+    for _ in range(passes):
+        gain = _gains(graph, mask)
+        inside = np.nonzero(mask & (gain > 0))[0]
+        outside = np.nonzero(~mask & (gain > 0))[0]
+        count = min(len(inside), len(outside))
+        if count == 0:
+            break
+        trial = mask.copy()
+        trial[inside[np.argsort(-gain[inside], kind='stable')[:count]]] = False
+        trial[outside[np.argsort(-gain[outside], kind='stable')[:count]]] = True
+        trial_cut = int(np.count_nonzero(trial[rows] != trial[cols]))
+        if trial_cut >= cut:
+            break
+        mask, cut = trial, trial_cut
+    return mask
+
+
+def _graph_split(graph: FCGraph, target: int) -> NDArray[np.bool_]:
+    """
+    Бисекция графа по уровням обхода в ширину: отделяются первые `target`
+    вершин порядка RCM от псевдопериферийной вершины, затем разрез
+    улучшается (`_refine_cut`).
+    """
+    mask = np.zeros(len(graph['offsets']) - 1, np.bool_)
+    mask[rcm_order(graph)[:target]] = True
+    return _refine_cut(graph, mask)
+
+
+def partition_elements(mesh: FCMesh, n_parts: int,
+                       method: FCPartitionMethodLiteral = 'rcb') -> Tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """
+    Номера частей (0..n_parts-1) для всех элементов сетки; возвращает id
+    элементов в порядке типов `mesh.elements` и номер части каждого.
+
+    'rcb' — рекурсивная координатная бисекция центров элементов поперёк
+    наибольшего габарита; 'graph' — рекурсивная бисекция двойственного
+    графа (`element_graph`) по уровням обхода в ширину с жадным
+    уменьшением числа общих сторон между частями, без координат.
+    Размеры частей отличаются не более чем на 1.
+    """
+    if n_parts < 1:
+        raise ValueError("n_parts must be positive")
+    if method == 'rcb':
+        ids, centers = element_centers(mesh)
+
+        def split(vertices: NDArray[np.int64], cut: int) -> NDArray[np.bool_]:
+            xyz = centers[vertices]
+            axis = int(np.argmax(np.ptp(xyz, axis=0))) if len(vertices) else 0
+            mask = np.zeros(len(vertices), np.bool_)
+            mask[np.argsort(xyz[:, axis], kind='stable')[:cut]] = True
+            return mask
+    elif method == 'graph':
+        graph, ids = element_graph(mesh)
+
+        def split(vertices: NDArray[np.int64], cut: int) -> NDArray[np.bool_]:
+            return _graph_split(_subgraph(graph, vertices), cut)
+    else:
+        raise ValueError(f"unknown partition method {method!r}")
+    if n_parts > len(ids):
+        raise ValueError(f"Cannot split {len(ids)} elements into {n_parts} parts")
+    return ids, _bisect(len(ids), n_parts, split)
+
+
+def partition(model: 'FCModel', n_parts: int, method: FCPartitionMethodLiteral = 'rcb') -> List[FCPart]:
+    """
+    Делит модель на `n_parts` сбалансированных по числу элементов частей
+    (см. `partition_elements`). Каждая часть — самостоятельная модель
+    (`fc_addons.extract`) со своими узлами, элементами, отфильтрованными
+    наборами, нагрузками, закреплениями и связями; id не меняются.
+    Для части возвращаются её интерфейсные узлы и соседние части.
+    """
+    mesh = model.mesh
+    ids, labels = partition_elements(mesh, n_parts, method)
+
+    # Пары (позиция узла, часть) без повторов
+    keys: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    start = 0
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        nodes = mesh.element_arrays(typename)['nodes']
+        positions = mesh.node_positions(nodes)
+        part = np.repeat(labels[start:start + len(nodes)].astype(np.int64), nodes.shape[1])
+        keys.append(unique_sorted(positions.ravel() * n_parts + part))
+        start += len(nodes)
+    key = unique_sorted(np.concatenate(keys))
+    position, part = key // n_parts, key % n_parts
+
+    # Узел интерфейса — узел нескольких частей; соседи — все пары частей такого узла
+    first = np.ones(len(key), np.bool_)
+    first[1:] = position[1:] != position[:-1]
+    group = np.cumsum(first) - 1
+    count = np.bincount(group)
+    shared = count[group] > 1
+    group_start = np.nonzero(first)[0]
+    members = count[group[shared]]
+    rows = np.repeat(part[shared], members)
+    cols = part[np.repeat(group_start[group[shared]], members) + np.arange(int(members.sum())) -
+                np.repeat(np.cumsum(members) - members, members)]
+    neighbors = csr_from_pairs(n_parts, rows, cols)
+
+    parts: List[FCPart] = []
+    for k in range(n_parts):
+        interface = np.sort(mesh.nodes_ids[position[shared & (part == k)]])
+        parts.append({
+            'model': extract(model, elements=ids[labels == k]),
+            'interface': interface.astype(np.int32),
+            'neighbors': neighbors['indices'][neighbors['offsets'][k]:neighbors['offsets'][k + 1]].tolist(),
+        })
+    return parts
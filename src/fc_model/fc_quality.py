@@ -0,0 +1,352 @@
+from functools import partial
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_mesh import FC_ELEMENT_SHAPES, FC_ELEMENT_TYPES_KEYNAME, FCMesh
+from .fc_parallel import FCElementChunk
+from .fc_shapes import FC_SHAPES, FCShape, FCShapeFamilyLiteral
+
+
+FCQualityMetricLiteral = Literal['scaled_jacobian', 'aspect_ratio', 'skewness', 'min_dihedral', 'warpage']
+
+FC_QUALITY_METRICS: List[FCQualityMetricLiteral] = [
+    'scaled_jacobian', 'aspect_ratio', 'skewness', 'min_dihedral', 'warpage']
+
+
+class FCQuality(TypedDict):
+    """
+    Показатели качества элементов (массивы, выровненные по `ids`).
+    Неприменимые к типу элемента показатели равны NaN.
+    """
+    ids: NDArray[np.int32]
+    blocks: NDArray[np.int32]
+    scaled_jacobian: NDArray[np.float64]  # min det J / (|J1||J2||J3|), 1 — идеальный элемент; у симплексов — min по углам
+    aspect_ratio: NDArray[np.float64]     # отношение длин наибольшего и наименьшего рёбер
+    skewness: NDArray[np.float64]         # равноугловая скошенность граней, 0 — идеал, 1 — вырождение
+    min_dihedral: NDArray[np.float64]     # наименьший двугранный угол, градусы (только 3D)
+    warpage: NDArray[np.float64]          # наибольшая депланация четырёхугольных граней, градусы
+    inverted: NDArray[np.bool_]           # det J <= 0 хотя бы в одной точке
+
+
+class FCQualityHistogram(TypedDict):
+    edges: NDArray[np.float64]
+    counts: Dict[int, NDArray[np.int64]]  # по id блоков
+
+
+# Линейный тип семейства: его рёбра и грани (по угловым узлам) берутся из FC_ELEMENT_TYPES
+_LINEAR_TYPES: Dict[str, str] = {
+    'TRI': 'TRI3', 'QUAD': 'QUAD4', 'TETRA': 'TETRA4', 'HEX': 'HEX8', 'WEDGE': 'WEDGE6', 'PYR': 'PYR5'}
+
+# Идеальные (правильные) элементы единичного ребра — угловые узлы в нумерации Fidesys
+_SQ3 = np.sqrt(3.0)
+_IDEAL_CORNERS: Dict[str, List[List[float]]] = {
+    'LINE': [[0, 0, 0], [1, 0, 0]],
+    'TRI': [[0, 0, 0], [1, 0, 0], [0.5, _SQ3 / 2, 0]],
+    'QUAD': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]],
+    'TETRA': [[0, 0, 0], [1, 0, 0], [0.5, _SQ3 / 2, 0], [0.5, _SQ3 / 6, np.sqrt(2 / 3)]],
+    'HEX': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]],
+    'WEDGE': [[0, 0, 0], [0.5, _SQ3 / 2, 0], [1, 0, 0], [0, 0, 1], [0.5, _SQ3 / 2, 1], [1, 0, 1]],
+    'PYR': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, np.sqrt(0.5)]],
+}
+
+
+class _Topology(TypedDict):
+    corners: int
+    edges: NDArray[np.int64]               # (E, 2)
+    faces: List[NDArray[np.int64]]         # грани по числу вершин: (F, m)
+    dihedral: NDArray[np.int64]            # (E, 2) номера граней (в порядке concat) при ребре
+    points: NDArray[np.float64]            # точки вычисления якобиана
+    frames: Optional[NDArray[np.float64]]  # (F, dim, dim) реперы углов симплекса или None
+    ideal: NDArray[np.float64]             # масштабированный якобиан идеального элемента в точках и реперах
+
+
+_TOPOLOGY: Dict[FCShapeFamilyLiteral, _Topology] = {}
+
+# Чётные перестановки вершин симплекса, ставящие первой каждую вершину (ориентация сохраняется)
+_SIMPLEX_CORNERS: Dict[str, List[List[int]]] = {
+    'TRI': [[0, 1, 2], [1, 2, 0], [2, 0, 1]],
+    'TETRA': [[0, 1, 2, 3], [1, 0, 3, 2], [2, 3, 0, 1], [3, 2, 1, 0]],
+}
+
+
+def _base(family: FCShapeFamilyLiteral) -> str:
+    return family.rstrip('0123456789')
+
+
+_Vector = Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]
+
+
+def _dot(a: _Vector, b: _Vector) -> NDArray[np.float64]:
+    dot: NDArray[np.float64] = a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+    return dot
+
+
+def _cross(a: _Vector, b: _Vector) -> _Vector:
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _sub(a: _Vector, b: _Vector) -> _Vector:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _cos(a: _Vector, b: _Vector) -> NDArray[np.float64]:
+    """Косинусы углов между векторами."""
+    cos: NDArray[np.float64] = _dot(a, b) / np.maximum(np.sqrt(_dot(a, a) * _dot(b, b)), 1e-300)
+    return cos
+
+
+def _degrees(cos: NDArray[np.float64]) -> NDArray[np.float64]:
+    angles: NDArray[np.float64] = np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+    return angles
+
+
+def _jacobian_ratio(shape: FCShape, xyz: _Vector, points: NDArray[np.float64],
+                    frames: Optional[NDArray[np.float64]] = None,
+                    normal: Optional[NDArray[np.float64]] = None) -> NDArray[np.float64]:
+    """
+    Знаковое отношение det J / (|J1|...|Jdim|) в точках `points` (N, P)
+    для элементов с координатами узлов по компонентам `xyz` (3 массива (N, k)).
+    Для реперов `frames` (F, dim, dim) столбцы J заменяются на J·A — рёбра
+    из каждого угла симплекса; результат (N, F·P), реперы идут подряд.
+    Знак у двумерных элементов берётся относительно нормали `normal` (3,),
+    без неё — относительно нормали в центре самого элемента.
+    """
+    if frames is None:
+        frames = np.eye(shape.dim)[None]
+    ratio: NDArray[np.float64] = np.concatenate(
+        [_frame_ratio(shape, xyz, points, frame, normal) for frame in frames], axis=1)
+    return ratio
+
+
+def _frame_ratio(shape: FCShape, xyz: _Vector, points: NDArray[np.float64],
+                 frame: NDArray[np.float64], direction: Optional[NDArray[np.float64]]) -> NDArray[np.float64]:
+    gradients = shape.gradients(points) @ frame                      # (P, k, dim)
+    size = len(xyz[0])
+    # columns[d][c] — dx_c/dxi_d в точках, (N, P)
+    matrix = gradients.transpose(1, 2, 0).reshape(len(shape.nodes), -1)
+    parts = [(component @ matrix).reshape(size, shape.dim, len(points)) for component in xyz]
+    columns = [(parts[0][:, d], parts[1][:, d], parts[2][:, d]) for d in range(shape.dim)]
+
+    scale = np.ones((size, len(points)))
+    for column in columns:
+        scale = scale * np.sqrt(_dot(column, column))
+    if shape.dim == 3:
+        det = _dot(columns[0], _cross(columns[1], columns[2]))
+    elif shape.dim == 2:
+        normal = _cross(columns[0], columns[1])
+        reference: _Vector
+        if direction is not None:
+            reference = (np.full((1, 1), direction[0]), np.full((1, 1), direction[1]), np.full((1, 1), direction[2]))
+        else:
+            # Нормаль в центре элемента: проверяется только согласованность внутри элемента
+            center = shape.gradients(shape.center[None])[0]              # (k, dim)
+            tangents = [xyz[0] @ center, xyz[1] @ center, xyz[2] @ center]  # (N, dim)
+            reference = _cross((tangents[0][:, :1], tangents[1][:, :1], tangents[2][:, :1]),
+                               (tangents[0][:, 1:], tangents[1][:, 1:], tangents[2][:, 1:]))
+        det = np.sqrt(_dot(normal, normal)) * np.sign(_dot(normal, reference))
+    else:
+        det = scale
+    ratio: NDArray[np.float64] = det / np.where(scale > 0, scale, 1.0) * (scale > 0)
+    return ratio
+
+
+def _topology(family: FCShapeFamilyLiteral) -> _Topology:
+    if family in _TOPOLOGY:
+        return _TOPOLOGY[family]
+    shape = FC_SHAPES[family]
+    base = _base(family)
+
+    if base == 'LINE':
+        edges = [[0, 1]]
+        facets: List[List[int]] = []
+    else:
+        linear = FC_ELEMENT_TYPES_KEYNAME[_LINEAR_TYPES[base]]  # type: ignore[index]
+        edges = [[line[i], line[i + 1]] for line in linear['edges'] for i in range(len(line) - 1)]
+        facets = linear['facets'] if shape.dim == 3 else [list(range(len(_IDEAL_CORNERS[base])))]
+
+    corners = np.array(_IDEAL_CORNERS[base], dtype=np.float64)
+    faces = [np.array([f for f in facets if len(f) == m], np.int64).reshape(-1, m) for m in (3, 4)]
+
+    # Грани при каждом ребре (для двугранных углов)
+    ordered = [f for group in faces for f in group.tolist()]
+    dihedral = []
+    if shape.dim == 3:
+        for a, b in edges:
+            dihedral.append([i for i, f in enumerate(ordered)
+                             if any({f[j], f[(j + 1) % len(f)]} == {a, b} for j in range(len(f)))])
+
+    # У симплекса J линейного типа постоянна и задаёт рёбра только из узла 0:
+    # отношение берётся по рёбрам из каждого угла
+    frames: Optional[NDArray[np.float64]] = None
+    if base in _SIMPLEX_CORNERS:
+        vertices = shape.nodes[:len(corners)]
+        frames = np.stack([(vertices[order[1:]] - vertices[order[0]]).T for order in _SIMPLEX_CORNERS[base]])
+
+    # Идеальный элемент того же порядка: прямые рёбра, узлы по линейной интерполяции углов
+    linear_shape = FC_SHAPES[{'LINE': 'LINE2'}.get(base, _LINEAR_TYPES.get(base, ''))]  # type: ignore[index]
+    ideal_coords = linear_shape.values(shape.nodes) @ corners
+    if base == 'LINE':
+        points = shape.nodes
+        ideal = np.ones(len(points))
+    else:
+        # Точки с вырожденным якобианом (вершина пирамиды) не учитываются
+        ideal_xyz = (ideal_coords[None, :, 0], ideal_coords[None, :, 1], ideal_coords[None, :, 2])
+        ratio = _jacobian_ratio(shape, ideal_xyz, shape.nodes)[0]
+        points = shape.nodes[ratio > 1e-9]
+        ideal = _jacobian_ratio(shape, ideal_xyz, points, frames)[0]
+
+    topology: _Topology = {
+        'corners': len(corners),
+        'edges': np.array(edges, np.int64),
+        'faces': faces,
+        'dihedral': np.array(dihedral, np.int64).reshape(-1, 2),
+        'points': points,
+        'frames': frames,
+        'ideal': ideal,
+    }
+    _TOPOLOGY[family] = topology
+    return topology
+
+
+def element_quality(family: FCShapeFamilyLiteral, coords: NDArray[np.float64],
+                    normal: Optional[Sequence[float]] = None) -> Tuple[NDArray[np.float64], ...]:
+    """
+    Показатели качества элементов семейства `family` с узлами `coords` (N, k, 3):
+    scaled_jacobian, aspect_ratio, skewness, min_dihedral, warpage (см. FCQuality).
+
+    Знак якобиана двумерных элементов берётся относительно общей нормали
+    `normal`: элемент с обходом по часовой стрелке относительно неё вывернут.
+    Без `normal` знак считается по нормали самого элемента, и перевёрнутый
+    целиком элемент не обнаруживается.
+    """
+    shape = FC_SHAPES[family]
+    topology = _topology(family)
+    size = len(coords)
+    nan = np.full(size, np.nan)
+    # Координаты по компонентам: быстрые операции над длинными массивами
+    flat = np.ascontiguousarray(coords.transpose(2, 0, 1))
+    xyz: _Vector = (flat[0], flat[1], flat[2])
+
+    # Масштабированный якобиан относительно идеального элемента
+    if shape.dim == 1:
+        scaled_jacobian = nan.copy()
+    else:
+        direction = None if normal is None else np.asarray(normal, np.float64)
+        ratio = _jacobian_ratio(shape, xyz, topology['points'], topology['frames'], direction) / topology['ideal']
+        scaled_jacobian = ratio.min(axis=1)
+
+    # Отношение длин рёбер
+    edges = topology['edges']
+    vectors = _sub((xyz[0][:, edges[:, 1]], xyz[1][:, edges[:, 1]], xyz[2][:, edges[:, 1]]),
+                   (xyz[0][:, edges[:, 0]], xyz[1][:, edges[:, 0]], xyz[2][:, edges[:, 0]]))
+    lengths = np.sqrt(_dot(vectors, vectors))
+    longest = lengths.max(axis=1)
+    shortest = lengths.min(axis=1)
+    aspect_ratio = np.where(shortest > 0, longest / np.where(shortest > 0, shortest, 1.0), np.inf)
+
+    # Скошенность и нормали граней. Арккосинус берётся только от экстремальных
+    # косинусов: угол монотонно убывает с ростом косинуса
+    skewness = nan.copy() if shape.dim == 1 else np.zeros(size)
+    warpage = nan.copy() if shape.dim == 1 else np.zeros(size)
+    normals: List[_Vector] = []
+    for group in topology['faces']:
+        if len(group) == 0:
+            continue
+        m = group.shape[1]
+        face: _Vector = (xyz[0][:, group], xyz[1][:, group], xyz[2][:, group])   # (N, F, m)
+        following: _Vector = (np.roll(face[0], -1, axis=2), np.roll(face[1], -1, axis=2), np.roll(face[2], -1, axis=2))
+        side = _sub(following, face)                                             # ребро i -> i+1
+        length = np.sqrt(_dot(side, side))
+        before: _Vector = (np.roll(side[0], 1, axis=2), np.roll(side[1], 1, axis=2), np.roll(side[2], 1, axis=2))
+        cos = -_dot(before, side) / np.maximum(np.roll(length, 1, axis=2) * length, 1e-300)
+        smallest = _degrees(np.max(cos, axis=(1, 2)))
+        largest = _degrees(np.min(cos, axis=(1, 2)))
+        equal = 60.0 if m == 3 else 90.0
+        skewness = np.maximum(skewness, np.maximum((largest - equal) / (180.0 - equal), (equal - smallest) / equal))
+
+        # Нормаль Ньюэлла (устойчива для неплоских четырёхугольников)
+        newell = _cross(face, following)
+        face_normal: _Vector = (newell[0].sum(axis=2), newell[1].sum(axis=2), newell[2].sum(axis=2))
+        norm = np.maximum(np.sqrt(_dot(face_normal, face_normal)), 1e-300)
+        normals.append((face_normal[0] / norm, face_normal[1] / norm, face_normal[2] / norm))
+
+        if m == 4:
+            # Депланация: угол между нормалями двух треугольников по каждой диагонали
+            p = [(face[0][:, :, i], face[1][:, :, i], face[2][:, :, i]) for i in range(4)]
+            first = _cross(_sub(p[1], p[0]), _sub(p[2], p[0]))
+            second = _cross(_sub(p[2], p[0]), _sub(p[3], p[0]))
+            third = _cross(_sub(p[2], p[1]), _sub(p[3], p[1]))
+            fourth = _cross(_sub(p[3], p[1]), _sub(p[0], p[1]))
+            cos = np.minimum(_cos(first, second), _cos(third, fourth))
+            warpage = np.maximum(warpage, _degrees(np.min(cos, axis=1)))
+
+    # Двугранные углы по рёбрам: 180° минус угол между внешними нормалями граней
+    if shape.dim == 3:
+        joined = [np.concatenate([n[i] for n in normals], axis=1) for i in range(3)]
+        pairs = topology['dihedral']
+        a: _Vector = (joined[0][:, pairs[:, 0]], joined[1][:, pairs[:, 0]], joined[2][:, pairs[:, 0]])
+        b: _Vector = (joined[0][:, pairs[:, 1]], joined[1][:, pairs[:, 1]], joined[2][:, pairs[:, 1]])
+        min_dihedral = 180.0 - _degrees(np.min(_dot(a, b), axis=1))
+    else:
+        min_dihedral = nan.copy()
+
+    return scaled_jacobian, aspect_ratio, skewness, min_dihedral, warpage
+
+
+def _chunk_quality(chunk: FCElementChunk, normal: Optional[Sequence[float]] = None) -> NDArray[np.float64]:
+    """Показатели `element_quality` для пачки: столбцы в порядке FC_QUALITY_METRICS."""
+    family = FC_ELEMENT_SHAPES[chunk['typename']].family
+    values: NDArray[np.float64] = np.column_stack(
+        element_quality(family, chunk['nodes_xyz'][chunk['positions']], normal))
+    return values
+
+
+def mesh_quality(mesh: FCMesh, processes: Optional[int] = None, chunk_size: int = 4096,
+                 normal: Optional[Sequence[float]] = None) -> FCQuality:
+    """
+    Показатели качества всех элементов сетки, кроме точечных.
+
+    Элементы обрабатываются пачками по `chunk_size`; при `processes` > 1
+    пачки считаются в пуле процессов над общей памятью (`FCMesh.parallel_map`).
+
+    Вывернутость двумерных элементов определяется относительно нормали
+    `normal`; для плоской сетки (все узлы в плоскости z = const) по умолчанию
+    берётся +z. Для неплоских оболочек без `normal` проверяется только
+    согласованность якобиана внутри элемента.
+    """
+    types = [t for t in mesh.elements if t in FC_ELEMENT_SHAPES and mesh.elements[t]]
+    arrays = [mesh.element_arrays(t) for t in types]
+    if normal is None:
+        z = np.asarray(mesh.nodes_xyz, np.float64).reshape(-1, 3)[:, 2]
+        if len(z) and np.ptp(z) == 0:
+            normal = (0.0, 0.0, 1.0)
+    values = mesh.parallel_map(partial(_chunk_quality, normal=normal), chunk_size, processes or 1, types).reshape(-1, 5)
+    scaled_jacobian, aspect_ratio, skewness, min_dihedral, warpage = values.T
+    return {
+        'ids': np.concatenate([np.array([], np.int32), *[a['ids'] for a in arrays]]),
+        'blocks': np.concatenate([np.array([], np.int32), *[a['blocks'] for a in arrays]]),
+        'scaled_jacobian': scaled_jacobian,
+        'aspect_ratio': aspect_ratio,
+        'skewness': skewness,
+        'min_dihedral': min_dihedral,
+        'warpage': warpage,
+        'inverted': scaled_jacobian <= 0,
+    }
+
+
+def block_histograms(quality: FCQuality, metric: FCQualityMetricLiteral, bins: int = 10,
+                     value_range: Optional[Tuple[float, float]] = None) -> FCQualityHistogram:
+    """Гистограммы показателя по блокам с общими границами интервалов (NaN не учитываются)."""
+    values = quality[metric]
+    finite = np.isfinite(values)
+    if value_range is None:
+        value_range = (float(np.min(values[finite])), float(np.max(values[finite]))) if finite.any() else (0.0, 1.0)
+    edges = np.histogram_bin_edges(values[finite], bins, value_range)
+
+    counts: Dict[int, NDArray[np.int64]] = {}
+    for block in np.unique(quality['blocks']).tolist():
+        mask = finite & (quality['blocks'] == block)
+        counts[block] = np.histogram(values[mask], edges)[0].astype(np.int64)
+    return {'edges': edges, 'counts': counts}
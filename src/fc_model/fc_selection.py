@@ -0,0 +1,166 @@
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import new_set
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, FCMesh, midside_nodes
+from .fc_set import FCSet
+from .fc_sides import side_geometry, side_nodes
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+# Область пространства: (N, 3) координаты -> маска точек внутри (границы включаются)
+FCRegion = Callable[[NDArray[np.float64]], NDArray[np.bool_]]
+
+
+def box(lower: Sequence[float], upper: Sequence[float]) -> FCRegion:
+    """Прямоугольный параллелепипед, параллельный осям."""
+    lo, hi = np.asarray(lower, np.float64), np.asarray(upper, np.float64)
+
+    def region(xyz: NDArray[np.float64]) -> NDArray[np.bool_]:
+        inside: NDArray[np.bool_] = np.all((xyz >= lo) & (xyz <= hi), axis=1)
+        return inside
+    return region
+
+
+def sphere(center: Sequence[float], radius: float) -> FCRegion:
+    """Шар."""
+    c = np.asarray(center, np.float64)
+
+    def region(xyz: NDArray[np.float64]) -> NDArray[np.bool_]:
+        inside: NDArray[np.bool_] = np.einsum('ij,ij->i', xyz - c, xyz - c) <= radius * radius
+        return inside
+    return region
+
+
+def cylinder(start: Sequence[float], end: Sequence[float], radius: float) -> FCRegion:
+    """Цилиндр с осью от `start` до `end`."""
+    a = np.asarray(start, np.float64)
+    axis = np.asarray(end, np.float64) - a
+    length = float(np.dot(axis, axis))
+    if length == 0.0:
+        raise ValueError("cylinder axis has zero length")
+
+    def region(xyz: NDArray[np.float64]) -> NDArray[np.bool_]:
+        t = (xyz - a) @ axis / length
+        radial = xyz - a - t[:, None] * axis
+        inside: NDArray[np.bool_] = (t >= 0.0) & (t <= 1.0) & (np.einsum('ij,ij->i', radial, radial) <= radius * radius)
+        return inside
+    return region
+
+
+def band(point: Sequence[float], normal: Sequence[float], width: float) -> FCRegion:
+    """Слой толщины `width` вокруг плоскости через `point` с нормалью `normal`."""
+    p = np.asarray(point, np.float64)
+    n = np.asarray(normal, np.float64)
+    n = n / np.linalg.norm(n)
+
+    def region(xyz: NDArray[np.float64]) -> NDArray[np.bool_]:
+        inside: NDArray[np.bool_] = np.abs((xyz - p) @ n) <= width / 2
+        return inside
+    return region
+
+
+def _row_counts(table: NDArray[np.int32]) -> NDArray[np.int64]:
+    """
+    Сколько раз встречается каждая строка таблицы. Строки сортируются
+    по 64-битному хэшу; при совпадении хэшей разных строк используется
+    точное сравнение строк как байтовых записей.
+    """
+    hashes = np.zeros(len(table), np.uint64)
+    for column in table.T:
+        hashes = hashes * np.uint64(0x9E3779B97F4A7C15) + column.astype(np.uint64)
+    order = np.argsort(hashes)
+    ordered = table[order]
+    same = hashes[order][1:] == hashes[order][:-1]
+    if np.any(same & np.any(ordered[1:] != ordered[:-1], axis=1)):
+        rows = np.ascontiguousarray(table).view(np.dtype((np.void, table.itemsize * table.shape[1]))).ravel()
+        _, inverse, counts = np.unique(rows, return_inverse=True, return_counts=True)
+        exact: NDArray[np.int64] = counts[inverse.ravel()]
+        return exact
+    first = np.ones(len(table), np.bool_)
+    first[1:] = ~same
+    group = np.cumsum(first) - 1
+    result = np.empty(len(table), np.int64)
+    result[order] = np.bincount(group)[group]
+    return result
+
+
+def boundary_sides(mesh: FCMesh) -> NDArray[np.int32]:
+    """
+    Внешние стороны сетки: грани объёмных элементов, не совпадающие (по набору
+    угловых узлов) ни с одной другой гранью. Пары (id элемента, номер грани
+    в таблице `facets`) упорядочены по типам элементов, элементам и граням.
+    """
+    # Число угловых узлов грани -> отсортированные узлы и (id элемента, грань, порядковый номер элемента)
+    groups: Dict[int, Tuple[List[NDArray[np.int32]], List[NDArray[np.int64]]]] = {}
+    count = 0
+    for typename, bucket in mesh.elements.items():
+        element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+        if not bucket or element_type['dim'] != 3:
+            continue
+        arrays = mesh.element_arrays(typename)
+        mids = set(midside_nodes(typename)[1].tolist()) if element_type['order'] == 2 else set()
+        size = len(arrays['ids'])
+        for f, facet in enumerate(element_type['facets']):
+            corners = [node for node in facet if node not in mids]
+            keys, owners = groups.setdefault(len(corners), ([], []))
+            keys.append(np.sort(arrays['nodes'][:, corners], axis=1))
+            owners.append(np.stack([arrays['ids'], np.full(size, f), np.arange(count, count + size)], axis=1))
+        count += size
+
+    result: List[NDArray[np.int64]] = [np.empty((0, 3), np.int64)]
+    for keys, owners in groups.values():
+        result.append(np.concatenate(owners)[_row_counts(np.concatenate(keys)) == 1])
+    outer = np.concatenate(result)
+    outer = outer[np.lexsort((outer[:, 1], outer[:, 2]))]
+    sides: NDArray[np.int32] = outer[:, :2].astype(np.int32)
+    return sides
+
+
+def select_nodes(mesh: FCMesh, region: FCRegion) -> NDArray[np.int32]:
+    """Id узлов внутри области в порядке `nodes_ids`."""
+    xyz = np.asarray(mesh.nodes_xyz, np.float64).reshape(-1, 3)
+    ids: NDArray[np.int32] = mesh.nodes_ids[region(xyz)]
+    return ids
+
+
+def select_sides(mesh: FCMesh, region: Optional[FCRegion] = None,
+                 direction: Optional[Sequence[float]] = None, angle: float = 5.0) -> NDArray[np.int32]:
+    """
+    Внешние стороны (`boundary_sides`), все узлы которых лежат в области
+    `region` и внешняя нормаль которых отклоняется от направления `direction`
+    не больше чем на `angle` градусов.
+    """
+    sides = boundary_sides(mesh)
+    keep = np.ones(len(sides), np.bool_)
+    if region is not None:
+        nodes = side_nodes(mesh, sides)
+        used = nodes >= 0
+        xyz = np.asarray(mesh.nodes_xyz, np.float64).reshape(-1, 3)
+        inside = np.ones(nodes.shape, np.bool_)
+        inside[used] = region(xyz[mesh.node_positions(nodes[used])])
+        keep &= inside.all(axis=1)
+    if direction is not None:
+        d = np.asarray(direction, np.float64) / np.linalg.norm(direction)
+        keep &= side_geometry(mesh, sides)['normals'] @ d >= np.cos(np.radians(angle))
+    selected: NDArray[np.int32] = sides[keep]
+    return selected
+
+
+def add_nodeset(model: 'FCModel', region: FCRegion, name: str = '') -> FCSet:
+    """Новый набор узлов модели из узлов области (`select_nodes`); id — следующий свободный."""
+    set_id = max(model.nodesets, default=0) + 1
+    model.nodesets[set_id] = new_set(set_id, name, select_nodes(model.mesh, region))
+    return model.nodesets[set_id]
+
+
+def add_sideset(model: 'FCModel', region: Optional[FCRegion] = None, direction: Optional[Sequence[float]] = None,
+                angle: float = 5.0, name: str = '') -> FCSet:
+    """Новый набор сторон модели из внешних сторон (`select_sides`); id — следующий свободный."""
+    set_id = max(model.sidesets, default=0) + 1
+    model.sidesets[set_id] = new_set(set_id, name, select_sides(model.mesh, region, direction, angle))
+    return model.sidesets[set_id]
@@ -1,8 +1,16 @@
-from typing import TypedDict
+from typing import Tuple, TypedDict
 
+import numpy as np
 from numpy import dtype, int32
+from numpy.typing import NDArray
 
-from .fc_value import FCValue
+from .fc_mesh import FCMesh
+from .fc_sides import side_geometry, side_nodes
+from .fc_value import FCValue, encode
+
+
+# Ключ стороны в операциях над наборами: id элемента * _SIDE_BASE + номер стороны
+_SIDE_BASE = 64
 
 
 class FCSrcSet(TypedDict):
@@ -31,6 +39,102 @@ class FCSet:
             "name": self.name
         }
 
+    def keys(self) -> Tuple[NDArray[np.int64], int]:
+        """
+        Отсортированные уникальные ключи набора и число столбцов: id узлов (1)
+        или id элемента * 64 + номер стороны для пар (элемент, сторона) (2).
+        Пустой набор имеет 0 столбцов и совместим с наборами обоих видов.
+        """
+        if self.apply.type == 'formula':
+            raise ValueError(f"Set(id={self.id}) is a formula, not an id array")
+        data = np.asarray(self.apply.data, np.int64)
+        if data.size == 0:
+            return np.array([], np.int64), 0
+        data = data.reshape(len(data), -1)
+        width = data.shape[1]
+        if width == 1:
+            keys = data.ravel()
+        elif width == 2:
+            keys = data[:, 0] * _SIDE_BASE + data[:, 1]
+        else:
+            raise ValueError(f"Set(id={self.id}) rows must hold a node id or an (element, side) pair, got {width} columns")
+        return np.unique(keys), width
+
+    def contains(self, items: NDArray[np.int32]) -> NDArray[np.bool_]:
+        """Маска принадлежности набору id узлов (K,) или пар (элемент, сторона) (K, 2)."""
+        keys, width = self.keys()
+        queries = np.asarray(items, np.int64)
+        if queries.ndim == 2 and queries.shape[1] == 2:
+            if width == 1:
+                raise ValueError(f"Set(id={self.id}) holds nodes, got (element, side) pairs")
+            queries = queries[:, 0] * _SIDE_BASE + queries[:, 1]
+        elif width == 2:
+            raise ValueError(f"Set(id={self.id}) holds (element, side) pairs, got ids")
+        queries = queries.ravel()
+        if not len(keys):
+            return np.zeros(len(queries), np.bool_)
+        positions = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+        found: NDArray[np.bool_] = keys[positions] == queries
+        return found
+
+    def union(self, *others: 'FCSet') -> 'FCSet':
+        """Объединение с наборами `others` — новый набор с id и именем этого набора."""
+        keys, width = self.keys()
+        parts = [keys]
+        for other in others:
+            other_keys, width = self._compatible(other, width)
+            parts.append(other_keys)
+        return self._from_keys(np.unique(np.concatenate(parts)), width)
+
+    def intersection(self, *others: 'FCSet') -> 'FCSet':
+        """Пересечение с наборами `others` — новый набор с id и именем этого набора."""
+        keys, width = self.keys()
+        for other in others:
+            other_keys, width = self._compatible(other, width)
+            keys = np.intersect1d(keys, other_keys, assume_unique=True)
+        return self._from_keys(keys, width)
+
+    def difference(self, *others: 'FCSet') -> 'FCSet':
+        """Элементы набора, не входящие в `others`, — новый набор с id и именем этого набора."""
+        keys, width = self.keys()
+        for other in others:
+            other_keys, width = self._compatible(other, width)
+            keys = np.setdiff1d(keys, other_keys, assume_unique=True)
+        return self._from_keys(keys, width)
+
+    def _compatible(self, other: 'FCSet', width: int) -> Tuple[NDArray[np.int64], int]:
+        other_keys, other_width = other.keys()
+        if width and other_width and width != other_width:
+            raise ValueError(f"Cannot combine node set and side set (ids {self.id} and {other.id})")
+        return other_keys, max(width, other_width)
+
+    def _from_keys(self, keys: NDArray[np.int64], width: int) -> 'FCSet':
+        data = np.stack([keys // _SIDE_BASE, keys % _SIDE_BASE], axis=1) if width == 2 else keys
+        data = data.astype(np.int32)
+        return FCSet({'id': self.id, 'name': self.name, 'apply_to': encode(data), 'apply_to_size': len(data)})
+
+    def sides(self) -> NDArray[np.int32]:
+        """Пары (id элемента, номер стороны) набора сторон (K, 2) в порядке хранения."""
+        if self.apply.type == 'formula':
+            raise ValueError(f"Set(id={self.id}) is a formula, not an id array")
+        data = np.asarray(self.apply.data, np.int32)
+        if data.size and (data.ndim != 2 or data.shape[1] != 2):
+            raise ValueError(f"Set(id={self.id}) is not a side set")
+        pairs: NDArray[np.int32] = data.reshape(-1, 2)
+        return pairs
+
+    def face_nodes(self, mesh: FCMesh) -> NDArray[np.int32]:
+        """Id узлов сторон набора (K, m) в порядке таблицы `facets`, дополненные -1 (см. `fc_sides.side_nodes`)."""
+        return side_nodes(mesh, self.sides())
+
+    def face_normals(self, mesh: FCMesh) -> NDArray[np.float64]:
+        """Единичные внешние нормали сторон набора (K, 3)."""
+        return side_geometry(mesh, self.sides())['normals']
+
+    def face_areas(self, mesh: FCMesh) -> NDArray[np.float64]:
+        """Площади сторон набора (K,)."""
+        return side_geometry(mesh, self.sides())['areas']
+
     def __str__(self) -> str:
         return f"FCSet(id={self.id}, name='{self.name}', apply_to_size={len(self.apply)})"
 
@@ -0,0 +1,350 @@
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+FCShapeFamilyLiteral = Literal[
+    'LINE2', 'LINE3',
+    'TRI3', 'TRI6', 'QUAD4', 'QUAD8',
+    'TETRA4', 'TETRA10', 'HEX8', 'HEX20',
+    'WEDGE6', 'WEDGE15', 'PYR5', 'PYR13',
+]
+
+
+# Опорные координаты узлов в порядке нумерации Fidesys.
+# Отрезки и четырёхугольники/шестигранники заданы на [-1, 1],
+# треугольники и тетраэдры — на единичном симплексе.
+_LINE = [[-1.0], [1.0], [0.0]]
+
+_TRI = [[0.0, 0.0], [1.0, 0.0], [0.0, 1.0],
+        [0.5, 0.0], [0.5, 0.5], [0.0, 0.5]]
+
+_QUAD = [[-1.0, -1.0], [1.0, -1.0], [1.0, 1.0], [-1.0, 1.0],
+         [0.0, -1.0], [1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]]
+
+_TETRA = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0],
+          [0.5, 0.0, 0.0], [0.5, 0.5, 0.0], [0.0, 0.5, 0.0],
+          [0.0, 0.0, 0.5], [0.5, 0.0, 0.5], [0.0, 0.5, 0.5]]
+
+_HEX = [[-1.0, -1.0, -1.0], [1.0, -1.0, -1.0], [1.0, 1.0, -1.0], [-1.0, 1.0, -1.0],
+        [-1.0, -1.0, 1.0], [1.0, -1.0, 1.0], [1.0, 1.0, 1.0], [-1.0, 1.0, 1.0],
+        [0.0, -1.0, -1.0], [1.0, 0.0, -1.0], [0.0, 1.0, -1.0], [-1.0, 0.0, -1.0],
+        [0.0, -1.0, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0], [-1.0, 0.0, 1.0],
+        [-1.0, -1.0, 0.0], [1.0, -1.0, 0.0], [1.0, 1.0, 0.0], [-1.0, 1.0, 0.0]]
+
+# Клин в Fidesys имеет обратную (по сравнению с VTK) ориентацию основания:
+# грань [0, 1, 2] смотрит наружу, поэтому узлы 1 и 2 переставлены.
+_WEDGE = [[0.0, 0.0, -1.0], [0.0, 1.0, -1.0], [1.0, 0.0, -1.0],
+          [0.0, 0.0, 1.0], [0.0, 1.0, 1.0], [1.0, 0.0, 1.0],
+          [0.0, 0.5, -1.0], [0.5, 0.5, -1.0], [0.5, 0.0, -1.0],
+          [0.0, 0.5, 1.0], [0.5, 0.5, 1.0], [0.5, 0.0, 1.0],
+          [0.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]]
+
+
+def _monomials(degree_spec: List[Tuple[int, ...]]) -> NDArray[np.int64]:
+    return np.array(degree_spec, dtype=np.int64)
+
+
+def _full(dim: int, degree: int) -> List[Tuple[int, ...]]:
+    """Все мономы степени не выше degree."""
+    grid = np.stack(np.meshgrid(*[np.arange(degree + 1)] * dim, indexing='ij'), -1).reshape(-1, dim)
+    return [tuple(int(v) for v in e) for e in grid if e.sum() <= degree]
+
+
+def _tensor(dim: int, degree: int) -> List[Tuple[int, ...]]:
+    """Мономы с наибольшей степенью по каждой переменной не выше degree."""
+    grid = np.stack(np.meshgrid(*[np.arange(degree + 1)] * dim, indexing='ij'), -1).reshape(-1, dim)
+    return [tuple(int(v) for v in e) for e in grid]
+
+
+def _serendipity(dim: int) -> List[Tuple[int, ...]]:
+    """Квадратичное пространство serendipity: мономы Q2 без вкладов внутренних узлов."""
+    return [e for e in _tensor(dim, 2) if sum(1 for v in e if v == 2) <= 1 and sum(e) <= dim + 1]
+
+
+def _wedge(degree: int) -> List[Tuple[int, ...]]:
+    """Мономы P(degree) по треугольнику, умноженные на 1, z (и z² для квадратичного)."""
+    tri = _full(2, degree)
+    out = [e + (k,) for k in range(2) for e in tri]
+    if degree == 2:
+        out += [e + (2,) for e in tri if sum(e) <= 1]
+    return out
+
+
+class FCShape:
+    """
+    Опорный элемент: координаты узлов и функции формы.
+
+    Функции формы строятся в мономиальном базисе: коэффициенты получаются
+    обращением матрицы Вандермонда в узлах. Пирамиды представлены вырожденными
+    шестигранниками (верхняя грань стянута в вершину), параметрическая область
+    у них — куб [-1, 1]^3.
+
+    Все методы принимают пачки параметрических точек формы (P, dim).
+    """
+
+    family: FCShapeFamilyLiteral
+    dim: int
+    order: int                          # Наибольшая степень функций формы по одной переменной
+    nodes: NDArray[np.float64]          # (k, dim) опорные координаты узлов
+    center: NDArray[np.float64]         # (dim,) центр параметрической области
+
+    _exponents: NDArray[np.int64]
+    _coefficients: NDArray[np.float64]
+    _collapse: Optional[NDArray[np.float64]]
+
+    def __init__(self, family: FCShapeFamilyLiteral, dim: int, nodes: List[List[float]],
+                 exponents: List[Tuple[int, ...]], center: List[float],
+                 collapse: Optional[List[int]] = None):
+
+        self.family = family
+        self.dim = dim
+        self._exponents = _monomials(exponents)
+        self.order = int(np.max(self._exponents))
+
+        base_nodes = np.array(nodes, dtype=np.float64)
+        vandermonde = self._basis(base_nodes)
+        self._coefficients = np.linalg.inv(vandermonde)
+        self.center = np.array(center, dtype=np.float64)
+
+        self._collapse = None
+        self.nodes = base_nodes
+        if collapse is not None:
+            # collapse[i] — номер узла вырожденного элемента для узла базового
+            matrix = np.zeros((len(collapse), max(collapse) + 1))
+            matrix[np.arange(len(collapse)), collapse] = 1.0
+            self._collapse = matrix
+            self.nodes = np.array([base_nodes[collapse.index(j)] for j in range(max(collapse) + 1)])
+
+
+    def _powers(self, xi: NDArray[np.float64]) -> List[NDArray[np.float64]]:
+        """Степени каждой координаты: список (P, order + 1) по осям."""
+        degrees = np.arange(self.order + 1)
+        return [xi[:, d, None] ** degrees for d in range(self.dim)]
+
+
+    def _basis(self, xi: NDArray[np.float64]) -> NDArray[np.float64]:
+        powers = self._powers(xi)
+        basis = np.ones((len(xi), len(self._exponents)))
+        for d in range(self.dim):
+            basis *= powers[d][:, self._exponents[:, d]]
+        return basis
+
+
+    def values(self, xi: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Значения функций формы (P, k)."""
+        values: NDArray[np.float64] = self._basis(xi) @ self._coefficients
+        if self._collapse is not None:
+            values = values @ self._collapse
+        return values
+
+
+    def gradients(self, xi: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Производные функций формы по параметрическим координатам (P, k, dim)."""
+        powers = self._powers(xi)
+        degrees = np.arange(self.order + 1)
+        # Производные степеней: e * x^(e-1)
+        derivatives = [np.concatenate([np.zeros((len(xi), 1)), degrees[1:] * p[:, :-1]], axis=1)
+                       for p in powers]
+        out = np.empty((len(xi), self._coefficients.shape[1], self.dim))
+        for d in range(self.dim):
+            basis = derivatives[d][:, self._exponents[:, d]]
+            for other in range(self.dim):
+                if other != d:
+                    basis = basis * powers[other][:, self._exponents[:, other]]
+            out[:, :, d] = basis @ self._coefficients
+        if self._collapse is not None:
+            out = np.einsum('pkd,kn->pnd', out, self._collapse)
+        return out
+
+
+    def lattice(self, count: int) -> NDArray[np.float64]:
+        """Равномерная решётка `count` точек на ось, обрезанная по опорной области."""
+        lo = self.nodes.min(axis=0)
+        hi = self.nodes.max(axis=0)
+        axes = [np.linspace(lo[d], hi[d], count) for d in range(self.dim)]
+        grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, self.dim)
+        inside: NDArray[np.float64] = grid[self.violation(grid) <= 1e-12]
+        return inside
+
+
+    def violation(self, xi: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Насколько параметрические точки выходят за опорную область
+        (0 — точка внутри или на границе).
+        """
+        if self.family in ('TRI3', 'TRI6', 'TETRA4', 'TETRA10'):
+            parts = [-xi, (xi.sum(axis=1) - 1.0)[:, None]]
+        elif self.family in ('WEDGE6', 'WEDGE15'):
+            parts = [-xi[:, :2], (xi[:, :2].sum(axis=1) - 1.0)[:, None], np.abs(xi[:, 2:]) - 1.0]
+        else:
+            parts = [np.abs(xi) - 1.0]
+        violation: NDArray[np.float64] = np.maximum(np.concatenate(parts, axis=1).max(axis=1), 0.0)
+        return violation
+
+
+    def quadrature(self, count: Optional[int] = None) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Квадратура Гаусса в опорной области: точки (Q, dim) и веса (Q,).
+        `count` — число точек Гаусса–Лежандра по направлению (по умолчанию order + 1).
+        Симплексы получаются из куба преобразованием Даффи.
+        """
+        count = self.order + 1 if count is None else count
+        g, w = np.polynomial.legendre.leggauss(count)
+        # Те же точки на [0, 1]
+        u = (g + 1.0) / 2.0
+        v = w / 2.0
+
+        if self.family in ('TRI3', 'TRI6', 'WEDGE6', 'WEDGE15'):
+            a, b = [x.ravel() for x in np.meshgrid(u, u, indexing='ij')]
+            wa, wb = [x.ravel() for x in np.meshgrid(v, v, indexing='ij')]
+            points = np.stack([a, b * (1.0 - a)], axis=1)
+            weights = wa * wb * (1.0 - a)
+            if self.dim == 3:
+                points = np.concatenate([np.repeat(points, count, axis=0), np.tile(g, len(points))[:, None]], axis=1)
+                weights = np.repeat(weights, count) * np.tile(w, len(weights))
+        elif self.family in ('TETRA4', 'TETRA10'):
+            a, b, c = [x.ravel() for x in np.meshgrid(u, u, u, indexing='ij')]
+            wa, wb, wc = [x.ravel() for x in np.meshgrid(v, v, v, indexing='ij')]
+            points = np.stack([a, b * (1.0 - a), c * (1.0 - a) * (1.0 - b)], axis=1)
+            weights = wa * wb * wc * (1.0 - a) ** 2 * (1.0 - b)
+        else:
+            points = np.stack([x.ravel() for x in np.meshgrid(*[g] * self.dim, indexing='ij')], axis=1)
+            weights = np.prod(np.stack([x.ravel() for x in np.meshgrid(*[w] * self.dim, indexing='ij')], axis=1), axis=1)
+        return points, weights
+
+
+    def _jacobian(self, coords: NDArray[np.float64], points: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Компоненты матрицы Якоби в точках `points`: [c, n, d, q] — dx_c/dxi_d, (3, N, dim, Q)."""
+        gradients = self.gradients(points).transpose(1, 2, 0)       # (k, dim, Q)
+        size, nodes = coords.shape[:2]
+        flat = np.ascontiguousarray(coords.transpose(2, 0, 1)).reshape(3 * size, nodes)
+        jacobian: NDArray[np.float64] = (flat @ gradients.reshape(nodes, -1)).reshape(3, size, self.dim, len(points))
+        return jacobian
+
+
+    def _density(self, coords: NDArray[np.float64],
+                 count: Optional[int]) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Веса интегрирования по элементам `coords` (N, k, 3): модуль якобиана,
+        умноженный на вес квадратуры (N, Q), и значения функций формы (Q, k).
+        """
+        points, weights = self.quadrature(count)
+        values = self.values(points)                                # (Q, k)
+        x, y, z = self._jacobian(coords, points)
+        if self.dim == 1:
+            density = np.sqrt(x[:, 0]**2 + y[:, 0]**2 + z[:, 0]**2)
+        elif self.dim == 2:
+            density = np.sqrt((y[:, 0] * z[:, 1] - z[:, 0] * y[:, 1])**2
+                              + (z[:, 0] * x[:, 1] - x[:, 0] * z[:, 1])**2
+                              + (x[:, 0] * y[:, 1] - y[:, 0] * x[:, 1])**2)
+        else:
+            density = np.abs(x[:, 0] * (y[:, 1] * z[:, 2] - y[:, 2] * z[:, 1])
+                             - x[:, 1] * (y[:, 0] * z[:, 2] - y[:, 2] * z[:, 0])
+                             + x[:, 2] * (y[:, 0] * z[:, 1] - y[:, 1] * z[:, 0]))
+        weighted: NDArray[np.float64] = density * weights
+        return weighted, values
+
+
+    def geometry(self, coords: NDArray[np.float64],
+                 count: Optional[int] = None) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Меры и центры тяжести элементов с узлами `coords` (N, k, 3):
+        длина для dim=1, площадь для dim=2, объём для dim=3 (N,) и центры (N, 3).
+        Интегрирование — квадратурой `quadrature(count)`.
+        """
+        density, values = self._density(coords, count)
+        size, nodes = coords.shape[:2]
+
+        measures: NDArray[np.float64] = density.sum(axis=1)
+        # Центр тяжести: интеграл x по элементу, делённый на меру
+        moments = (density @ values).reshape(size, 1, nodes) @ coords  # (N, 1, 3)
+        total = np.where(measures > 0, measures, 1.0)
+        centroids: NDArray[np.float64] = moments[:, 0, :] / total[:, None]
+        # Вырожденные элементы: центр — среднее узлов
+        degenerate = measures <= 0
+        centroids[degenerate] = coords[degenerate].mean(axis=1)
+        return measures, centroids
+
+
+    def surface(self, coords: NDArray[np.float64],
+                count: Optional[int] = None) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Площади (N,) и векторы площади (N, 3) — интегралы dx/dxi × dx/deta —
+        поверхностей с узлами `coords` (N, k, 3) для dim=2. Вектор площади
+        направлен по обходу узлов против часовой стрелки.
+        """
+        if self.dim != 2:
+            raise ValueError(f"surface() requires a 2D shape, got {self.family}")
+        points, weights = self.quadrature(count)
+        x, y, z = self._jacobian(coords, points)
+        normal = np.stack([y[:, 0] * z[:, 1] - z[:, 0] * y[:, 1],
+                           z[:, 0] * x[:, 1] - x[:, 0] * z[:, 1],
+                           x[:, 0] * y[:, 1] - y[:, 0] * x[:, 1]])     # (3, N, Q)
+        areas: NDArray[np.float64] = np.sqrt((normal ** 2).sum(axis=0)) @ weights
+        vectors: NDArray[np.float64] = (normal @ weights).T
+        return areas, vectors
+
+
+    def moments(self, coords: NDArray[np.float64], count: Optional[int] = None
+                ) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Моменты элементов с узлами `coords` (N, k, 3): мера (N,), первый
+        момент — интеграл x (N, 3) и второй — интеграл x xᵀ (N, 3, 3).
+        По умолчанию точек квадратуры на одну больше, чем в `geometry`:
+        подынтегральное выражение второго момента на два порядка выше.
+        """
+        density, values = self._density(coords, self.order + 2 if count is None else count)
+        size, nodes = coords.shape[:2]
+        # Координаты точек квадратуры по компонентам: (3, N, Q)
+        flat = np.ascontiguousarray(coords.transpose(2, 0, 1)).reshape(3 * size, nodes)
+        points = (flat @ values.T).reshape(3, size, -1)
+        weighted = points * density
+        measures: NDArray[np.float64] = density.sum(axis=1)
+        first: NDArray[np.float64] = weighted.sum(axis=2).T
+        second = np.empty((size, 3, 3))
+        for i in range(3):
+            for j in range(i, 3):
+                second[:, i, j] = second[:, j, i] = np.einsum('nq,nq->n', weighted[i], points[j])
+        return measures, first, second
+
+
+    def __repr__(self) -> str:
+        return f"<FCShape {self.family} dim:{self.dim} nodes:{len(self.nodes)}>"
+
+
+FC_SHAPES: Dict[FCShapeFamilyLiteral, FCShape] = {
+    'LINE2': FCShape('LINE2', 1, _LINE[:2], _full(1, 1), [0.0]),
+    'LINE3': FCShape('LINE3', 1, _LINE, _full(1, 2), [0.0]),
+    'TRI3': FCShape('TRI3', 2, _TRI[:3], _full(2, 1), [1 / 3, 1 / 3]),
+    'TRI6': FCShape('TRI6', 2, _TRI, _full(2, 2), [1 / 3, 1 / 3]),
+    'QUAD4': FCShape('QUAD4', 2, _QUAD[:4], _tensor(2, 1), [0.0, 0.0]),
+    'QUAD8': FCShape('QUAD8', 2, _QUAD, _serendipity(2), [0.0, 0.0]),
+    'TETRA4': FCShape('TETRA4', 3, _TETRA[:4], _full(3, 1), [0.25, 0.25, 0.25]),
+    'TETRA10': FCShape('TETRA10', 3, _TETRA, _full(3, 2), [0.25, 0.25, 0.25]),
+    'HEX8': FCShape('HEX8', 3, _HEX[:8], _tensor(3, 1), [0.0, 0.0, 0.0]),
+    'HEX20': FCShape('HEX20', 3, _HEX, _serendipity(3), [0.0, 0.0, 0.0]),
+    'WEDGE6': FCShape('WEDGE6', 3, _WEDGE[:6], _wedge(1), [1 / 3, 1 / 3, 0.0]),
+    'WEDGE15': FCShape('WEDGE15', 3, _WEDGE, _wedge(2), [1 / 3, 1 / 3, 0.0]),
+    # Пирамиды: вершина 4 получена стягиванием верхней грани шестигранника,
+    # рёбра к вершине (9..12) — из вертикальных рёбер (16..19).
+    'PYR5': FCShape('PYR5', 3, _HEX[:8], _tensor(3, 1), [0.0, 0.0, -0.5],
+                    collapse=[0, 1, 2, 3, 4, 4, 4, 4]),
+    'PYR13': FCShape('PYR13', 3, _HEX, _serendipity(3), [0.0, 0.0, -0.5],
+                     collapse=[0, 1, 2, 3, 4, 4, 4, 4, 5, 6, 7, 8, 4, 4, 4, 4, 9, 10, 11, 12]),
+}
+
+
+_FAMILIES_BY_SIZE: Dict[Tuple[int, int], FCShapeFamilyLiteral] = {
+    (1, 2): 'LINE2', (1, 3): 'LINE3',
+    (2, 3): 'TRI3', (2, 6): 'TRI6', (2, 4): 'QUAD4', (2, 8): 'QUAD8',
+    (3, 4): 'TETRA4', (3, 10): 'TETRA10', (3, 8): 'HEX8', (3, 20): 'HEX20',
+    (3, 6): 'WEDGE6', (3, 15): 'WEDGE15', (3, 5): 'PYR5', (3, 13): 'PYR13',
+}
+
+
+def shape_for(dim: int, nodes: int) -> Optional[FCShape]:
+    """Опорный элемент по размерности и числу узлов типа (None для точечных типов)."""
+    family = _FAMILIES_BY_SIZE.get((dim, nodes))
+    return FC_SHAPES[family] if family is not None else None
@@ -0,0 +1,83 @@
+from typing import Iterator, List, Optional, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, FCMesh, lookup
+from .fc_shapes import shape_for
+
+
+class FCSideGeometry(TypedDict):
+    areas: NDArray[np.float64]      # (K,) площади сторон
+    normals: NDArray[np.float64]    # (K, 3) единичные внешние нормали (направление вектора площади)
+    vectors: NDArray[np.float64]    # (K, 3) векторы площади — интегралы нормали по стороне
+
+
+def _side_groups(mesh: FCMesh, sides: NDArray[np.int32]) -> Iterator[Tuple[NDArray[np.int64], List[int], int, NDArray[np.int32]]]:
+    """
+    Стороны (id элемента, номер грани в таблице `facets`) группами одного
+    типа и номера грани: номера строк `sides`, узлы грани в порядке обхода
+    таблицы, порядок типа и id узлов граней (n, m).
+    """
+    pairs = np.asarray(sides, np.int64).reshape(-1, 2)
+    found = np.zeros(len(pairs), np.bool_)
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+        arrays = mesh.element_arrays(typename)
+        rows = lookup(arrays['ids'], pairs[:, 0])
+        present = rows >= 0
+        found |= present
+        facets = element_type['facets']
+        bad = present & ((pairs[:, 1] < 0) | (pairs[:, 1] >= len(facets)))
+        if np.any(bad):
+            raise ValueError(f"{typename} element {pairs[bad][0, 0]} has no side {pairs[bad][0, 1]}")
+        for f, facet in enumerate(facets):
+            members = np.nonzero(present & (pairs[:, 1] == f))[0]
+            if len(members):
+                yield members, facet, element_type['order'], arrays['nodes'][rows[members]][:, facet]
+    if not np.all(found):
+        raise KeyError(f"Sides reference elements missing in the mesh: {np.unique(pairs[~found, 0])[:10].tolist()}")
+
+
+def side_nodes(mesh: FCMesh, sides: NDArray[np.int32]) -> NDArray[np.int32]:
+    """
+    Id узлов сторон (K, m) в порядке обхода таблицы `facets` (внешняя нормаль
+    по правилу правой руки); m — наибольшее число узлов стороны, недостающие
+    узлы сторон с меньшим числом узлов заполняются -1.
+    """
+    groups = list(_side_groups(mesh, sides))
+    width = max((len(facet) for _, facet, _, _ in groups), default=0)
+    nodes = np.full((len(np.asarray(sides).reshape(-1, 2)), width), -1, np.int32)
+    for members, facet, _, face_nodes in groups:
+        nodes[members, :len(facet)] = face_nodes
+    return nodes
+
+
+def side_geometry(mesh: FCMesh, sides: NDArray[np.int32], count: Optional[int] = None) -> FCSideGeometry:
+    """
+    Площади, векторы площади и внешние нормали сторон. Сторона интегрируется
+    как поверхность TRI3/TRI6/QUAD4/QUAD8 по квадратуре Гаусса (`count` точек
+    на ось, по умолчанию — по порядку формы), так что криволинейные
+    квадратичные грани учитываются точно в пределах квадратуры.
+    """
+    size = len(np.asarray(sides).reshape(-1, 2))
+    areas = np.zeros(size, np.float64)
+    vectors = np.zeros((size, 3), np.float64)
+    xyz = np.asarray(mesh.nodes_xyz, np.float64).reshape(-1, 3)
+    for members, facet, order, face_nodes in _side_groups(mesh, sides):
+        shape = shape_for(2, len(facet))
+        if shape is None:
+            raise ValueError(f"Side with {len(facet)} nodes is not a surface")
+        # Обход грани чередует угловые и срединные узлы; форма ждёт сначала углы
+        local = np.arange(len(facet))
+        if order == 2:
+            local = np.concatenate([local[0::2], local[1::2]])
+        positions = mesh.node_positions(face_nodes[:, local])
+        if np.any(positions < 0):
+            raise KeyError("Sides reference nodes missing in the mesh")
+        areas[members], vectors[members] = shape.surface(xyz[positions], count)
+    lengths = np.linalg.norm(vectors, axis=1)
+    normals = np.divide(vectors, lengths[:, None], out=np.zeros_like(vectors), where=lengths[:, None] > 0)
+    return {'areas': areas, 'normals': normals, 'vectors': vectors}
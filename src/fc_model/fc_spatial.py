@@ -0,0 +1,710 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_shapes import FCShape
+
+
+def _quantize(xyz: NDArray[np.float64], bits: int) -> NDArray[np.uint64]:
+    """Целочисленные координаты 0..2^bits-1 в общем кубе (пропорции сохраняются)."""
+    xyz = np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+    if len(xyz) == 0:
+        return np.zeros((0, 3), np.uint64)
+    lo = xyz.min(axis=0)
+    extent = float(np.max(xyz.max(axis=0) - lo))
+    scale = (2**bits - 1) / extent if extent > 0 else 0.0
+    cells: NDArray[np.uint64] = np.floor((xyz - lo) * scale).astype(np.uint64)
+    return cells
+
+
+def _spread(x: NDArray[np.uint64]) -> NDArray[np.uint64]:
+    """Разрежает 21 младший бит: бит i переходит в позицию 3i."""
+    x = x & np.uint64(0x1fffff)
+    x = (x | x << np.uint64(32)) & np.uint64(0x1f00000000ffff)
+    x = (x | x << np.uint64(16)) & np.uint64(0x1f0000ff0000ff)
+    x = (x | x << np.uint64(8)) & np.uint64(0x100f00f00f00f00f)
+    x = (x | x << np.uint64(4)) & np.uint64(0x10c30c30c30c30c3)
+    x = (x | x << np.uint64(2)) & np.uint64(0x1249249249249249)
+    return x
+
+
+def _interleave(cells: NDArray[np.uint64]) -> NDArray[np.uint64]:
+    keys: NDArray[np.uint64] = (_spread(cells[:, 0]) << np.uint64(2)) | \
+        (_spread(cells[:, 1]) << np.uint64(1)) | _spread(cells[:, 2])
+    return keys
+
+
+def morton_keys(xyz: NDArray[np.float64], bits: int = 21) -> NDArray[np.uint64]:
+    """Ключи кривой Мортона (Z-порядок) для точек (N, 3); bits — точность по оси (до 21)."""
+    if not 1 <= bits <= 21:
+        raise ValueError(f"bits must be in 1..21, got {bits}")
+    return _interleave(_quantize(xyz, bits))
+
+
+def hilbert_keys(xyz: NDArray[np.float64], bits: int = 21) -> NDArray[np.uint64]:
+    """
+    Ключи кривой Гильберта для точек (N, 3); bits — точность по оси (до 21).
+    Преобразование координат — алгоритм Скиллинга, векторно по всем точкам.
+    """
+    if not 1 <= bits <= 21:
+        raise ValueError(f"bits must be in 1..21, got {bits}")
+    x = [column.copy() for column in _quantize(xyz, bits).T]
+
+    # Обратное отражение/поворот по битам от старшего к младшему
+    q = 1 << (bits - 1)
+    while q > 1:
+        p = np.uint64(q - 1)
+        for i in range(3):
+            high = (x[i] & np.uint64(q)) != 0
+            x[0] = np.where(high, x[0] ^ p, x[0])
+            t = np.where(high, np.uint64(0), (x[0] ^ x[i]) & p)
+            x[0] ^= t
+            x[i] ^= t
+        q >>= 1
+
+    # Код Грея
+    x[1] ^= x[0]
+    x[2] ^= x[1]
+    t = np.zeros_like(x[0])
+    q = 1 << (bits - 1)
+    while q > 1:
+        t = np.where((x[2] & np.uint64(q)) != 0, t ^ np.uint64(q - 1), t)
+        q >>= 1
+    return _interleave(np.stack([xi ^ t for xi in x], axis=1))
+
+
+def _hash_cells(cells: NDArray[np.int64]) -> NDArray[np.uint64]:
+    """Перемешивающий 64-битный хэш целочисленных координат ячеек (коллизии допустимы)."""
+    c = cells.astype(np.uint64)
+    keys: NDArray[np.uint64] = (c[:, 0] * np.uint64(0x9E3779B97F4A7C15)) ^ \
+        (c[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)) ^ (c[:, 2] * np.uint64(0x165667B19E3779F9))
+    return keys
+
+
+def _expand(start: NDArray[np.int64], count: NDArray[np.int64]) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Для диапазонов [start, start + count) — номер диапазона и позиция каждого элемента."""
+    total = int(count.sum())
+    owner = np.repeat(np.arange(len(count)), count)
+    local = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+    return owner, np.repeat(start, count) + local
+
+
+def coincident_pairs(xyz: NDArray[np.float64], tol: float) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    Все пары точек (i < j) на расстоянии не больше `tol`.
+
+    Точки хэшируются по ячейкам размера 2·tol, так что в ячейке лежит
+    ограниченное допуском число точек. Пары ищутся внутри ячейки и с 13
+    «следующими» соседними ячейками (половина окрестности 3×3×3), поэтому
+    каждая пара соседних ячеек просматривается один раз.
+    """
+    xyz = np.ascontiguousarray(xyz, dtype=np.float64).reshape(-1, 3)
+    empty = np.array([], np.int64)
+    if tol < 0:
+        raise ValueError(f"tolerance must be non-negative, got {tol}")
+    if len(xyz) < 2:
+        return empty, empty
+
+    lo = xyz.min(axis=0)
+    extent = float(np.max(xyz.max(axis=0) - lo))
+    size = 2.0 * tol if tol > 0 else max(extent, 1.0) / 2.0**20
+    if extent / size >= 2.0**62:
+        raise ValueError("tolerance is too small for the extent of the points")
+
+    cells = np.floor((xyz - lo) / size).astype(np.int64)
+    keys = _hash_cells(cells)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    boundary = np.ones(len(sorted_keys), np.bool_)
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=boundary[1:])
+    starts = np.nonzero(boundary)[0]
+    counts = np.diff(np.append(starts, len(sorted_keys)))
+    unique_keys = sorted_keys[starts]
+
+    # Пары внутри ячейки
+    crowded = np.nonzero(counts > 1)[0]
+    _, member = _expand(starts[crowded], counts[crowded])
+    group_end = np.repeat(starts[crowded] + counts[crowded], counts[crowded])
+    first, second = _expand(member + 1, group_end - member - 1)
+    pair_i = [order[member[first]]]
+    pair_j = [order[second]]
+
+    # Пары с соседними ячейками: сдвиги, лексикографически большие нуля.
+    # Совпадающие точки (tol = 0) всегда в одной ячейке
+    if tol > 0:
+        cell_of = cells[order[starts]]
+        for shift in np.array(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing='ij')).reshape(3, -1).T[14:]:
+            neighbor = _hash_cells(cell_of + shift)
+            pos = np.searchsorted(unique_keys, neighbor)
+            pos[pos == len(unique_keys)] = 0
+            hit = np.nonzero(unique_keys[pos] == neighbor)[0]
+            # Каждая точка ячейки со всеми точками соседней
+            owner, member = _expand(starts[hit], counts[hit])
+            other = pos[hit][owner]
+            query, partner = _expand(starts[other], counts[other])
+            pair_i.append(order[member[query]])
+            pair_j.append(order[partner])
+
+    i = np.concatenate(pair_i)
+    j = np.concatenate(pair_j)
+    close = np.sum((xyz[i] - xyz[j])**2, axis=1) <= tol * tol
+    i, j = np.minimum(i[close], j[close]), np.maximum(i[close], j[close])
+    keep = i != j
+    pairs = np.unique(i[keep] * np.int64(len(xyz)) + j[keep])
+    return pairs // len(xyz), pairs % len(xyz)
+
+def coincident_groups(xyz: NDArray[np.float64], tol: float) -> NDArray[np.int64]:
+    """
+    Для каждой точки — номер наименьшей точки её группы совпадающих точек
+    (группы — компоненты связности пар на расстоянии не больше `tol`).
+    """
+    i, j = coincident_pairs(xyz, tol)
+    label = np.arange(len(xyz), dtype=np.int64)
+    if len(i) == 0:
+        return label
+
+    # Распространение минимальной метки со сжатием путей
+    while True:
+        previous = label.copy()
+        np.minimum.at(label, i, label[j])
+        np.minimum.at(label, j, label[i])
+        label = label[label]
+        if np.array_equal(label, previous):
+            return label
+
+
+class FCNodeIndex:
+    """
+    Пространственный индекс точек на равномерной сетке-хэше.
+
+    Точки раскладываются по кубическим ячейкам размера `cell_size` и хранятся
+    отсортированными по линейному ключу ячейки. Запросы (ближайший, k ближайших,
+    радиус) выполняются пачками: для всех точек запроса одновременно
+    перебираются слои соседних ячеек, кандидаты собираются векторно.
+
+    Все методы возвращают позиции строк исходного массива `xyz`
+    (для сетки — индексы в `FCMesh.nodes_ids`/`FCMesh.nodes_xyz`).
+    """
+
+    xyz: NDArray[np.float64]
+    cell_size: float
+    origin: NDArray[np.float64]
+    shape: NDArray[np.int64]
+
+    order: NDArray[np.int64]            # Индексы точек, отсортированные по ключу ячейки
+    sorted_xyz: NDArray[np.float64]     # Координаты точек в порядке order
+    keys: NDArray[np.int64]             # Отсортированные ключи непустых ячеек
+    offsets: NDArray[np.int64]          # Границы непустых ячеек в sorted_xyz (len(keys) + 1)
+    table: Optional[NDArray[np.int64]]  # Плотная таблица границ всех ячеек, если она невелика
+
+    def __init__(self, xyz: NDArray[np.float64], cell_size: Optional[float] = None,
+                 points_per_cell: float = 1.0):
+
+        xyz = np.ascontiguousarray(xyz, dtype=np.float64).reshape(-1, 3)
+        self.xyz = xyz
+        self.table = None
+
+        if len(xyz) == 0:
+            self.cell_size = 1.0
+            self.origin = np.zeros(3, np.float64)
+            self.shape = np.ones(3, np.int64)
+            self.order = np.array([], np.int64)
+            self.sorted_xyz = xyz
+            self.keys = np.array([], np.int64)
+            self.offsets = np.zeros(1, np.int64)
+            return
+
+        lo = xyz.min(axis=0)
+        hi = xyz.max(axis=0)
+        extent = hi - lo
+
+        if cell_size is None:
+            cell_size = self._estimate_cell_size(extent, len(xyz), points_per_cell)
+        if not cell_size > 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+
+        self.cell_size = float(cell_size)
+        self.origin = lo
+        self.shape = np.floor(extent / self.cell_size).astype(np.int64) + 1
+
+        cells_count = float(np.prod(self.shape.astype(np.float64)))
+        if cells_count >= 2.0**62:
+            raise ValueError("cell_size is too small for the extent of the points")
+
+        keys = self._keys(self._cells(xyz))
+        self.order = np.argsort(keys, kind='stable').astype(np.int64)
+        self.sorted_xyz = xyz[self.order]
+
+        self.keys, counts = np.unique(keys[self.order], return_counts=True)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        # Для компактных облаков точек поиск ячейки — прямая адресация
+        if cells_count <= 4 * len(xyz) + 1024:
+            dense = np.bincount(keys, minlength=int(cells_count))
+            self.table = np.concatenate([[0], np.cumsum(dense)]).astype(np.int64)
+
+
+    @staticmethod
+    def _estimate_cell_size(extent: NDArray[np.float64], size: int, points_per_cell: float) -> float:
+        # Размер ячейки подбирается по "эффективной" размерности облака точек,
+        # чтобы плоские (2D) и линейные сетки не давали вырожденный объём.
+        scale = float(np.max(extent))
+        if scale == 0.0:
+            return 1.0
+        active = extent[extent > scale * 1e-9]
+        measure = float(np.prod(active))
+        return float((measure * points_per_cell / size) ** (1.0 / len(active)))
+
+
+    def _cells(self, points: NDArray[np.float64]) -> NDArray[np.int64]:
+        cells: NDArray[np.int64] = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.shape - 1)
+
+
+    def _keys(self, cells: NDArray[np.int64]) -> NDArray[np.int64]:
+        keys: NDArray[np.int64] = cells[..., 0] + self.shape[0] * (cells[..., 1] + self.shape[1] * cells[..., 2])
+        return keys
+
+
+    def _ranges(self, keys: NDArray[np.int64]) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Начало и количество точек ячеек с ключами `keys` в sorted_xyz."""
+        if self.table is not None:
+            start = self.table[keys]
+            return start, self.table[keys + 1] - start
+
+        pos = np.searchsorted(self.keys, keys)
+        pos[pos == len(self.keys)] = 0
+        found = self.keys[pos] == keys
+        start = self.offsets[pos]
+        count = np.where(found, self.offsets[pos + 1] - start, 0)
+        return start, count
+
+
+    def _shell(self, layer: int) -> NDArray[np.int64]:
+        """Смещения ячеек, лежащих ровно на расстоянии `layer` (по Чебышёву)."""
+        offsets = self._cube(layer)
+        shell: NDArray[np.int64] = offsets[np.abs(offsets).max(axis=1) == layer]
+        return shell
+
+
+    def _cube(self, layer: int) -> NDArray[np.int64]:
+        """Смещения всех ячеек на расстоянии не больше `layer`."""
+        reach = np.minimum(layer, self.shape - 1)
+        axes = [np.arange(-r, r + 1, dtype=np.int64) for r in reach]
+        cube: NDArray[np.int64] = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+        return cube
+
+
+    def _candidates(self, cells: NDArray[np.int64], shifts: NDArray[np.int64]
+                    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Собирает пары (номер запроса, позиция точки в sorted_xyz) для точек
+        из ячеек `cells + shifts`. Пары упорядочены по номеру запроса.
+        """
+        near = cells[:, None, :] + shifts[None, :, :]
+        valid = np.all((near >= 0) & (near < self.shape), axis=2)
+        query, _ = np.nonzero(valid)
+        start, count = self._ranges(self._keys(near[valid]))
+
+        nonempty = count > 0
+        query = query[nonempty]
+        start = start[nonempty]
+        count = count[nonempty]
+
+        total = int(count.sum())
+        pair_query = np.repeat(query, count).astype(np.int64)
+        # Позиция внутри ячейки: сквозной номер минус начало группы
+        group_start = np.repeat(np.cumsum(count) - count, count)
+        pair_point = np.repeat(start, count) + (np.arange(total, dtype=np.int64) - group_start)
+        return pair_query, pair_point
+
+
+    def _gap(self, points: NDArray[np.float64], cells: NDArray[np.int64], layer: int) -> NDArray[np.float64]:
+        """
+        Нижняя оценка расстояния до точек вне уже просмотренных слоёв.
+        Стороны, за которыми ячеек сетки больше нет, не ограничивают поиск.
+        """
+        lo_cell = cells - layer
+        hi_cell = cells + layer + 1
+        lo = np.where(lo_cell <= 0, np.inf, points - (self.origin + lo_cell * self.cell_size))
+        hi = np.where(hi_cell >= self.shape, np.inf, (self.origin + hi_cell * self.cell_size) - points)
+        gap: NDArray[np.float64] = np.minimum(lo, hi).min(axis=1)
+        return gap
+
+
+    def _query_order(self, points: NDArray[np.float64]) -> NDArray[np.int64]:
+        """Порядок обхода точек запроса по ячейкам — для локальности обращений к памяти."""
+        order: NDArray[np.int64] = np.argsort(self._keys(self._cells(points)), kind='stable').astype(np.int64)
+        return order
+
+
+    def knearest(self, points: NDArray[np.float64], k: int, chunk_size: int = 65536
+                 ) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """
+        Ищет `k` ближайших точек индекса для каждой точки запроса.
+
+        Возвращает массивы формы (M, k): индексы точек и расстояния,
+        упорядоченные по возрастанию расстояния.
+        """
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(self.xyz) == 0:
+            raise ValueError("FCNodeIndex is empty")
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        k = min(k, len(self.xyz))
+
+        index = np.empty((len(points), k), np.int64)
+        dist = np.empty((len(points), k), np.float64)
+        query_order = self._query_order(points)
+        for begin in range(0, len(points), chunk_size):
+            chunk = query_order[begin:begin + chunk_size]
+            chunk_index, dist[chunk] = self._knearest_chunk(points[chunk], k)
+            index[chunk] = self.order[chunk_index]
+        return index, dist
+
+
+    def _knearest_chunk(self, points: NDArray[np.float64], k: int
+                        ) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+        size = len(points)
+        best_d2 = np.full((size, k), np.inf)
+        best_idx = np.zeros((size, k), np.int64)
+        cells = self._cells(points)
+
+        active = np.arange(size, dtype=np.int64)
+        layer = 0
+        max_layer = int(np.max(self.shape))
+
+        while len(active):
+            pair_query, pair_point = self._candidates(cells[active], self._shell(layer))
+
+            if len(pair_query):
+                d2 = np.sum((self.sorted_xyz[pair_point] - points[active[pair_query]])**2, axis=1)
+                new_d2, new_idx = self._group_smallest(pair_query, d2, pair_point, len(active), k)
+
+                if layer == 0:
+                    best_d2[active] = new_d2
+                    best_idx[active] = new_idx
+                else:
+                    # Слияние с текущими лучшими: точная сортировка строк длины 2k
+                    all_d2 = np.concatenate([best_d2[active], new_d2], axis=1)
+                    all_idx = np.concatenate([best_idx[active], new_idx], axis=1)
+                    order = np.argsort(all_d2, axis=1, kind='stable')[:, :k]
+                    best_d2[active] = np.take_along_axis(all_d2, order, axis=1)
+                    best_idx[active] = np.take_along_axis(all_idx, order, axis=1)
+
+            gap = self._gap(points[active], cells[active], layer)
+            done = (best_d2[active, -1] <= gap**2) | (layer >= max_layer)
+            active = active[~done]
+            layer += 1
+
+        return best_idx, np.sqrt(best_d2)
+
+
+    @staticmethod
+    def _group_smallest(group: NDArray[np.int64], d2: NDArray[np.float64], idx: NDArray[np.int64],
+                        size: int, k: int) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Для пар, упорядоченных по номеру группы, выбирает `k` наименьших
+        расстояний в каждой группе. Результат — матрицы (size, k), дополненные inf.
+        """
+        out_d2 = np.full((size, k), np.inf)
+        out_idx = np.zeros((size, k), np.int64)
+
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        counts = np.diff(np.r_[starts, len(group)])
+        if k == 1:
+            group_min = np.minimum.reduceat(d2, starts)
+            hit = np.flatnonzero(d2 == np.repeat(group_min, counts))
+            first = hit[np.r_[True, group[hit[1:]] != group[hit[:-1]]]]
+            out_d2[group[first], 0] = d2[first]
+            out_idx[group[first], 0] = idx[first]
+            return out_d2, out_idx
+
+        # Группы уже упорядочены, поэтому достаточно одной сортировки по ключу
+        # "номер группы + нормированное расстояние"; точный порядок внутри
+        # отобранных k восстанавливается при слиянии.
+        scale = np.maximum(np.maximum.reduceat(d2, starts), np.finfo(np.float64).tiny)
+        key = group + 0.5 * d2 / np.repeat(scale, counts)
+        order = np.argsort(key)
+        rank = np.arange(len(group)) - np.repeat(starts, counts)
+        keep = rank < k
+        out_d2[group[keep], rank[keep]] = d2[order][keep]
+        out_idx[group[keep], rank[keep]] = idx[order][keep]
+        return out_d2, out_idx
+
+
+    def nearest(self, points: NDArray[np.float64], chunk_size: int = 65536
+                ) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """Ищет ближайшую точку индекса для каждой точки запроса."""
+        index, dist = self.knearest(points, 1, chunk_size)
+        return index[:, 0], dist[:, 0]
+
+
+    def radius(self, points: NDArray[np.float64], r: float, chunk_size: int = 65536
+               ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Ищет все точки индекса на расстоянии не больше `r` от точек запроса.
+
+        Результат возвращается в CSR-виде: `offsets` длины M+1 и `indices`,
+        точки запроса i соответствуют `indices[offsets[i]:offsets[i+1]]`.
+        Внутри каждой группы индексы упорядочены по возрастанию.
+        """
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        if r < 0:
+            raise ValueError(f"radius must be non-negative, got {r}")
+
+        offsets = np.zeros(len(points) + 1, np.int64)
+        if len(self.xyz) == 0:
+            return offsets, np.array([], np.int64)
+
+        shifts = self._cube(int(np.ceil(r / self.cell_size)))
+        query_parts = []
+        point_parts = []
+        for begin in range(0, len(points), chunk_size):
+            chunk = np.arange(begin, min(begin + chunk_size, len(points)), dtype=np.int64)
+            pair_query, pair_point = self._candidates(self._cells(points[chunk]), shifts)
+            d2 = np.sum((self.sorted_xyz[pair_point] - points[chunk[pair_query]])**2, axis=1)
+            inside = d2 <= r * r
+            query_parts.append(chunk[pair_query[inside]])
+            point_parts.append(self.order[pair_point[inside]])
+
+        pair_query = np.concatenate(query_parts)
+        pair_point = np.concatenate(point_parts)
+        order = np.lexsort((pair_point, pair_query))
+        offsets[1:] = np.cumsum(np.bincount(pair_query, minlength=len(points)))
+        return offsets, pair_point[order]
+
+
+    def __len__(self) -> int:
+        return len(self.xyz)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FCNodeIndex points:{len(self.xyz)} cells:{len(self.keys)} cell_size:{self.cell_size:g}>"
+        )
+
+
+
+class FCElementLocator:
+    """
+    Поиск элементов, содержащих заданные точки.
+
+    Габаритные параллелепипеды элементов раскладываются по ячейкам равномерной
+    сетки. Кандидатами для точки служат элементы её ячейки, чей габарит содержит
+    точку; для всех пар (точка, элемент) одного типа обратное отображение
+    x(ξ) = p решается векторно методом Ньютона.
+
+    Элементы передаются группами одной размерности `dim`: опорный элемент,
+    id элементов (N,) и координаты их узлов (N, k, 3). Для плоских элементов
+    (dim = 2) используются координаты x, y.
+    """
+
+    dim: int
+    shapes: List[FCShape]
+    ids: NDArray[np.int32]              # id всех элементов подряд по группам
+    starts: NDArray[np.int64]           # Границы групп в ids (len(shapes) + 1)
+    coords: List[NDArray[np.float64]]   # Координаты узлов элементов групп (N, k, dim)
+    lo: NDArray[np.float64]             # Габариты элементов (E, dim)
+    hi: NDArray[np.float64]
+
+    cell_size: float
+    origin: NDArray[np.float64]
+    shape: NDArray[np.int64]
+    keys: NDArray[np.int64]             # Отсортированные ключи непустых ячеек
+    offsets: NDArray[np.int64]          # Границы ячеек в cell_elements (len(keys) + 1)
+    cell_elements: NDArray[np.int64]    # Номера элементов (в ids), сгруппированные по ячейкам
+
+    def __init__(self, groups: Sequence[Tuple[FCShape, NDArray[np.int32], NDArray[np.float64]]]):
+
+        dims = {shape.dim for shape, _, _ in groups}
+        if len(dims) > 1:
+            raise ValueError(f"all element groups must have the same dimension, got {sorted(dims)}")
+        self.dim = dims.pop() if dims else 3
+
+        self.shapes = [shape for shape, _, _ in groups]
+        self.ids = np.concatenate([np.array([], np.int32)] + [ids for _, ids, _ in groups]).astype(np.int32)
+        self.starts = np.concatenate([[0], np.cumsum([len(ids) for _, ids, _ in groups])]).astype(np.int64)
+        self.coords = [np.ascontiguousarray(xyz[:, :, :self.dim], dtype=np.float64) for _, _, xyz in groups]
+
+        if len(self.ids) == 0:
+            self.lo = np.zeros((0, self.dim))
+            self.hi = np.zeros((0, self.dim))
+            self.cell_size = 1.0
+            self.origin = np.zeros(self.dim)
+            self.shape = np.ones(self.dim, np.int64)
+            self.keys = np.array([], np.int64)
+            self.offsets = np.zeros(1, np.int64)
+            self.cell_elements = np.array([], np.int64)
+            return
+
+        self.lo = np.concatenate([xyz.min(axis=1) for xyz in self.coords])
+        self.hi = np.concatenate([xyz.max(axis=1) for xyz in self.coords])
+
+        # Криволинейные (квадратичные) элементы могут выходить за габарит узлов:
+        # габарит дополняется образами точек решётки опорного элемента
+        for shape, begin, xyz in zip(self.shapes, self.starts, self.coords):
+            if shape.order < 2:
+                continue
+            values = shape.values(shape.lattice(5))
+            for chunk in range(0, len(xyz), 8192):
+                image = np.einsum('sk,nkc->nsc', values, xyz[chunk:chunk + 8192])
+                rows = slice(begin + chunk, begin + chunk + len(image))
+                self.lo[rows] = np.minimum(self.lo[rows], image.min(axis=1))
+                self.hi[rows] = np.maximum(self.hi[rows], image.max(axis=1))
+
+        # Ячейка порядка типичного размера элемента: каждый элемент попадает
+        # в несколько ячеек, в ячейке — несколько элементов.
+        size = float(np.median((self.hi - self.lo).max(axis=1)))
+        self.cell_size = size if size > 0 else 1.0
+        self.origin = self.lo.min(axis=0)
+        self.shape = np.floor((self.hi.max(axis=0) - self.origin) / self.cell_size).astype(np.int64) + 1
+
+        if float(np.prod(self.shape.astype(np.float64))) >= 2.0**62:
+            raise ValueError("elements are too small for the extent of the mesh")
+
+        c0 = self._cells(self.lo)
+        c1 = self._cells(self.hi)
+        sizes = c1 - c0 + 1
+        counts = np.prod(sizes, axis=1)
+
+        # Все ячейки, перекрываемые габаритом каждого элемента
+        total = int(counts.sum())
+        element = np.repeat(np.arange(len(self.ids), dtype=np.int64), counts)
+        local = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells = np.empty((total, self.dim), np.int64)
+        for d in range(self.dim):
+            cells[:, d] = c0[element, d] + local % sizes[element, d]
+            local = local // sizes[element, d]
+
+        keys = self._keys(cells)
+        order = np.argsort(keys, kind='stable')
+        self.cell_elements = element[order]
+        self.keys, counts = np.unique(keys[order], return_counts=True)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+
+    def _cells(self, points: NDArray[np.float64]) -> NDArray[np.int64]:
+        cells: NDArray[np.int64] = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.shape - 1)
+
+
+    def _keys(self, cells: NDArray[np.int64]) -> NDArray[np.int64]:
+        keys = np.zeros(len(cells), np.int64)
+        for d in reversed(range(self.dim)):
+            keys = keys * self.shape[d] + cells[:, d]
+        return keys
+
+
+    def _candidates(self, points: NDArray[np.float64], pad: float
+                    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Пары (номер точки, номер элемента), где габарит элемента содержит точку."""
+        inside = np.all((points >= self.origin - pad) &
+                        (points <= self.origin + self.shape * self.cell_size + pad), axis=1)
+        query = np.nonzero(inside)[0]
+        keys = self._keys(self._cells(points[query]))
+
+        pos = np.searchsorted(self.keys, keys)
+        pos[pos == len(self.keys)] = 0
+        found = self.keys[pos] == keys
+        start = self.offsets[pos]
+        count = np.where(found, self.offsets[pos + 1] - start, 0)
+
+        total = int(count.sum())
+        pair_query = np.repeat(query, count)
+        group_start = np.repeat(np.cumsum(count) - count, count)
+        pair_element = self.cell_elements[np.repeat(start, count) + np.arange(total) - group_start]
+
+        p = points[pair_query]
+        hit = np.all((p >= self.lo[pair_element] - pad) & (p <= self.hi[pair_element] + pad), axis=1)
+        return pair_query[hit], pair_element[hit]
+
+
+    @staticmethod
+    def inverse_map(shape: FCShape, coords: NDArray[np.float64], points: NDArray[np.float64],
+                    iterations: int = 20, eps: float = 1e-12
+                    ) -> Tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """
+        Параметрические координаты точек `points` (P, dim) в элементах
+        с узлами `coords` (P, k, dim). Возвращает координаты и признак сходимости.
+        """
+        xi = np.tile(shape.center, (len(points), 1))
+        converged = np.zeros(len(points), np.bool_)
+        active = np.arange(len(points))
+
+        for _ in range(iterations):
+            if len(active) == 0:
+                break
+            x = coords[active]
+            residual = np.einsum('pk,pkc->pc', shape.values(xi[active]), x) - points[active]
+            jacobian = np.einsum('pkd,pkc->pcd', shape.gradients(xi[active]), x)
+
+            # Вырожденный якобиан (например, в вершине пирамиды) — итерации прекращаются
+            regular = np.abs(np.linalg.det(jacobian)) > 0
+            active = active[regular]
+            step = np.linalg.solve(jacobian[regular], residual[regular][:, :, None])[:, :, 0]
+
+            # Ограничение шага удерживает расходящиеся итерации возле опорной области
+            xi[active] = np.clip(xi[active] - step, shape.center - 2.0, shape.center + 2.0)
+
+            done = np.abs(step).max(axis=1) <= eps * (1.0 + np.abs(xi[active]).max(axis=1))
+            converged[active[done]] = True
+            active = active[~done]
+
+        return xi, converged
+
+
+    def locate(self, points: NDArray[np.float64], tol: float = 1e-6, chunk_size: int = 65536
+               ) -> Tuple[NDArray[np.int32], NDArray[np.float64]]:
+        """
+        Для каждой точки (M, 3) возвращает id содержащего её элемента
+        (-1, если точка вне сетки) и параметрические координаты (M, 3)
+        (NaN для ненайденных точек; лишние компоненты для плоских элементов — 0).
+
+        `tol` — допуск выхода за опорную область; точки на общей границе
+        нескольких элементов относятся к элементу с наименьшим нарушением.
+        """
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+
+        result_ids = np.full(len(points), -1, np.int32)
+        result_xi = np.full((len(points), 3), np.nan)
+
+        pad = tol * self.cell_size
+        for begin in range(0, len(points), chunk_size):
+            chunk = points[begin:begin + chunk_size, :self.dim]
+            pair_query, pair_element = self._candidates(chunk, pad)
+
+            violation = np.full(len(pair_query), np.inf)
+            xi = np.zeros((len(pair_query), 3))
+            group = np.searchsorted(self.starts, pair_element, side='right') - 1
+
+            for g, shape in enumerate(self.shapes):
+                sel = np.nonzero(group == g)[0]
+                if len(sel) == 0:
+                    continue
+                local, converged = self.inverse_map(
+                    shape, self.coords[g][pair_element[sel] - self.starts[g]], chunk[pair_query[sel]]
+                )
+                xi[sel, :self.dim] = local
+                violation[sel] = np.where(converged, shape.violation(local), np.inf)
+
+            # Для каждой точки — кандидат с наименьшим нарушением
+            order = np.lexsort((violation, pair_query))
+            first = order[np.concatenate([[True], np.diff(pair_query[order]) != 0])] \
+                if len(order) else order
+            first = first[violation[first] <= tol]
+
+            query = begin + pair_query[first]
+            result_ids[query] = self.ids[pair_element[first]]
+            result_xi[query] = xi[first]
+
+        return result_ids, result_xi
+
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FCElementLocator elements:{len(self.ids)} dim:{self.dim} cells:{len(self.keys)}>"
+        )
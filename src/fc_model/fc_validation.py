@@ -0,0 +1,153 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Literal, Tuple, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import data_values, shell_layers
+from .fc_conditions import FCApplyTargetLiteral
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, lookup
+from .fc_value import FCValue
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+FCValidationProblemLiteral = Literal['missing', 'duplicate', 'invalid']
+
+
+class FCValidationIssue(TypedDict):
+    source: str                           # что ссылается: 'HEX8 elements', 'blocks', 'load 3', 'sideset 2', ...
+    target: str                           # на что: 'nodes', 'elements', 'faces', 'blocks', 'materials', ...
+    problem: FCValidationProblemLiteral   # нет такого id, id повторяется, неверное значение
+    ids: NDArray[np.int32]                # id без повторов (для 'faces' — id элементов)
+    count: int                            # число ошибочных ссылок
+
+
+def _issue(issues: List[FCValidationIssue], source: str, target: str,
+           problem: FCValidationProblemLiteral, ids: NDArray[np.generic]) -> None:
+    if ids.size:
+        issues.append({
+            'source': source, 'target': target, 'problem': problem,
+            'ids': np.unique(ids).astype(np.int32), 'count': int(ids.size),
+        })
+
+
+def _duplicates(ids: NDArray[np.int32]) -> NDArray[np.int32]:
+    ordered = np.sort(ids, kind='stable')
+    repeated: NDArray[np.int32] = ordered[1:][ordered[1:] == ordered[:-1]]
+    return repeated
+
+
+def _missing(keys: Iterable[int], refs: Iterable[int]) -> NDArray[np.int32]:
+    """Ссылки `refs` > 0 (id <= 0 — признак отсутствия), которых нет среди `keys`."""
+    refs_array = np.fromiter(refs, np.int64)
+    refs_array = refs_array[refs_array > 0]
+    missing: NDArray[np.int32] = refs_array[~np.isin(refs_array, np.fromiter(keys, np.int64))].astype(np.int32)
+    return missing
+
+
+def _named_apply_values(model: 'FCModel') -> Iterator[Tuple[str, FCValue, FCApplyTargetLiteral]]:
+    """Массивы ссылок модели (как `fc_addons.apply_values`) с именем владельца."""
+    for nodeset in model.nodesets.values():
+        yield f'nodeset {nodeset.id}', nodeset.apply, 'nodes'
+    for sideset in model.sidesets.values():
+        yield f'sideset {sideset.id}', sideset.apply, 'faces'
+    for load in model.loads:
+        yield f'load {load.id}', load.apply, load.apply_target
+    for restraint in model.restraints:
+        yield f'restraint {restraint.id}', restraint.apply, restraint.apply_target
+    for initial_set in model.initial_sets:
+        yield f'initial_set {initial_set.id}', initial_set.apply, initial_set.apply_target
+    for receiver in model.receivers:
+        yield f'receiver {receiver.id}', receiver.apply, 'nodes'
+    for constraint in model.contact_constraints + model.periodic_constraints:
+        yield f'constraint {constraint.id} master', constraint.master, 'faces'
+        yield f'constraint {constraint.id} slave', constraint.slave, 'faces'
+    for constraint in model.coupling_constraints:
+        yield f'constraint {constraint.id} master', constraint.master, 'nodes'
+        yield f'constraint {constraint.id} slave', constraint.slave, 'nodes'
+
+
+def validate(model: 'FCModel') -> List[FCValidationIssue]:
+    """
+    Проверка ссылочной целостности модели; пустой список — модель корректна.
+
+    Проверяются: уникальность id узлов и элементов, существование узлов
+    элементов и их блоков; материалов, таблиц свойств и систем координат
+    блоков, материалов слоёв оболочек и систем координат условий;
+    узлов, элементов и номеров сторон в наборах, нагрузках, закреплениях,
+    начальных условиях, приёмниках и связях, а также в столбцах
+    TABULAR_NODE_ID/TABULAR_ELEMENT_ID зависимостей. Ссылки-формулы
+    не проверяются. Все проверки — векторные поиски id (`np.isin`, `lookup`).
+    """
+    issues: List[FCValidationIssue] = []
+    mesh = model.mesh
+
+    # Сетка
+    nodes_ids = np.asarray(mesh.nodes_ids, np.int32)
+    if np.asarray(mesh.nodes_xyz).reshape(-1, 3).shape[0] != len(nodes_ids):
+        _issue(issues, 'mesh', 'nodes', 'invalid', np.array([len(nodes_ids)], np.int32))
+    _issue(issues, 'mesh', 'nodes', 'duplicate', _duplicates(nodes_ids))
+
+    element_ids: List[NDArray[np.int32]] = [np.array([], np.int32)]
+    side_counts: List[NDArray[np.int64]] = [np.array([], np.int64)]
+    for typename, bucket in mesh.elements.items():
+        if not bucket:
+            continue
+        arrays = mesh.element_arrays(typename)
+        nodes = arrays['nodes']
+        _issue(issues, f'{typename} elements', 'nodes', 'missing', nodes[mesh.node_positions(nodes) < 0])
+        _issue(issues, f'{typename} elements', 'blocks', 'missing', arrays['blocks'][~np.isin(arrays['blocks'], list(model.blocks))])
+        element_type = FC_ELEMENT_TYPES_KEYNAME[typename]
+        side_count = max(len(element_type['facets']), len(element_type['edges']), 1)
+        element_ids.append(arrays['ids'])
+        side_counts.append(np.full(len(arrays['ids']), side_count, np.int64))
+    all_ids = np.concatenate(element_ids)
+    all_sides = np.concatenate(side_counts)
+    _issue(issues, 'mesh', 'elements', 'duplicate', _duplicates(all_ids))
+
+    # Блоки, таблицы свойств, условия
+    blocks = list(model.blocks.values())
+    _issue(issues, 'blocks', 'materials', 'missing', _missing(model.materials, (
+        [block.material_id for block in blocks] +
+        [mid for block in blocks if block.material is not None for mid in block.material['ids']])))
+    _issue(issues, 'blocks', 'property_tables', 'missing',
+           _missing(model.property_tables, (block.property_id for block in blocks)))
+    _issue(issues, 'blocks', 'coordinate_systems', 'missing',
+           _missing(model.coordinate_systems, (block.cs_id for block in blocks)))
+    _issue(issues, 'property_tables', 'materials', 'missing',
+           _missing(model.materials, (int(layer['material_id']) for layer in shell_layers(model))))
+    for name, conditions in (('loads', model.loads), ('restraints', model.restraints), ('initial_sets', model.initial_sets)):
+        _issue(issues, name, 'coordinate_systems', 'missing',
+               _missing(model.coordinate_systems, (condition.cs_id for condition in conditions)))
+
+    # Ссылки на узлы, элементы и стороны
+    for source, value, target in _named_apply_values(model):
+        if value.type != 'array' or not isinstance(value.data, np.ndarray) or value.data.size == 0:
+            continue
+        data = value.data.astype(np.int32)
+        if target == 'nodes':
+            refs = data.ravel()
+            _issue(issues, source, 'nodes', 'missing', refs[mesh.node_positions(refs) < 0])
+        elif target == 'elements':
+            refs = data.ravel()
+            _issue(issues, source, 'elements', 'missing', refs[lookup(all_ids, refs) < 0])
+        else:
+            pairs = data.reshape(-1, 2)
+            positions = lookup(all_ids, pairs[:, 0])
+            _issue(issues, source, 'elements', 'missing', pairs[positions < 0, 0])
+            found = positions >= 0
+            sides = all_sides[positions[found]]
+            bad = (pairs[found, 1] < 0) | (pairs[found, 1] >= sides)
+            _issue(issues, source, target, 'invalid', pairs[found, 0][bad])
+
+    for data_value in data_values(model):
+        for column in data_value.table:
+            if column.type not in ('TABULAR_NODE_ID', 'TABULAR_ELEMENT_ID') or not isinstance(column.value.data, np.ndarray):
+                continue
+            refs = np.rint(column.value.data).astype(np.int32).ravel()
+            if column.type == 'TABULAR_NODE_ID':
+                _issue(issues, 'data', 'nodes', 'missing', refs[mesh.node_positions(refs) < 0])
+            else:
+                _issue(issues, 'data', 'elements', 'missing', refs[lookup(all_ids, refs) < 0])
+    return issues
@@ -0,0 +1,316 @@
+import re
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .fc_addons import populate
+from .fc_mesh import FC_ELEMENT_TYPES_KEYNAME, FCElementArrays, FCElementTypeLiteral, FCMesh, midside_nodes
+
+if TYPE_CHECKING:
+    from . import FCModel
+
+
+# Типы ячеек VTK по размерности и числу узлов элемента
+_VTK_CELLS: Dict[Tuple[int, int], int] = {
+    (0, 1): 1,                                   # VTK_VERTEX
+    (1, 2): 3, (1, 3): 21,                       # VTK_LINE, VTK_QUADRATIC_EDGE
+    (2, 3): 5, (2, 6): 22,                       # VTK_TRIANGLE, VTK_QUADRATIC_TRIANGLE
+    (2, 4): 9, (2, 8): 23,                       # VTK_QUAD, VTK_QUADRATIC_QUAD
+    (3, 4): 10, (3, 10): 24,                     # VTK_TETRA, VTK_QUADRATIC_TETRA
+    (3, 8): 12, (3, 20): 25,                     # VTK_HEXAHEDRON, VTK_QUADRATIC_HEXAHEDRON
+    (3, 6): 13, (3, 15): 26,                     # VTK_WEDGE, VTK_QUADRATIC_WEDGE
+    (3, 5): 14, (3, 13): 27,                     # VTK_PYRAMID, VTK_QUADRATIC_PYRAMID
+}
+
+# Порядок рёбер, по которому VTK нумерует срединные узлы квадратичных ячеек
+_VTK_EDGES: Dict[int, List[Tuple[int, int]]] = {
+    21: [(0, 1)],
+    22: [(0, 1), (1, 2), (2, 0)],
+    23: [(0, 1), (1, 2), (2, 3), (3, 0)],
+    24: [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)],
+    25: [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)],
+    26: [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)],
+    27: [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (1, 4), (2, 4), (3, 4)],
+}
+
+
+def _vtk_order(typename: FCElementTypeLiteral, cell: int) -> List[int]:
+    """Локальные номера узлов элемента в порядке узлов ячейки VTK."""
+    size = FC_ELEMENT_TYPES_KEYNAME[typename]['nodes']
+    if cell not in _VTK_EDGES:
+        return list(range(size))
+    pairs, mids = midside_nodes(typename)
+    by_edge = {(int(a), int(b)): int(m) for (a, b), m in zip(np.sort(pairs, axis=1), mids)}
+    corners = size - len(mids)
+    return list(range(corners)) + [by_edge[(min(a, b), max(a, b))] for a, b in _VTK_EDGES[cell]]
+
+
+FC_VTK_CELL_TYPES: Dict[FCElementTypeLiteral, int] = {
+    name: _VTK_CELLS[(element_type['dim'], element_type['nodes'])]
+    for name, element_type in FC_ELEMENT_TYPES_KEYNAME.items() if element_type['nodes']
+}
+
+FC_VTK_NODE_ORDER: Dict[FCElementTypeLiteral, List[int]] = {
+    name: _vtk_order(name, cell) for name, cell in FC_VTK_CELL_TYPES.items()
+}
+
+
+# Имя, тип VTK, число компонент, число кортежей и генератор пачек массива
+_Array = Tuple[str, str, int, int, Callable[[], Iterator[NDArray[np.generic]]]]
+
+_DTYPES = {'Int32': '<i4', 'Int64': '<i8', 'UInt8': 'u1', 'Float64': '<f8'}
+
+
+def _slices(array: NDArray[np.generic], chunk_size: int) -> Callable[[], Iterator[NDArray[np.generic]]]:
+    def chunks() -> Iterator[NDArray[np.generic]]:
+        for start in range(0, len(array), chunk_size):
+            yield array[start:start + chunk_size]
+    return chunks
+
+
+def _cell_arrays(mesh: FCMesh, types: List[FCElementTypeLiteral], chunk_size: int) -> List[_Array]:
+    """Массивы ячеек; связность и данные элементов читаются пачками при записи."""
+    counts = [len(mesh.elements[tp]) for tp in types]
+    cells = sum(counts)
+    connectivity = sum(count * FC_ELEMENT_TYPES_KEYNAME[tp]['nodes'] for tp, count in zip(types, counts))
+
+    def connectivity_chunks() -> Iterator[NDArray[np.generic]]:
+        for typename in types:
+            order = FC_VTK_NODE_ORDER[typename]
+            for arrays in mesh.iter_element_arrays(typename, chunk_size):
+                positions = mesh.node_positions(arrays['nodes'][:, order])
+                if np.any(positions < 0):
+                    raise KeyError(f"{typename} elements reference nodes missing in the mesh")
+                yield positions.ravel()
+
+    def offset_chunks() -> Iterator[NDArray[np.generic]]:
+        end = 0
+        for typename, count in zip(types, counts):
+            size = FC_ELEMENT_TYPES_KEYNAME[typename]['nodes']
+            for start in range(0, count, chunk_size):
+                number = min(chunk_size, count - start)
+                yield end + size * np.arange(1, number + 1, dtype=np.int64)
+                end += size * number
+
+    def type_chunks() -> Iterator[NDArray[np.generic]]:
+        for typename, count in zip(types, counts):
+            for start in range(0, count, chunk_size):
+                yield np.full(min(chunk_size, count - start), FC_VTK_CELL_TYPES[typename], np.uint8)
+
+    def field(key: str) -> Callable[[], Iterator[NDArray[np.generic]]]:
+        def chunks() -> Iterator[NDArray[np.generic]]:
+            for typename in types:
+                for arrays in mesh.iter_element_arrays(typename, chunk_size):
+                    yield arrays[key]  # type: ignore[literal-required]
+        return chunks
+
+    def fc_types() -> Iterator[NDArray[np.generic]]:
+        for typename, count in zip(types, counts):
+            for start in range(0, count, chunk_size):
+                yield np.full(min(chunk_size, count - start), FC_ELEMENT_TYPES_KEYNAME[typename]['fc_id'], np.int32)
+
+    return [
+        ('connectivity', 'Int64', 1, connectivity, connectivity_chunks),
+        ('offsets', 'Int64', 1, cells, offset_chunks),
+        ('types', 'UInt8', 1, cells, type_chunks),
+        ('fc_id', 'Int32', 1, cells, field('ids')),
+        ('block', 'Int32', 1, cells, field('blocks')),
+        ('parent_id', 'Int32', 1, cells, field('parent_ids')),
+        ('order', 'Int32', 1, cells, field('orders')),
+        ('fc_type', 'Int32', 1, cells, fc_types),
+    ]
+
+
+def _set_arrays(model: 'FCModel', chunk_size: int) -> List[_Array]:
+    """Наборы узлов (id узлов) и сторон (пары id элемента и номер стороны)."""
+    result: List[_Array] = []
+    for kind, sets, components in (('nodeset', model.nodesets, 1), ('sideset', model.sidesets, 2)):
+        for set_id in sorted(sets):
+            fc_set = sets[set_id]
+            data = fc_set.apply.data
+            if fc_set.apply.type != 'array' or not isinstance(data, np.ndarray):
+                continue
+            name = f"{kind}_{set_id}" + (f"_{fc_set.name}" if fc_set.name else "")
+            result.append((name, 'Int32', components, data.size // components, _slices(data.ravel(), chunk_size)))
+    return result
+
+
+def _xml(arrays: List[_Array], offsets: Dict[str, int], indent: str) -> str:
+    return "".join(
+        f'{indent}<DataArray type="{vtk_type}" Name={quoteattr(name)} NumberOfComponents="{components}" '
+        f'NumberOfTuples="{tuples}" format="appended" offset="{offsets[name]}"/>\n'
+        for name, vtk_type, components, tuples, _ in arrays
+    )
+
+
+def _write(stream: BinaryIO, array: _Array) -> None:
+    name, vtk_type, components, tuples, chunks = array
+    dtype = np.dtype(_DTYPES[vtk_type])
+    stream.write(np.uint64(tuples * components * dtype.itemsize).astype('<u8').tobytes())
+    written = 0
+    for chunk in chunks():
+        data = np.ascontiguousarray(chunk, dtype)
+        stream.write(memoryview(data).cast('B'))
+        written += data.size
+    if written != tuples * components:
+        raise ValueError(f"VTU array '{name}': expected {tuples * components} values, got {written}")
+
+
+def to_vtu(model: 'FCModel', path: str, chunk_size: int = 1 << 20) -> None:
+    """
+    Записывает сетку модели в файл VTK XML UnstructuredGrid (.vtu).
+
+    Данные хранятся в сыром двоичном виде в разделе AppendedData и пишутся
+    пачками по `chunk_size`, поэтому расход памяти не растёт с размером
+    сетки. Узлы элементов переставляются в порядок VTK (`FC_VTK_NODE_ORDER`).
+    Данные ячеек: id элемента, блок, parent_id, order и код типа fc; данные точек —
+    id узла; наборы узлов и сторон записываются в FieldData.
+    """
+    mesh = model.mesh
+    xyz = mesh.nodes_xyz.reshape(-1, 3)
+    types = [tp for tp in mesh.elements if mesh.elements[tp] and tp in FC_VTK_CELL_TYPES]
+    cells = sum(len(mesh.elements[tp]) for tp in types)
+
+    field_data = _set_arrays(model, chunk_size)
+    point_data: List[_Array] = [('fc_id', 'Int32', 1, len(xyz), _slices(mesh.nodes_ids, chunk_size))]
+    points: List[_Array] = [('Points', 'Float64', 3, len(xyz), _slices(xyz, chunk_size))]
+    cell_arrays = _cell_arrays(mesh, types, chunk_size)
+    cell_data, topology = cell_arrays[3:], cell_arrays[:3]
+
+    sections = [field_data, point_data, cell_data, points, topology]
+    offsets: List[Dict[str, int]] = []
+    position = 0
+    for section in sections:
+        offsets.append({})
+        for name, vtk_type, components, tuples, _ in section:
+            offsets[-1][name] = position
+            position += 8 + tuples * components * np.dtype(_DTYPES[vtk_type]).itemsize
+
+    header = (
+        '<?xml version="1.0"?>\n'
+        '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64">\n'
+        '  <UnstructuredGrid>\n'
+        + (f'    <FieldData>\n{_xml(field_data, offsets[0], "      ")}    </FieldData>\n' if field_data else '')
+        + f'    <Piece NumberOfPoints="{len(xyz)}" NumberOfCells="{cells}">\n'
+        + f'      <PointData>\n{_xml(point_data, offsets[1], "        ")}      </PointData>\n'
+        + f'      <CellData>\n{_xml(cell_data, offsets[2], "        ")}      </CellData>\n'
+        + f'      <Points>\n{_xml(points, offsets[3], "        ")}      </Points>\n'
+        + f'      <Cells>\n{_xml(topology, offsets[4], "        ")}      </Cells>\n'
+        '    </Piece>\n'
+        '  </UnstructuredGrid>\n'
+        '  <AppendedData encoding="raw">\n   _'
+    )
+    with open(path, 'wb') as stream:
+        stream.write(header.encode())
+        for section in sections:
+            for array in section:
+                _write(stream, array)
+        stream.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+
+# Тип ячейки VTK -> тип fc по умолчанию (если в файле нет массива fc_type)
+VTK_FC_CELL_TYPES: Dict[int, FCElementTypeLiteral] = {
+    1: 'POINT3D', 3: 'BEAM26', 21: 'BEAM36', 5: 'TRI3', 22: 'TRI6', 9: 'QUAD4', 23: 'QUAD8',
+    10: 'TETRA4', 24: 'TETRA10', 12: 'HEX8', 25: 'HEX20', 13: 'WEDGE6', 26: 'WEDGE15', 14: 'PYR5', 27: 'PYR13',
+}
+
+# Массивы данных ячеек, из которых берутся блоки (первый найденный)
+_BLOCK_ARRAYS = ('block', 'gmsh:physical', 'CellEntityIds', 'MaterialIds')
+
+
+def read_vtu(model: 'FCModel', path: str) -> None:
+    """
+    Читает файл VTK XML UnstructuredGrid (.vtu) с данными в сыром двоичном
+    разделе AppendedData в пустую модель. Массивы читаются целиком из буфера
+    файла. Id узлов и элементов, блоки, parent_id, order и типы fc берутся из массивов,
+    которые пишет `to_vtu`; если их нет — нумерация с 1, блок из массивов
+    `gmsh:physical`, `CellEntityIds` или `MaterialIds` (иначе 1), parent_id 0
+    (нет геометрии), order 1 и типы по `VTK_FC_CELL_TYPES`. Наборы
+    восстанавливаются из FieldData.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    start = data.find(b'<AppendedData')
+    if start < 0:
+        raise ValueError(f"{path}: only appended VTU data is supported")
+    root = ET.fromstring(data[:start] + b'</VTKFile>')
+    if root.get('type') != 'UnstructuredGrid' or root.get('compressor'):
+        raise ValueError(f"{path}: expected an uncompressed UnstructuredGrid")
+    appended = data[start:data.index(b'>', start)]
+    if b'encoding="raw"' not in appended:
+        raise ValueError(f"{path}: only raw appended encoding is supported")
+    order = '<' if root.get('byte_order', 'LittleEndian') == 'LittleEndian' else '>'
+    header = np.dtype(order + ('u8' if root.get('header_type') == 'UInt64' else 'u4'))
+    base = data.index(b'_', start) + 1
+    types = {'Int8': 'i1', 'UInt8': 'u1', 'Int16': 'i2', 'UInt16': 'u2', 'Int32': 'i4', 'UInt32': 'u4',
+             'Int64': 'i8', 'UInt64': 'u8', 'Float32': 'f4', 'Float64': 'f8'}
+
+    def read(item: ET.Element) -> NDArray[Any]:
+        if item.get('format') != 'appended':
+            raise ValueError(f"{path}: DataArray '{item.get('Name')}' is not appended")
+        offset = base + int(item.get('offset', '0'))
+        dtype = np.dtype(order + types[item.get('type', '')])
+        size = int(np.frombuffer(data, header, 1, offset)[0])
+        values: NDArray[Any] = np.frombuffer(data, dtype, size // dtype.itemsize, offset + header.itemsize)
+        return values.reshape(-1, int(item.get('NumberOfComponents', '1')))
+
+    def arrays(parent: Optional[ET.Element]) -> Dict[str, NDArray[Any]]:
+        if parent is None:
+            return {}
+        return {item.get('Name', ''): read(item) for item in parent.findall('DataArray')}
+
+    pieces = root.findall('./UnstructuredGrid/Piece')
+    if len(pieces) != 1:
+        raise ValueError(f"{path}: expected exactly one Piece, got {len(pieces)}")
+    piece = pieces[0]
+    points = next(iter(arrays(piece.find('Points')).values()))
+    cells = arrays(piece.find('Cells'))
+    point_data = arrays(piece.find('PointData'))
+    cell_data = arrays(piece.find('CellData'))
+
+    count = len(cells['types'])
+    nodes_ids = point_data['fc_id'].ravel() if 'fc_id' in point_data else np.arange(1, len(points) + 1)
+    element_ids = cell_data['fc_id'].ravel() if 'fc_id' in cell_data else np.arange(1, count + 1)
+    block_key = next((key for key in _BLOCK_ARRAYS if key in cell_data), None)
+    blocks = cell_data[block_key].ravel() if block_key else np.ones(count, np.int32)
+    parent_ids = cell_data['parent_id'].ravel() if 'parent_id' in cell_data else np.zeros(count, np.int32)
+    orders = cell_data['order'].ravel() if 'order' in cell_data else np.ones(count, np.int32)
+    if 'fc_type' in cell_data:
+        codes = cell_data['fc_type'].ravel()
+        known = {element_type['fc_id']: name for name, element_type in FC_ELEMENT_TYPES_KEYNAME.items()}
+    else:
+        codes = cells['types'].ravel()
+        known = VTK_FC_CELL_TYPES
+
+    connectivity = cells['connectivity'].ravel()
+    ends = cells['offsets'].ravel().astype(np.int64)
+    elements: Dict[FCElementTypeLiteral, FCElementArrays] = {}
+    for code in np.unique(codes).tolist():
+        if code not in known:
+            raise ValueError(f"{path}: cell type {code} is not supported")
+        typename = known[code]
+        rows = np.nonzero(codes == code)[0]
+        size = FC_ELEMENT_TYPES_KEYNAME[typename]['nodes']
+        if np.any(ends[rows] - np.where(rows > 0, ends[rows - 1], 0) != size):
+            raise ValueError(f"{path}: {typename} cells must have {size} nodes")
+        vtk_nodes = connectivity[(ends[rows] - size)[:, None] + np.arange(size)]
+        elements[typename] = {
+            'ids': element_ids[rows].astype(np.int32),
+            'nodes': nodes_ids[vtk_nodes[:, np.argsort(FC_VTK_NODE_ORDER[typename])]].astype(np.int32),
+            'blocks': blocks[rows].astype(np.int32),
+            'parent_ids': parent_ids[rows].astype(np.int32),
+            'orders': orders[rows].astype(np.int32),
+        }
+
+    nodesets: Dict[int, Tuple[str, NDArray[np.int32]]] = {}
+    sidesets: Dict[int, Tuple[str, NDArray[np.int32]]] = {}
+    for name, values in arrays(root.find('./UnstructuredGrid/FieldData')).items():
+        match = re.fullmatch(r'(nodeset|sideset)_(\d+)_?(.*)', name)
+        if match:
+            target = nodesets if match.group(1) == 'nodeset' else sidesets
+            values = values.astype(np.int32)
+            target[int(match.group(2))] = (match.group(3), values.ravel() if values.shape[1] == 1 else values)
+    populate(model, nodes_ids.astype(np.int32), points.astype(np.float64), elements, nodesets, sidesets)
@@ -0,0 +1,33 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fc_model import FCElement, FCModel
+
+
+def hex_grid(nx: int, ny: Optional[int] = None, nz: Optional[int] = None, cell: float = 1.0,
+             origin: Sequence[float] = (0.0, 0.0, 0.0), node_ids: Optional[NDArray[np.int32]] = None) -> FCModel:
+    """
+    Модель с сеткой nx×ny×nz (по умолчанию ny = nz = nx) из HEX8 с ребром `cell`
+    от точки `origin`. Узлы нумеруются 1, 2, ... по порядку (x, y, z) с z
+    быстрее всех или id из `node_ids` в том же порядке; элементы — 1, 2, ...
+    """
+    counts = (nx, ny if ny is not None else nx, nz if nz is not None else nx)
+    axes = [start + np.linspace(0.0, n * cell, n + 1) for start, n in zip(origin, counts)]
+    xyz = np.stack(np.meshgrid(*axes, indexing='ij'), -1).reshape(-1, 3)
+    idx = np.arange(len(xyz)).reshape(counts[0] + 1, counts[1] + 1, counts[2] + 1)
+    corners = [idx[:-1, :-1, :-1], idx[1:, :-1, :-1], idx[1:, 1:, :-1], idx[:-1, 1:, :-1],
+               idx[:-1, :-1, 1:], idx[1:, :-1, 1:], idx[1:, 1:, 1:], idx[:-1, 1:, 1:]]
+    conn = np.stack([c.ravel() for c in corners], axis=1)
+    ids = np.arange(1, len(xyz) + 1, dtype=np.int32) if node_ids is None else np.asarray(node_ids, np.int32)
+
+    m = FCModel()
+    m.mesh.nodes_ids = ids
+    m.mesh.nodes_xyz = xyz
+    for i, row in enumerate(conn):
+        m.mesh[i + 1] = FCElement({
+            'id': i + 1, 'block': 1, 'parent_id': 0, 'type': 'HEX8',
+            'nodes': ids[row].tolist(), 'order': 1,
+        })
+    return m
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import numpy as np
+
+from fc_model import FCModel
+from fc_model.fc_mesh import FCMesh
+
+from conftest import hex_grid
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def assert_conflict_free(mesh: FCMesh, groups: list) -> None:
+    for group in groups:
+        nodes = np.concatenate([np.array(mesh[int(i)].nodes) for i in group])
+        assert len(np.unique(nodes)) == len(nodes)
+
+
+def test_coloring_is_conflict_free_and_balanced() -> None:
+    mesh = hex_grid(10, cell=0.1).mesh
+    coloring = mesh.color_elements()
+    groups = coloring['groups']
+
+    assert 8 <= len(groups) <= 27
+    assert_conflict_free(mesh, groups)
+    assert np.array_equal(np.sort(np.concatenate(groups)), np.arange(1, 1001))
+    for c, group in enumerate(groups):
+        assert np.all(coloring['colors'][np.isin(coloring['ids'], group)] == c)
+
+    sizes = [len(g) for g in groups]
+    unbalanced = [len(g) for g in mesh.color_elements(balance=False)['groups']]
+    assert max(sizes) - min(sizes) < max(unbalanced) - min(unbalanced)
+
+
+def test_coloring_of_model_mesh() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    coloring = m.mesh.color_elements()
+    assert_conflict_free(m.mesh, coloring['groups'])
+    assert len(coloring['groups']) == 8   # все элементы куба 2×2×2 имеют общий центральный узел
+    assert len(FCMesh().color_elements()['groups']) == 0
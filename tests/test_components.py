@@ -0,0 +1,70 @@
+import numpy as np
+
+from fc_model import FCElement
+from fc_model.fc_mesh import FCMesh
+
+from conftest import hex_grid
+
+
+def test_components_bodies_bounds_and_free_nodes() -> None:
+    m = hex_grid(3, cell=1 / 3)
+    m.merge(hex_grid(2, cell=0.5, origin=(5.0, 0.0, 0.0)))
+    m.merge(hex_grid(2, cell=0.5, origin=(10.0, 0.0, 0.0)))
+    mesh = m.mesh
+    free = int(mesh.nodes_ids[-1]) + 1
+    mesh.nodes_ids = np.append(mesh.nodes_ids, free).astype(np.int32)
+    mesh.nodes_xyz = np.vstack([mesh.nodes_xyz, [[100.0, 0.0, 0.0]]])
+
+    # Стержень связывает второе и третье тело
+    a, b = 64 + 27, 64 + 27 + 1
+    mesh[len(mesh) + 1] = FCElement({'id': len(mesh) + 1, 'block': 1, 'parent_id': 0,
+                                     'type': 'BAR2', 'nodes': [a, b], 'order': 1})
+
+    components = mesh.connected_components()
+    assert components['counts'].tolist() == [27, 17]
+    hex_labels = components['elements'][:len(components['elements']) - 1]
+    assert hex_labels[:27].tolist() == [0] * 27 and hex_labels[27:].tolist() == [1] * 16
+    assert components['elements'][-1] == 1
+    assert components['nodes'][-1] == -1
+    assert np.all(components['nodes'][:-1] >= 0)
+    assert np.allclose(components['bounds'][0], [[0, 0, 0], [1, 1, 1]])
+    assert np.allclose(components['bounds'][1], [[5, 0, 0], [11, 1, 1]])
+
+
+def test_components_match_breadth_first_search() -> None:
+    rng = np.random.default_rng(3)
+    count = 400
+    mesh = FCMesh()
+    mesh.nodes_ids = np.arange(1, count + 1, dtype=np.int32)
+    mesh.nodes_xyz = rng.random((count, 3))
+    pairs = rng.integers(1, count + 1, (300, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    for i, (a, b) in enumerate(pairs.tolist()):
+        mesh[i + 1] = FCElement({'id': i + 1, 'block': 1, 'parent_id': 0,
+                                 'type': 'BAR2', 'nodes': [a, b], 'order': 1})
+    components = mesh.connected_components()
+
+    # Обход в ширину по узлам
+    adjacency: dict = {}
+    for a, b in pairs.tolist():
+        adjacency.setdefault(a, []).append(b)
+        adjacency.setdefault(b, []).append(a)
+    label: dict = {}
+    for start in adjacency:
+        if start in label:
+            continue
+        label[start] = start
+        queue = [start]
+        while queue:
+            node = queue.pop()
+            for other in adjacency[node]:
+                if other not in label:
+                    label[other] = start
+                    queue.append(other)
+
+    nodes = components['nodes']
+    for a, b in pairs.tolist():
+        assert nodes[a - 1] == nodes[b - 1]
+    same = {(label[a], int(nodes[a - 1])) for a in adjacency}
+    assert len(same) == len(set(label.values())) == len(components['counts'])
+    assert np.all(nodes[[n - 1 for n in range(1, count + 1) if n not in adjacency]] == -1)
@@ -0,0 +1,147 @@
+import copy
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCIdMap, FCModel, assemble
+from fc_model.fc_addons import remap
+
+
+DATA = Path(__file__).parent / 'data'
+
+SECTIONS = ['mesh', 'sets', 'loads', 'restraints', 'initial_sets', 'receivers',
+            'contact_constraints', 'coupling_constraints', 'periodic_constraints', 'blocks']
+
+
+def test_compress_restores_dense_ids() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    m.materials = {mid: m.materials[mid] for mid in [1]}
+    reference = m.dump()
+
+    nodes = m.mesh.nodes_ids.copy()
+    elements = np.array([e.id for e in m.mesh], np.int32)
+    remap(m,
+          nodes=FCIdMap(nodes, nodes * 10 + 5),
+          elements=FCIdMap(elements, elements * 7),
+          blocks=FCIdMap(np.array([1]), np.array([4])),
+          materials=FCIdMap(np.array([1]), np.array([9])))
+    assert m.dump()['mesh'] != reference['mesh']
+
+    # Лишние узел, блок, материал и таблица свойств удаляются
+    m.mesh.nodes_ids = np.append(m.mesh.nodes_ids, np.int32(100000))
+    m.mesh.nodes_xyz = np.vstack([m.mesh.nodes_xyz, [[1.0, 2.0, 3.0]]])
+
+    maps = m.compress()
+    assert maps['nodes'](np.array([15]))[0] == 1
+    assert maps['elements'].to_dict()[14] == 2
+    assert 100000 not in maps['nodes']
+
+    compressed = m.dump()
+    for section in SECTIONS:
+        assert compressed.get(section) == reference.get(section), section
+    assert list(m.materials) == [1]
+
+
+def test_element_renumbering_keeps_parent_ids() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    elements = np.array([e.id for e in m.mesh], np.int32)
+    remap(m, elements=FCIdMap(elements, elements + 100))
+    assert [e.parent_id for e in m.mesh] == [1] * len(elements)
+    m.compress()
+    assert [e.parent_id for e in m.mesh] == [1] * len(elements)
+
+
+def test_compress_rejects_dangling_references() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    elements = np.array([e.id for e in m.mesh], np.int32)
+    remap(m, elements=FCIdMap(elements, elements + 100))
+    sideset = next(iter(m.sidesets.values()))
+    sideset.apply.data = np.vstack([np.asarray(sideset.apply.data).reshape(-1, 2), [[3, 0]]]).astype(np.int32)
+    before = m.dump()
+
+    with pytest.raises(KeyError):
+        m.compress()
+    assert m.dump() == before
+
+
+def test_compress_drops_unused_entities() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    maps = m.compress()
+
+    assert len(m.materials) == 1
+    assert len(maps['materials']) == 1
+    assert len(m.mesh.nodes_ids) == 81
+    assert np.array_equal(m.mesh.nodes_ids, np.arange(1, 82))
+
+
+def test_tabular_columns_are_remapped() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    column = next(c for load in m.loads for d in load.data for c in d.table if c.type == 'TABULAR_NODE_ID')
+    before = np.array(column.value.data)
+
+    remap(m, nodes=FCIdMap(m.mesh.nodes_ids, m.mesh.nodes_ids + 1000))
+    assert np.array_equal(column.value.data, before + 1000)
+
+
+def test_merge_coincident_nodes_restores_shared_nodes() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    reference = m.dump()
+
+    # Первый элемент получает собственные копии узлов, сдвинутые в пределах допуска
+    typename = next(iter(m.mesh.elements))
+    arrays = m.mesh.element_arrays(typename)
+    own = arrays['nodes'][0].copy()
+    copies = own + 1000
+    arrays['nodes'][0] = copies
+    m.mesh.set_element_arrays(typename, arrays)
+    shifted = m.mesh.nodes_xyz[m.mesh.node_positions(own)] + 1e-9
+    m.mesh.nodes_ids = np.append(m.mesh.nodes_ids, copies)
+    m.mesh.nodes_xyz = np.vstack([m.mesh.nodes_xyz, shifted])
+
+    merged = m.merge_coincident_nodes(tol=1e-6)
+    assert merged.to_dict() == dict(zip(copies.tolist(), own.tolist()))
+
+    dumped = m.dump()
+    for section in SECTIONS:
+        assert dumped.get(section) == reference.get(section), section
+    assert len(m.merge_coincident_nodes(tol=1e-6)) == 0
+
+
+def test_assemble_offsets_ids() -> None:
+    first = FCModel(str(DATA / 'ultracube.fc'))
+    second = FCModel(str(DATA / 'ultracube.fc'))
+    second.mesh.nodes_xyz = second.mesh.nodes_xyz + [np.ptp(first.mesh.nodes_xyz[:, 0]), 0.0, 0.0]
+
+    assembly = assemble([first, second])
+    assert len(assembly.mesh.nodes_ids) == 162
+    assert len(assembly.mesh) == 16
+    assert list(assembly.blocks) == [1, 2]
+    assert len(assembly.materials) == 30
+    assert list(assembly.coordinate_systems) == [1]
+    assert len(assembly.loads) == 2 * len(first.loads)
+    assert [load.id for load in assembly.loads[len(first.loads):]] == [load.id + 3 for load in first.loads]
+
+    # Ссылки второй модели сдвинуты вместе с id
+    nodeset = next(iter(first.nodesets.values()))
+    shifted = assembly.nodesets[nodeset.id + 22]
+    assert np.array_equal(shifted.apply.data, nodeset.apply.data + 81)
+    assert second.mesh.nodes_ids.max() == 81
+
+    # Общая грань кубов (2x2 грани HEX20: 9 вершин и 12 середин рёбер) сливается
+    assert len(assembly.merge_coincident_nodes(1e-9)) == 21
+
+
+def test_merge_keeps_parent_ids_and_shared_coordinate_systems() -> None:
+    a = FCModel(str(DATA / 'cube_sidesets.fc'))
+    b = FCModel(str(DATA / 'cube_sidesets.fc'))
+    duplicate = copy.deepcopy(b.coordinate_systems[1])
+    duplicate.id = 2
+    b.coordinate_systems[2] = duplicate
+    next(iter(b.blocks.values())).cs_id = 2
+
+    maps = a.merge(b)
+    assert maps['coordinate_systems'].to_dict() == {1: 1, 2: 1}
+    assert list(a.coordinate_systems) == [1]
+    assert all(block.cs_id == 1 for block in a.blocks.values())
+    assert [e.parent_id for e in a.mesh] == [1] * len(a.mesh)
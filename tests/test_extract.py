@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import numpy as np
+
+from fc_model import FCModel
+from fc_model.fc_addons import apply_values
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_extract_by_block_keeps_whole_model() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    sub = m.extract(blocks=[1])
+
+    assert sub.dump()['mesh'] == m.dump()['mesh']
+    assert list(sub.materials) == [1]
+    assert len(sub.loads) == len(m.loads)
+    assert list(sub.coordinate_systems) == [1]
+
+
+def test_extract_by_bbox(tmp_path: Path) -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    lo = m.mesh.nodes_xyz.min(axis=0)
+    hi = m.mesh.nodes_xyz.max(axis=0)
+    half = np.array([lo, [(lo[0] + hi[0]) / 2, hi[1], hi[2]]])
+
+    sub = m.extract(bbox=half)
+    assert len(sub.mesh) == 4
+    assert np.all(sub.mesh.nodes_xyz[:, 0] <= half[1, 0])
+    assert len(m.mesh) == 8
+
+    # Все ссылки подмодели указывают на её узлы и элементы
+    element_ids = {e.id for e in sub.mesh}
+    node_ids = set(sub.mesh.nodes_ids.tolist())
+    for value, target in apply_values(sub):
+        if value.type != 'array' or not isinstance(value.data, np.ndarray) or value.data.size == 0:
+            continue
+        owners = value.data.reshape(len(value.data), -1)[:, 0].tolist()
+        assert set(owners) <= (node_ids if target == 'nodes' else element_ids)
+
+    # Подмодель сохраняется и читается как самостоятельная
+    sub.save(str(tmp_path / 'sub.fc'))
+    assert FCModel(str(tmp_path / 'sub.fc')).dump()['mesh'] == sub.dump()['mesh']
+
+
+def test_extract_by_nodeset() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    lower = m.mesh.nodes_xyz[:, 2] <= np.median(m.mesh.nodes_xyz[:, 2])
+    nodeset = next(iter(m.nodesets.values()))
+    nodeset.apply.data = m.mesh.nodes_ids[lower]
+
+    sub = m.extract(nodeset=nodeset.id, blocks=[1])
+    assert len(sub.mesh) == 4
+    assert set(sub.mesh.nodes_ids.tolist()) <= set(m.mesh.nodes_ids[lower].tolist())
+    assert np.array_equal(sub.nodesets[nodeset.id].apply.data, sub.mesh.nodes_ids)
+
+
+def test_extract_filters_tabular_id_rows() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    ids = m.mesh.element_arrays('HEX20')['ids']
+    sub = m.extract(elements=ids[:5])
+    assert sub.validate() == []
+    for part in m.partition(2):
+        assert part['model'].validate() == []
+
+    # Строки таблиц согласованы: значение и столбцы укорочены вместе
+    columns = [(data, column) for load in sub.loads for data in load.data for column in data.table
+               if column.type in ('TABULAR_NODE_ID', 'TABULAR_ELEMENT_ID')]
+    assert columns
+    for data, column in columns:
+        assert len(data.value.data) == len(column.value.data)
+        owners = sub.mesh.nodes_ids if column.type == 'TABULAR_NODE_ID' else ids[:5]
+        assert set(column.value.data.astype(int).tolist()) <= set(owners.tolist())
+    # Таблицы исходной модели не изменились
+    assert all(len(c.value.data) == 6 for load in m.loads for d in load.data for c in d.table
+               if c.type in ('TABULAR_NODE_ID', 'TABULAR_ELEMENT_ID'))
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCModel
+from fc_model.fc_shapes import FC_SHAPES
+
+
+DATA = Path(__file__).parent / 'data'
+
+# Объём (площадь, длина) опорных элементов
+REFERENCE = {
+    'LINE2': 2.0, 'LINE3': 2.0, 'TRI3': 0.5, 'TRI6': 0.5, 'QUAD4': 4.0, 'QUAD8': 4.0,
+    'TETRA4': 1 / 6, 'TETRA10': 1 / 6, 'HEX8': 8.0, 'HEX20': 8.0, 'WEDGE6': 1.0, 'WEDGE15': 1.0,
+}
+
+
+@pytest.mark.parametrize('family', sorted(REFERENCE))
+def test_reference_measures_under_affine_map(family: str) -> None:
+    shape = FC_SHAPES[family]  # type: ignore[index]
+    rng = np.random.default_rng(1)
+    matrix = np.eye(3) + rng.normal(size=(3, 3)) * 0.2
+    shift = rng.normal(size=3)
+    coords = np.pad(shape.nodes, ((0, 0), (0, 3 - shape.dim))) @ matrix.T + shift
+
+    measures, centroids = shape.geometry(coords[None])
+    if shape.dim == 3:
+        expected = REFERENCE[family] * abs(np.linalg.det(matrix))
+        assert measures[0] == pytest.approx(expected)
+
+    # Центр тяжести переходит в образ центра опорной области
+    center = np.pad(shape.values(shape.center[None]) @ shape.nodes, ((0, 0), (0, 3 - shape.dim)))
+    assert np.allclose(centroids[0], center[0] @ matrix.T + shift)
+
+
+def test_pyramid_volume_and_centroid() -> None:
+    base = np.array([[-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1], [0, 0, 1.0]])
+    measures, centroids = FC_SHAPES['PYR5'].geometry(base[None])
+    assert measures[0] == pytest.approx(8 / 3)
+    assert np.allclose(centroids[0], [0.0, 0.0, -0.5])
+
+
+def test_mesh_element_geometry() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    xyz = m.mesh.nodes_xyz
+    geometry = m.mesh.element_geometry('HEX20')
+
+    assert len(geometry['ids']) == 8
+    assert geometry['measures'].sum() == pytest.approx(np.prod(np.ptp(xyz, axis=0)))
+    center = geometry['measures'] @ geometry['centroids'] / geometry['measures'].sum()
+    assert np.allclose(center, (xyz.min(axis=0) + xyz.max(axis=0)) / 2)
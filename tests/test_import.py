@@ -0,0 +1,282 @@
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+from fc_model import FCMaterial, FCModel
+from fc_model.fc_addons import new_set
+from fc_model.fc_gmsh import GMSH_ELEMENT_TYPES
+from fc_model.fc_mesh import midside_nodes
+from fc_model.fc_quality import mesh_quality
+
+
+DATA = Path(__file__).parent / 'data'
+
+# Сущности: (размерность, тег) -> физические группы
+Entities = Dict[Tuple[int, int], List[int]]
+# Блоки элементов: размерность, тег сущности, тип Gmsh, теги элементов и узлов
+Blocks = List[Tuple[int, int, int, np.ndarray]]
+
+
+def _write_gmsh(path: Path, binary: bool, names: Dict[Tuple[int, int], str], entities: Entities,
+                nodes: np.ndarray, blocks: Blocks) -> None:
+    """Минимальный писатель Gmsh 4.1: все узлы в одном блоке сущности старшей размерности."""
+    out = bytearray(b'$MeshFormat\n4.1 %d 8\n' % binary)
+    if binary:
+        out += struct.pack('<i', 1) + b'\n'
+    out += b'$EndMeshFormat\n$PhysicalNames\n%d\n' % len(names)
+    for (dim, tag), name in names.items():
+        out += b'%d %d "%s"\n' % (dim, tag, name.encode())
+    out += b'$EndPhysicalNames\n'
+
+    def put(values: list, fmt: str) -> None:
+        nonlocal out
+        if binary:
+            out += struct.pack('<' + fmt * len(values), *values)
+        else:
+            out += (' '.join(str(v) for v in values) + '\n').encode()
+
+    out += b'$Entities\n'
+    put([sum(1 for d, _ in entities if d == dim) for dim in range(4)], 'Q')
+    for (dim, tag), physical in sorted(entities.items()):
+        put([tag], 'i')
+        put([0.0] * (3 if dim == 0 else 6), 'd')
+        put([len(physical)], 'Q')
+        put(physical, 'i')
+        if dim > 0:
+            put([0], 'Q')
+    out += b'\n$EndEntities\n' if binary else b'$EndEntities\n'
+
+    top = max(dim for dim, _, _, _ in blocks)
+    out += b'$Nodes\n'
+    put([1, len(nodes), 1, len(nodes)], 'Q')
+    put([top, 1, 0], 'i')
+    put([len(nodes)], 'Q')
+    put(list(range(1, len(nodes) + 1)), 'Q')
+    put(nodes.ravel().tolist(), 'd')
+    out += b'\n$EndNodes\n' if binary else b'$EndNodes\n'
+
+    out += b'$Elements\n'
+    put([len(blocks), sum(len(t) for *_, t in blocks), 1, 1], 'Q')
+    for dim, tag, gmsh_type, table in blocks:
+        put([dim, tag, gmsh_type], 'i')
+        put([len(table)], 'Q')
+        put(table.ravel().tolist(), 'Q')
+    out += b'\n$EndElements\n' if binary else b'$EndElements\n'
+    path.write_bytes(bytes(out))
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_gmsh_groups(tmp_path: Path, binary: bool) -> None:
+    # Два шестигранника вдоль x: узлы решётки 3 x 2 x 2
+    grid = np.stack(np.meshgrid(np.arange(3.0), np.arange(2.0), np.arange(2.0), indexing='ij'), -1)
+    index = np.arange(12).reshape(3, 2, 2) + 1
+
+    def hexa(i: int) -> list:
+        n = index[i:i + 2]
+        return [n[0, 0, 0], n[1, 0, 0], n[1, 1, 0], n[0, 1, 0], n[0, 0, 1], n[1, 0, 1], n[1, 1, 1], n[0, 1, 1]]
+
+    left = index[0].ravel()[[0, 2, 3, 1]]
+    blocks: Blocks = [
+        (3, 1, 5, np.array([[10] + hexa(0), [11] + hexa(1)])),
+        (2, 1, 3, np.array([[20, *left]])),
+        (0, 1, 15, np.array([[30, index[2, 1, 1]]])),
+    ]
+    names = {(3, 7): 'solid', (2, 3): 'left', (0, 5): 'corner'}
+    path = tmp_path / 'bar.msh'
+    _write_gmsh(path, binary, names, {(0, 1): [5], (2, 1): [3], (3, 1): [7]}, grid.reshape(-1, 3), blocks)
+
+    m = FCModel.from_gmsh(str(path))
+    arrays = m.mesh.element_arrays('HEX8')
+    assert list(m.mesh.elements) == ['HEX8'] and arrays['ids'].tolist() == [10, 11]
+    assert np.all(arrays['blocks'] == 7) and list(m.blocks) == [7]
+    assert np.all(arrays['parent_ids'] == 1)
+    assert not np.any(mesh_quality(m.mesh)['inverted'])
+
+    # Группы меньшей размерности по порядку (размерность, тег): (0, 5) -> 1, (2, 3) -> 2
+    assert m.nodesets[1].name == 'corner' and m.nodesets[1].apply.data.ravel().tolist() == [12]
+    assert m.nodesets[2].name == 'left' and sorted(m.nodesets[2].apply.data.ravel().tolist()) == [1, 2, 3, 4]
+    assert list(m.sidesets) == [2] and m.sidesets[2].name == 'left'
+    element, face = m.sidesets[2].apply.data.reshape(-1, 2)[0]
+    facet = m.mesh.find_faces(left[None].astype(np.int32))[0]
+    assert element == 10 and face == facet[1]
+
+
+REFERENCE = {
+    11: [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]],
+    12: [[-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1], [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]],
+    13: [[0, 0, -1], [1, 0, -1], [0, 1, -1], [0, 0, 1], [1, 0, 1], [0, 1, 1]],
+    14: [[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0], [0, 0, 1]],
+}
+VOLUMES = {11: 1 / 6, 12: 8.0, 13: 1.0, 14: 4 / 3}
+EDGES = {
+    11: [(0, 1), (1, 2), (2, 0), (3, 0), (3, 2), (3, 1)],
+    12: [(0, 1), (0, 3), (0, 4), (1, 2), (1, 5), (2, 3), (2, 6), (3, 7), (4, 5), (4, 7), (5, 6), (6, 7)],
+    13: [(0, 1), (0, 2), (0, 3), (1, 2), (1, 4), (2, 5), (3, 4), (3, 5), (4, 5)],
+    14: [(0, 1), (0, 3), (0, 4), (1, 2), (1, 4), (2, 3), (2, 4), (3, 4)],
+}
+
+
+@pytest.mark.parametrize('gmsh_type', sorted(REFERENCE))
+def test_gmsh_quadratic_order(tmp_path: Path, gmsh_type: int) -> None:
+    corners = np.array(REFERENCE[gmsh_type], np.float64)
+    mids = corners[np.array(EDGES[gmsh_type])].mean(axis=1)
+    typename, size, _ = GMSH_ELEMENT_TYPES[gmsh_type]
+    # Узлы граней и центра элементов Лагранжа при чтении отбрасываются
+    extra = np.full((size - len(corners) - len(mids), 3), 7.0)
+    nodes = np.concatenate([corners, mids, extra])
+    path = tmp_path / 'one.msh'
+    _write_gmsh(path, False, {}, {(3, 1): []}, nodes, [(3, 1, gmsh_type, np.arange(size + 1)[None] + [[1] + [0] * size])])
+
+    m = FCModel.from_gmsh(str(path))
+    xyz = m.mesh.nodes_xyz.reshape(-1, 3)
+    element = m.mesh.element_arrays(typename)['nodes'][0] - 1
+    pairs, middle = midside_nodes(typename)
+    if typename != 'PYR13':
+        assert np.allclose(xyz[element[middle]], xyz[element[pairs]].mean(axis=1))
+    assert m.mesh.element_geometry(typename)['measures'][0] == pytest.approx(VOLUMES[gmsh_type])
+    assert list(m.blocks) == [1]
+
+
+def test_vtu_round_trip(tmp_path: Path) -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    path = tmp_path / 'cube.vtu'
+    m.to_vtu(str(path))
+    back = FCModel.from_vtu(str(path))
+
+    assert np.array_equal(back.mesh.nodes_ids, m.mesh.nodes_ids)
+    assert np.allclose(back.mesh.nodes_xyz.reshape(-1, 3), m.mesh.nodes_xyz.reshape(-1, 3))
+    for key in ('ids', 'nodes', 'blocks', 'parent_ids'):
+        assert np.array_equal(back.mesh.element_arrays('HEX8')[key], m.mesh.element_arrays('HEX8')[key])
+    for set_id, fc_set in m.sidesets.items():
+        if len(fc_set.apply):
+            assert np.array_equal(back.sidesets[set_id].apply.data.reshape(-1, 2), fc_set.apply.data.reshape(-1, 2))
+    assert set(back.blocks) == set(m.blocks)
+
+    # Без массивов parent_id и order: нет геометрии и order 1
+    raw = path.read_bytes()
+    path.write_bytes(raw.replace(b'Name="parent_id"', b'Name="geometry"').replace(b'Name="order"', b'Name="degree"'))
+    arrays = FCModel.from_vtu(str(path)).mesh.element_arrays('HEX8')
+    assert np.all(arrays['parent_ids'] == 0) and np.all(arrays['orders'] == 1)
+
+
+def _with_steel(m: FCModel) -> FCModel:
+    steel = FCMaterial({'id': 3, 'name': 'Steel'})
+    steel.set_constant('elasticity', 'HOOK', 'YOUNG_MODULE', 2.1e11)
+    steel.set_constant('elasticity', 'HOOK', 'POISSON_RATIO', 0.3)
+    steel.set_constant('common', 'USUAL', 'DENSITY', 7800.0)
+    m.materials[3] = steel
+    for block in m.blocks.values():
+        block.material_id = 3
+    return m
+
+
+@pytest.mark.parametrize('suffix', ['inp', 'bdf'])
+def test_inp_bdf_round_trip(tmp_path: Path, suffix: str) -> None:
+    m = _with_steel(FCModel(str(DATA / 'cube_sidesets.fc')))
+    m.nodesets[5] = new_set(5, 'bottom', np.arange(1, 20, dtype=np.int32))
+    path = tmp_path / f'cube.{suffix}'
+    getattr(m, f'to_{suffix}')(str(path))
+    back = getattr(FCModel, f'from_{suffix}')(str(path))
+
+    assert np.array_equal(back.mesh.nodes_ids, m.mesh.nodes_ids)
+    assert np.allclose(back.mesh.nodes_xyz.reshape(-1, 3), m.mesh.nodes_xyz.reshape(-1, 3))
+    for key in ('ids', 'nodes', 'blocks'):
+        assert np.array_equal(back.mesh.element_arrays('HEX8')[key], m.mesh.element_arrays('HEX8')[key])
+    material = back.materials[back.blocks[1].material_id]
+    assert material.constant('elasticity', 'POISSON_RATIO') == pytest.approx(0.3)
+    assert material.constant('common', 'DENSITY') == pytest.approx(7800.0)
+    assert [s.apply.data.ravel().tolist() for s in back.nodesets.values()] == [list(range(1, 20))]
+    if suffix == 'inp':
+        # Непустые наборы сторон нумеруются подряд
+        sides = [s.apply.data.reshape(-1, 2) for s in m.sidesets.values() if len(s.apply)]
+        assert len(back.sidesets) == len(sides)
+        for fc_set, data in zip(back.sidesets.values(), sides):
+            assert np.array_equal(fc_set.apply.data.reshape(-1, 2), data)
+
+
+INP = """*HEADING
+** Призма и квадратичный шестигранник
+*NODE, NSET=ALL
+1, 0., 0., 0.
+2, 1., 0., 0.
+3, 0., 1., 0.
+4, 0., 0., 1.
+5, 1., 0., 1.
+6, 0., 1., 1.
+*ELEMENT, TYPE=C3D6, ELSET=PRISM
+1, 1, 2, 3, 4, 5, 6
+*NSET, NSET=BASE, GENERATE
+1, 3, 1
+*ELSET, ELSET=ONE
+1
+*SURFACE, NAME=TOP
+ONE, S2
+*MATERIAL, NAME=ALU
+*ELASTIC
+7.0e10, 0.33
+20.0, 0.1
+*DENSITY
+2700.
+*SOLID SECTION, ELSET=ONE, MATERIAL=ALU
+*STEP
+*STATIC
+*NSET, NSET=IGNORED
+1
+*END STEP
+"""
+
+
+def test_inp_deck(tmp_path: Path) -> None:
+    path = tmp_path / 'prism.inp'
+    path.write_text(INP)
+    m = FCModel.from_inp(str(path))
+
+    assert list(m.mesh.elements) == ['WEDGE6']
+    assert m.mesh.element_geometry('WEDGE6')['measures'][0] == pytest.approx(0.5)
+    assert [s.name for s in m.nodesets.values()] == ['ALL', 'BASE']
+    assert m.nodesets[2].apply.data.ravel().tolist() == [1, 2, 3]
+    # Сторона S2 — верхний треугольник 4-6-5
+    element, face = m.sidesets[1].apply.data.reshape(-1, 2)[0]
+    assert m.sidesets[1].name == 'TOP' and element == 1
+    assert face == m.mesh.find_faces(np.array([[4, 5, 6]], np.int32))[0, 1]
+    # Секция по набору ONE выделяет элемент в отдельный блок с материалом ALU
+    block = m.blocks[int(m.mesh.element_arrays('WEDGE6')['blocks'][0])]
+    assert block.id == 2 and m.materials[block.material_id].name == 'ALU'
+    assert m.materials[block.material_id].constant('elasticity', 'YOUNG_MODULE') == pytest.approx(7.0e10)
+
+
+BDF = """SOL 101
+CEND
+BEGIN BULK
+$ Свободный, короткий и длинный форматы
+GRID,1,,0.,0.,0.
+GRID           2             1.0     0.0     0.0
+GRID*                  3                             0.0             1.0
+*                    0.0
+GRID,4,,0.,0.,1.-0
+GRID,5,,1.,0.,10.-1
+GRID           6             0.0     1.0     1.0
+CPENTA         7       2       1       2       3       4       5       6
+PSOLID         2      10
+MAT1,10,2.0+11,8.0+10,,7.8+3
+SET1,3,1,THRU,3,6
+ENDDATA
+"""
+
+
+def test_bdf_deck(tmp_path: Path) -> None:
+    path = tmp_path / 'prism.bdf'
+    path.write_text(BDF)
+    m = FCModel.from_bdf(str(path))
+
+    assert np.allclose(m.mesh.nodes_xyz.reshape(-1, 3)[[2, 3, 4]], [[0, 1, 0], [0, 0, 1], [1, 0, 1]])
+    arrays = m.mesh.element_arrays('WEDGE6')
+    assert arrays['ids'].tolist() == [7] and arrays['blocks'].tolist() == [2]
+    assert m.mesh.element_geometry('WEDGE6')['measures'][0] == pytest.approx(0.5)
+    assert m.blocks[2].material_id == 10
+    assert m.materials[10].constant('elasticity', 'POISSON_RATIO') == pytest.approx(0.25)
+    assert m.materials[10].constant('common', 'DENSITY') == pytest.approx(7800.0)
+    assert m.nodesets[3].apply.data.ravel().tolist() == [1, 2, 3, 6]
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCElement, FCMesh, FCModel
+from fc_model.fc_mesh import FC_ELEMENT_SHAPES
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def single_element_mesh(typename: str, rng: np.random.Generator) -> FCMesh:
+    shape = FC_ELEMENT_SHAPES[typename]
+    ref = np.zeros((len(shape.nodes), 3))
+    ref[:, :shape.dim] = shape.nodes
+    affine = np.eye(3) + 0.2 * rng.random((3, 3))
+    mesh = FCMesh()
+    mesh.nodes_ids = np.arange(10, 10 + len(ref), dtype=np.int32)
+    mesh.nodes_xyz = ref @ affine.T + 0.02 * rng.random(ref.shape) * [1, 1, shape.dim == 3]
+    mesh[7] = FCElement({
+        'id': 7, 'block': 1, 'parent_id': 0, 'type': typename,
+        'nodes': mesh.nodes_ids.tolist(), 'order': 1,
+    })
+    return mesh
+
+
+@pytest.mark.parametrize('typename', [
+    'TRI3', 'TRI6', 'QUAD4', 'QUAD8',
+    'TETRA4', 'TETRA10', 'HEX8', 'HEX20', 'WEDGE6', 'WEDGE15', 'PYR5', 'PYR13',
+])
+def test_locate_single_element(typename: str) -> None:
+    rng = np.random.default_rng(3)
+    mesh = single_element_mesh(typename, rng)
+    shape = FC_ELEMENT_SHAPES[typename]
+
+    lo, hi = shape.nodes.min(axis=0), shape.nodes.max(axis=0)
+    xi = lo + (hi - lo) * rng.random((400, shape.dim))
+    xi = xi[shape.violation(xi) == 0][:100]
+    points = np.zeros((len(xi), 3))
+    points[:, :shape.dim] = shape.values(xi) @ mesh.nodes_xyz[:, :shape.dim]
+
+    ids, local = mesh.locate(points)
+    assert np.all(ids == 7)
+    if typename.startswith('PYR'):
+        # Параметризация вырожденного шестигранника неоднозначна только в вершине
+        assert np.allclose(shape.values(local[:, :3]) @ mesh.nodes_xyz, points)
+    else:
+        assert np.allclose(local[:, :shape.dim], xi)
+
+    ids, local = mesh.locate(np.array([[5.0, 5.0, 5.0]]))
+    assert ids[0] == -1 and np.all(np.isnan(local))
+
+
+def test_locate_on_model() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    arrays = m.mesh.element_arrays('HEX8')
+    centers = m.mesh.nodes_xyz[m.mesh.node_positions(arrays['nodes'])].mean(axis=1)
+
+    ids, local = m.mesh.locate(centers)
+    assert np.array_equal(ids, arrays['ids'])
+    assert np.allclose(local, 0.0)
+
+    # Узлы сетки лежат на границах элементов и тоже должны находиться
+    ids, _ = m.mesh.locate(m.mesh.nodes_xyz)
+    assert np.all(ids > 0)
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCBlock, FCData, FCMaterialProperty, FCModel, FCPropertyTable
+from fc_model.fc_mass import section_area
+from fc_model.fc_value import encode
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def _dense_cube(density: float) -> FCModel:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    prop = FCMaterialProperty('USUAL', 'DENSITY', FCData(encode(np.array([density])), 0, ''))
+    m.materials[1].properties.setdefault('common', []).append([prop])
+    return m
+
+
+def _add(m: FCModel, typename: str, eid: int, nodes: list, block: int, table: dict) -> None:
+    m.property_tables[table['id']] = FCPropertyTable(table)  # type: ignore[arg-type]
+    m.blocks[block] = FCBlock({'id': block, 'cs_id': 1, 'material_id': 1, 'property_id': table['id']})
+    one = np.array([1], np.int32)
+    m.mesh.set_element_arrays(typename, {  # type: ignore[arg-type]
+        'ids': np.array([eid], np.int32), 'nodes': np.array([nodes], np.int32),
+        'blocks': one * block, 'parent_ids': one * 0, 'orders': one,
+    })
+
+
+def test_solid_cube_mass_properties() -> None:
+    m = _dense_cube(2.0)
+    xyz = m.mesh.nodes_xyz.reshape(-1, 3)
+    size = np.ptp(xyz, axis=0)
+    report = m.mass_properties()
+
+    mass = 2.0 * np.prod(size)
+    assert report['total']['mass'] == pytest.approx(mass)
+    assert np.allclose(report['total']['center'], (xyz.min(axis=0) + xyz.max(axis=0)) / 2)
+    # Брусок: I_xx = m (b^2 + c^2) / 12
+    expected = mass * (np.sum(size**2) - size**2) / 12
+    assert np.allclose(report['total']['inertia'], np.diag(expected))
+    assert report['blocks'][1]['mass'] == pytest.approx(mass)
+
+
+def test_lumpmass_and_beam_blocks() -> None:
+    m = _dense_cube(2.0)
+    ids = m.mesh.nodes_ids
+    xyz = m.mesh.nodes_xyz.reshape(-1, 3)
+    corner = int(np.argmin(xyz.sum(axis=1)))
+    # Балка вдоль ребра куба: от угла до соседнего угла по x
+    other = int(np.argmin(np.abs(xyz - (xyz[corner] + [np.ptp(xyz[:, 0]), 0, 0])).sum(axis=1)))
+
+    _add(m, 'LUMPMASS3D', 1001, [ids[corner]], 2, {
+        'id': 2, 'type': 5, 'properties': {'mass': 3.0, 'mass_inertia': 0.5}, 'additional_properties': {}})
+    _add(m, 'BEAM26', 1002, [ids[corner], ids[other]], 3, {
+        'id': 3, 'type': 1, 'properties': {'section_type': 0, 'geometry': {'B': 0.1, 'H': 0.2}},
+        'additional_properties': {}})
+    report = m.mass_properties()
+
+    lump = report['blocks'][2]
+    assert lump['mass'] == pytest.approx(3.0)
+    assert np.allclose(lump['center'], xyz[corner])
+    assert np.allclose(lump['inertia'], 0.5 * np.eye(3))
+
+    length = np.ptp(xyz[:, 0])
+    beam = report['blocks'][3]
+    assert beam['mass'] == pytest.approx(2.0 * 0.02 * length)
+    assert np.allclose(beam['center'], (xyz[corner] + xyz[other]) / 2)
+    assert beam['inertia'][1, 1] == pytest.approx(beam['mass'] * length**2 / 12)
+
+    masses = [block['mass'] for block in report['blocks'].values()]
+    assert report['total']['mass'] == pytest.approx(sum(masses))
+
+
+def test_section_areas() -> None:
+    def area(section_type: int, **geometry: float) -> float:
+        return section_area(FCPropertyTable({  # type: ignore[arg-type]
+            'id': 1, 'type': 1, 'properties': {'section_type': section_type, 'geometry': geometry},
+            'additional_properties': {}}))
+
+    assert area(1, a=4.0, b=2.0) == pytest.approx(2.0 * np.pi)
+    # Уголок и тавр: полка 3×0.5 и стенка 0.25 на оставшейся высоте 1.5
+    assert area(6, H=2.0, B=3.0, d=0.25, c1=0.5) == pytest.approx(1.875)
+    assert area(8, H=2.0, B=3.0, d=0.25, c1=0.5) == pytest.approx(1.875)
+    # Корытный профиль: полки 1×0.1, 1×0.1, 2×0.2 и стенки 0.1 высотой 0.7
+    hat = area(10, H=1.0, B1=1.0, B2=1.0, B3=2.0, c1=0.1, c2=0.1, c3=0.2, d1=0.1, d2=0.1)
+    assert hat == pytest.approx(0.74)
+    with pytest.raises(ValueError, match="missing 'c1'"):
+        area(8, H=2.0, B=3.0, d=0.25)
+    with pytest.raises(ValueError, match="requires 'area'"):
+        area(4)
+
+
+def test_missing_density() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    with pytest.raises(ValueError, match='DENSITY'):
+        m.mass_properties()
@@ -0,0 +1,58 @@
+from base64 import b64encode
+
+import numpy as np
+
+from fc_model import FCModel, FCRestraint
+
+from conftest import hex_grid
+
+
+def brute_nnz(m: FCModel, free: np.ndarray) -> int:
+    """Число ненулевых элементов матрицы перебором пар узлов элементов."""
+    pairs = set()
+    for element in m.mesh:
+        for a in element.nodes:
+            for b in element.nodes:
+                pairs.add((a, b))
+    return sum(int(free[a - 1] * free[b - 1]) for a, b in pairs)
+
+
+def test_memory_nnz_matches_brute_force() -> None:
+    m = hex_grid(3, 2, 2)
+    report = m.estimate_solver_memory(pattern=True, memory_limit=1)
+
+    free = np.full(len(m.mesh.nodes_ids), 3)
+    assert report['dofs'] == 3 * len(m.mesh.nodes_ids)
+    assert report['nnz'] == brute_nnz(m, free)
+    assert report['factor_nnz'] >= (report['nnz'] + report['dofs']) // 2
+    assert report['permission_write']
+
+    pattern = report['pattern']
+    assert pattern is not None
+    assert pattern['offsets'][-1] == report['nnz']
+    assert len(pattern['offsets']) == report['dofs'] + 1
+    for row in range(report['dofs']):
+        cols = pattern['indices'][pattern['offsets'][row]:pattern['offsets'][row + 1]]
+        assert row in cols and np.all(np.diff(cols) > 0)
+
+
+def test_memory_settings_and_restraints() -> None:
+    m = hex_grid(2, 2, 2)
+    m.settings['heat_transfer'] = True
+    fixed = np.arange(1, 10, dtype=np.int32)  # грань x = 0
+    m.restraints.append(FCRestraint({
+        'id': 1, 'name': 'fix', 'apply_to': b64encode(fixed.tobytes()).decode(),
+        'apply_to_size': len(fixed), 'flag': [1, 1, 1, 0, 0, 0],
+    }))
+    report = m.estimate_solver_memory(memory_limit=1 << 40)
+
+    free = np.full(len(m.mesh.nodes_ids), 4)
+    free[fixed - 1] = 1
+    assert report['restrained'] == 3 * len(fixed)
+    assert report['dofs'] == int(free.sum())
+    assert report['nnz'] == brute_nnz(m, free)
+    assert report['pattern'] is None
+    assert not report['permission_write']
+
+    m.settings['dimensions'] = '2D'
+    assert m.estimate_solver_memory()['dofs'] == int(free.sum()) - len(m.mesh.nodes_ids) + len(fixed)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCModel
+from fc_model.fc_mesh import FC_ELEMENT_SHAPES, FC_QUADRATIC_TYPES, midside_nodes
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+# Пирамида задана вырожденным шестигранником: её опорные узлы рёбер к вершине не середины
+@pytest.mark.parametrize('typename', sorted(tp for tp in FC_QUADRATIC_TYPES.values() if not tp.startswith('PYR')))
+def test_midside_tables_match_shapes(typename: str) -> None:
+    pairs, mids = midside_nodes(typename)  # type: ignore[arg-type]
+    shape = FC_ELEMENT_SHAPES[typename]  # type: ignore[index]
+    corners = len(shape.nodes) - len(mids)
+    assert sorted(mids.tolist()) == list(range(corners, len(shape.nodes)))
+    assert np.allclose(shape.nodes[mids], shape.nodes[pairs].mean(axis=1))
+
+
+def test_reduce_and_elevate_round_trip() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    mesh = m.mesh
+    original = {tuple(p) for p in mesh.nodes_xyz.reshape(-1, 3).tolist()}
+
+    removed = mesh.reduce_order()
+    assert list(mesh.elements) == ['HEX8']
+    assert len(removed) == 54 and len(mesh.nodes_ids) == 27
+
+    # Решётка 2x2x2: 54 различных ребра, каждое получает один общий узел
+    added = mesh.elevate_order()
+    assert list(mesh.elements) == ['HEX20']
+    assert len(added) == 54 and int(added.min()) > int(mesh.nodes_ids[:27].max())
+    assert {tuple(p) for p in mesh.nodes_xyz.reshape(-1, 3).tolist()} == original
+
+    geometry = mesh.element_geometry('HEX20')
+    assert np.allclose(geometry['measures'], geometry['measures'][0])
+
+    # Квадратичная сетка повторно не меняется
+    assert len(mesh.elevate_order()) == 0 and len(mesh.nodes_ids) == 81
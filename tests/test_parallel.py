@@ -0,0 +1,52 @@
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCElementChunk, FCModel
+
+from conftest import hex_grid
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def chunk_rows(scale: float, chunk: FCElementChunk) -> np.ndarray:
+    """Id, блок и сумма координат узлов каждого элемента пачки."""
+    coords = chunk['nodes_xyz'][chunk['positions']]
+    return np.column_stack([chunk['ids'], chunk['blocks'], scale * coords.sum(axis=(1, 2))])
+
+
+def chunk_writes(chunk: FCElementChunk) -> np.ndarray:
+    chunk['nodes_xyz'][0] = 0.0
+    return chunk['ids']
+
+
+def test_parallel_map_matches_serial() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    func = partial(chunk_rows, 2.0)
+
+    serial = m.mesh.parallel_map(func, chunk_size=3, workers=1)
+    shared = m.mesh.parallel_map(func, chunk_size=3, workers=2)
+    assert np.array_equal(serial, shared)
+
+    # Результаты склеены в порядке типов и элементов
+    ids = np.concatenate([m.mesh.element_arrays(t)['ids'] for t in m.mesh.elements if m.mesh.elements[t]])
+    assert np.array_equal(shared[:, 0], ids)
+
+    # 216 элементов пачками по 16 — по несколько пачек на процесс
+    grid = hex_grid(6, cell=0.5)
+    geometry = grid.mesh.element_geometry('HEX8', chunk_size=16, workers=2)
+    assert len(geometry['measures']) == 216
+    assert np.allclose(geometry['measures'], grid.mesh.element_geometry('HEX8')['measures'])
+    assert np.allclose(geometry['measures'], 0.125)
+
+
+def test_parallel_map_is_read_only() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    xyz = m.mesh.nodes_xyz.copy()
+    for workers in (1, 2):
+        with pytest.raises(ValueError):
+            m.mesh.parallel_map(chunk_writes, chunk_size=3, workers=workers)
+    assert np.array_equal(m.mesh.nodes_xyz, xyz)
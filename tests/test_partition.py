@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCModel
+
+from conftest import hex_grid
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+@pytest.mark.parametrize('method', ['rcb', 'graph'])
+def test_partition_balance_and_interface(method: str) -> None:
+    m = hex_grid(12, 6, 4)
+    parts = m.partition(5, method)  # type: ignore[arg-type]
+
+    sizes = [len(p['model'].mesh) for p in parts]
+    assert max(sizes) - min(sizes) <= 1
+
+    # Части покрывают все элементы без пересечений
+    element_ids = np.concatenate([p['model'].mesh.element_arrays('HEX8')['ids'] for p in parts])
+    assert np.array_equal(np.sort(element_ids), np.arange(1, len(m.mesh) + 1))
+
+    # Интерфейс — узлы, принадлежащие нескольким частям; соседство симметрично
+    owners: dict = {}
+    for k, p in enumerate(parts):
+        for node in p['model'].mesh.nodes_ids.tolist():
+            owners.setdefault(node, set()).add(k)
+    for k, p in enumerate(parts):
+        shared = sorted(n for n in p['model'].mesh.nodes_ids.tolist() if len(owners[n]) > 1)
+        assert p['interface'].tolist() == shared
+        expected = sorted(set().union(*(owners[n] for n in shared)) - {k})
+        assert p['neighbors'] == expected
+        for j in p['neighbors']:
+            assert k in parts[j]['neighbors']
+
+
+def test_graph_partition_follows_slab() -> None:
+    # Вытянутый брус делится графовым методом поперёк длинной стороны
+    m = hex_grid(16, 2, 2)
+    parts = m.partition(2, 'graph')
+    assert len(parts[0]['interface']) == len(parts[1]['interface'])
+    assert len(parts[0]['interface']) <= 2 * 9
+
+
+def test_partition_filters_sets() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    parts = m.partition(2)
+
+    for p in parts:
+        sub = p['model']
+        node_ids = set(sub.mesh.nodes_ids.tolist())
+        element_ids = {e.id for e in sub.mesh}
+        for nodeset in sub.nodesets.values():
+            assert set(np.asarray(nodeset.apply.data).reshape(-1).tolist()) <= node_ids
+        for sideset in sub.sidesets.values():
+            assert set(np.asarray(sideset.apply.data)[:, 0].tolist()) <= element_ids
+        assert list(sub.coordinate_systems) == list(m.coordinate_systems)
+    assert sum(len(p['model'].mesh) for p in parts) == len(m.mesh)
+
+
+def test_partition_errors() -> None:
+    m = hex_grid(2, 2, 1)
+    with pytest.raises(ValueError):
+        m.partition(0)
+    with pytest.raises(ValueError):
+        m.partition(5)
+    with pytest.raises(ValueError):
+        m.partition(2, 'metis')  # type: ignore[arg-type]
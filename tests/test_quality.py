@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCElement, FCModel
+from fc_model.fc_mesh import FCMesh
+from fc_model.fc_quality import block_histograms, element_quality, mesh_quality
+from fc_model.fc_shapes import FC_SHAPES
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_cube_mesh_is_ideal() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    quality = mesh_quality(m.mesh)
+
+    assert len(quality['ids']) == 8
+    assert np.allclose(quality['scaled_jacobian'], 1.0)
+    assert np.allclose(quality['aspect_ratio'], 1.0)
+    assert np.allclose(quality['skewness'], 0.0)
+    assert np.allclose(quality['min_dihedral'], 90.0)
+    assert np.allclose(quality['warpage'], 0.0)
+    assert not quality['inverted'].any()
+
+
+def test_distorted_and_inverted_elements() -> None:
+    hexa = FC_SHAPES['HEX8'].nodes.copy()
+    sheared = hexa.copy()
+    sheared[4:, 0] += 2.0                      # сдвиг верхней грани на 45°
+    warped = hexa.copy()
+    warped[6, 2] += 0.5                        # один узел верхней грани поднят
+    inverted = hexa[[4, 5, 6, 7, 0, 1, 2, 3]]  # верх и низ переставлены
+
+    scaled_jacobian, aspect_ratio, skewness, min_dihedral, warpage = element_quality(
+        'HEX8', np.stack([hexa, sheared, warped, inverted]))
+
+    assert scaled_jacobian[1] == pytest.approx(1 / np.sqrt(2))
+    assert min_dihedral[1] == pytest.approx(45.0)
+    assert skewness[1] == pytest.approx(0.5)
+    assert aspect_ratio[1] == pytest.approx(np.sqrt(2))
+    assert warpage[2] > 5.0 and warpage[0] == 0.0
+    assert scaled_jacobian[3] < 0
+
+
+def test_simplex_jacobian_does_not_depend_on_numbering() -> None:
+    sliver = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0.01]])
+    even = [[0, 1, 2, 3], [1, 0, 3, 2], [2, 3, 0, 1], [3, 2, 1, 0], [1, 2, 0, 3], [0, 2, 3, 1]]
+    tetra = element_quality('TETRA4', sliver[even])[0]
+    assert np.allclose(tetra, tetra[0]) and 0 < tetra[0] < 0.02
+
+    needle = np.array([[0, 0, 0], [1, 0, 0], [0.5, 0.01, 0]])
+    triangle = element_quality('TRI3', needle[[[0, 1, 2], [2, 0, 1], [1, 0, 2], [0, 2, 1]]])[0]
+    assert np.allclose(triangle, triangle[0]) and 0 < triangle[0] < 0.05
+
+    # Прямоугольный угол тетраэдра из разбиения куба не даёт значения выше идеала
+    corner = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], np.float64)
+    assert element_quality('TETRA4', corner[None])[0][0] < 1.0
+
+
+def test_reversed_plane_elements_are_inverted() -> None:
+    # Два QUAD4 в плоскости xy: второй обходится по часовой стрелке
+    mesh = FCMesh()
+    mesh.nodes_ids = np.arange(1, 7, dtype=np.int32)
+    mesh.nodes_xyz = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0]], np.float64)
+    for eid, nodes in ((1, [1, 2, 5, 4]), (2, [2, 3, 6, 5][::-1])):
+        mesh[eid] = FCElement({'id': eid, 'block': 1, 'parent_id': 0, 'type': 'QUAD4', 'nodes': nodes, 'order': 1})
+    quality = mesh_quality(mesh)
+    assert quality['scaled_jacobian'][0] == pytest.approx(1.0)
+    assert quality['inverted'].tolist() == [False, True]
+
+    triangle = np.array([[0, 0, 1], [1, 0, 1], [0, 1, 1]], np.float64)
+    scaled_jacobian = element_quality('TRI3', np.stack([triangle, triangle[::-1]]), normal=[0, 0, 1])[0]
+    assert scaled_jacobian[0] > 0 and scaled_jacobian[1] < 0
+
+
+def test_block_histograms_and_process_pool() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    quality = mesh_quality(m.mesh, processes=2, chunk_size=3)
+    assert np.array_equal(quality['ids'], mesh_quality(m.mesh)['ids'])
+
+    histogram = block_histograms(quality, 'scaled_jacobian', bins=5, value_range=(0.0, 1.0))
+    assert list(histogram['counts']) == [1]
+    assert histogram['counts'][1].tolist() == [0, 0, 0, 0, 8]
+    assert len(histogram['edges']) == 6
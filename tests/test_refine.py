@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCMesh, FCModel, FCSet
+from fc_model.fc_mesh import FC_ELEMENT_TYPES_KEYNAME
+from fc_model.fc_quality import mesh_quality
+from fc_model.fc_value import encode
+
+
+DATA = Path(__file__).parent / 'data'
+
+ELEMENTS = {
+    'BEAM26': [[0, 0, 0], [1, 0, 0]],
+    'TRI3': [[0, 0, 0], [1, 0, 0], [0, 1, 0]],
+    'QUAD4': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]],
+    'TETRA4': [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]],
+    'HEX8': [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]],
+    'WEDGE6': [[0, 0, 0], [0, 1, 0], [1, 0, 0], [0, 0, 1], [0, 1, 1], [1, 0, 1]],
+    'PYR5': [[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0], [0, 0, 1]],
+}
+
+# Число элементов и узлов после двух уровней деления
+COUNTS = {'BEAM26': 4, 'TRI3': 16, 'QUAD4': 16, 'TETRA4': 64, 'HEX8': 64, 'WEDGE6': 64, 'PYR5': 36 + 56}
+NODES = {'BEAM26': 5, 'TRI3': 15, 'QUAD4': 25, 'TETRA4': 35, 'HEX8': 125, 'WEDGE6': 75, 'PYR5': 55}
+
+
+def _single(typename: str) -> FCMesh:
+    mesh = FCMesh()
+    mesh.nodes_xyz = np.array(ELEMENTS[typename], np.float64)
+    mesh.nodes_ids = np.arange(1, len(mesh.nodes_xyz) + 1, dtype=np.int32)
+    one = np.ones(1, np.int32)
+    mesh.set_element_arrays(typename, {  # type: ignore[arg-type]
+        'ids': one, 'nodes': mesh.nodes_ids[None].copy(), 'blocks': one * 3, 'parent_ids': one * 5, 'orders': one})
+    return mesh
+
+
+def _measure(mesh: FCMesh) -> float:
+    return float(sum(mesh.element_geometry(tp)['measures'].sum() for tp in mesh.elements))
+
+
+@pytest.mark.parametrize('typename', sorted(ELEMENTS))
+def test_refine_single_element(typename: str) -> None:
+    mesh = _single(typename)
+    before = _measure(mesh)
+    levels = mesh.refine(2)
+
+    assert sum(len(bucket) for bucket in mesh.elements.values()) == COUNTS[typename]
+    assert len(mesh.nodes_ids) == NODES[typename]
+    assert _measure(mesh) == pytest.approx(before)
+    assert not np.any(mesh_quality(mesh)['inverted'])
+    for typename_ in mesh.elements:
+        arrays = mesh.element_arrays(typename_)
+        assert np.all(arrays['blocks'] == 3) and np.all(arrays['parent_ids'] == 5)
+    assert len(levels) == 2 and np.all(np.isin(levels[0]['children'], levels[1]['parents']))
+
+
+def test_refine_model_sets() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    xyz = m.mesh.nodes_xyz.reshape(-1, 3)
+    # Набор узлов грани x = min
+    face = m.mesh.nodes_ids[np.isclose(xyz[:, 0], xyz[:, 0].min())]
+    m.nodesets[1] = FCSet({'id': 1, 'name': 'left', 'apply_to': encode(face), 'apply_to_size': len(face)})
+    sizes = {key: len(s.apply) for key, s in m.sidesets.items()}
+    facets = np.array(FC_ELEMENT_TYPES_KEYNAME['HEX8']['facets'])
+
+    def face_points(mesh: FCMesh, pairs: np.ndarray) -> np.ndarray:
+        arrays = mesh.element_arrays('HEX8')
+        rows = mesh.node_positions(arrays['nodes'])[np.searchsorted(arrays['ids'], pairs[:, 0])]
+        return mesh.nodes_xyz.reshape(-1, 3)[rows[np.arange(len(pairs))[:, None], facets[pairs[:, 1]]]]
+
+    planes = {}
+    for key, sideset in m.sidesets.items():
+        if len(sideset.apply):
+            pairs = sideset.apply.data.reshape(-1, 2)
+            points = face_points(m.mesh, pairs)
+            normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+            planes[key] = {int(e): (p[0], n) for e, p, n in zip(pairs[:, 0], points, normals)}
+
+    levels = m.refine()
+    xyz = m.mesh.nodes_xyz.reshape(-1, 3)
+    assert len(m.mesh.elements['HEX8']) == 64 and len(m.mesh.nodes_ids) == 125
+    assert len(m.nodesets[1].apply) == 25
+    assert np.allclose(xyz[m.mesh.node_positions(m.nodesets[1].apply.data), 0], xyz[:, 0].min())
+
+    # Каждая сторона потомка лежит в плоскости стороны родителя
+    parents = dict(zip(levels[0]['children'].tolist(), levels[0]['parents'].tolist()))
+    for key, sideset in m.sidesets.items():
+        assert len(sideset.apply) == 4 * sizes[key]
+        if key not in planes:
+            continue
+        pairs = sideset.apply.data.reshape(-1, 2)
+        for (child, _), points in zip(pairs, face_points(m.mesh, pairs)):
+            origin, normal = planes[key][parents[int(child)]]
+            assert np.allclose((points - origin) @ normal, 0.0)
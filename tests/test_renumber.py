@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import numpy as np
+
+from fc_model import FCModel
+from fc_model.fc_graph import bandwidth, node_graph
+from fc_model.fc_spatial import hilbert_keys
+
+from conftest import hex_grid
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def shuffled_grid(n: int, seed: int) -> FCModel:
+    """Сетка n×n×n из HEX8 на [0, 1]^3 со случайной нумерацией узлов."""
+    ids = np.random.default_rng(seed).permutation((n + 1) ** 3).astype(np.int32) + 1
+    return hex_grid(n, cell=1.0 / n, node_ids=ids)
+
+
+def element_centers(m: FCModel) -> np.ndarray:
+    nodes = m.mesh.element_arrays('HEX8')['nodes']
+    return m.mesh.nodes_xyz[m.mesh.node_positions(nodes)].mean(axis=1)
+
+
+def test_rcm_reduces_bandwidth() -> None:
+    m = shuffled_grid(8, 0)
+    centers = element_centers(m)
+
+    report = m.renumber_nodes()
+    assert report['after']['bandwidth'] < report['before']['bandwidth'] / 3
+    assert report['after']['profile'] < report['before']['profile']
+
+    # Геометрия элементов не меняется, строки узлов упорядочены по id
+    assert np.allclose(element_centers(m), centers)
+    assert np.array_equal(m.mesh.nodes_ids, np.arange(1, 9**3 + 1))
+    graph = node_graph(m.mesh)
+    assert bandwidth(graph, np.arange(len(m.mesh.nodes_ids))) == report['after']
+
+
+def test_renumber_updates_references() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    xyz = {int(i): tuple(p) for i, p in zip(m.mesh.nodes_ids, m.mesh.nodes_xyz)}
+    nodeset = np.array(next(iter(m.nodesets.values())).apply.data).ravel()
+
+    report = m.renumber_nodes('rcm')
+    new_nodeset = np.array(next(iter(m.nodesets.values())).apply.data).ravel()
+    assert np.array_equal(new_nodeset, report['nodes'](nodeset))
+
+    positions = m.mesh.node_positions(new_nodeset)
+    assert [tuple(p) for p in m.mesh.nodes_xyz[positions]] == [xyz[int(i)] for i in nodeset]
+
+
+def test_hilbert_curve_is_continuous() -> None:
+    g = np.arange(8.0)
+    xyz = np.stack(np.meshgrid(g, g, g, indexing='ij'), -1).reshape(-1, 3)
+    keys = hilbert_keys(xyz, 3)
+    assert len(np.unique(keys)) == len(xyz)
+    path = xyz[np.argsort(keys)]
+    assert np.all(np.abs(np.diff(path, axis=0)).sum(axis=1) == 1)
+
+
+def test_spatial_reorder() -> None:
+    for curve in ('hilbert', 'morton'):
+        m = shuffled_grid(6, 2)
+        for element in m.mesh:
+            element.parent_id = 1 + element.id % 3     # id геометрии, не элемента
+        parents = {element.id: element.parent_id for element in m.mesh}
+        centers = element_centers(m)
+        maps = m.reorder(spatial=curve)
+
+        ids = m.mesh.element_arrays('HEX8')['ids']
+        assert np.array_equal(ids, np.arange(1, 6**3 + 1))
+        new_centers = element_centers(m)
+        assert np.allclose(new_centers[maps['elements'](np.arange(1, 6**3 + 1)) - 1], centers)
+        new_ids = maps['elements'](np.array(list(parents), np.int32)).tolist()
+        assert {element.id: element.parent_id for element in m.mesh} == dict(zip(new_ids, parents.values()))
+
+        # Соседние по нумерации узлы лежат рядом
+        step = np.linalg.norm(np.diff(m.mesh.nodes_xyz, axis=0), axis=1)
+        assert np.median(step) <= 1.0 / 6 + 1e-12
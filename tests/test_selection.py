@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from fc_model.fc_addons import new_set
+from fc_model.fc_selection import band, boundary_sides, box, cylinder, sphere
+
+from conftest import hex_grid
+
+
+def test_set_algebra() -> None:
+    a = new_set(1, 'a', np.array([5, 1, 3, 3, 9], np.int32))
+    b = new_set(2, 'b', np.array([3, 4, 5], np.int32))
+    c = new_set(3, 'c', np.array([9], np.int32))
+    assert a.union(b, c).keys()[0].tolist() == [1, 3, 4, 5, 9]
+    assert a.intersection(b).keys()[0].tolist() == [3, 5]
+    assert a.difference(b, c).keys()[0].tolist() == [1]
+    assert a.contains(np.array([1, 2, 9])).tolist() == [True, False, True]
+
+    sides = new_set(4, 's', np.array([[7, 0], [7, 5], [2, 1]], np.int32))
+    other = new_set(5, 't', np.array([[7, 5], [3, 3]], np.int32))
+    union = sides.union(other)
+    assert union.id == 4 and union.name == 's'
+    assert np.array_equal(np.asarray(union.apply.data).reshape(-1, 2), [[2, 1], [3, 3], [7, 0], [7, 5]])
+    assert sides.contains(np.array([[7, 5], [7, 1]])).tolist() == [True, False]
+    with pytest.raises(ValueError):
+        a.union(sides)
+
+
+def test_geometric_selection() -> None:
+    n = 4
+    m = hex_grid(n)
+    assert len(boundary_sides(m.mesh)) == 6 * n * n
+
+    assert len(m.select_nodes(box([0, 0, 0], [1, 1, 1])).apply) == 8
+    assert len(m.select_nodes(sphere([2, 2, 2], 1.0)).apply) == 7
+    assert len(m.select_nodes(cylinder([0, 0, 0], [0, 0, 4], 1.0)).apply) == 3 * 5
+    assert len(m.select_nodes(band([0, 0, 2], [0, 0, 1], 0.1), 'mid').apply) == 25
+    assert list(m.nodesets) == [1, 2, 3, 4] and m.nodesets[4].name == 'mid'
+
+    top = m.select_sides(direction=[0, 0, 1], name='top')
+    assert len(top.apply) == n * n
+    corner = m.select_sides(box([0, 0, n], [2, 2, n]), direction=[0, 0, 1])
+    assert len(corner.apply) == 4
+    assert top.contains(np.asarray(corner.apply.data)).all()
+    assert len(m.select_sides(box([0, 0, 0], [n, n, 0])).apply) == n * n
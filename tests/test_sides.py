@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from fc_model import FC_ELEMENT_TYPES_KEYNAME
+from fc_model.fc_addons import new_set
+from fc_model.fc_selection import boundary_sides
+from fc_model.fc_sides import side_geometry
+
+from conftest import hex_grid
+
+
+def test_face_nodes_normals_areas() -> None:
+    n = 2
+    m = hex_grid(n)
+    sides = boundary_sides(m.mesh)
+    skin = new_set(1, 'skin', sides)
+
+    nodes = skin.face_nodes(m.mesh)
+    assert nodes.shape == (6 * n * n, 4)
+    for (element_id, f), row in zip(sides, nodes):
+        element = m.mesh.elements['HEX8'][int(element_id)]
+        assert row.tolist() == [element.nodes[i] for i in FC_ELEMENT_TYPES_KEYNAME['HEX8']['facets'][f]]
+
+    assert np.allclose(skin.face_areas(m.mesh), 1.0)
+    normals = skin.face_normals(m.mesh)
+    assert np.allclose(np.abs(normals).sum(axis=1), 1.0)
+    xyz = np.asarray(m.mesh.nodes_xyz).reshape(-1, 3)
+    centers = xyz[m.mesh.node_positions(nodes)].mean(axis=1)
+    assert np.all(np.einsum('ij,ij->i', normals, centers - n / 2) > 0)
+
+    with pytest.raises(ValueError):
+        new_set(2, 'nodes', np.array([1, 2], np.int32)).face_nodes(m.mesh)
+    with pytest.raises(KeyError):
+        new_set(3, 'bad', np.array([[99, 0]], np.int32)).face_areas(m.mesh)
+    with pytest.raises(ValueError):
+        new_set(4, 'bad', np.array([[1, 6]], np.int32)).face_areas(m.mesh)
+
+
+def test_curved_quadratic_faces() -> None:
+    n = 2
+    m = hex_grid(n)
+    m.mesh.elevate_order()
+    xyz = np.asarray(m.mesh.nodes_xyz, np.float64).reshape(-1, 3).copy()
+    xyz[:, 2] += 0.1 * xyz[:, 0] ** 2
+    m.mesh.nodes_xyz = xyz
+    skin = new_set(1, 'skin', boundary_sides(m.mesh))
+
+    assert skin.face_nodes(m.mesh).shape == (6 * n * n, 8)
+    geometry = side_geometry(m.mesh, skin.sides(), count=6)
+    assert np.allclose(geometry['vectors'].sum(axis=0), 0.0)
+
+    top = geometry['normals'][:, 2] > 0.9
+    assert np.isclose(geometry['vectors'][top, 2].sum(), n * n)
+    a = 0.2
+    exact = n * (n * np.sqrt(1 + (a * n) ** 2) + np.arcsinh(a * n) / a) / 2
+    assert np.isclose(geometry['areas'][top].sum(), exact, rtol=1e-6)
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fc_model import FCMesh, FCModel
+from fc_model.fc_mesh import FC_ELEMENT_TYPES_KEYNAME
+from fc_model.fc_quality import mesh_quality
+
+
+DATA = Path(__file__).parent / 'data'
+
+ELEMENTS = {
+    'QUAD4': ([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], 'TRI3', 2),
+    'HEX8': ([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]], 'TETRA4', 6),
+    'WEDGE6': ([[0, 0, 0], [0, 1, 0], [1, 0, 0], [0, 0, 1], [0, 1, 1], [1, 0, 1]], 'TETRA4', 3),
+    'PYR5': ([[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0], [0, 0, 1]], 'TETRA4', 2),
+}
+
+
+def _measure(mesh: FCMesh) -> float:
+    return float(sum(mesh.element_geometry(tp)['measures'].sum() for tp in mesh.elements))
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('typename', sorted(ELEMENTS))
+def test_single_element(typename: str, seed: int) -> None:
+    xyz, simplex, count = ELEMENTS[typename]
+    # Перестановка id узлов меняет выбор диагоналей
+    ids = (np.random.default_rng(seed).permutation(len(xyz)) + 1).astype(np.int32)
+    mesh = FCMesh()
+    mesh.nodes_xyz = np.array(xyz, np.float64)
+    mesh.nodes_ids = ids
+    one = np.ones(1, np.int32)
+    mesh.set_element_arrays(typename, {  # type: ignore[arg-type]
+        'ids': one * 4, 'nodes': ids[None].copy(), 'blocks': one * 3, 'parent_ids': one * 5, 'orders': one})
+    before = _measure(mesh)
+    result = mesh.to_simplices()
+
+    assert list(mesh.elements) == [simplex] and len(mesh.elements[simplex]) == count
+    assert _measure(mesh) == pytest.approx(before)
+    assert not np.any(mesh_quality(mesh)['inverted'])
+    arrays = mesh.element_arrays(simplex)  # type: ignore[arg-type]
+    assert np.all(arrays['blocks'] == 3) and np.all(arrays['parent_ids'] == 5)
+    assert np.all(result['parents'] == 4) and np.all(arrays['ids'] > 4)
+    # Каждая сторона родителя покрыта сторонами потомков
+    triangles = sum(len(f) - 2 for f in FC_ELEMENT_TYPES_KEYNAME[typename]['facets'])
+    assert len(result['faces']) == triangles
+
+
+def test_conforming_split() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    volume = _measure(m.mesh)
+    sizes = {key: len(s.apply) for key, s in m.sidesets.items()}
+    m.to_simplices()
+
+    arrays = m.mesh.element_arrays('TETRA4')
+    assert len(arrays['ids']) == 48 and _measure(m.mesh) == pytest.approx(volume)
+    # Внутренние треугольники общие ровно для двух тетраэдров, внешние — 6 граней по 4 квадрата
+    facets = np.array(FC_ELEMENT_TYPES_KEYNAME['TETRA4']['facets'])
+    triangles = np.sort(arrays['nodes'][:, facets].reshape(-1, 3), axis=1)
+    _, counts = np.unique(triangles, axis=0, return_counts=True)
+    assert set(counts.tolist()) <= {1, 2} and np.count_nonzero(counts == 1) == 6 * 4 * 2
+
+    assert any(sizes.values())
+    for key, sideset in m.sidesets.items():
+        assert len(sideset.apply) == 2 * sizes[key]
+
+
+def test_quadratic_rejected() -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    with pytest.raises(ValueError, match='linear'):
+        m.to_simplices()
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import numpy as np
+
+from fc_model import FCModel, FCNodeIndex
+from fc_model.fc_spatial import coincident_groups, coincident_pairs
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def brute_knearest(xyz: np.ndarray, points: np.ndarray, k: int) -> np.ndarray:
+    d = np.linalg.norm(points[:, None, :] - xyz[None, :, :], axis=2)
+    return np.sort(d, axis=1)[:, :k]
+
+
+def test_knearest_matches_brute_force() -> None:
+    rng = np.random.default_rng(0)
+    xyz = rng.random((2000, 3)) * [10.0, 2.0, 1.0]
+    points = rng.random((500, 3)) * 14.0 - 2.0
+
+    index = FCNodeIndex(xyz)
+    idx, dist = index.knearest(points, 5, chunk_size=128)
+
+    assert np.allclose(dist, brute_knearest(xyz, points, 5))
+    assert np.allclose(np.linalg.norm(xyz[idx] - points[:, None, :], axis=2), dist)
+
+
+def test_nearest_on_flat_cloud() -> None:
+    rng = np.random.default_rng(1)
+    xyz = np.zeros((1000, 3))
+    xyz[:, :2] = rng.random((1000, 2))
+    points = rng.random((200, 3))
+
+    idx, dist = FCNodeIndex(xyz).nearest(points)
+    assert np.allclose(dist, brute_knearest(xyz, points, 1)[:, 0])
+
+
+def test_radius() -> None:
+    rng = np.random.default_rng(2)
+    xyz = rng.random((1500, 3))
+    points = rng.random((50, 3))
+    r = 0.15
+
+    offsets, indices = FCNodeIndex(xyz).radius(points, r)
+    d = np.linalg.norm(points[:, None, :] - xyz[None, :, :], axis=2)
+    for i in range(len(points)):
+        assert np.array_equal(indices[offsets[i]:offsets[i + 1]], np.nonzero(d[i] <= r)[0])
+
+
+def test_mesh_nearest_nodes() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    ids = m.mesh.nearest_nodes(m.mesh.nodes_xyz + 0.01)
+    assert np.array_equal(ids, m.mesh.nodes_ids)
+    assert m.mesh.node_index is m.mesh.node_index
+
+    corner = m.mesh.nodes_in_radius(np.array([-5.0, -5.0, -5.0]), 0.5)
+    assert len(corner) == 1
+
+
+def test_coincident_pairs_match_brute_force() -> None:
+    rng = np.random.default_rng(3)
+    for tol in [1e-3, 5e-2, 0.2]:
+        xyz = rng.random((1500, 3))
+        xyz = np.vstack([xyz, xyz[:300] + rng.normal(size=(300, 3)) * tol / 4])
+
+        i, j = coincident_pairs(xyz, tol)
+        d = np.linalg.norm(xyz[:, None, :] - xyz[None, :, :], axis=2)
+        bi, bj = np.nonzero(np.triu(d <= tol, 1))
+        assert np.array_equal(i * len(xyz) + j, np.sort(bi * len(xyz) + bj))
+
+
+def test_coincident_groups_exact() -> None:
+    xyz = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+    assert coincident_groups(xyz, 0.0).tolist() == [0, 1, 0, 1, 4]
+    assert coincident_groups(xyz, 1.0).tolist() == [0, 0, 0, 0, 0]
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import numpy as np
+
+from fc_model import FCModel
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_validate_sample_models() -> None:
+    assert FCModel(str(DATA / 'cube_sidesets.fc')).validate() == []
+
+    # В ultracube одна табличная зависимость ссылается на элемент 0
+    issues = FCModel(str(DATA / 'ultracube.fc')).validate()
+    assert [(i['source'], i['target'], i['problem'], i['ids'].tolist()) for i in issues] == \
+        [('data', 'elements', 'missing', [0])]
+
+
+def test_validate_reports_broken_references() -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    element = next(iter(m.mesh))
+    element.nodes[0] = 10 ** 6
+    m.mesh.nodes_ids = np.append(m.mesh.nodes_ids, m.mesh.nodes_ids[2]).astype(np.int32)
+    m.mesh.nodes_xyz = np.vstack([m.mesh.nodes_xyz, m.mesh.nodes_xyz[2]])
+    m.blocks[1].material_id = 99
+    sideset = next(s for s in m.sidesets.values() if len(s.apply))
+    pairs = np.array(sideset.apply.data, np.int32).reshape(-1, 2)
+    pairs[0] = [element.id, 6]
+    pairs[1] = [10 ** 6, 0]
+    sideset.apply.data = pairs
+
+    found = {(i['source'], i['target'], i['problem']): i['ids'].tolist() for i in m.validate()}
+    assert found == {
+        ('mesh', 'nodes', 'duplicate'): [int(m.mesh.nodes_ids[2])],
+        ('HEX8 elements', 'nodes', 'missing'): [10 ** 6],
+        ('blocks', 'materials', 'missing'): [99],
+        (f'sideset {sideset.id}', 'elements', 'missing'): [10 ** 6],
+        (f'sideset {sideset.id}', 'faces', 'invalid'): [int(element.id)],
+    }
@@ -0,0 +1,70 @@
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from fc_model import FCModel
+from fc_model.fc_mesh import FC_ELEMENT_TYPES_KEYNAME
+from fc_model.fc_vtk import FC_VTK_CELL_TYPES, FC_VTK_NODE_ORDER
+
+
+DATA = Path(__file__).parent / 'data'
+DTYPES = {'Int32': '<i4', 'Int64': '<i8', 'UInt8': 'u1', 'Float64': '<f8'}
+
+
+def _read_vtu(path: Path) -> Dict[str, np.ndarray]:
+    raw = path.read_bytes()
+    start = raw.index(b'<AppendedData encoding="raw">')
+    data_start = raw.index(b'_', start) + 1
+    root = ET.fromstring(raw[:start] + b'</VTKFile>')
+    result = {}
+    for section in ('FieldData', 'PointData', 'CellData', 'Points', 'Cells'):
+        for array in root.iter(section):
+            for item in array.iter('DataArray'):
+                offset = data_start + int(item.get('offset', 0))
+                size = int(np.frombuffer(raw, '<u8', 1, offset)[0])
+                values = np.frombuffer(raw, DTYPES[item.get('type', '')], offset=offset + 8,
+                                       count=size // np.dtype(DTYPES[item.get('type', '')]).itemsize)
+                result[f"{section}/{item.get('Name')}"] = values.reshape(-1, int(item.get('NumberOfComponents', 1)))
+    return result
+
+
+def test_cell_tables() -> None:
+    assert FC_VTK_CELL_TYPES['HEX20'] == 25 and FC_VTK_CELL_TYPES['PYR13S'] == 27
+    for typename, order in FC_VTK_NODE_ORDER.items():
+        assert sorted(order) == list(range(FC_ELEMENT_TYPES_KEYNAME[typename]['nodes']))
+
+
+def test_to_vtu(tmp_path: Path) -> None:
+    m = FCModel(str(DATA / 'cube_sidesets.fc'))
+    path = tmp_path / 'cube.vtu'
+    m.to_vtu(str(path))
+    vtu = _read_vtu(path)
+
+    arrays = m.mesh.element_arrays('HEX8')
+    assert np.allclose(vtu['Points/Points'], m.mesh.nodes_xyz.reshape(-1, 3))
+    assert np.array_equal(vtu['PointData/fc_id'].ravel(), m.mesh.nodes_ids)
+    assert np.array_equal(vtu['CellData/fc_id'].ravel(), arrays['ids'])
+    assert np.array_equal(vtu['CellData/block'].ravel(), arrays['blocks'])
+    assert np.all(vtu['Cells/types'] == 12)
+    assert np.array_equal(vtu['Cells/offsets'].ravel(), 8 * np.arange(1, len(arrays['ids']) + 1))
+    connectivity = m.mesh.nodes_ids[vtu['Cells/connectivity'].reshape(-1, 8)]
+    assert np.array_equal(connectivity, arrays['nodes'])
+
+    sidesets = [name for name in vtu if name.startswith('FieldData/sideset_')]
+    assert len(sidesets) == sum(1 for s in m.sidesets.values() if s.apply.type == 'array')
+    for name in sidesets:
+        set_id = int(re.match(r'FieldData/sideset_(\d+)', name).group(1))  # type: ignore[union-attr]
+        assert np.array_equal(vtu[name], m.sidesets[set_id].apply.data.reshape(-1, 2))
+
+
+def test_vtu_keeps_element_order(tmp_path: Path) -> None:
+    m = FCModel(str(DATA / 'ultracube.fc'))
+    path = tmp_path / 'ultracube.vtu'
+    m.to_vtu(str(path))
+    orders = m.mesh.element_arrays('HEX20')['orders']
+    assert np.all(orders == 3)
+    assert np.array_equal(_read_vtu(path)['CellData/order'].ravel(), orders)
+    assert np.array_equal(FCModel.from_vtu(str(path)).mesh.element_arrays('HEX20')['orders'], orders)